@@ -0,0 +1,116 @@
+import argparse
+import json
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+from bs4 import BeautifulSoup
+from src.news_sentiment_analyzer.feed_parser import FeedMapping, FeedParser
+from src.news_sentiment_analyzer.rss_news_scraper import StringCleaner, NYTRSSNewsScraperAdapter
+
+# ? python -m benchmarks.bench_feed_parser --items 100 1000 10000
+# ? python -m benchmarks.bench_feed_parser --no-clean
+
+
+def make_feed(item_count: int) -> bytes:
+    '''
+    Build a synthetic NYT-style RSS feed with ``item_count`` items.
+    '''
+    items = []
+    for i in range(item_count):
+        items.append(
+            f'<item><title>Headline number {i} about the economy and politics</title>'
+            f'<link>https://www.example.com/2024/01/01/story-{i}.html</link>'
+            f'<guid isPermaLink="true">https://www.example.com/2024/01/01/story-{i}.html</guid>'
+            f'<description>Officials said on Monday that story {i} would have wide ranging '
+            f'effects across several regions, according to people familiar with the matter.</description>'
+            f'<media:description>Photo for story {i}.</media:description>'
+            f'<pubDate>Mon, 01 Jan 2024 12:00:00 +0000</pubDate></item>')
+    return ('<?xml version="1.0" encoding="UTF-8"?>'
+            '<rss version="2.0" xmlns:media="http://search.yahoo.com/mrss/"><channel>'
+            '<title>Benchmark</title>' + ''.join(items) + '</channel></rss>').encode('utf-8')
+
+
+def parse_with_beautifulsoup(content: bytes, clean: Callable[[str], str] = StringCleaner.clean_string) -> List[Dict[str, str]]:
+    '''
+    The BeautifulSoup implementation the NYT adapter used before FeedParser.
+    '''
+    articles = []
+    soup = BeautifulSoup(content, 'xml')
+    for item in soup.find_all('item'):
+        title, link, description = "", "", ""
+        if item.find('title'):
+            title = clean(item.find('title').text)
+        if item.find('link'):
+            link = clean(item.find('link').text)
+        if item.find('description'):
+            description = clean(item.find('description').text)
+        if item.find('media:description'):
+            description += " " + clean(item.find('media:description').text)
+        articles.append({'title': title, 'link': link, 'description': description})
+    return articles
+
+
+def parse_with_feed_parser(content: bytes, clean: Callable[[str], str] = StringCleaner.clean_string) -> List[Dict[str, str]]:
+    # * Only the fields the BeautifulSoup implementation extracted
+    nyt_mapping = NYTRSSNewsScraperAdapter.FEED_MAPPING
+    mapping = FeedMapping({}, nyt_mapping.join_fields)
+    mapping.fields = {name: nyt_mapping.fields[name] for name in ('title', 'link', 'description')}
+    parser = FeedParser(mapping, cleaner=clean)
+    return list(parser.parse(content))
+
+
+def measure(parse: Callable[[bytes], List[Dict[str, str]]], content: bytes, repeat: int) -> Dict[str, float]:
+    '''
+    Time ``parse`` (best of ``repeat``) and record its peak traced memory.
+    '''
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parse(content)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    parse(content)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'seconds': best, 'peak_mb': peak / (1024 * 1024)}
+
+
+def main(argv: List[str] = None) -> List[Dict]:
+    arg_parser = argparse.ArgumentParser(description="Compare BeautifulSoup and streaming feed parsing")
+    arg_parser.add_argument('--items', type=int, nargs='+', default=[100, 1000, 10000])
+    arg_parser.add_argument('--repeat', type=int, default=3)
+    arg_parser.add_argument('--no-clean', action='store_true',
+                            help="Measure parsing only, without StringCleaner")
+    arg_parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    args = arg_parser.parse_args(argv)
+
+    clean = str.strip if args.no_clean else StringCleaner.clean_string
+    results = []
+    for item_count in args.items:
+        content = make_feed(item_count)
+        assert parse_with_feed_parser(content, clean) == parse_with_beautifulsoup(content, clean)
+        soup = measure(lambda c: parse_with_beautifulsoup(c, clean), content, args.repeat)
+        streaming = measure(lambda c: parse_with_feed_parser(c, clean), content, args.repeat)
+        results.append({
+            'items': item_count,
+            'clean': not args.no_clean,
+            'bytes': len(content),
+            'beautifulsoup_seconds': round(soup['seconds'], 4),
+            'feed_parser_seconds': round(streaming['seconds'], 4),
+            'speedup': round(soup['seconds'] / streaming['seconds'], 2),
+            'beautifulsoup_peak_mb': round(soup['peak_mb'], 2),
+            'feed_parser_peak_mb': round(streaming['peak_mb'], 2),
+        })
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for row in results:
+            print(f"{row['items']:>6} items: BeautifulSoup {row['beautifulsoup_seconds']:.4f}s "
+                  f"({row['beautifulsoup_peak_mb']:.1f} MB) | FeedParser {row['feed_parser_seconds']:.4f}s "
+                  f"({row['feed_parser_peak_mb']:.1f} MB) | {row['speedup']:.1f}x faster")
+    return results
+
+
+if __name__ == "__main__":
+    main()
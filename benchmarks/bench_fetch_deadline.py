@@ -0,0 +1,94 @@
+import argparse
+import json
+import random
+import time
+from typing import Dict, List
+import numpy as np
+import requests
+from src.news_sentiment_analyzer.feed_pipeline import FeedPipeline
+from src.news_sentiment_analyzer.resilience import CircuitBreakers, RetryPolicy
+
+# ? python -m benchmarks.bench_fetch_deadline
+# ? python -m benchmarks.bench_fetch_deadline --runs 200 --hang 10
+
+
+class _Adapter():
+    def __init__(self, url: str) -> None:
+        self.url = url
+
+    def get_rss_url(self) -> str:
+        return self.url
+
+
+class SimulatedFeed():
+    '''
+    Feed with a fixed latency. The misbehaving feed hangs for ``hang`` seconds on some calls
+    (like a request stuck until the transport timeout) and fails with a connection error on others.
+    '''
+
+    def __init__(self, url: str, latency: float, hang: float = 0.0, hang_rate: float = 0.0,
+                 error_rate: float = 0.0, seed: int = 0) -> None:
+        self.rss_adapter = _Adapter(url)
+        self.latency = latency
+        self.hang = hang
+        self.hang_rate = hang_rate
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+
+    def scrape_rss_feed(self) -> List[Dict]:
+        draw = self._random.random()
+        if draw < self.hang_rate:
+            time.sleep(self.hang)
+        else:
+            time.sleep(self.latency)
+        if self.hang_rate <= draw < self.hang_rate + self.error_rate:
+            raise requests.ConnectionError("connection reset")
+        return [{'title': f'{self.rss_adapter.url} story', 'link': '', 'description': ''}]
+
+
+def run_latencies(runs: int, hang: float, resilient: bool) -> List[float]:
+    feeds = [SimulatedFeed(f'http://feed{i}.example/rss', 0.05) for i in range(3)]
+    feeds.append(SimulatedFeed('http://flaky.example/rss', 0.05, hang=hang, hang_rate=0.3, error_rate=0.2))
+    breakers = CircuitBreakers(failure_threshold=3, reset_timeout=1.0)
+    latencies = []
+    for _ in range(runs):
+        if resilient:
+            pipeline = FeedPipeline(feeds, deadline=1.0, feed_timeout=0.5, partial_results=True,
+                                    retry=RetryPolicy(attempts=3, base_delay=0.05), breakers=breakers)
+        else:
+            pipeline = FeedPipeline(feeds)
+        start = time.perf_counter()
+        try:
+            for _ in pipeline.batches():
+                pass
+        except requests.ConnectionError:
+            pass
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def main(argv: List[str] = None) -> Dict:
+    arg_parser = argparse.ArgumentParser(description="Run latency with one slow, flaky feed, with and without deadlines")
+    arg_parser.add_argument('--runs', type=int, default=40)
+    arg_parser.add_argument('--hang', type=float, default=3.0, help="Seconds the flaky feed hangs")
+    arg_parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    args = arg_parser.parse_args(argv)
+
+    results = {}
+    for name, resilient in (('no_deadline', False), ('deadline_breaker', True)):
+        latencies = np.array(run_latencies(args.runs, args.hang, resilient))
+        results[name] = {'p50_seconds': round(float(np.percentile(latencies, 50)), 3),
+                         'p99_seconds': round(float(np.percentile(latencies, 99)), 3),
+                         'max_seconds': round(float(latencies.max()), 3)}
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{args.runs} runs, 4 feeds, one hangs {args.hang}s on 30% and fails on 20% of calls")
+        for name, case in results.items():
+            print(f"  {name:<18} p50 {case['p50_seconds']:>7.3f}s  p99 {case['p99_seconds']:>7.3f}s  "
+                  f"max {case['max_seconds']:>7.3f}s")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import argparse
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+from src.news_sentiment_analyzer.feed_parser import FeedParser
+from src.news_sentiment_analyzer.inference_pool import InferencePool, available_cores
+from src.news_sentiment_analyzer.sentiment_analyzer import SentimentAnalyzer
+from benchmarks.run_benchmarks import FIXTURES, load_fixture
+from benchmarks.tiny_model import build_tiny_model
+
+# ? python -m benchmarks.bench_inference_pool
+# ? python -m benchmarks.bench_inference_pool --workers 1 2 4 8 --model distilbert-base-uncased-finetuned-sst-2-english
+
+
+def load_texts(copies: int) -> List[str]:
+    '''
+    Title plus description of every recorded story, repeated ``copies`` times with a
+    suffix so caches and deduplication cannot shortcut the work.
+    '''
+    stories = [story for name in FIXTURES for story in FeedParser().parse(load_fixture(name))]
+    return [f"{story['title']} {story['description']} ({copy})" for copy in range(copies) for story in stories]
+
+
+def measure(score, texts: List[str], repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        score(texts)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv: List[str] = None) -> Dict:
+    arg_parser = argparse.ArgumentParser(description="Measure InferencePool throughput as workers are added")
+    arg_parser.add_argument('--workers', type=int, nargs='+',
+                            default=sorted({1, 2, 4, len(available_cores())} - {0}))
+    arg_parser.add_argument('--model', help="Model name or directory (default: a generated medium-size model)")
+    arg_parser.add_argument('--copies', type=int, default=4, help="Times the recorded stories are repeated")
+    arg_parser.add_argument('--repeat', type=int, default=3)
+    arg_parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    args = arg_parser.parse_args(argv)
+
+    texts = load_texts(args.copies)
+    cores = len(available_cores())
+    with tempfile.TemporaryDirectory() as temp_dir:
+        model_dir = args.model
+        if model_dir is None:
+            words = {word for text in texts for word in text.lower().split()}
+            # * Large enough that a forward pass, not process overhead, dominates
+            model_dir = build_tiny_model(Path(temp_dir) / "model", words=words, max_position_embeddings=128,
+                                         dim=256, hidden_dim=1024, n_layers=4)
+        # * Reference: one analyzer in this process with torch's default threading
+        analyzer = SentimentAnalyzer(model_dir)
+        analyzer.get_sentiment(texts[:8])
+        single_process = measure(analyzer.get_sentiment, texts, args.repeat)
+        cases = {}
+        for workers in args.workers:
+            with InferencePool(model_dir, workers=workers) as pool:
+                pool.get_sentiment(texts[:8])
+                seconds = measure(pool.get_sentiment, texts, args.repeat)
+                cases[workers] = {'seconds': round(seconds, 3), 'threads_per_worker': pool.num_threads,
+                                  'texts_per_second': round(len(texts) / seconds, 1)}
+    baseline = cases[min(cases)]['texts_per_second'] / min(cases)
+    for workers, case in cases.items():
+        case['speedup'] = round(case['texts_per_second'] / baseline, 2)
+        case['efficiency'] = round(case['speedup'] / workers, 2)
+    results = {'texts': len(texts), 'cores': cores, 'os_cpu_count': os.cpu_count(),
+               'single_process': {'seconds': round(single_process, 3),
+                                  'texts_per_second': round(len(texts) / single_process, 1)},
+               'workers': cases}
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{results['texts']} texts on {cores} cores")
+        print(f"  {'in-process':<12} {results['single_process']['texts_per_second']:>10.1f} texts/s")
+        for workers, case in cases.items():
+            print(f"  {f'{workers} workers':<12} {case['texts_per_second']:>10.1f} texts/s  "
+                  f"{case['speedup']:>5.2f}x  efficiency {case['efficiency']:.2f}  "
+                  f"({case['threads_per_worker']} threads each)")
+    return results
+
+
+if __name__ == "__main__":
+    main()
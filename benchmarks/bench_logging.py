@@ -0,0 +1,112 @@
+import argparse
+import json
+import logging
+import logging.handlers
+import queue
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+from src.news_sentiment_analyzer.feed_parser import FeedParser
+from src.news_sentiment_analyzer.logging_setup import DEFAULT_FORMAT, DeferredQueueHandler
+from benchmarks.run_benchmarks import FIXTURES, load_fixture
+
+# ? python -m benchmarks.bench_logging
+# ? python -m benchmarks.bench_logging --copies 20 --json
+
+logger = logging.getLogger('benchmarks.hot_path')
+
+
+def legacy_log_article(story: Dict, result: Dict) -> None:
+    '''
+    The per-article logging of the adapter loop and _process_batch before queued logging.
+    '''
+    logger.debug(f'---')
+    logger.debug(f'Story: {story}')
+    logger.debug(f'result: {result}')
+
+
+def log_article(story: Dict, result: Dict) -> None:
+    '''
+    The per-article logging now: lazy %-formatting behind a level check.
+    '''
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug('Story: %s', story)
+        logger.debug('result: %s', result)
+
+
+def load_articles(copies: int) -> List[tuple]:
+    stories = [story for name in FIXTURES for story in FeedParser().parse(load_fixture(name))]
+    return [(story, {'text': story['title'], 'sentiment': 'POSITIVE', 'confidence': 0.991})
+            for _ in range(copies) for story in stories]
+
+
+def measure(log: Callable[[Dict, Dict], None], articles: List[tuple], handler: logging.Handler,
+            level: int, repeat: int) -> Dict[str, float]:
+    '''
+    Time the logging calls as the hot path sees them, and separately until everything is written.
+    '''
+    best_calls, best_total = float('inf'), float('inf')
+    for _ in range(repeat):
+        listener = None
+        if isinstance(handler, DeferredQueueHandler):
+            listener = logging.handlers.QueueListener(handler.queue, *handler.targets, respect_handler_level=True)
+            listener.start()
+        logger.handlers, logger.propagate = [handler], False
+        logger.setLevel(level)
+        start = time.perf_counter()
+        for story, result in articles:
+            log(story, result)
+        calls = time.perf_counter() - start
+        if listener is not None:
+            listener.stop()
+        best_calls = min(best_calls, calls)
+        best_total = min(best_total, time.perf_counter() - start)
+    return {'calls_us_per_article': round(best_calls / len(articles) * 1e6, 2),
+            'written_us_per_article': round(best_total / len(articles) * 1e6, 2)}
+
+
+def main(argv: List[str] = None) -> Dict:
+    arg_parser = argparse.ArgumentParser(description="Per-article logging overhead before and after queued logging")
+    arg_parser.add_argument('--copies', type=int, default=10, help="Times the recorded stories are repeated")
+    arg_parser.add_argument('--repeat', type=int, default=3)
+    arg_parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    args = arg_parser.parse_args(argv)
+
+    articles = load_articles(args.copies)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        def file_handler(name: str) -> logging.Handler:
+            handler = logging.FileHandler(Path(temp_dir) / name, encoding='utf-8')
+            handler.setFormatter(logging.Formatter(DEFAULT_FORMAT))
+            return handler
+
+        def queued_handler(name: str) -> logging.Handler:
+            handler = DeferredQueueHandler(queue.SimpleQueue())
+            handler.targets = [file_handler(name)]
+            return handler
+
+        cases = {
+            'before_debug_sync_file': (legacy_log_article, file_handler('before.log'), logging.DEBUG),
+            'before_info_sync_file': (legacy_log_article, file_handler('before_info.log'), logging.INFO),
+            'after_debug_queued_file': (log_article, queued_handler('after.log'), logging.DEBUG),
+            'after_info_queued_file': (log_article, queued_handler('after_info.log'), logging.INFO),
+        }
+        results = {'articles': len(articles),
+                   'cases': {name: measure(log, articles, handler, level, args.repeat)
+                             for name, (log, handler, level) in cases.items()}}
+        for _, handler, _ in cases.values():
+            for target in getattr(handler, 'targets', [handler]):
+                target.close()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{results['articles']} articles (microseconds per article)")
+        print(f"  {'case':<26} {'hot path':>10} {'written':>10}")
+        for name, case in results['cases'].items():
+            print(f"  {name:<26} {case['calls_us_per_article']:>10.2f} {case['written_us_per_article']:>10.2f}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+import numpy as np
+from src.news_sentiment_analyzer.news_sentiment_analyzer import NewsSentimentAnalyzer
+from src.news_sentiment_analyzer.records import ARTICLE_FIELDS, ArticleBatch, SentimentBatch
+from src.news_sentiment_analyzer.result_buffer import ResultBuffer
+
+# ? python -m benchmarks.bench_records
+# ? python -m benchmarks.bench_records --articles 1000000 --json
+
+LABELS = ('NEGATIVE', 'POSITIVE')
+# * The results table before sentiments became categories and confidences float32
+LEGACY_RESULT_COLUMNS = dict(NewsSentimentAnalyzer.RESULT_COLUMNS, sentiment='object', confidence='float64')
+
+
+def make_columns(count: int) -> Dict[str, List[str]]:
+    '''
+    Feed-like string columns. Both representations are built from these same strings,
+    so the measurements compare the containers, not the text itself.
+    '''
+    return {'title': [f'Headline number {i} about the economy' for i in range(count)],
+            'link': [f'https://news.example.com/2024/05/01/story-{i}.html' for i in range(count)],
+            'description': [f'Summary of story {i}, a few sentences of teaser text.' for i in range(count)],
+            'guid': [f'urn:story:{i}' for i in range(count)],
+            'published': ['Wed, 01 May 2024 12:30:00 +0000'] * count}
+
+
+def allocated(build: Callable[[], object]) -> int:
+    '''
+    Bytes still allocated by ``build``'s result once it returns.
+    '''
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current
+
+
+def best_time(run: Callable[[], object], repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv: List[str] = None) -> Dict:
+    arg_parser = argparse.ArgumentParser(description="Memory and conversion cost of dict records against columnar batches")
+    arg_parser.add_argument('--articles', type=int, default=100000)
+    arg_parser.add_argument('--repeat', type=int, default=3)
+    arg_parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    args = arg_parser.parse_args(argv)
+
+    count = args.articles
+    columns = make_columns(count)
+    texts = ArticleBatch(columns).texts()
+    rng = np.random.default_rng(0)
+    codes = rng.integers(0, 2, count).astype(np.int8)
+    confidences = np.round(rng.uniform(0.5, 1.0, count), 3).astype(np.float32)
+    sentiments = [LABELS[code] for code in codes.tolist()]
+    scores = [round(float(value), 3) for value in confidences.tolist()]
+
+    def dict_articles():
+        return [dict(zip(ARTICLE_FIELDS, values)) for values in zip(*(columns[f] for f in ARTICLE_FIELDS))]
+
+    def batch_articles():
+        return ArticleBatch({field: list(values) for field, values in columns.items()})
+
+    def dict_results():
+        # * Confidences are new float objects per result, as the analyzer produced them
+        return [{'text': text, 'sentiment': sentiment, 'confidence': float(str(score))}
+                for text, sentiment, score in zip(texts, sentiments, scores)]
+
+    def batch_results():
+        return SentimentBatch(LABELS, codes.copy(), confidences.copy(), texts)
+
+    def legacy_table():
+        buffer = ResultBuffer(LEGACY_RESULT_COLUMNS, emit_every=None, emit_interval=None)
+        for text, result, link, guid in zip(texts, dict_results(), columns['link'], columns['guid']):
+            buffer.append({'text': text, 'sentiment': result['sentiment'], 'confidence': result['confidence'],
+                           'source': 'http://feed.example/rss', 'link': link, 'guid': guid, 'published': 0.0})
+        return buffer.to_frame()
+
+    def columnar_table():
+        buffer = ResultBuffer(NewsSentimentAnalyzer.RESULT_COLUMNS, emit_every=None, emit_interval=None)
+        scored = batch_results()
+        buffer.extend_columns({'text': texts, 'sentiment': scored.sentiments(), 'confidence': scored.confidences,
+                               'source': ['http://feed.example/rss'] * count, 'link': columns['link'],
+                               'guid': columns['guid'], 'published': np.zeros(count)})
+        return buffer.to_frame()
+
+    legacy_frame, columnar_frame = legacy_table(), columnar_table()
+    per_100k = 100000 / count
+    results = {
+        'articles': count,
+        'bytes_per_100k': {
+            'articles_dicts': round(allocated(dict_articles) * per_100k),
+            'articles_batch': round(allocated(batch_articles) * per_100k),
+            'results_dicts': round(allocated(dict_results) * per_100k),
+            'results_batch': round(allocated(batch_results) * per_100k),
+            'table_sentiment_confidence_before': round(
+                legacy_frame[['sentiment', 'confidence']].memory_usage(deep=True, index=False).sum() * per_100k),
+            'table_sentiment_confidence_after': round(
+                columnar_frame[['sentiment', 'confidence']].memory_usage(deep=True, index=False).sum() * per_100k),
+        },
+        'seconds': {
+            'results_to_table_dicts': round(best_time(legacy_table, args.repeat), 4),
+            'results_to_table_columnar': round(best_time(columnar_table, args.repeat), 4),
+        },
+    }
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{count} articles")
+        print(f"  {'memory per 100k articles':<42} {'bytes':>12}")
+        for name, value in results['bytes_per_100k'].items():
+            print(f"  {name:<42} {value:>12,}")
+        for name, value in results['seconds'].items():
+            print(f"  {name:<42} {value:>11.4f}s")
+    return results
+
+
+if __name__ == "__main__":
+    main()
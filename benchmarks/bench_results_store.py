@@ -0,0 +1,89 @@
+import argparse
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List
+from src.news_sentiment_analyzer.results_store import ResultsStore
+
+# ? python -m benchmarks.bench_results_store
+# ? python -m benchmarks.bench_results_store --rows 1000000 --json
+
+SOURCES = [f'https://feeds.example.com/{name}.xml' for name in
+           ('world', 'us', 'politics', 'business', 'technology', 'science', 'health', 'sports')]
+SENTIMENTS = ('POSITIVE', 'NEGATIVE')
+DAY = 86400.0
+
+
+def generate_rows(count: int, days: int, seed: int = 0) -> Iterator[Dict]:
+    '''
+    Synthetic results spread evenly over ``days`` days across the benchmark feeds.
+    '''
+    rng = random.Random(seed)
+    start = time.time() - days * DAY
+    for i in range(count):
+        yield {'source': SOURCES[i % len(SOURCES)], 'text': f'Headline number {i} and its description',
+               'link': f'https://news.example.com/story/{i}', 'guid': '',
+               'sentiment': SENTIMENTS[rng.random() < 0.45], 'confidence': 0.5 + rng.random() / 2,
+               'published': start + rng.random() * days * DAY}
+
+
+def measure(query: Callable[[], object], repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        query()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv: List[str] = None) -> Dict:
+    arg_parser = argparse.ArgumentParser(description="Time bulk upserts and indexed queries of ResultsStore")
+    arg_parser.add_argument('--rows', type=int, default=200_000)
+    arg_parser.add_argument('--days', type=int, default=365, help="History the rows are spread over")
+    arg_parser.add_argument('--batch', type=int, default=5_000, help="Rows per upsert, as one analysis run")
+    arg_parser.add_argument('--repeat', type=int, default=5)
+    arg_parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    args = arg_parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = ResultsStore(Path(directory) / 'results.db')
+        rows = generate_rows(args.rows, args.days)
+        start = time.perf_counter()
+        while True:
+            batch = [row for _, row in zip(range(args.batch), rows)]
+            if not batch:
+                break
+            store.upsert(batch)
+        insert_seconds = time.perf_counter() - start
+
+        now = time.time()
+        source = SOURCES[0]
+        queries = {
+            'latest_100': lambda: store.query(limit=100),
+            'source_last_day': lambda: store.query(source=source, start=now - DAY, limit=None),
+            'negative_last_week': lambda: store.query(sentiment='NEGATIVE', start=now - 7 * DAY,
+                                                      min_confidence=0.9, limit=500),
+            'count_source_last_month': lambda: store.count(source=source, start=now - 30 * DAY),
+            'sentiment_counts_last_day': lambda: store.sentiment_counts(start=now - DAY),
+            'page_deep_in_history': lambda: store.query(source=source, end=now - 180 * DAY, limit=100, offset=1000),
+        }
+        seconds = {name: measure(query, args.repeat) for name, query in queries.items()}
+        results = {'rows': store.count(), 'insert_seconds': round(insert_seconds, 3),
+                   'rows_per_second': round(args.rows / insert_seconds),
+                   'queries_ms': {name: round(value * 1000, 3) for name, value in seconds.items()}}
+        store.close()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{results['rows']} rows inserted in {results['insert_seconds']}s "
+              f"({results['rows_per_second']} rows/s)")
+        for name, milliseconds in results['queries_ms'].items():
+            print(f"  {name:<26} {milliseconds:>9.3f}ms")
+    return results
+
+
+if __name__ == "__main__":
+    main()
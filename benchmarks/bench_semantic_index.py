@@ -0,0 +1,93 @@
+import argparse
+import json
+import tempfile
+import time
+from typing import Dict, List
+import numpy as np
+from src.news_sentiment_analyzer.semantic_index import SemanticIndex, normalize_rows
+
+# ? python -m benchmarks.bench_semantic_index
+# ? python -m benchmarks.bench_semantic_index --rows 1000000 --quantize
+
+
+class SyntheticEmbedder():
+    '''
+    Stand-in for a sentence embedding model: texts named "story <i> topic <t>" map to a
+    noisy copy of topic t's direction, so the collection has the cluster structure of real
+    headlines without the cost of running a model over a million of them.
+    '''
+
+    def __init__(self, dim: int = 384, topics: int = 2000, noise: float = 0.6, seed: int = 0) -> None:
+        self.dim = dim
+        self.name = f'synthetic-{dim}'
+        self.noise = noise
+        self.centers = normalize_rows(np.random.default_rng(seed).standard_normal((topics, dim)).astype(np.float32))
+        self._rng = np.random.default_rng(seed + 1)
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        topics = np.array([int(text.rsplit(' ', 1)[1]) for text in texts]) % len(self.centers)
+        noise = self._rng.standard_normal((len(texts), self.dim)).astype(np.float32) * self.noise / np.sqrt(self.dim)
+        return normalize_rows(self.centers[topics] + noise)
+
+
+def time_queries(search, queries: np.ndarray, k: int) -> tuple:
+    start = time.perf_counter()
+    results = [[item['id'] for item in search(query, k)] for query in queries]
+    return (time.perf_counter() - start) / len(queries), results
+
+
+def main(argv: List[str] = None) -> Dict:
+    arg_parser = argparse.ArgumentParser(description="Ingest and top-k search cost of the semantic index")
+    arg_parser.add_argument('--rows', type=int, default=200000)
+    arg_parser.add_argument('--dim', type=int, default=384)
+    arg_parser.add_argument('--queries', type=int, default=20)
+    arg_parser.add_argument('--k', type=int, default=10)
+    arg_parser.add_argument('--nprobe', type=int, nargs='+', default=[8, 32])
+    arg_parser.add_argument('--quantize', action='store_true', help="Store int8 rows")
+    arg_parser.add_argument('--batch', type=int, default=50000, help="Rows per add call")
+    arg_parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    args = arg_parser.parse_args(argv)
+
+    embedder = SyntheticEmbedder(args.dim)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        index = SemanticIndex(temp_dir, embedder, quantize=args.quantize)
+        start = time.perf_counter()
+        for first in range(0, args.rows, args.batch):
+            index.add({'text': f'story {i} topic {i}', 'source': f'http://feed{i % 50}.example/rss',
+                       'sentiment': 'POSITIVE' if i % 3 else 'NEGATIVE', 'confidence': 0.9,
+                       'published': 1_700_000_000.0 + i} for i in range(first, min(args.rows, first + args.batch)))
+        ingest = time.perf_counter() - start
+        queries = embedder.embed([f'query {i} topic {i * 7}' for i in range(args.queries)])
+
+        def exact(query, k):
+            return index.search(query, k, exact=True)
+        exact_seconds, truth = time_queries(exact, queries, args.k)
+        start = time.perf_counter()
+        ivf = index.build_ivf()
+        build = time.perf_counter() - start
+        cases = {}
+        for nprobe in args.nprobe:
+            index.nprobe = nprobe
+            seconds, found = time_queries(index.search, queries, args.k)
+            recall = np.mean([len(set(a) & set(b)) / len(a) for a, b in zip(truth, found)])
+            cases[f'ivf_nprobe_{nprobe}'] = {'ms_per_query': round(seconds * 1000, 2), 'recall': round(float(recall), 3)}
+        index.close()
+
+    results = {'rows': args.rows, 'dim': args.dim, 'quantize': args.quantize,
+               'ingest_rows_per_second': round(args.rows / ingest),
+               'exact_ms_per_query': round(exact_seconds * 1000, 2),
+               'ivf_build_seconds': round(build, 2), 'ivf_lists': ivf['lists'], 'cases': cases}
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{args.rows} rows x {args.dim} ({'int8' if args.quantize else 'float32'}), "
+              f"ingest {results['ingest_rows_per_second']} rows/s")
+        print(f"  {'exact scan':<18} {results['exact_ms_per_query']:>9.2f} ms/query")
+        print(f"  {'ivf build':<18} {results['ivf_build_seconds']:>9.2f} s ({ivf['lists']} lists)")
+        for name, case in cases.items():
+            print(f"  {name:<18} {case['ms_per_query']:>9.2f} ms/query  recall@{args.k} {case['recall']:.3f}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+import argparse
+import json
+import time
+from typing import Callable, Dict, List
+import emoji
+from src.news_sentiment_analyzer.feed_parser import FeedParser
+from src.news_sentiment_analyzer.text_normalizer import DEFAULT_NORMALIZER, HTML_NORMALIZER
+from benchmarks.run_benchmarks import FIXTURES, load_fixture
+
+# ? python -m benchmarks.bench_text_normalizer
+# ? python -m benchmarks.bench_text_normalizer --repeat 10 --json
+
+
+def legacy_clean_string(input_string: str) -> str:
+    '''
+    The StringCleaner.clean_string implementation used before TextNormalizer.
+    '''
+    emoji_free = emoji.replace_emoji(input_string, replace='')
+    temp_string = emoji_free.replace(
+        "\n", " ").replace("\r", " ").strip()
+    clean_string = ' '.join(temp_string.split())
+    clean_string = clean_string.encode(
+        'ascii', 'ignore').decode('ascii').strip()
+    return clean_string
+
+
+def load_texts() -> List[str]:
+    '''
+    Every raw title, link and description from the recorded feeds, plus a share of
+    headlines with accents, emoji and markup as seen in international feeds.
+    '''
+    parser = FeedParser(cleaner=lambda text: text)
+    texts = [value for name in FIXTURES for story in parser.parse(load_fixture(name))
+             for value in story.values()]
+    extra = ["Zelensky meets Macron in Paris 🇺🇦🇫🇷 as talks resume\n",
+             "Café owner in São Paulo wins award ☕️ after 20 years",
+             "<p>Markets rally &amp; the Fed&#8217;s next move</p>\r\n<br/>",
+             "Björk and Sigur Rós announce Reykjavík concert 🎶"]
+    return texts + extra * (len(texts) // 20)
+
+
+def measure(clean: Callable[[List[str]], List[str]], texts: List[str], repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        clean(texts)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv: List[str] = None) -> Dict:
+    arg_parser = argparse.ArgumentParser(description="Compare the legacy cleaner with TextNormalizer")
+    arg_parser.add_argument('--repeat', type=int, default=5)
+    arg_parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    args = arg_parser.parse_args(argv)
+
+    texts = load_texts()
+    implementations = {
+        'legacy_clean_string': lambda values: [legacy_clean_string(text) for text in values],
+        'normalize': lambda values: [DEFAULT_NORMALIZER.normalize(text) for text in values],
+        'normalize_batch': DEFAULT_NORMALIZER.normalize_batch,
+        'normalize_batch_html': HTML_NORMALIZER.normalize_batch,
+    }
+    seconds = {name: measure(clean, texts, args.repeat) for name, clean in implementations.items()}
+    baseline = seconds['legacy_clean_string']
+    results = {'texts': len(texts), 'characters': sum(len(text) for text in texts),
+               'cases': {name: {'seconds': round(value, 5), 'speedup': round(baseline / value, 1)}
+                         for name, value in seconds.items()}}
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{results['texts']} texts, {results['characters']} characters")
+        for name, case in results['cases'].items():
+            print(f"  {name:<22} {case['seconds']:.5f}s  {case['speedup']:>6.1f}x")
+    return results
+
+
+if __name__ == "__main__":
+    main()
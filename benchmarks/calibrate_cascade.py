@@ -0,0 +1,131 @@
+import argparse
+import csv
+import json
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from src.news_sentiment_analyzer.feed_parser import FeedParser
+from src.news_sentiment_analyzer.lexicon_scorer import CascadeAnalyzer, LexiconScorer
+from src.news_sentiment_analyzer.sentiment_analyzer import SentimentAnalyzer
+from benchmarks.run_benchmarks import FIXTURE_DIR, FIXTURES, load_fixture
+
+# ? python -m benchmarks.calibrate_cascade
+# ? python -m benchmarks.calibrate_cascade --sample my_labeled.csv --margins 0.4 0.6 0.8 --min-agreement 0.97
+
+DEFAULT_SAMPLE = FIXTURE_DIR / 'labeled_headlines.jsonl'
+
+
+def load_sample(path: Path) -> Tuple[List[str], List[Optional[str]]]:
+    '''
+    Texts and labels from a JSONL or CSV file with a 'text' and an optional 'label' field.
+    '''
+    path = Path(path)
+    with open(path, encoding='utf-8', newline='') as handle:
+        if path.suffix == '.csv':
+            rows = list(csv.DictReader(handle))
+        else:
+            rows = [json.loads(line) for line in handle if line.strip()]
+    return [row['text'] for row in rows], [row.get('label') or None for row in rows]
+
+
+def feed_texts() -> List[str]:
+    '''
+    Title plus description of every recorded feed story (unlabeled).
+    '''
+    return [f"{story['title']} {story['description']}" for name in FIXTURES
+            for story in FeedParser().parse(load_fixture(name))]
+
+
+def measure(score, texts: List[str], repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        score(texts)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def accuracy(predicted: List[str], labels: List[Optional[str]]) -> Optional[float]:
+    pairs = [(p, label) for p, label in zip(predicted, labels) if label is not None]
+    return round(sum(p == label for p, label in pairs) / len(pairs), 4) if pairs else None
+
+
+def calibrate(analyzer, texts: List[str], labels: List[Optional[str]], margins: List[float],
+              lexicon: Optional[LexiconScorer] = None, repeat: int = 3) -> Dict:
+    '''
+    Score ``texts`` with the model alone and with the cascade at each margin.
+
+    Agreement is measured against the model's own labels, accuracy against ``labels``
+    where given, and speedup as model-only time over cascade time.
+    '''
+    reference = analyzer.score_batch(texts).sentiments()
+    model_seconds = measure(analyzer.score_batch, texts, repeat)
+    cases = []
+    for margin in margins:
+        cascade = CascadeAnalyzer(analyzer, lexicon, margin)
+        seconds = measure(cascade.score_batch, texts, repeat)
+        scored = cascade.score_batch(texts)
+        predicted = scored.sentiments()
+        cases.append({'margin': margin,
+                      'lexicon_share': round(scored.tiers.count('lexicon') / len(texts), 4),
+                      'agreement': round(sum(a == b for a, b in zip(predicted, reference)) / len(texts), 4),
+                      'accuracy': accuracy(predicted, labels),
+                      'seconds': round(seconds, 4),
+                      'speedup': round(model_seconds / seconds, 2) if seconds else None})
+    return {'texts': len(texts), 'labeled': sum(label is not None for label in labels),
+            'model_seconds': round(model_seconds, 4), 'model_accuracy': accuracy(reference, labels),
+            'cases': cases}
+
+
+def recommend(results: Dict, min_agreement: float) -> Optional[Dict]:
+    '''
+    The fastest case whose agreement with the model is at least ``min_agreement``.
+    '''
+    eligible = [case for case in results['cases'] if case['agreement'] >= min_agreement]
+    return max(eligible, key=lambda case: case['speedup'] or 0) if eligible else None
+
+
+def main(argv: List[str] = None) -> Dict:
+    arg_parser = argparse.ArgumentParser(
+        description="Agreement-vs-speedup tradeoff of cascade scoring against full-model scoring")
+    arg_parser.add_argument('--sample', default=str(DEFAULT_SAMPLE),
+                            help="JSONL or CSV file with 'text' and optional 'label' columns")
+    arg_parser.add_argument('--feeds', action='store_true', help="Add the recorded feed stories (unlabeled)")
+    arg_parser.add_argument('--model', default=SentimentAnalyzer.DEFAULT_MODEL_NAME,
+                            help="Model name or directory")
+    arg_parser.add_argument('--lexicon', help="word<TAB>polarity lexicon file (default: built-in)")
+    arg_parser.add_argument('--margins', type=float, nargs='+', default=[0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9])
+    arg_parser.add_argument('--min-agreement', type=float, default=0.95)
+    arg_parser.add_argument('--repeat', type=int, default=3)
+    arg_parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    args = arg_parser.parse_args(argv)
+
+    texts, labels = load_sample(args.sample)
+    if args.feeds:
+        stories = feed_texts()
+        texts, labels = texts + stories, labels + [None] * len(stories)
+    analyzer = SentimentAnalyzer(args.model)
+    lexicon = LexiconScorer.from_file(args.lexicon, labels=analyzer.labels) if args.lexicon else None
+    results = calibrate(analyzer, texts, labels, args.margins, lexicon, args.repeat)
+    results['recommended'] = recommend(results, args.min_agreement)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return results
+    print(f"{results['texts']} texts ({results['labeled']} labeled), model only {results['model_seconds']:.3f}s"
+          + (f", accuracy {results['model_accuracy']:.3f}" if results['model_accuracy'] is not None else ''))
+    print(f"  {'margin':>6} {'lexicon':>8} {'agree':>7} {'accuracy':>9} {'seconds':>9} {'speedup':>8}")
+    for case in results['cases']:
+        case_accuracy = f"{case['accuracy']:.3f}" if case['accuracy'] is not None else '-'
+        print(f"  {case['margin']:>6.2f} {case['lexicon_share']:>8.1%} {case['agreement']:>7.1%} "
+              f"{case_accuracy:>9} {case['seconds']:>9.3f} {case['speedup']:>7.2f}x")
+    best = results['recommended']
+    if best:
+        print(f"Recommended margin for >= {args.min_agreement:.0%} agreement: {best['margin']} "
+              f"({best['speedup']}x, {best['lexicon_share']:.0%} answered by the lexicon)")
+    else:
+        print(f"No margin reaches {args.min_agreement:.0%} agreement; use a higher margin or no cascade")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+import argparse
+import json
+import logging
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+from src.news_sentiment_analyzer import (NewsSentimentAnalyzer, RSSNewsScraper, BaseRSSNewsScraperAdapter,
+                                         ABCRSSNewsScraperAdapter, NYTRSSNewsScraperAdapter, SentimentAnalyzer)
+from src.news_sentiment_analyzer.feed_parser import FeedParser
+from src.news_sentiment_analyzer.http_transport import FetchResult
+from src.news_sentiment_analyzer.rss_news_scraper import StringCleaner
+from src.news_sentiment_analyzer.sentiment_cache import SentimentCache
+from src.news_sentiment_analyzer.text_normalizer import HTML_NORMALIZER
+from benchmarks.tiny_model import build_tiny_model
+
+# ? python -m benchmarks.run_benchmarks
+# ? python -m benchmarks.run_benchmarks --save-baseline
+# ? python -m benchmarks.run_benchmarks --baseline benchmarks/baseline.json --tolerance 0.25
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures"
+DEFAULT_BASELINE = Path(__file__).parent / "baseline.json"
+
+# * Recorded feeds and the adapters that parse them
+FIXTURES = {
+    'nyt_small': ('nyt_small.xml', NYTRSSNewsScraperAdapter),
+    'abc_medium': ('abc_medium.xml', ABCRSSNewsScraperAdapter),
+    'nyt_large': ('nyt_large.xml', NYTRSSNewsScraperAdapter),
+}
+
+
+class FixtureTransport():
+    '''
+    Stand-in for HTTPTransport that serves a recorded feed instead of the network.
+    '''
+    timeout = 10
+
+    def __init__(self, content: bytes) -> None:
+        self.content = content
+
+    def get(self, url: str, timeout: float = None) -> FetchResult:
+        return FetchResult(url, 200, self.content)
+
+
+def load_fixture(name: str) -> bytes:
+    return (FIXTURE_DIR / FIXTURES[name][0]).read_bytes()
+
+
+def make_source(name: str, adapter_class=None) -> RSSNewsScraper:
+    '''
+    Build a scraper for a recorded fixture using its adapter (or ``adapter_class``).
+    '''
+    adapter_class = adapter_class or FIXTURES[name][1]
+    transport = FixtureTransport(load_fixture(name))
+    if adapter_class is BaseRSSNewsScraperAdapter:
+        adapter = BaseRSSNewsScraperAdapter(f"https://fixtures.invalid/{name}", transport=transport)
+    else:
+        adapter = adapter_class(transport=transport)
+    return RSSNewsScraper(adapter)
+
+
+def time_case(case: Callable[[], object], repeat: int, warmup: int = 1) -> Dict[str, float]:
+    '''
+    Run ``case`` ``warmup`` times untimed, then ``repeat`` times timed.
+
+    Returns:
+        Dict[str, float]: min / median / mean seconds per run and the repeat count.
+    '''
+    for _ in range(warmup):
+        case()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        case()
+        timings.append(time.perf_counter() - start)
+    return {
+        'min_seconds': round(min(timings), 6),
+        'median_seconds': round(statistics.median(timings), 6),
+        'mean_seconds': round(statistics.fmean(timings), 6),
+        'repeat': repeat
+    }
+
+
+def build_cases(model_dir: str) -> Dict[str, Callable[[], object]]:
+    '''
+    Build the benchmark cases. Every case runs offline against recorded fixtures
+    and the tiny local model in ``model_dir``.
+    '''
+    raw_parser = FeedParser(cleaner=lambda text: text)
+    raw_texts = [value for name in FIXTURES for story in raw_parser.parse(load_fixture(name))
+                 for value in story.values()]
+    headlines = [story['title'] + ' ' + story['description']
+                 for story in make_source('nyt_small').scrape_rss_feed()]
+    analyzer = SentimentAnalyzer(model_name=model_dir)
+
+    def analyze_news_end_to_end():
+        # * A fresh cache per run so every run pays for inference
+        news_analyzer = NewsSentimentAnalyzer(model_name=model_dir, sentiment_cache=SentimentCache(),
+                                              emit_every=None, emit_interval=None)
+        sources = [make_source(name) for name in FIXTURES]
+        for _ in news_analyzer.analyze_news(sources, progress=lambda *args, **kwargs: None):
+            pass
+
+    cases = {
+        'clean_string': lambda: [StringCleaner.clean_string(text) for text in raw_texts],
+        'normalize_batch_html': lambda: HTML_NORMALIZER.normalize_batch(raw_texts),
+        'scrape_base_nyt_small': lambda: make_source('nyt_small', BaseRSSNewsScraperAdapter).scrape_rss_feed(),
+    }
+    for name in FIXTURES:
+        cases[f'scrape_{name}'] = (lambda name=name: make_source(name).scrape_rss_feed())
+    cases['get_sentiment_single'] = lambda: [analyzer.get_sentiment(text) for text in headlines]
+    cases['get_sentiment_batch'] = lambda: analyzer.get_sentiment(headlines)
+    cases['analyze_news_end_to_end'] = analyze_news_end_to_end
+    return cases
+
+
+def run_suite(repeat: int = 5, only: List[str] = None) -> Dict:
+    '''
+    Run the benchmark suite.
+
+    Returns:
+        Dict: Machine-readable results with a 'meta' section and one entry per case.
+    '''
+    with tempfile.TemporaryDirectory() as temp_dir:
+        words = set()
+        for name in FIXTURES:
+            for story in FeedParser().parse(load_fixture(name)):
+                words.update(' '.join(story.values()).lower().split())
+        model_dir = build_tiny_model(Path(temp_dir) / "model", words=words, max_position_embeddings=128)
+        cases = build_cases(model_dir)
+        results = {}
+        for name, case in cases.items():
+            if only and name not in only:
+                continue
+            results[name] = time_case(case, repeat)
+            print(f"{name:<28} median {results[name]['median_seconds'] * 1000:9.3f} ms", file=sys.stderr)
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': results
+    }
+
+
+def compare(current: Dict, baseline: Dict, tolerance: float = 0.25, min_seconds: float = 0.001) -> List[Dict]:
+    '''
+    Compare median timings with a stored baseline.
+
+    A case regresses when its median is more than ``tolerance`` slower than the baseline
+    and the slowdown is larger than ``min_seconds`` (to ignore timer noise on tiny cases).
+
+    Returns:
+        List[Dict]: One entry per regressed case.
+    '''
+    regressions = []
+    for name, result in current['results'].items():
+        reference = baseline.get('results', {}).get(name)
+        if not reference:
+            continue
+        before, after = reference['median_seconds'], result['median_seconds']
+        if after > before * (1 + tolerance) and after - before > min_seconds:
+            regressions.append({'case': name, 'baseline_seconds': before, 'current_seconds': after,
+                                'slowdown': round(after / before, 2) if before else None})
+    return regressions
+
+
+def main(argv: List[str] = None) -> int:
+    arg_parser = argparse.ArgumentParser(description="Offline micro-benchmarks for the news sentiment pipeline")
+    arg_parser.add_argument('--repeat', type=int, default=5)
+    arg_parser.add_argument('--only', nargs='+', help="Run only these cases")
+    arg_parser.add_argument('--output', type=Path, help="Write results JSON to this file")
+    arg_parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE)
+    arg_parser.add_argument('--tolerance', type=float, default=0.25,
+                            help="Allowed slowdown relative to the baseline (0.25 = 25%%)")
+    arg_parser.add_argument('--save-baseline', action='store_true',
+                            help="Store these results as the new baseline")
+    args = arg_parser.parse_args(argv)
+
+    # * Keep per-article debug logging out of the measurements
+    logging.getLogger().setLevel(logging.WARNING)
+    current = run_suite(args.repeat, args.only)
+    output = json.dumps(current, indent=2)
+    if args.output:
+        args.output.write_text(output + "\n")
+    else:
+        print(output)
+
+    if args.save_baseline:
+        args.baseline.write_text(output + "\n")
+        print(f"Saved baseline to {args.baseline}", file=sys.stderr)
+        return 0
+    if not args.baseline.is_file():
+        print(f"No baseline at {args.baseline}; skipping comparison", file=sys.stderr)
+        return 0
+    regressions = compare(current, json.loads(args.baseline.read_text()), args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression['case']}: {regression['baseline_seconds']:.6f}s -> "
+              f"{regression['current_seconds']:.6f}s ({regression['slowdown']}x)", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
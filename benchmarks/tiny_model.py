@@ -0,0 +1,38 @@
+from pathlib import Path
+from typing import Iterable, Union
+from transformers import DistilBertConfig, DistilBertForSequenceClassification, DistilBertTokenizer
+
+SPECIAL_TOKENS = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"]
+DEFAULT_WORDS = "the a is this i love hate great sad movie weather okay feeling good bad news".split()
+
+
+def build_tiny_model(model_dir: Union[str, Path], words: Iterable[str] = DEFAULT_WORDS,
+                     max_position_embeddings: int = 32, seed: int = 0, dim: int = 16,
+                     hidden_dim: int = 32, n_layers: int = 1) -> str:
+    '''
+    Save a tiny randomly initialised DistilBERT sentiment classifier to ``model_dir``.
+
+    The model has the same interface as the production SST-2 model (two labels,
+    WordPiece tokenizer) but loads in milliseconds and needs no network access,
+    which makes it suitable for offline tests and benchmarks. Raise ``dim``,
+    ``hidden_dim`` and ``n_layers`` for a model with realistic compute per token.
+
+    Returns:
+        str: The model directory, usable as SentimentAnalyzer(model_name=...).
+    '''
+    import torch
+    model_dir = Path(model_dir)
+    model_dir.mkdir(parents=True, exist_ok=True)
+    vocab = SPECIAL_TOKENS + sorted(set(words) - set(SPECIAL_TOKENS))
+    vocab_file = model_dir / "vocab.txt"
+    vocab_file.write_text("\n".join(vocab))
+    tokenizer = DistilBertTokenizer(str(vocab_file))
+    config = DistilBertConfig(
+        vocab_size=len(vocab), dim=dim, hidden_dim=hidden_dim, n_layers=n_layers, n_heads=2,
+        max_position_embeddings=max_position_embeddings,
+        id2label={0: "NEGATIVE", 1: "POSITIVE"}, label2id={"NEGATIVE": 0, "POSITIVE": 1})
+    torch.manual_seed(seed)
+    model = DistilBertForSequenceClassification(config)
+    model.save_pretrained(str(model_dir))
+    tokenizer.save_pretrained(str(model_dir))
+    return str(model_dir)
@@ -1,12 +1,35 @@
 # main.py
 
-from src.news_sentiment_analyzer.news_sentiment_analyzer import NewsSentimentAnalyzer
+import os
+from src.news_sentiment_analyzer import NewsSentimentAnalyzer, configure_logging
+from src.news_sentiment_analyzer.inference_pool import InferencePool
+from src.news_sentiment_analyzer.results_store import ResultsStore
+from src.news_sentiment_analyzer.sentiment_aggregator import SentimentAggregator
+from src.news_sentiment_analyzer.semantic_index import SemanticIndex
+from src.news_sentiment_analyzer.sentiment_cache import SentimentCache
 
 
 def main():
+    configure_logging()
     print("Starting News Sentiment Analyzer")
-    analyzer = NewsSentimentAnalyzer()
-    analyzer.run()
+    # * Set RESULTS_DB to keep every run, and the rolling per-source aggregates, in SQLite
+    results_db = os.environ.get("RESULTS_DB")
+    # * Set INFERENCE_WORKERS to score in worker processes with their own cores and model copies
+    inference_workers = os.environ.get("INFERENCE_WORKERS")
+    # * Set SEMANTIC_INDEX_DIR to embed scored stories (sentence-transformers) for similarity search
+    semantic_index_dir = os.environ.get("SEMANTIC_INDEX_DIR")
+    # * Set SENTIMENT_CACHE_DB to keep sentiment scores in SQLite and reuse them after a restart
+    sentiment_cache_db = os.environ.get("SENTIMENT_CACHE_DB")
+    # * Set HTTP_CACHE_DIR to revalidate unchanged feeds with conditional requests (read by HTTPTransport.shared)
+    analyzer = NewsSentimentAnalyzer(results_store=ResultsStore(results_db) if results_db else None,
+                                     aggregator=SentimentAggregator(results_db or ':memory:'),
+                                     inference_pool=InferencePool(workers=int(inference_workers))
+                                     if inference_workers else None,
+                                     semantic_index=SemanticIndex(semantic_index_dir) if semantic_index_dir else None,
+                                     sentiment_cache=SentimentCache(db_path=sentiment_cache_db))
+    # * Set METRICS_PORT to expose Prometheus metrics at http://127.0.0.1:<port>/metrics
+    metrics_port = os.environ.get("METRICS_PORT")
+    analyzer.run(metrics_port=int(metrics_port) if metrics_port else None)
 
 
 if __name__ == "__main__":
@@ -1,3 +1,27 @@
-from .news_sentiment_analyzer import NewsSentimentAnalyzer
-from .rss_news_scraper import RSSNewsScraper, BaseRSSNewsScraperAdapter, ABCRSSNewsScraperAdapter, NYTRSSNewsScraperAdapter
-from .sentiment_analyzer import SentimentAnalyzer
+import importlib
+
+# * Public names are resolved on first access so importing the package stays cheap
+_EXPORTS = {
+    'NewsSentimentAnalyzer': '.news_sentiment_analyzer',
+    'RSSNewsScraper': '.rss_news_scraper',
+    'BaseRSSNewsScraperAdapter': '.rss_news_scraper',
+    'ABCRSSNewsScraperAdapter': '.rss_news_scraper',
+    'NYTRSSNewsScraperAdapter': '.rss_news_scraper',
+    'SentimentAnalyzer': '.sentiment_analyzer',
+    'ModelRegistry': '.model_registry',
+    'configure_logging': '.logging_setup',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
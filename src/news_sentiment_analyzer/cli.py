@@ -0,0 +1,270 @@
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+from .rss_news_scraper import RSSNewsScraper, create_adapter
+from .sentiment_analyzer import SentimentAnalyzer
+
+logger = logging.getLogger(__name__)
+
+OUTPUT_FORMATS = ('jsonl', 'parquet')
+RESULT_FIELDS = ['text', 'sentiment', 'confidence', 'source', 'link', 'guid', 'published', 'tier']
+_STAGE_PATTERN = re.compile(r'^(\w+)_seconds_sum(?:\{.*\})?$')
+
+
+def load_feed_urls(path: Union[str, Path]) -> List[str]:
+    """
+    Read feed URLs from a plain-text list or an OPML file.
+
+    Text files contain one URL per line; blank lines and lines starting with ``#`` are
+    ignored. OPML files (detected by an ``.opml``/``.xml`` suffix or a leading ``<``)
+    contribute the ``xmlUrl`` of every outline.
+
+    Args:
+        path (Union[str, Path]): The feed list.
+
+    Returns:
+        List[str]: Feed URLs in file order, without duplicates.
+    """
+    path = Path(path)
+    content = path.read_bytes()
+    if path.suffix.lower() in ('.opml', '.xml') or content.lstrip().startswith(b'<'):
+        from lxml import etree
+        root = etree.fromstring(content, parser=etree.XMLParser(recover=True, resolve_entities=False))
+        urls = [outline.get('xmlUrl') for outline in root.iter('outline') if outline.get('xmlUrl')]
+    else:
+        lines = content.decode('utf-8').splitlines()
+        urls = [line.strip() for line in lines if line.strip() and not line.strip().startswith('#')]
+    return list(dict.fromkeys(url.strip() for url in urls))
+
+
+def make_source(url: str) -> RSSNewsScraper:
+    """
+    Build a scraper for a feed URL, using a source-specific adapter when one exists.
+    """
+    return RSSNewsScraper(create_adapter(url))
+
+
+def stage_seconds(stage_summary: Dict[str, float]) -> Dict[str, float]:
+    """
+    Total the per-source latency sums of a metrics summary by stage.
+
+    Args:
+        stage_summary (Dict[str, float]): ``last_run_metrics['stages']`` of a run.
+
+    Returns:
+        Dict[str, float]: Seconds spent per stage, e.g. {'fetch': 1.2, 'inference': 3.4}.
+    """
+    totals = {}
+    for series, value in stage_summary.items():
+        match = _STAGE_PATTERN.match(series)
+        if match:
+            totals[match.group(1)] = totals.get(match.group(1), 0.0) + value
+    return {stage: round(seconds, 4) for stage, seconds in sorted(totals.items())}
+
+
+def analyze_feeds(urls: List[str], model_name: str = SentimentAnalyzer.DEFAULT_MODEL_NAME,
+                  model_options: Optional[Dict] = None, cache_db: Optional[str] = None,
+                  num_threads: Optional[int] = None, cascade_margin: Optional[float] = None) -> Tuple[List[Dict], Dict]:
+    """
+    Scrape and score a list of feeds in the current process.
+
+    This is the unit of work of one worker process; it is also used directly when the
+    CLI runs with a single worker.
+
+    Args:
+        urls (List[str]): Feed URLs to process.
+        model_name (str, optional): HuggingFace model name or local path of the model.
+        model_options (Optional[Dict], optional): Additional SentimentAnalyzer arguments.
+        cache_db (Optional[str], optional): SQLite sentiment cache shared between runs.
+        num_threads (Optional[int], optional): Torch intra-op threads for this process.
+        cascade_margin (Optional[float], optional): Lexicon polarity above which the model is skipped.
+
+    Returns:
+        Tuple[List[Dict], Dict]: The result rows and the run statistics (articles,
+        failed feeds and seconds per stage).
+    """
+    from .metrics import METRICS
+    from .news_sentiment_analyzer import NewsSentimentAnalyzer
+    from .sentiment_cache import SentimentCache
+    if num_threads:
+        import torch
+        torch.set_num_threads(num_threads)
+    sources = [make_source(url) for url in urls]
+    analyzer = NewsSentimentAnalyzer(model_name=model_name, model_options=model_options,
+                                     emit_every=sys.maxsize, emit_interval=None,
+                                     sentiment_cache=SentimentCache(db_path=cache_db),
+                                     cascade_margin=cascade_margin, fetch_deadline=None)
+    metrics_enabled, METRICS.enabled = METRICS.enabled, True
+    frame = None
+    try:
+        for frame in analyzer.analyze_news(sources):
+            pass
+    finally:
+        METRICS.enabled = metrics_enabled
+    rows = frame.to_dict('records') if frame is not None else []
+    for row in rows:
+        # * Confidences are float32 in the frame; round off the float32 tail for JSON
+        row['confidence'] = round(row['confidence'], 6)
+        # * Unknown publish times are NaN in the frame; JSON has no NaN, so use null
+        if row['published'] != row['published']:
+            row['published'] = None
+    # * Failing feeds are skipped by the pipeline; batch runs have no overall fetch deadline
+    failed = list(analyzer.last_run_metrics.get('failed_feeds', {}))
+    stats = {'articles': len(rows), 'failed_feeds': failed,
+             'stages': stage_seconds(analyzer.last_run_metrics.get('stages', {}))}
+    analyzer.sentiment_cache.close()
+    return rows, stats
+
+
+def _init_worker(log_level: int) -> None:
+    logging.basicConfig(level=log_level, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+
+def run_batch(urls: List[str], workers: int = 1, **options) -> Tuple[List[Dict], Dict]:
+    """
+    Process feeds with one or more worker processes and build a throughput report.
+
+    Feeds are split round-robin into one shard per worker. Each worker loads its own
+    model and limits torch to ``cpu_count // workers`` threads so the processes do not
+    oversubscribe the cores. Deduplication happens within a shard.
+
+    Args:
+        urls (List[str]): Feed URLs to process.
+        workers (int, optional): Number of worker processes.
+        **options: Arguments forwarded to ``analyze_feeds``.
+
+    Returns:
+        Tuple[List[Dict], Dict]: The result rows and the throughput report.
+    """
+    workers = max(1, min(workers, len(urls) or 1))
+    start = time.perf_counter()
+    if workers == 1:
+        outcomes = [analyze_feeds(urls, **options)]
+    else:
+        options.setdefault('num_threads', max(1, (os.cpu_count() or 1) // workers))
+        shards = [urls[i::workers] for i in range(workers)]
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker,
+                                 initargs=(logging.getLogger().getEffectiveLevel(),)) as pool:
+            futures = [pool.submit(analyze_feeds, shard, **options) for shard in shards]
+            outcomes = [future.result() for future in futures]
+    elapsed = time.perf_counter() - start
+
+    rows, stages, failed = [], {}, []
+    for shard_rows, stats in outcomes:
+        rows.extend(shard_rows)
+        failed.extend(stats['failed_feeds'])
+        for stage, seconds in stats['stages'].items():
+            stages[stage] = round(stages.get(stage, 0.0) + seconds, 4)
+    report = {
+        'feeds': len(urls),
+        'failed_feeds': failed,
+        'articles': len(rows),
+        'workers': workers,
+        'seconds': round(elapsed, 3),
+        'articles_per_second': round(len(rows) / elapsed, 2) if elapsed > 0 else 0.0,
+        # * Summed over workers, so stage totals can exceed the wall-clock time
+        'stage_seconds': stages,
+    }
+    return rows, report
+
+
+def write_results(rows: List[Dict], output: str, output_format: Optional[str] = None) -> str:
+    """
+    Write result rows as JSON lines or Parquet.
+
+    Args:
+        rows (List[Dict]): The result rows.
+        output (str): Output path, or ``-`` for JSON lines on stdout.
+        output_format (Optional[str], optional): 'jsonl' or 'parquet'; inferred from the
+            output suffix when omitted.
+
+    Returns:
+        str: The format that was written.
+
+    Raises:
+        ValueError: If the format is unknown.
+        ImportError: If Parquet is requested and neither pyarrow nor fastparquet is installed.
+    """
+    if output_format is None:
+        output_format = 'parquet' if output.endswith('.parquet') else 'jsonl'
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"output_format must be one of {OUTPUT_FORMATS}")
+    if output_format == 'parquet':
+        import pandas as pd
+        try:
+            pd.DataFrame(rows, columns=RESULT_FIELDS).to_parquet(output, index=False)
+        except ImportError as ex:
+            raise ImportError("Parquet output requires pyarrow or fastparquet") from ex
+        return output_format
+    stream = sys.stdout if output == '-' else open(output, 'w', encoding='utf-8')
+    try:
+        for row in rows:
+            stream.write(json.dumps(row, ensure_ascii=False) + '\n')
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+    return output_format
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Scrape news feeds and score their sentiment without the Gradio UI.")
+    parser.add_argument('feeds', help="Text file with one feed URL per line, or an OPML file")
+    parser.add_argument('-o', '--output', default='-',
+                        help="Output path (.jsonl or .parquet); '-' writes JSON lines to stdout")
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, help="Output format (default: from the suffix)")
+    parser.add_argument('-w', '--workers', type=int, default=1, help="Number of worker processes")
+    parser.add_argument('--model', default=SentimentAnalyzer.DEFAULT_MODEL_NAME,
+                        help="HuggingFace model name or local model directory")
+    parser.add_argument('--backend', default='torch', help="Inference backend: torch, int8 or onnx")
+    parser.add_argument('--cascade-margin', type=float,
+                        help="Label headlines whose lexicon polarity (0-1) reaches this margin without the model")
+    parser.add_argument('--cache-db', help="SQLite sentiment cache reused between runs")
+    parser.add_argument('--store', help="SQLite results store the rows are also upserted into")
+    parser.add_argument('--report', help="Also write the throughput report as JSON to this path")
+    parser.add_argument('--log-config', help="Logging YAML config (default: console logging)")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    from .logging_setup import configure_logging
+    if args.log_config:
+        configure_logging(args.log_config)
+    else:
+        logging.basicConfig(level=logging.WARNING, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    urls = load_feed_urls(args.feeds)
+    if not urls:
+        print(f"No feed URLs found in {args.feeds}", file=sys.stderr)
+        return 2
+    rows, report = run_batch(urls, workers=args.workers, model_name=args.model,
+                             model_options={'backend': args.backend}, cache_db=args.cache_db,
+                             cascade_margin=args.cascade_margin)
+    write_results(rows, args.output, args.format)
+    if args.store:
+        from .results_store import ResultsStore
+        store = ResultsStore(args.store)
+        store.upsert(rows)
+        store.close()
+    if args.report:
+        Path(args.report).write_text(json.dumps(report, indent=2))
+    print(f"{report['articles']} articles from {report['feeds'] - len(report['failed_feeds'])}/"
+          f"{report['feeds']} feeds in {report['seconds']}s "
+          f"({report['articles_per_second']} articles/s, {report['workers']} workers)", file=sys.stderr)
+    for stage, seconds in report['stage_seconds'].items():
+        print(f"  {stage:<12} {seconds:>10.3f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,203 @@
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, Hashable, List, Tuple, Union
+from .metrics import METRICS
+from .records import SentimentBatch
+
+
+class SingleFlight():
+    """
+    Collapses concurrent calls for the same key into one execution.
+
+    The first caller for a key runs the function; callers that arrive while it is running
+    wait for and share its result. A successful result is also reused by calls that arrive
+    within ``fresh_for`` seconds of it completing. Errors are shared with the callers that
+    were waiting but are never reused afterwards.
+
+    Attributes:
+        logger (logging.Logger): Logger instance for the class.
+    """
+
+    def __init__(self) -> None:
+        self.logger = logging.getLogger(__name__)
+        self.logger.debug(f"Initiating Class {__name__}")
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+        self._completed: Dict[Hashable, Tuple[float, object]] = {}
+        self._counters = {'calls': 0, 'executions': 0, 'shared': 0, 'fresh_hits': 0}
+
+    def do(self, key: Hashable, fn: Callable[[], object], fresh_for: float = 0.0):
+        """
+        Run ``fn`` for ``key`` unless an identical call is running or finished recently.
+
+        Args:
+            key (Hashable): Identifies equivalent calls, e.g. a feed URL.
+            fn (Callable[[], object]): The work to do.
+            fresh_for (float, optional): Seconds a completed result may be reused.
+
+        Returns:
+            The result of ``fn``, possibly computed for another caller.
+
+        Raises:
+            Exception: Whatever ``fn`` raised, for the caller that ran it and those waiting on it.
+        """
+        with self._lock:
+            self._counters['calls'] += 1
+            completed = self._completed.get(key)
+            if completed is not None and time.monotonic() - completed[0] <= fresh_for:
+                self._counters['fresh_hits'] += 1
+                return completed[1]
+            future = self._calls.get(key)
+            owner = future is None
+            if owner:
+                future = self._calls[key] = Future()
+                self._counters['executions'] += 1
+            else:
+                self._counters['shared'] += 1
+        if not owner:
+            return future.result()
+        try:
+            result = fn()
+        except BaseException as ex:
+            future.set_exception(ex)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+                if not future.exception():
+                    self._completed[key] = (time.monotonic(), future.result())
+                self._expire(fresh_for)
+
+    def forget(self, key: Hashable) -> None:
+        """
+        Drop a completed result so the next call runs again.
+        """
+        with self._lock:
+            self._completed.pop(key, None)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counters, in_flight=len(self._calls))
+
+    def _expire(self, fresh_for: float) -> None:
+        # * Completed results only matter inside their freshness window
+        cutoff = time.monotonic() - fresh_for
+        for key in [key for key, (finished_at, _) in self._completed.items() if finished_at < cutoff]:
+            del self._completed[key]
+
+
+class InferenceCoalescer():
+    """
+    Shares in-flight sentiment scoring between concurrent callers.
+
+    When two sessions send the same text to the model at the same time, the first one
+    scores it and the second waits for that result instead of scoring it again. Each
+    caller first scores the texts it claimed and only then waits for texts claimed by
+    others, so callers never wait on each other in a cycle.
+    """
+
+    def __init__(self) -> None:
+        self.logger = logging.getLogger(__name__)
+        self.logger.debug(f"Initiating Class {__name__}")
+        self._lock = threading.Lock()
+        self._in_flight: Dict[Tuple[str, str, str], Future] = {}
+        self._counters = {'texts': 0, 'scored': 0, 'shared': 0}
+
+    def wrap(self, analyzer) -> '_CoalescedAnalyzer':
+        """
+        Get an analyzer-like object whose ``score_batch`` goes through this coalescer.
+        """
+        return _CoalescedAnalyzer(analyzer, self)
+
+    def score_batch(self, analyzer, texts: List[str]) -> SentimentBatch:
+        """
+        Score texts with ``analyzer``, sharing texts that another caller is already scoring.
+
+        Args:
+            analyzer (SentimentAnalyzer): The analyzer, or anything with ``score_batch``.
+            texts (List[str]): The texts to score.
+
+        Returns:
+            SentimentBatch: Results in the same order as ``texts``.
+        """
+        if not texts:
+            raise ValueError("Input text cannot be empty or None")
+        model = (analyzer.model_name, analyzer.model_revision)
+        futures, owned = [], {}
+        with self._lock:
+            for text in texts:
+                key = model + (text,)
+                future = self._in_flight.get(key)
+                if future is None:
+                    future = owned[key] = self._in_flight[key] = Future()
+                futures.append(future)
+            shared = sum(1 for key in dict.fromkeys(model + (text,) for text in texts) if key not in owned)
+            self._counters['texts'] += len(texts)
+            self._counters['scored'] += len(owned)
+            self._counters['shared'] += shared
+        if shared:
+            METRICS.inc('inference_coalesced_total', shared)
+        if owned:
+            try:
+                scored = _score(analyzer, [key[2] for key in owned])
+                for index, future in enumerate(owned.values()):
+                    future.set_result((scored.sentiment(index), scored.confidence(index)))
+            except BaseException as ex:
+                for future in owned.values():
+                    if not future.done():
+                        future.set_exception(ex)
+                raise
+            finally:
+                with self._lock:
+                    for key in owned:
+                        self._in_flight.pop(key, None)
+        results = [future.result() for future in futures]
+        return SentimentBatch.from_labels([sentiment for sentiment, _ in results],
+                                          [confidence for _, confidence in results],
+                                          list(texts), getattr(analyzer, 'labels', ()))
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counters, in_flight=len(self._in_flight))
+
+
+def _score(analyzer, texts: List[str]) -> SentimentBatch:
+    score_batch = getattr(analyzer, 'score_batch', None)
+    if score_batch is not None:
+        return score_batch(texts)
+    return SentimentBatch.from_dicts(analyzer.get_sentiment(texts))
+
+
+class _CoalescedAnalyzer():
+    """
+    Analyzer proxy used by NewsSentimentAnalyzer so the SentimentCache's misses are coalesced.
+    """
+
+    def __init__(self, analyzer, coalescer: InferenceCoalescer) -> None:
+        self.analyzer = analyzer
+        self.coalescer = coalescer
+
+    @property
+    def model_name(self) -> str:
+        return self.analyzer.model_name
+
+    @property
+    def model_revision(self) -> str:
+        return self.analyzer.model_revision
+
+    @property
+    def labels(self) -> Tuple[str, ...]:
+        return getattr(self.analyzer, 'labels', ())
+
+    def score_batch(self, texts: List[str]) -> SentimentBatch:
+        return self.coalescer.score_batch(self.analyzer, texts)
+
+    def get_sentiment(self, text: Union[str, List[str]]) -> Union[Dict, List[Dict]]:
+        if isinstance(text, str):
+            return self.get_sentiment([text])[0]
+        return self.score_batch(text).to_dicts()
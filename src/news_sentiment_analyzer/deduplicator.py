@@ -0,0 +1,219 @@
+import hashlib
+import logging
+import re
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+import numpy as np
+
+# * Query parameters that only track the referrer and never change the story
+TRACKING_PARAMS = {'cmpid', 'partner', 'ref', 'smid', 'smtyp', 'src', 'fbclid', 'gclid', 'ocid'}
+WORD_PATTERN = re.compile(r'\w+')
+MERSENNE_PRIME = (1 << 31) - 1
+
+
+def canonicalize_link(link: str) -> str:
+    """
+    Canonicalize an article link so the same story from different feeds compares equal.
+
+    Lower-cases the scheme and host, drops ``www.``, the fragment, tracking query
+    parameters and any trailing slash, and sorts the remaining query parameters.
+
+    Args:
+        link (str): The article link or GUID.
+
+    Returns:
+        str: The canonical form, or an empty string for an empty link.
+    """
+    link = link.strip()
+    if not link:
+        return ''
+    parts = urlsplit(link)
+    if not parts.netloc:
+        return link.lower()
+    host = parts.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    query = sorted((key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+                   if key.lower() not in TRACKING_PARAMS and not key.lower().startswith('utm_'))
+    return urlunsplit(('https' if parts.scheme in ('http', 'https') else parts.scheme.lower(),
+                       host, parts.path.rstrip('/'), urlencode(query), ''))
+
+
+def article_key(article: Dict[str, str]) -> str:
+    """
+    Identify a feed item across polls and runs.
+
+    Args:
+        article (Dict[str, str]): A scraped article.
+
+    Returns:
+        str: The GUID if present, else the canonical link, else a hash of the text.
+    """
+    if article.get('guid'):
+        return 'guid:' + article['guid']
+    link = canonicalize_link(article.get('link') or '')
+    if link:
+        return 'link:' + link
+    text = f"{article.get('title', '')}\0{article.get('description', '')}"
+    return 'text:' + hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def result_key(row: Dict[str, str]) -> str:
+    """
+    Identify a scored result row, the same way in every store that keeps results.
+
+    Args:
+        row (Dict[str, str]): A result with 'text' (the scored title and description)
+            and optionally 'guid', 'link' and an explicit 'article_key'.
+
+    Returns:
+        str: The row's 'article_key' if given, else ``article_key`` of its guid, link and text.
+    """
+    return row.get('article_key') or article_key(
+        {'guid': row.get('guid'), 'link': row.get('link'), 'title': row['text']})
+
+
+class ArticleDeduplicator():
+    """
+    Groups duplicate and near-duplicate articles across feeds before scoring.
+
+    Exact duplicates are detected by canonical link (or GUID). Near duplicates are
+    detected with MinHash signatures over word shingles of title + description, using
+    locality-sensitive hashing (banding) to find candidates and the signature agreement
+    as the Jaccard similarity estimate. Each group is scored once and its result is
+    reused for every article in the group.
+
+    Attributes:
+        logger (logging.Logger): Logger instance for the class.
+        threshold (float): Minimum estimated Jaccard similarity for a near duplicate.
+        shingle_size (int): Number of words per shingle.
+        num_perm (int): Number of MinHash permutations.
+        bands (int): Number of LSH bands (num_perm must be divisible by bands).
+    """
+
+    def __init__(self, threshold: float = 0.8, shingle_size: int = 3, num_perm: int = 64,
+                 bands: int = 16, seed: int = 1) -> None:
+        """
+        Initialize the ArticleDeduplicator.
+
+        Args:
+            threshold (float, optional): Minimum estimated Jaccard similarity for a near duplicate.
+            shingle_size (int, optional): Number of words per shingle.
+            num_perm (int, optional): Number of MinHash permutations.
+            bands (int, optional): Number of LSH bands.
+            seed (int, optional): Seed of the MinHash permutations.
+
+        Raises:
+            ValueError: If num_perm is not divisible by bands.
+        """
+        self.logger = logging.getLogger(__name__)
+        self.logger.debug(f"Initiating Class {__name__}")
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.num_perm = num_perm
+        self.bands = bands
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self._links: Dict[str, int] = {}
+        self._buckets: Dict[Tuple[int, bytes], List[int]] = {}
+        self._signatures: List[Optional[np.ndarray]] = []
+        self._total = 0
+        self._exact = 0
+        self._near = 0
+
+    def add(self, article: Dict[str, str], source: str = '') -> Tuple[int, bool]:
+        """
+        Assign an article to a duplicate group.
+
+        Links and GUIDs that are http(s) URLs match across feeds. Other GUIDs are often
+        feed-local IDs (``isPermaLink="false"``), so they only match within ``source``.
+
+        Args:
+            article (Dict[str, str]): Article with 'title', 'link' and 'description' keys
+                (and optionally 'guid').
+            source (str, optional): The feed the article came from.
+
+        Returns:
+            Tuple[int, bool]: The group id and whether the article started a new group.
+        """
+        self._total += 1
+        links = [canonicalize_link(article.get('link') or '')]
+        guid = (article.get('guid') or '').strip()
+        if guid:
+            parts = urlsplit(guid)
+            if parts.scheme.lower() in ('http', 'https') and parts.netloc:
+                links.append(canonicalize_link(guid))
+            else:
+                links.append(f'guid:{source}\0{guid}')
+        links = [link for link in links if link]
+        for link in links:
+            if link in self._links:
+                self._exact += 1
+                return self._links[link], False
+
+        signature = self._signature(f"{article.get('title', '')} {article.get('description', '')}")
+        group_id = self._find_similar(signature) if signature is not None else None
+        if group_id is not None:
+            self._near += 1
+            is_new = False
+        else:
+            group_id = len(self._signatures)
+            self._signatures.append(signature)
+            if signature is not None:
+                for band in self._bands(signature):
+                    self._buckets.setdefault(band, []).append(group_id)
+            is_new = True
+        for link in links:
+            self._links.setdefault(link, group_id)
+        return group_id, is_new
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Get deduplication statistics for the articles seen so far.
+
+        Returns:
+            Dict[str, float]: Article and group counts, exact and near duplicate counts,
+            and the dedup ratio (share of articles that did not need scoring).
+        """
+        groups = len(self._signatures)
+        return {
+            'articles': self._total,
+            'groups': groups,
+            'exact_duplicates': self._exact,
+            'near_duplicates': self._near,
+            'dedup_ratio': round(1 - groups / self._total, 4) if self._total else 0.0
+        }
+
+    def _shingles(self, text: str) -> List[str]:
+        words = WORD_PATTERN.findall(text.lower())
+        if len(words) < self.shingle_size:
+            return [' '.join(words)] if words else []
+        return [' '.join(words[i:i + self.shingle_size])
+                for i in range(len(words) - self.shingle_size + 1)]
+
+    def _signature(self, text: str) -> Optional[np.ndarray]:
+        shingles = set(self._shingles(text))
+        if not shingles:
+            return None
+        hashes = np.array([int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=8).digest(), 'little')
+                           % MERSENNE_PRIME for s in shingles], dtype=np.uint64)
+        # * (a * h + b) mod p stays below 2**62, so uint64 arithmetic cannot overflow
+        permuted = (self._a[:, None] * hashes[None, :] + self._b[:, None]) % MERSENNE_PRIME
+        return permuted.min(axis=1)
+
+    def _bands(self, signature: np.ndarray) -> List[Tuple[int, bytes]]:
+        rows = self.num_perm // self.bands
+        return [(band, signature[band * rows:(band + 1) * rows].tobytes()) for band in range(self.bands)]
+
+    def _find_similar(self, signature: np.ndarray) -> Optional[int]:
+        candidates = {group_id for band in self._bands(signature)
+                      for group_id in self._buckets.get(band, ())}
+        best_id, best_similarity = None, self.threshold
+        for group_id in sorted(candidates):
+            similarity = float(np.mean(self._signatures[group_id] == signature))
+            if similarity >= best_similarity:
+                best_id, best_similarity = group_id, similarity
+        return best_id
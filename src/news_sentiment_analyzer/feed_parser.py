@@ -0,0 +1,210 @@
+import io
+import logging
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+from lxml import etree
+
+# * Namespace prefixes that may be used in field mappings
+NAMESPACES = {
+    'atom': 'http://www.w3.org/2005/Atom',
+    'content': 'http://purl.org/rss/1.0/modules/content/',
+    'dc': 'http://purl.org/dc/elements/1.1/',
+    'media': 'http://search.yahoo.com/mrss/',
+}
+ATOM_NAMESPACE = '{' + NAMESPACES['atom'] + '}'
+ITEM_TAGS = ('item', ATOM_NAMESPACE + 'entry')
+
+
+class FeedMapping():
+    """
+    Declarative description of how a feed's items map to article fields.
+
+    Each output field lists the element tags it is read from, using ``prefix:name`` for
+    namespaced elements (see ``NAMESPACES``). Atom elements are matched by their local
+    name, so one mapping covers both RSS ``<item>`` and Atom ``<entry>`` elements.
+
+    Attributes:
+        fields (Dict[str, Tuple[str, ...]]): Output field mapped to candidate tags.
+        join_fields (Tuple[str, ...]): Fields whose candidates are all joined with a space
+            instead of taking the first non-empty one.
+        strip_cdata (bool): Strip literal ``<![CDATA[ ... ]]>`` wrappers left in the text.
+    """
+
+    def __init__(self, fields: Dict[str, Tuple[str, ...]], join_fields: Tuple[str, ...] = (),
+                 strip_cdata: bool = False) -> None:
+        self.fields = {name: tuple(self._qualify(tag) for tag in tags)
+                       for name, tags in fields.items()}
+        self.join_fields = tuple(join_fields)
+        self.strip_cdata = strip_cdata
+
+    def extend(self, fields: Optional[Dict[str, Tuple[str, ...]]] = None, join_fields: Tuple[str, ...] = (),
+               strip_cdata: Optional[bool] = None) -> 'FeedMapping':
+        """
+        Create a new mapping that overrides some fields of this one.
+
+        Args:
+            fields (Optional[Dict[str, Tuple[str, ...]]]): Fields to add or replace.
+            join_fields (Tuple[str, ...], optional): Additional fields to join.
+            strip_cdata (Optional[bool], optional): Override CDATA stripping.
+
+        Returns:
+            FeedMapping: The combined mapping.
+        """
+        mapping = FeedMapping({}, self.join_fields + tuple(join_fields),
+                              self.strip_cdata if strip_cdata is None else strip_cdata)
+        mapping.fields = dict(self.fields)
+        mapping.fields.update({name: tuple(self._qualify(tag) for tag in tags)
+                               for name, tags in (fields or {}).items()})
+        return mapping
+
+    @staticmethod
+    def _qualify(tag: str) -> str:
+        if ':' not in tag:
+            return tag
+        prefix, name = tag.split(':', 1)
+        return '{' + NAMESPACES[prefix] + '}' + name
+
+
+# * Plain RSS 2.0 / Atom mapping shared by all adapters
+RSS_MAPPING = FeedMapping({
+    'title': ('title',),
+    'link': ('link',),
+    'description': ('description', 'summary', 'content'),
+    'guid': ('guid', 'id'),
+    'published': ('pubDate', 'dc:date', 'published', 'updated'),
+})
+
+
+def parse_published(value: Optional[str]) -> Optional[float]:
+    """
+    Parse an RSS (RFC 822) or Atom (ISO 8601) date.
+
+    Args:
+        value (Optional[str]): The date as it appears in the feed.
+
+    Returns:
+        Optional[float]: Unix timestamp, or None if the value is missing or invalid.
+        Dates without a timezone are taken as UTC.
+    """
+    if not value:
+        return None
+    try:
+        published = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        value = value.strip()
+        # * fromisoformat only accepts a trailing 'Z' from Python 3.11
+        if value[-1:] in ('Z', 'z'):
+            value = value[:-1] + '+00:00'
+        try:
+            published = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if published.tzinfo is None:
+        published = published.replace(tzinfo=timezone.utc)
+    return published.timestamp()
+
+
+class FeedParser():
+    """
+    Streaming RSS/Atom parser built on ``lxml.etree.iterparse``.
+
+    Items are extracted one at a time as their closing tag is parsed and are cleared
+    from the tree immediately afterwards, so memory stays bounded by the size of a
+    single item rather than the whole document.
+
+    Attributes:
+        logger (logging.Logger): Logger instance for the class.
+        mapping (FeedMapping): Field mapping applied to each item.
+        cleaner (Callable[[str], str]): Function applied to every extracted value.
+    """
+
+    def __init__(self, mapping: FeedMapping = RSS_MAPPING,
+                 cleaner: Optional[Callable[[str], str]] = None) -> None:
+        """
+        Initialize the FeedParser.
+
+        Args:
+            mapping (FeedMapping, optional): Field mapping applied to each item.
+            cleaner (Optional[Callable[[str], str]], optional): Function applied to every
+                extracted value, e.g. StringCleaner.clean_string. Defaults to str.strip.
+        """
+        self.logger = logging.getLogger(__name__)
+        self.mapping = mapping
+        self.cleaner = cleaner or str.strip
+
+    def parse(self, source: Union[bytes, io.IOBase]) -> Iterator[Dict[str, str]]:
+        """
+        Parse a feed and yield one article dictionary per item.
+
+        Args:
+            source (Union[bytes, io.IOBase]): The raw feed, as bytes or a binary file object.
+
+        Yields:
+            Dict[str, str]: One dictionary per item with a key per mapped field.
+        """
+        names = list(self.mapping.fields)
+        for values in self._items(source):
+            yield dict(zip(names, values))
+
+    def parse_columns(self, source: Union[bytes, io.IOBase]) -> Dict[str, List[str]]:
+        """
+        Parse a feed into one list of values per mapped field, without a dict per item.
+
+        Args:
+            source (Union[bytes, io.IOBase]): The raw feed, as bytes or a binary file object.
+
+        Returns:
+            Dict[str, List[str]]: Each mapped field with its value for every item, in feed order.
+        """
+        columns = {name: [] for name in self.mapping.fields}
+        appends = [column.append for column in columns.values()]
+        for values in self._items(source):
+            for append, value in zip(appends, values):
+                append(value)
+        return columns
+
+    def _items(self, source: Union[bytes, io.IOBase]) -> Iterator[List[str]]:
+        if isinstance(source, (bytes, bytearray)):
+            source = io.BytesIO(bytes(source).lstrip())
+        for _, element in etree.iterparse(source, events=('end',), tag=ITEM_TAGS,
+                                          recover=True, resolve_entities=False):
+            yield self._extract(element)
+            # * Free the parsed item and any siblings already processed
+            element.clear(keep_tail=False)
+            parent = element.getparent()
+            if parent is not None:
+                while element.getprevious() is not None:
+                    del parent[0]
+
+    def _extract(self, element: etree._Element) -> List[str]:
+        values: Dict[str, list] = {}
+        for child in element:
+            if not isinstance(child.tag, str):
+                continue
+            tag = child.tag
+            if tag.startswith(ATOM_NAMESPACE):
+                tag = tag[len(ATOM_NAMESPACE):]
+            text = ''.join(child.itertext())
+            if tag == 'link' and not text.strip() and child.get('href'):
+                # * Atom links carry the URL in href; prefer the alternate link
+                if child.get('rel', 'alternate') != 'alternate':
+                    continue
+                text = child.get('href')
+            values.setdefault(tag, []).append(text)
+
+        story = []
+        for name, tags in self.mapping.fields.items():
+            found = [self._clean(text) for tag in tags for text in values.get(tag, ())]
+            found = [text for text in found if text]
+            if name in self.mapping.join_fields:
+                story.append(' '.join(found))
+            else:
+                story.append(found[0] if found else '')
+        return story
+
+    def _clean(self, text: str) -> str:
+        text = self.cleaner(text)
+        if self.mapping.strip_cdata and text.startswith('<![CDATA[') and text.endswith(']]>'):
+            text = text[9:-3]
+        return text
@@ -0,0 +1,330 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+from .coalescing import SingleFlight
+from .metrics import METRICS
+from .resilience import CircuitBreakers, CircuitOpenError, Deadline, RetryPolicy
+from .rss_news_scraper import RSSNewsScraper
+
+
+class StageMetrics():
+    """
+    Counters for one pipeline stage and the queue feeding the next stage.
+
+    Attributes:
+        items (int): Number of items the stage has completed.
+        busy_seconds (float): Time spent doing work.
+        wait_seconds (float): Time spent blocked on the queue (backpressure or starvation).
+        max_queue_depth (int): Deepest the output queue has been.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.items = 0
+        self.busy_seconds = 0.0
+        self.wait_seconds = 0.0
+        self.max_queue_depth = 0
+        self._depth_samples = 0
+        self._depth_total = 0
+
+    def record(self, busy_seconds: float = 0.0, wait_seconds: float = 0.0, items: int = 0) -> None:
+        with self._lock:
+            self.items += items
+            self.busy_seconds += busy_seconds
+            self.wait_seconds += wait_seconds
+
+    def sample_depth(self, depth: int) -> None:
+        with self._lock:
+            self.max_queue_depth = max(self.max_queue_depth, depth)
+            self._depth_samples += 1
+            self._depth_total += depth
+
+    def as_dict(self) -> Dict[str, float]:
+        with self._lock:
+            mean_depth = self._depth_total / self._depth_samples if self._depth_samples else 0.0
+            return {
+                'items': self.items,
+                'busy_seconds': round(self.busy_seconds, 4),
+                'wait_seconds': round(self.wait_seconds, 4),
+                'max_queue_depth': self.max_queue_depth,
+                'mean_queue_depth': round(mean_depth, 2)
+            }
+
+
+class FeedPipeline():
+    """
+    Producer/consumer pipeline that overlaps feed fetching with inference.
+
+    A bounded pool of fetcher threads scrapes the sources concurrently and puts each
+    feed's articles on a bounded queue. When the queue is full the fetchers block, which
+    applies backpressure instead of buffering an unbounded number of feeds. The consumer
+    (the inference stage) drains the queue in batches via ``batches``. With a shared
+    ``SingleFlight``, pipelines of concurrent sessions fetch each feed URL once and reuse
+    the result for ``fresh_for`` seconds.
+
+    Fetching can be bounded in time: each feed must arrive within ``feed_timeout`` seconds
+    of its fetch starting and all feeds within ``deadline`` seconds of the run starting.
+    Transient errors are retried by ``retry`` only while time is left, and feeds whose
+    ``breakers`` entry is open are not fetched at all. With ``partial_results`` a failing
+    or late feed is skipped and listed in ``failed_feeds`` instead of raising.
+
+    Attributes:
+        logger (logging.Logger): Logger instance for the class.
+        sources (List[RSSNewsScraper]): News sources to fetch.
+        max_fetchers (int): Maximum number of concurrent fetches.
+        queue_size (int): Maximum number of fetched feeds waiting for inference.
+        fetch_metrics (StageMetrics): Metrics of the fetch stage and its output queue.
+        infer_metrics (StageMetrics): Metrics of the inference stage.
+        flights (Optional[SingleFlight]): Coalesces fetches of the same feed URL, if set.
+        fresh_for (float): Seconds a coalesced fetch result may be reused.
+        deadline (Optional[float]): Seconds all feeds must arrive within, or None.
+        feed_timeout (Optional[float]): Seconds one feed may take from the start of its fetch, or None.
+        retry (Optional[RetryPolicy]): Retries transient fetch errors, if set.
+        breakers (Optional[CircuitBreakers]): Per-feed circuit breakers, if set.
+        partial_results (bool): Skip failed or late feeds instead of raising.
+        failures (List[Tuple[RSSNewsScraper, str]]): Skipped feeds and why.
+    """
+
+    # * How often the consumer checks started fetches against feed_timeout
+    TIMEOUT_POLL_SECONDS = 0.25
+
+    def __init__(self, sources: List[RSSNewsScraper], max_fetchers: int = 4, queue_size: int = 4,
+                 flights: Optional[SingleFlight] = None, fresh_for: float = 0.0,
+                 deadline: Optional[float] = None, feed_timeout: Optional[float] = None,
+                 retry: Optional[RetryPolicy] = None, breakers: Optional[CircuitBreakers] = None,
+                 partial_results: bool = False) -> None:
+        """
+        Initialize the FeedPipeline.
+
+        Args:
+            sources (List[RSSNewsScraper]): News sources to fetch.
+            max_fetchers (int, optional): Maximum number of concurrent fetches.
+            queue_size (int, optional): Maximum number of fetched feeds waiting for inference.
+            flights (Optional[SingleFlight], optional): Shared SingleFlight keyed by feed URL.
+            fresh_for (float, optional): Seconds a fetched feed may be reused by other pipelines.
+            deadline (Optional[float], optional): Latency budget of the whole fetch stage.
+            feed_timeout (Optional[float], optional): Latency budget of one feed, retries included.
+            retry (Optional[RetryPolicy], optional): Retry policy for transient errors.
+            breakers (Optional[CircuitBreakers], optional): Circuit breakers keyed by feed URL.
+            partial_results (bool, optional): Skip failed or late feeds instead of raising.
+
+        Raises:
+            ValueError: If max_fetchers or queue_size is not positive.
+        """
+        self.logger = logging.getLogger(__name__)
+        self.logger.debug(f"Initiating Class {__name__}")
+        if max_fetchers < 1 or queue_size < 1:
+            raise ValueError("max_fetchers and queue_size must be positive")
+        self.sources = sources
+        self.max_fetchers = max_fetchers
+        self.queue_size = queue_size
+        self.flights = flights
+        self.fresh_for = fresh_for
+        self.deadline = deadline
+        self.feed_timeout = feed_timeout
+        self.retry = retry
+        self.breakers = breakers
+        self.partial_results = partial_results
+        self.failures: List[Tuple[RSSNewsScraper, str]] = []
+        self.fetch_metrics = StageMetrics()
+        self.infer_metrics = StageMetrics()
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._stop = threading.Event()
+        self._run_deadline = Deadline()
+        # * Start time of each fetch in progress, and fetches given up on as too slow
+        self._started: Dict[int, float] = {}
+        self._timed_out = set()
+        self._lock = threading.Lock()
+
+    def batches(self, max_articles: int = 256) -> Iterator[List[Tuple[RSSNewsScraper, List[Dict[str, str]]]]]:
+        """
+        Start the fetchers and yield fetched feeds in batches as they arrive.
+
+        Each batch holds at least one feed; further feeds already waiting on the queue
+        are added without blocking until ``max_articles`` is reached. Time the consumer
+        spends between batches is recorded as inference busy time.
+
+        Args:
+            max_articles (int, optional): Soft limit on articles per batch.
+
+        Yields:
+            List[Tuple[RSSNewsScraper, List[Dict[str, str]]]]: (source, articles) pairs.
+
+        Raises:
+            Exception: Re-raises the first error raised by a source's scraper, unless
+                ``partial_results`` is set.
+        """
+        self._run_deadline = Deadline(self.deadline)
+        executor = ThreadPoolExecutor(max_workers=self.max_fetchers,
+                                      thread_name_prefix="feed-fetcher")
+        futures = []
+        try:
+            for index, source in enumerate(self.sources):
+                futures.append(executor.submit(self._fetch, index, source))
+            pending = set(range(len(self.sources)))
+            while pending:
+                try:
+                    batch = [self._get(block=True, timeout=self._wait_seconds())]
+                except queue.Empty:
+                    self._expire(pending)
+                    continue
+                pending.discard(batch[0][0])
+                article_count = len(batch[0][2] or [])
+                while pending and article_count < max_articles:
+                    try:
+                        item = self._get(block=False)
+                    except queue.Empty:
+                        break
+                    batch.append(item)
+                    pending.discard(item[0])
+                    article_count += len(item[2] or [])
+                fetched = []
+                for index, source, articles, error in batch:
+                    if index in self._timed_out:
+                        continue
+                    if error is None:
+                        fetched.append((source, articles))
+                    elif self.partial_results:
+                        self._skip(source, f'{type(error).__name__}: {error}')
+                    else:
+                        raise error
+                if not fetched:
+                    continue
+                start = time.perf_counter()
+                yield fetched
+                self.infer_metrics.record(busy_seconds=time.perf_counter() - start,
+                                          items=article_count)
+        finally:
+            self._stop.set()
+            # * Drop fetches that have not started (shutdown's cancel_futures needs Python 3.9)
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+            self.logger.debug(f'Pipeline metrics: {self.metrics()}')
+
+    def metrics(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get per-stage metrics.
+
+        Returns:
+            Dict[str, Dict[str, float]]: Metrics for the 'fetch' and 'infer' stages.
+        """
+        return {'fetch': self.fetch_metrics.as_dict(), 'infer': self.infer_metrics.as_dict()}
+
+    def failed_feeds(self) -> Dict[str, str]:
+        """
+        Get the feeds skipped in this run.
+
+        Returns:
+            Dict[str, str]: Feed URL mapped to the reason it was skipped.
+        """
+        return {_source_url(source) or repr(source): reason for source, reason in self.failures}
+
+    def _fetch(self, index: int, source: RSSNewsScraper) -> None:
+        articles, error, attempted = None, None, False
+        url = _source_url(source)
+        breaker = self.breakers.get(url) if self.breakers is not None and url else None
+        start = time.perf_counter()
+        with self._lock:
+            self._started[index] = time.monotonic()
+        if self._run_deadline.expired():
+            error = TimeoutError("Fetch deadline passed before the fetch started")
+        elif breaker is not None and not breaker.allow():
+            error = CircuitOpenError(f"Circuit open after {breaker.failures} failures")
+        else:
+            attempted = True
+            try:
+                articles = self._scrape(source, url)
+            except Exception as ex:
+                error = ex
+        with self._lock:
+            self._started.pop(index, None)
+            counted = index in self._timed_out
+        if breaker is not None and attempted:
+            if error is None:
+                breaker.record_success()
+            elif not counted:
+                breaker.record_failure()
+        busy_seconds = time.perf_counter() - start
+
+        # * Block while the queue is full (backpressure), unless the consumer stopped
+        wait_start = time.perf_counter()
+        while not self._stop.is_set():
+            try:
+                self._queue.put((index, source, articles, error), timeout=0.1)
+                break
+            except queue.Full:
+                continue
+        self.fetch_metrics.record(busy_seconds=busy_seconds,
+                                  wait_seconds=time.perf_counter() - wait_start,
+                                  items=1)
+        self.fetch_metrics.sample_depth(self._queue.qsize())
+        METRICS.set_gauge('feed_queue_depth', self._queue.qsize())
+
+    def _scrape(self, source: RSSNewsScraper, url: Optional[str]):
+        feed_deadline = self._run_deadline.earliest(self.feed_timeout)
+
+        def scrape_once():
+            # * Cap each request at the time left, so a hung request does not outlive the feed
+            if feed_deadline.remaining() == float('inf') or not isinstance(source, RSSNewsScraper):
+                return source.scrape_rss_feed()
+            if feed_deadline.expired():
+                raise TimeoutError("Feed deadline passed before the request started")
+            return source.scrape_rss_feed(timeout=feed_deadline.remaining())
+        scrape = scrape_once
+        if self.retry is not None:
+            def scrape():
+                return self.retry.call(scrape_once, feed_deadline, url or '')
+        if self.flights is None or not url:
+            return scrape()
+        return self.flights.do(url, scrape, self.fresh_for)
+
+    def _wait_seconds(self) -> Optional[float]:
+        # * Wake up in time for the run deadline, and regularly to check feed timeouts
+        wait = self._run_deadline.remaining()
+        if self.feed_timeout is not None:
+            wait = min(wait, self.TIMEOUT_POLL_SECONDS)
+        return None if wait == float('inf') else wait
+
+    def _expire(self, pending: set) -> None:
+        now = time.monotonic()
+        with self._lock:
+            started = dict(self._started)
+        for index in sorted(pending):
+            if self._run_deadline.expired():
+                reason = f'Timeout: no response within the {self.deadline}s fetch deadline'
+            elif self.feed_timeout is not None and index in started and now - started[index] >= self.feed_timeout:
+                reason = f'Timeout: no response within {self.feed_timeout}s'
+            else:
+                continue
+            source = self.sources[index]
+            if not self.partial_results:
+                raise TimeoutError(f'{_source_url(source) or repr(source)}: {reason}')
+            pending.discard(index)
+            with self._lock:
+                self._timed_out.add(index)
+            url = _source_url(source)
+            if self.breakers is not None and url:
+                self.breakers.get(url).record_failure()
+            self._skip(source, reason)
+
+    def _skip(self, source: RSSNewsScraper, reason: str) -> None:
+        url = _source_url(source) or repr(source)
+        self.logger.error("Skipping feed %s: %s", url, reason)
+        METRICS.inc('feed_skipped_total', source=url)
+        self.failures.append((source, reason))
+
+    def _get(self, block: bool, timeout: Optional[float] = None):
+        start = time.perf_counter()
+        item = self._queue.get(block=block, timeout=timeout)
+        self.infer_metrics.record(wait_seconds=time.perf_counter() - start)
+        METRICS.set_gauge('feed_queue_depth', self._queue.qsize())
+        return item
+
+
+def _source_url(source) -> Optional[str]:
+    adapter = getattr(source, 'rss_adapter', None)
+    return adapter.get_rss_url() if adapter is not None else None
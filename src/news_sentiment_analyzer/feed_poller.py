@@ -0,0 +1,358 @@
+import argparse
+import json
+import logging
+import random
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple, Union
+from .deduplicator import article_key
+from .http_transport import HTTPTransport
+from .metrics import METRICS
+from .model_registry import ModelRegistry
+from .rss_news_scraper import RSSNewsScraper, create_adapter
+from .sentiment_analyzer import SentimentAnalyzer
+from .sentiment_cache import SentimentCache
+
+
+class FeedState():
+    """
+    Polling schedule of one feed.
+
+    Attributes:
+        url (str): The feed URL.
+        base_interval (float): Polling interval while the feed keeps changing, in seconds.
+        interval (float): Current interval after backoff.
+        next_poll_at (float): Unix time of the next poll.
+        unchanged_polls (int): Consecutive polls without new items.
+        errors (int): Consecutive failed polls.
+        last_polled_at (Optional[float]): Unix time of the last poll.
+        last_new_at (Optional[float]): Unix time new items were last found.
+    """
+
+    def __init__(self, url: str, base_interval: float, interval: Optional[float] = None,
+                 next_poll_at: float = 0.0, unchanged_polls: int = 0, errors: int = 0,
+                 last_polled_at: Optional[float] = None, last_new_at: Optional[float] = None) -> None:
+        self.url = url
+        self.base_interval = base_interval
+        self.interval = interval or base_interval
+        self.next_poll_at = next_poll_at
+        self.unchanged_polls = unchanged_polls
+        self.errors = errors
+        self.last_polled_at = last_polled_at
+        self.last_new_at = last_new_at
+
+
+class FeedPoller():
+    """
+    Long-running poller that scores only the items it has not seen before.
+
+    Every feed has its own interval. A feed that yields no new items backs off
+    exponentially (up to ``max_interval``) and returns to its base interval as soon as
+    new items appear; failing feeds back off the same way. Feeds are fetched through an
+    HTTPTransport with an on-disk validator cache, so polling an unchanged feed costs one
+    conditional GET answered with 304 and no parsing or inference. The schedule and the
+    seen-set of item GUIDs/links are persisted in SQLite and survive restarts.
+
+    Attributes:
+        logger (logging.Logger): Logger instance for the class.
+        state_path (Path): SQLite database holding the schedule and seen-set.
+        transport (HTTPTransport): Transport shared by all polled feeds.
+        default_interval (float): Base interval of feeds added without one, in seconds.
+        max_interval (float): Upper bound of the backed-off interval, in seconds.
+        backoff_factor (float): Interval multiplier per poll without new items.
+        jitter (float): Random spread applied to each interval (0.1 = +/-10%).
+        seen_retention (float): Seen items absent from their feed for longer are forgotten.
+        on_results (Optional[Callable]): Called with the scored rows of every poll that found new items.
+    """
+
+    def __init__(self, state_path: Union[str, Path], transport: Optional[HTTPTransport] = None,
+                 default_interval: float = 300, max_interval: float = 6 * 3600,
+                 backoff_factor: float = 2.0, jitter: float = 0.1, seen_retention: float = 30 * 24 * 3600,
+                 model_name: str = SentimentAnalyzer.DEFAULT_MODEL_NAME, model_options: Optional[Dict] = None,
+                 sentiment_cache: Optional[SentimentCache] = None,
+                 on_results: Optional[Callable[[List[Dict]], None]] = None, max_fetchers: int = 4,
+                 clock: Callable[[], float] = time.time) -> None:
+        """
+        Initialize the FeedPoller.
+
+        Args:
+            state_path (Union[str, Path]): SQLite database for the poll state.
+            transport (Optional[HTTPTransport], optional): Transport for all feeds. Defaults to
+                one with a validator cache next to the state database.
+            default_interval (float, optional): Base interval of feeds added without one, in seconds.
+            max_interval (float, optional): Upper bound of the backed-off interval, in seconds.
+            backoff_factor (float, optional): Interval multiplier per poll without new items.
+            jitter (float, optional): Random spread applied to each interval.
+            seen_retention (float, optional): How long items that left their feed stay in the seen-set.
+            model_name (str, optional): HuggingFace model name or local path of the model.
+            model_options (Optional[Dict], optional): Additional SentimentAnalyzer arguments.
+            sentiment_cache (Optional[SentimentCache], optional): Cache in front of the model.
+            on_results (Optional[Callable], optional): Receives the scored rows of each poll.
+            max_fetchers (int, optional): Number of feeds fetched concurrently.
+            clock (Callable[[], float], optional): Time source, replaceable in tests.
+        """
+        self.logger = logging.getLogger(__name__)
+        self.logger.debug(f"Initiating Class {__name__}")
+        self.state_path = Path(state_path)
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        self.transport = transport or HTTPTransport(cache_dir=self.state_path.parent / "http_cache")
+        self.default_interval = default_interval
+        self.max_interval = max_interval
+        self.backoff_factor = backoff_factor
+        self.jitter = jitter
+        self.seen_retention = seen_retention
+        self.model_name = model_name
+        self.model_options = model_options or {}
+        self.sentiment_cache = sentiment_cache if sentiment_cache is not None else SentimentCache()
+        self.on_results = on_results
+        self.max_fetchers = max_fetchers
+        self.clock = clock
+        self._random = random.Random()
+        self._stop = threading.Event()
+        self._feeds: Dict[str, FeedState] = {}
+        self._sources: Dict[str, RSSNewsScraper] = {}
+        self._seen: Dict[str, Set[str]] = {}
+        self._connection = sqlite3.connect(str(self.state_path), check_same_thread=False)
+        self._connection.executescript("""
+            PRAGMA journal_mode=WAL;
+            CREATE TABLE IF NOT EXISTS feeds (
+                url TEXT PRIMARY KEY,
+                base_interval REAL NOT NULL,
+                interval REAL NOT NULL,
+                next_poll_at REAL NOT NULL,
+                unchanged_polls INTEGER NOT NULL,
+                errors INTEGER NOT NULL,
+                last_polled_at REAL,
+                last_new_at REAL
+            );
+            CREATE TABLE IF NOT EXISTS seen_items (
+                feed_url TEXT NOT NULL,
+                item_key TEXT NOT NULL,
+                last_seen_at REAL NOT NULL,
+                PRIMARY KEY (feed_url, item_key)
+            );
+            CREATE INDEX IF NOT EXISTS idx_seen_items_last_seen ON seen_items (last_seen_at);
+        """)
+
+    def add_feed(self, url: str, interval: Optional[float] = None,
+                 source: Optional[RSSNewsScraper] = None) -> FeedState:
+        """
+        Register a feed, restoring its schedule and seen-set from an earlier run.
+
+        Args:
+            url (str): The feed URL.
+            interval (Optional[float], optional): Base polling interval in seconds.
+            source (Optional[RSSNewsScraper], optional): Scraper to poll with. Defaults to the
+                adapter for ``url`` on the poller's transport.
+
+        Returns:
+            FeedState: The feed's schedule.
+        """
+        base_interval = interval or self.default_interval
+        row = self._connection.execute(
+            "SELECT interval, next_poll_at, unchanged_polls, errors, last_polled_at, last_new_at "
+            "FROM feeds WHERE url = ?", (url,)).fetchone()
+        if row:
+            state = FeedState(url, base_interval, min(row[0], self.max_interval), *row[1:])
+        else:
+            state = FeedState(url, base_interval)
+        self._feeds[url] = state
+        self._sources[url] = source or RSSNewsScraper(create_adapter(url, self.transport))
+        self._seen[url] = {key for (key,) in self._connection.execute(
+            "SELECT item_key FROM seen_items WHERE feed_url = ?", (url,))}
+        self._save_state(state)
+        self.logger.info(f"Polling {url} every {state.interval:.0f}s ({len(self._seen[url])} items seen)")
+        return state
+
+    def feeds(self) -> List[FeedState]:
+        """
+        Get the schedule of every registered feed.
+        """
+        return list(self._feeds.values())
+
+    def poll_once(self, force: bool = False) -> List[Dict]:
+        """
+        Poll every feed that is due and score its new items.
+
+        Args:
+            force (bool, optional): Poll all feeds regardless of their schedule.
+
+        Returns:
+            List[Dict]: One row per new item with 'text', 'sentiment', 'confidence',
+            'source', 'link' and 'guid'.
+        """
+        now = self.clock()
+        due = [state for state in self._feeds.values() if force or state.next_poll_at <= now]
+        if not due:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.max_fetchers, len(due))) as pool:
+            outcomes = list(pool.map(self._scrape, due))
+
+        new_items, pending = [], {}
+        for state, (articles, error) in zip(due, outcomes):
+            new_articles, pending[state.url] = self._update(state, articles, error, now)
+            new_items.extend((state.url, article) for article in new_articles)
+        rows = self._score(new_items)
+        if rows and self.on_results:
+            self.on_results(rows)
+        # * Items only count as seen once they were scored and delivered, so a failure retries them
+        for url, keys in pending.items():
+            if keys:
+                self._seen[url].update(keys)
+                self._mark_seen(url, keys, now)
+        return rows
+
+    def run(self, max_polls: Optional[int] = None) -> None:
+        """
+        Poll feeds as they become due until ``stop`` is called. A round that fails while
+        scoring or delivering is logged and its items are retried in a later round.
+
+        Args:
+            max_polls (Optional[int], optional): Stop after this many poll rounds.
+        """
+        polls = 0
+        self._stop.clear()
+        while not self._stop.is_set() and (max_polls is None or polls < max_polls):
+            try:
+                rows = self.poll_once()
+            except Exception:
+                # * The round's new items stay unseen and are delivered again when their feed is next polled
+                self.logger.exception("Poll round failed")
+                rows = []
+            polls += 1
+            if rows:
+                self.logger.info(f"Scored {len(rows)} new items")
+            if not self._feeds:
+                break
+            wait = min(state.next_poll_at for state in self._feeds.values()) - self.clock()
+            self._stop.wait(max(0.0, wait))
+
+    def stop(self) -> None:
+        """
+        Ask ``run`` to return after the current poll.
+        """
+        self._stop.set()
+
+    def close(self) -> None:
+        """
+        Close the state database.
+        """
+        self._connection.close()
+
+    def _scrape(self, state: FeedState):
+        try:
+            return self._sources[state.url].scrape_rss_feed(), None
+        except Exception as ex:
+            return None, ex
+
+    def _update(self, state: FeedState, articles: Optional[List[Dict]], error: Optional[Exception],
+                now: float) -> Tuple[List[Dict], List[str]]:
+        state.last_polled_at = now
+        new_articles, keys = [], []
+        if error is not None:
+            state.errors += 1
+            state.interval = min(self.max_interval, state.base_interval * self.backoff_factor ** state.errors)
+            METRICS.inc('poller_polls_total', source=state.url, status='error')
+            self.logger.error(f"Polling {state.url} failed: {str(error)}")
+        else:
+            state.errors = 0
+            seen = self._seen[state.url]
+            keys = [article_key(article) for article in articles or []]
+            new_keys = set()
+            for key, article in zip(keys, articles or []):
+                if key not in seen and key not in new_keys:
+                    new_keys.add(key)
+                    new_articles.append(article)
+            if new_articles:
+                state.unchanged_polls = 0
+                state.interval = state.base_interval
+                state.last_new_at = now
+            else:
+                state.unchanged_polls += 1
+                state.interval = min(self.max_interval,
+                                     state.base_interval * self.backoff_factor ** state.unchanged_polls)
+            not_modified = getattr(self._sources[state.url].rss_adapter, 'not_modified', False)
+            status = 'new' if new_articles else ('not_modified' if not_modified else 'unchanged')
+            METRICS.inc('poller_polls_total', source=state.url, status=status)
+            METRICS.inc('poller_new_items_total', len(new_articles), source=state.url)
+        state.next_poll_at = now + state.interval * (1 + self._random.uniform(-self.jitter, self.jitter))
+        self._save_state(state)
+        return new_articles, keys
+
+    def _score(self, new_items: List) -> List[Dict]:
+        if not new_items:
+            return []
+        analyzer = ModelRegistry.get(self.model_name, **self.model_options)
+        texts = [article['title'] + ' ' + article['description'] for _, article in new_items]
+        results = self.sentiment_cache.get_sentiment(analyzer, texts)
+        return [{'text': text, 'sentiment': result['sentiment'], 'confidence': result['confidence'],
+                 'source': url, 'link': article.get('link', ''), 'guid': article.get('guid', '')}
+                for text, result, (url, article) in zip(texts, results, new_items)]
+
+    def _mark_seen(self, url: str, keys: List[str], now: float) -> None:
+        with self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO seen_items (feed_url, item_key, last_seen_at) VALUES (?, ?, ?)",
+                [(url, key, now) for key in keys])
+            expired = self._connection.execute(
+                "SELECT item_key FROM seen_items WHERE feed_url = ? AND last_seen_at < ?",
+                (url, now - self.seen_retention)).fetchall()
+            if expired:
+                self._connection.execute(
+                    "DELETE FROM seen_items WHERE feed_url = ? AND last_seen_at < ?",
+                    (url, now - self.seen_retention))
+                self._seen[url].difference_update(key for (key,) in expired)
+
+    def _save_state(self, state: FeedState) -> None:
+        with self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO feeds (url, base_interval, interval, next_poll_at, unchanged_polls, "
+                "errors, last_polled_at, last_new_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (state.url, state.base_interval, state.interval, state.next_poll_at, state.unchanged_polls,
+                 state.errors, state.last_polled_at, state.last_new_at))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from .cli import load_feed_urls
+    from .logging_setup import configure_logging
+    arg_parser = argparse.ArgumentParser(description="Continuously poll news feeds and score new items.")
+    arg_parser.add_argument('feeds', help="Text file with one feed URL per line, or an OPML file")
+    arg_parser.add_argument('--state', default='poller_state/poller.db', help="SQLite poll state database")
+    arg_parser.add_argument('--interval', type=float, default=300, help="Base polling interval in seconds")
+    arg_parser.add_argument('--max-interval', type=float, default=6 * 3600, help="Longest backed-off interval")
+    arg_parser.add_argument('-o', '--output', default='-', help="Append new results as JSON lines here ('-' for stdout)")
+    arg_parser.add_argument('--model', default=SentimentAnalyzer.DEFAULT_MODEL_NAME)
+    arg_parser.add_argument('--cache-db', help="SQLite sentiment cache")
+    args = arg_parser.parse_args(argv)
+    configure_logging()
+
+    def write_rows(rows: List[Dict]) -> None:
+        stream = sys.stdout if args.output == '-' else open(args.output, 'a', encoding='utf-8')
+        try:
+            for row in rows:
+                stream.write(json.dumps(row, ensure_ascii=False) + '\n')
+            stream.flush()
+        finally:
+            if stream is not sys.stdout:
+                stream.close()
+
+    poller = FeedPoller(args.state, default_interval=args.interval, max_interval=args.max_interval,
+                        model_name=args.model, sentiment_cache=SentimentCache(db_path=args.cache_db),
+                        on_results=write_rows)
+    for url in load_feed_urls(args.feeds):
+        poller.add_feed(url)
+    try:
+        poller.run()
+    except KeyboardInterrupt:
+        poller.stop()
+    finally:
+        poller.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
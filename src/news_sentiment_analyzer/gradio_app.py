@@ -0,0 +1,96 @@
+import logging
+import gradio as gr
+
+logger = logging.getLogger(__name__)
+
+
+def create_blocks(analyzer) -> gr.Blocks:
+    """
+    Build the Gradio interface for a NewsSentimentAnalyzer.
+
+    Kept apart from the analysis core so that scraping and scoring can be imported
+    (by CLIs and worker processes) without loading gradio.
+
+    Args:
+        analyzer (NewsSentimentAnalyzer): The analyzer the interface drives.
+
+    Returns:
+        gr.Blocks: The interface, ready to ``launch``.
+    """
+    aggregator = getattr(analyzer, 'aggregator', None)
+    semantic_index = getattr(analyzer, 'semantic_index', None)
+
+    def display(frame):
+        # * Categories and float32 confidences become plain labels and 3-decimal floats for the table
+        return frame[analyzer.DISPLAY_COLUMNS].astype({'sentiment': 'object', 'confidence': 'float64'}).round(
+            {'confidence': 3})
+
+    def summary_panels():
+        return aggregator.summary_frame(), aggregator.series_frame()
+
+    def find_similar(query: str):
+        import pandas as pd
+        columns = ['text', 'sentiment', 'confidence', 'source', 'score']
+        if not query or not query.strip():
+            return pd.DataFrame(columns=columns)
+        return pd.DataFrame(semantic_index.search(query.strip(), k=20), columns=columns)
+
+    def news_sentiment_analysis(cnn: bool, abc: bool, nyt: bool, progress=gr.Progress()):
+        # * gradio injects the progress tracker through the gr.Progress default
+        frame = None
+        try:
+            for frame in analyzer.news_sentiment_analysis(cnn, abc, nyt, progress):
+                if aggregator is None:
+                    yield display(frame)
+                else:
+                    yield (display(frame), *summary_panels())
+        except ValueError as ex:
+            raise gr.Error(str(ex), duration=5)
+        failed_feeds = frame.attrs.get('failed_feeds') if frame is not None else None
+        if failed_feeds:
+            # * The table still shows every feed that answered in time
+            gr.Warning("Partial results, skipped: " + "; ".join(
+                f"{url} ({reason})" for url, reason in failed_feeds.items()), duration=10)
+
+    with gr.Blocks(title="News Sentiment Analysis", fill_height=True) as demo:
+        gr.Markdown(
+            "Select at least one News Sources below to analyze sentiment of headlines and stories and then click **Run** to see the output.")
+        with gr.Row():
+            inp = [
+                gr.Checkbox(label="CNN", value=True, info="CNN"),
+                gr.Checkbox(label="ABC", value=True, info="ABC News"),
+                gr.Checkbox(label="NYT", value=True, info="New York Times")
+            ]
+            btn = gr.Button("Run")
+        with gr.Row():
+            out = [
+                gr.Dataframe(
+                    label="Sentiment Results",
+                    headers=["Description", "Sentiment", "Confidence", "Source"],
+                    min_width=300,
+                    wrap=True,
+                    scale=3
+                )
+            ]
+            if aggregator is not None:
+                # * Rolling aggregates are read from the aggregator's buckets, not recomputed from the table
+                with gr.Column(scale=2):
+                    out.append(gr.Dataframe(label="Last 24 Hours by Source", wrap=True))
+                    out.append(gr.LinePlot(x="bucket_start", y="positive_ratio", color="source",
+                                           title="Hourly Positive Ratio", y_lim=[0, 1]))
+        if semantic_index is not None:
+            with gr.Row():
+                query = gr.Textbox(label="Find Similar Stories", placeholder="A headline or topic", scale=3)
+                search_btn = gr.Button("Search")
+            similar = gr.Dataframe(label="Similar Stories", wrap=True)
+            search_btn.click(fn=find_similar, inputs=query, outputs=similar)
+            query.submit(fn=find_similar, inputs=query, outputs=similar)
+        # * One click per session at a time; runs beyond max_concurrent_runs wait in the queue
+        btn.click(fn=news_sentiment_analysis, inputs=inp, outputs=out, trigger_mode='once',
+                  concurrency_limit=getattr(analyzer, 'max_concurrent_runs', 1), concurrency_id='analysis')
+        if aggregator is not None:
+            demo.load(fn=summary_panels, outputs=out[1:])
+    # * Bursts beyond the queue size are turned away instead of piling up
+    demo.queue(max_size=getattr(analyzer, 'max_queued_runs', None))
+    logger.debug("Created Gradio blocks")
+    return demo
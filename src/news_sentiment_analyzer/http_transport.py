@@ -0,0 +1,166 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Optional, Union
+import requests
+from requests.adapters import HTTPAdapter
+
+# * Directory of the shared transport's on-disk validator cache; unset disables conditional requests
+CACHE_DIR_ENV_VAR = "HTTP_CACHE_DIR"
+
+
+class FetchResult():
+    """
+    Result of fetching a URL through the HTTPTransport.
+
+    Attributes:
+        url (str): The requested URL.
+        status_code (int): HTTP status code of the response.
+        content (bytes): Response body (the cached body for a 304 response).
+        not_modified (bool): True if the server answered 304 Not Modified.
+    """
+
+    def __init__(self, url: str, status_code: int, content: bytes, not_modified: bool = False) -> None:
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.not_modified = not_modified
+
+
+class HTTPTransport():
+    """
+    Shared HTTP transport for the RSS adapters.
+
+    Wraps a pooled ``requests.Session`` so connections are kept alive and reused
+    across feeds, negotiates gzip/deflate compression, and optionally keeps an
+    on-disk cache of validators (ETag / Last-Modified) and bodies so unchanged
+    feeds can be revalidated with a conditional GET.
+
+    Attributes:
+        logger (logging.Logger): Logger instance for the class.
+        cache_dir (Optional[Path]): Directory of the HTTP cache, or None to disable caching.
+        timeout (float): Default request timeout in seconds.
+        session (requests.Session): The pooled session.
+    """
+
+    DEFAULT_HEADERS = {
+        'Accept-Encoding': 'gzip, deflate',
+        'Accept': 'application/rss+xml, application/atom+xml, application/xml;q=0.9, */*;q=0.8',
+        'User-Agent': 'news-sentiment-analyzer/1.0'
+    }
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, cache_dir: Optional[Union[str, Path]] = None, timeout: float = 10,
+                 pool_connections: int = 10, pool_maxsize: int = 10) -> None:
+        """
+        Initialize the HTTPTransport.
+
+        Args:
+            cache_dir (Optional[Union[str, Path]], optional): Directory for the on-disk HTTP cache.
+                Conditional requests are only sent when a cache directory is configured.
+            timeout (float, optional): Default request timeout in seconds.
+            pool_connections (int, optional): Number of host connection pools to keep.
+            pool_maxsize (int, optional): Maximum connections kept per host.
+        """
+        self.logger = logging.getLogger(__name__)
+        self.logger.debug(f"Initiating Class {__name__}")
+        self.timeout = timeout
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.session = requests.Session()
+        self.session.headers.update(self.DEFAULT_HEADERS)
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    @classmethod
+    def shared(cls) -> 'HTTPTransport':
+        """
+        Get the process-wide transport used by adapters that are not given one.
+
+        The transport caches validators and bodies in the ``HTTP_CACHE_DIR`` directory when
+        that environment variable is set.
+
+        Returns:
+            HTTPTransport: The shared transport instance.
+        """
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls(cache_dir=os.environ.get(CACHE_DIR_ENV_VAR))
+            return cls._shared
+
+    def get(self, url: str, timeout: Optional[float] = None) -> FetchResult:
+        """
+        Fetch a URL, revalidating a cached copy when one exists.
+
+        Args:
+            url (str): The URL to fetch.
+            timeout (Optional[float], optional): Request timeout; defaults to the transport timeout.
+
+        Returns:
+            FetchResult: The response. ``not_modified`` is set when the server answered 304.
+
+        Raises:
+            requests.RequestException: If the request fails or returns an error status.
+        """
+        headers = {}
+        cached = self._load_cache_entry(url)
+        if cached:
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+
+        response = self.session.get(url, headers=headers,
+                                    timeout=timeout if timeout is not None else self.timeout)
+        if response.status_code == 304 and cached:
+            self.logger.debug(f'Not modified: {url}')
+            return FetchResult(url, 304, self._body_path(url).read_bytes(), not_modified=True)
+        response.raise_for_status()
+        self._store_cache_entry(url, response)
+        return FetchResult(url, response.status_code, response.content)
+
+    def close(self) -> None:
+        """
+        Close the pooled connections.
+        """
+        self.session.close()
+
+    def _cache_key(self, url: str) -> str:
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+    def _meta_path(self, url: str) -> Path:
+        return self.cache_dir / f'{self._cache_key(url)}.json'
+
+    def _body_path(self, url: str) -> Path:
+        return self.cache_dir / f'{self._cache_key(url)}.body'
+
+    def _load_cache_entry(self, url: str) -> Optional[dict]:
+        if not self.cache_dir:
+            return None
+        meta_path = self._meta_path(url)
+        if not meta_path.is_file() or not self._body_path(url).is_file():
+            return None
+        try:
+            with open(meta_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError) as ex:
+            self.logger.warning(f'Ignoring unreadable cache entry for {url}: {str(ex)}')
+            return None
+
+    def _store_cache_entry(self, url: str, response: requests.Response) -> None:
+        if not self.cache_dir:
+            return
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+        # * Write the body first so a metadata file always has a body next to it
+        self._body_path(url).write_bytes(response.content)
+        with open(self._meta_path(url), 'w') as f:
+            json.dump({'url': url, 'etag': etag, 'last_modified': last_modified}, f)
@@ -0,0 +1,261 @@
+import copy
+import logging
+import os
+import warnings
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+import torch
+
+# * Default location of exported / quantized model artifacts
+DEFAULT_ARTIFACT_DIR = Path.home() / '.cache' / 'news_sentiment_analyzer' / 'artifacts'
+
+# * Fixed sample used to check that an optimized backend agrees with the baseline
+PARITY_SAMPLES = [
+    "Stocks rally to record highs as inflation cools",
+    "Wildfire forces thousands to evacuate their homes",
+    "Local team wins championship in overtime thriller",
+    "Company announces layoffs affecting 10,000 workers",
+    "Scientists hail breakthrough in cancer treatment",
+    "Bridge collapse leaves commuters stranded for hours",
+    "City council approves new park for downtown residents",
+    "Officials warn of severe storms and flooding this weekend",
+    "Volunteers rebuild school damaged by hurricane",
+    "Airline cancels hundreds of flights amid staffing shortage",
+    "New study finds coffee drinkers live longer",
+    "Court rules against the governor in redistricting case",
+    "Tech giant unveils cheaper and faster smartphone",
+    "Unemployment rises for the third straight month",
+    "Rescue crews save hikers trapped on the mountain",
+    "Prices at the pump climb ahead of holiday travel",
+]
+
+
+class InferenceBackend():
+    """
+    Base class for the engines that run a sequence classification model.
+
+    A backend takes padded ``input_ids`` / ``attention_mask`` tensors and returns
+    logits, so SentimentAnalyzer can swap the engine without changing how texts are
+    tokenized, batched or post-processed.
+
+    Attributes:
+        logger (logging.Logger): Logger instance for the class.
+        name (str): Short name used to select the backend.
+        model (torch.nn.Module): The PyTorch model the backend was built from.
+    """
+    name = 'base'
+
+    def __init__(self, model: torch.nn.Module, fingerprint: str, artifact_dir: Optional[Path] = None) -> None:
+        """
+        Initialize the backend.
+
+        Args:
+            model (torch.nn.Module): The loaded PyTorch model.
+            fingerprint (str): Fingerprint of the model, used to key cached artifacts.
+            artifact_dir (Optional[Path], optional): Directory for exported artifacts.
+        """
+        self.logger = logging.getLogger(__name__)
+        self.logger.debug(f"Initiating Class {__name__}")
+        self.model = model
+        self.fingerprint = fingerprint
+        self.artifact_dir = Path(artifact_dir) if artifact_dir else DEFAULT_ARTIFACT_DIR
+
+    def predict(self, input_ids: torch.Tensor, attention_mask: torch.Tensor) -> torch.Tensor:
+        """
+        Compute logits for one padded batch.
+
+        Args:
+            input_ids (torch.Tensor): Token ids with shape (batch, sequence).
+            attention_mask (torch.Tensor): Attention mask with shape (batch, sequence).
+
+        Returns:
+            torch.Tensor: Logits with shape (batch, num_labels).
+        """
+        raise NotImplementedError
+
+    def _artifact_path(self, filename: str) -> Path:
+        path = self.artifact_dir / self.fingerprint / filename
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return path
+
+
+class TorchBackend(InferenceBackend):
+    """
+    Runs the stock PyTorch model.
+    """
+    name = 'torch'
+
+    def predict(self, input_ids: torch.Tensor, attention_mask: torch.Tensor) -> torch.Tensor:
+        with torch.inference_mode():
+            return self.model(input_ids=input_ids, attention_mask=attention_mask).logits
+
+
+class QuantizedTorchBackend(InferenceBackend):
+    """
+    Runs a dynamically int8-quantized copy of the PyTorch model.
+
+    The Linear layers are replaced with dynamically quantized int8 layers. The quantized
+    weights are cached on disk, keyed by the model fingerprint. Later runs swap empty
+    int8 layers into a copy of the model and load the cached weights into them, without
+    observing and quantizing the float weights again.
+    """
+    name = 'int8'
+
+    def __init__(self, model: torch.nn.Module, fingerprint: str, artifact_dir: Optional[Path] = None) -> None:
+        super().__init__(model, fingerprint, artifact_dir)
+        path = self._artifact_path('model_int8.pt')
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            self.quantized_model = self._load(path) if path.is_file() else None
+            if self.quantized_model is None:
+                self.quantized_model = torch.ao.quantization.quantize_dynamic(
+                    copy.deepcopy(model), {torch.nn.Linear}, dtype=torch.qint8)
+                self.logger.info(f'Caching quantized weights at {path}')
+                # * Quantized tensors do not pickle cleanly, so cache plain int8 data plus scales
+                temp_path = path.with_suffix('.tmp')
+                torch.save({name: self._pack_weight(*layer._weight_bias())
+                            for name, layer in self._quantized_layers(self.quantized_model).items()}, temp_path)
+                os.replace(temp_path, path)
+        self.quantized_model.eval()
+
+    def _load(self, path: Path) -> Optional[torch.nn.Module]:
+        packed_layers = torch.load(path, weights_only=True)
+        skeleton = copy.deepcopy(self.model)
+        linear_names = [name for name, module in skeleton.named_modules() if type(module) is torch.nn.Linear]
+        if set(linear_names) != set(packed_layers):
+            self.logger.warning(f'Ignoring quantized weights at {path}: layers do not match the model')
+            return None
+        self.logger.info(f'Loading quantized weights from {path}')
+        for name in linear_names:
+            linear = skeleton.get_submodule(name)
+            layer = torch.ao.nn.quantized.dynamic.Linear(linear.in_features, linear.out_features,
+                                                         bias_=linear.bias is not None, dtype=torch.qint8)
+            packed = packed_layers[name]
+            layer.set_weight_bias(self._unpack_weight(packed), packed['bias'])
+            parent, _, attribute = name.rpartition('.')
+            setattr(skeleton.get_submodule(parent), attribute, layer)
+        return skeleton
+
+    @staticmethod
+    def _quantized_layers(model: torch.nn.Module) -> Dict[str, torch.nn.Module]:
+        return {name: module for name, module in model.named_modules()
+                if isinstance(module, torch.ao.nn.quantized.dynamic.Linear)}
+
+    @staticmethod
+    def _pack_weight(weight: torch.Tensor, bias: Optional[torch.Tensor]) -> Dict:
+        packed = {'int_repr': weight.int_repr(), 'bias': bias}
+        if weight.qscheme() in (torch.per_channel_affine, torch.per_channel_symmetric):
+            packed.update(scales=weight.q_per_channel_scales(),
+                          zero_points=weight.q_per_channel_zero_points(),
+                          axis=weight.q_per_channel_axis())
+        else:
+            packed.update(scale=weight.q_scale(), zero_point=weight.q_zero_point())
+        return packed
+
+    @staticmethod
+    def _unpack_weight(packed: Dict) -> torch.Tensor:
+        if 'scales' in packed:
+            return torch._make_per_channel_quantized_tensor(
+                packed['int_repr'], packed['scales'], packed['zero_points'], packed['axis'])
+        return torch._make_per_tensor_quantized_tensor(
+            packed['int_repr'], packed['scale'], packed['zero_point'])
+
+    def predict(self, input_ids: torch.Tensor, attention_mask: torch.Tensor) -> torch.Tensor:
+        with torch.inference_mode():
+            return self.quantized_model(input_ids=input_ids, attention_mask=attention_mask).logits
+
+
+class ONNXBackend(InferenceBackend):
+    """
+    Runs the model with ONNX Runtime on CPU.
+
+    The model is exported to ONNX once, with dynamic batch and sequence axes, and the
+    exported file is cached on disk keyed by the model fingerprint. Requires the
+    optional ``onnxruntime`` package (and ``onnx`` for the export step).
+    """
+    name = 'onnx'
+
+    def __init__(self, model: torch.nn.Module, fingerprint: str, artifact_dir: Optional[Path] = None) -> None:
+        super().__init__(model, fingerprint, artifact_dir)
+        try:
+            import onnxruntime
+        except ImportError as ex:
+            raise ImportError("The 'onnx' backend requires the onnxruntime package") from ex
+
+        path = self._artifact_path('model.onnx')
+        if not path.is_file():
+            self.logger.info(f'Exporting model to ONNX at {path}')
+            self._export(path)
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = onnxruntime.InferenceSession(
+            str(path), sess_options=options, providers=['CPUExecutionProvider'])
+
+    def predict(self, input_ids: torch.Tensor, attention_mask: torch.Tensor) -> torch.Tensor:
+        logits = self.session.run(['logits'], {'input_ids': input_ids.numpy(),
+                                               'attention_mask': attention_mask.numpy()})[0]
+        return torch.from_numpy(logits)
+
+    def _export(self, path: Path) -> None:
+        dummy_ids = torch.ones((2, 8), dtype=torch.long)
+        dummy_mask = torch.ones((2, 8), dtype=torch.long)
+        temp_path = path.with_suffix('.tmp')
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            torch.onnx.export(
+                self.model, (dummy_ids, dummy_mask), str(temp_path),
+                input_names=['input_ids', 'attention_mask'], output_names=['logits'],
+                dynamic_axes={'input_ids': {0: 'batch', 1: 'sequence'},
+                              'attention_mask': {0: 'batch', 1: 'sequence'},
+                              'logits': {0: 'batch'}},
+                opset_version=17, dynamo=False)
+        os.replace(temp_path, path)
+
+
+BACKENDS = {backend.name: backend for backend in (TorchBackend, QuantizedTorchBackend, ONNXBackend)}
+
+
+def create_backend(name: str, model: torch.nn.Module, fingerprint: str,
+                   artifact_dir: Optional[Union[str, Path]] = None) -> InferenceBackend:
+    """
+    Create an inference backend by name.
+
+    Args:
+        name (str): One of 'torch', 'int8' or 'onnx'.
+        model (torch.nn.Module): The loaded PyTorch model.
+        fingerprint (str): Fingerprint of the model, used to key cached artifacts.
+        artifact_dir (Optional[Union[str, Path]], optional): Directory for exported artifacts.
+
+    Returns:
+        InferenceBackend: The backend.
+
+    Raises:
+        ValueError: If the backend name is unknown.
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"backend must be one of {tuple(BACKENDS)}")
+    return BACKENDS[name](model, fingerprint, Path(artifact_dir) if artifact_dir else None)
+
+
+def check_backend_parity(candidate, baseline, samples: List[str] = PARITY_SAMPLES) -> Dict[str, float]:
+    """
+    Compare an optimized analyzer with the baseline over a fixed sample set.
+
+    Args:
+        candidate (SentimentAnalyzer): Analyzer using the backend under test.
+        baseline (SentimentAnalyzer): Analyzer using the reference backend.
+        samples (List[str], optional): Texts to compare on.
+
+    Returns:
+        Dict[str, float]: Label agreement ratio and the mean / max absolute confidence difference.
+    """
+    expected = baseline.get_sentiment(list(samples))
+    actual = candidate.get_sentiment(list(samples))
+    agreement = sum(a['sentiment'] == e['sentiment'] for a, e in zip(actual, expected))
+    differences = [abs(a['confidence'] - e['confidence']) for a, e in zip(actual, expected)]
+    return {
+        'samples': len(samples),
+        'label_agreement': round(agreement / len(samples), 4),
+        'mean_confidence_diff': round(sum(differences) / len(differences), 4),
+        'max_confidence_diff': round(max(differences), 4)
+    }
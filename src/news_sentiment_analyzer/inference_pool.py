@@ -0,0 +1,481 @@
+import itertools
+import logging
+import math
+import multiprocessing
+import multiprocessing.connection
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Tuple, Union
+import numpy as np
+from .metrics import METRICS
+from .records import SentimentBatch
+from .sentiment_analyzer import SentimentAnalyzer
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Cheap estimate of a text's WordPiece token count, used for scheduling.
+
+    Roughly four characters per token for English news text, plus the special tokens.
+    The parent process never loads the tokenizer; only relative costs matter here.
+
+    Args:
+        text (str): The text to score.
+
+    Returns:
+        int: Estimated token count.
+    """
+    return len(text) // 4 + 2
+
+
+def available_cores() -> List[int]:
+    """
+    CPU cores this process may run on.
+    """
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def _worker_main(index: int, model_name: str, model_options: Dict, num_threads: int,
+                 cores: Optional[List[int]], max_memory_mb: Optional[float],
+                 tasks: 'multiprocessing.Queue', results: 'multiprocessing.connection.Connection') -> None:
+    # * Thread counts must be fixed before torch spins up its pools
+    for variable in ('OMP_NUM_THREADS', 'MKL_NUM_THREADS'):
+        os.environ[variable] = str(num_threads)
+    if cores and hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, cores)
+    import torch
+    from .model_registry import ModelRegistry, get_resident_memory_mb
+    torch.set_num_threads(num_threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        pass
+    logger = logging.getLogger(__name__)
+    try:
+        analyzer = ModelRegistry.get(model_name, **model_options)
+        analyzer.get_sentiment(["Warm-up headline for the sentiment model."])
+    except Exception as ex:
+        results.send(('failed', index, None, f"{type(ex).__name__}: {ex}"))
+        return
+    results.send(('ready', index, None, (analyzer.model_revision, analyzer.labels, get_resident_memory_mb())))
+    while True:
+        task = tasks.get()
+        if task is None:
+            return
+        task_id, texts = task
+        try:
+            scored = analyzer.score_batch(texts)
+            # * The parent still has the texts; send back only the label codes and confidences
+            scored.texts = None
+            results.send(('done', index, task_id, scored))
+        except Exception as ex:
+            results.send(('error', index, task_id, f"{type(ex).__name__}: {ex}"))
+        memory = get_resident_memory_mb()
+        if max_memory_mb is not None and memory > max_memory_mb:
+            # * Exit after the task; the pool starts a fresh worker in its place
+            logger.warning(f"Inference worker {index} uses {memory:.0f} MB (limit {max_memory_mb:.0f} MB), recycling")
+            results.send(('recycle', index, None, memory))
+            return
+
+
+class _Worker():
+    """
+    Parent-side handle of one worker process.
+    """
+
+    def __init__(self, index: int, cores: Optional[List[int]]) -> None:
+        self.index = index
+        self.cores = cores
+        self.process = None
+        self.tasks = None
+        self.results = None
+        self.recycling = False
+        self.pending: Dict[int, tuple] = {}
+        self.outstanding_tokens = 0
+        self.completed_tasks = 0
+        self.scored_texts = 0
+        self.restarts = 0
+        self.resident_memory_mb = None
+        self.error = None
+        self.ready = threading.Event()
+
+
+class InferencePool():
+    """
+    Pool of worker processes that each hold one copy of the sentiment model.
+
+    Every worker runs ``num_threads`` torch threads and, where the platform allows it,
+    is pinned to its own slice of the available cores. Concurrent callers, such as
+    several Gradio sessions, then share a fixed set of cores and do not oversubscribe
+    them. A call's texts are sorted by estimated token count and cut into chunks of
+    similar length and roughly equal token cost. Each chunk goes to the worker with the
+    fewest outstanding tokens, so long texts do not pile up behind each other on one
+    worker. A worker whose resident memory exceeds ``max_memory_mb`` is replaced after
+    its current task. A worker that dies fails the chunk it was running and is restarted
+    with the rest of its chunks; if the restart cannot load the model, those chunks move
+    to the remaining workers.
+
+    The pool exposes ``model_name``, ``model_revision``, ``labels``, ``get_sentiment`` and
+    ``score_batch`` like a SentimentAnalyzer, so it can be used with the SentimentCache and
+    NewsSentimentAnalyzer. Workers return label codes and confidences only, not the texts.
+
+    Attributes:
+        logger (logging.Logger): Logger instance for the class.
+        model_name (str): HuggingFace model name or local path of the model.
+        model_options (Dict): Additional SentimentAnalyzer arguments.
+        workers (int): Number of worker processes.
+        num_threads (int): Torch threads per worker.
+        max_memory_mb (Optional[float]): Resident memory above which a worker is recycled.
+        max_tokens_per_task (int): Upper bound of the estimated tokens sent to a worker at once.
+        model_revision (str): Revision reported by the workers; reading it starts the pool.
+        labels (Tuple[str, ...]): Label of each class id reported by the workers; reading it starts the pool.
+    """
+
+    def __init__(self, model_name: str = SentimentAnalyzer.DEFAULT_MODEL_NAME, workers: Optional[int] = None,
+                 num_threads: Optional[int] = None, model_options: Optional[Dict] = None,
+                 max_memory_mb: Optional[float] = None, max_tokens_per_task: int = 16384,
+                 pin_cores: bool = True, start_timeout: float = 300.0) -> None:
+        """
+        Initialize the InferencePool. Workers are started by ``start`` or on first use.
+
+        Args:
+            model_name (str, optional): HuggingFace model name or local path of the model.
+            workers (Optional[int], optional): Number of worker processes. Defaults to one
+                per two available cores.
+            num_threads (Optional[int], optional): Torch threads per worker. Defaults to the
+                available cores divided by the number of workers.
+            model_options (Optional[Dict], optional): Additional SentimentAnalyzer arguments.
+            max_memory_mb (Optional[float], optional): Recycle a worker whose resident memory
+                exceeds this after a task. None disables the limit.
+            max_tokens_per_task (int, optional): Upper bound of estimated tokens per chunk.
+            pin_cores (bool, optional): Pin each worker to its own cores where supported.
+            start_timeout (float, optional): Seconds to wait for the workers to load the model.
+
+        Raises:
+            ValueError: If workers, num_threads or max_tokens_per_task is not positive.
+        """
+        self.logger = logging.getLogger(__name__)
+        self.logger.debug(f"Initiating Class {__name__}")
+        cores = available_cores()
+        workers = workers if workers is not None else max(1, len(cores) // 2)
+        if workers < 1 or (num_threads is not None and num_threads < 1) or max_tokens_per_task < 1:
+            raise ValueError("workers, num_threads and max_tokens_per_task must be positive")
+        self.model_name = model_name
+        self.model_options = dict(model_options or {})
+        self.workers = workers
+        self.num_threads = num_threads or max(1, len(cores) // workers)
+        self.max_memory_mb = max_memory_mb
+        self.max_tokens_per_task = max_tokens_per_task
+        self.start_timeout = start_timeout
+        self._model_revision = None
+        self._labels = ()
+        # * Disjoint core slices when there are enough cores, otherwise let the OS schedule
+        pinned = pin_cores and hasattr(os, 'sched_setaffinity') and len(cores) >= workers * self.num_threads
+        self._workers = [_Worker(i, cores[i * self.num_threads:(i + 1) * self.num_threads] if pinned else None)
+                         for i in range(workers)]
+        self._context = multiprocessing.get_context('spawn')
+        self._futures: Dict[int, Future] = {}
+        self._task_ids = itertools.count()
+        self._lock = threading.Lock()
+        self._started = False
+        self._closed = False
+        self._collector = None
+
+    def start(self) -> 'InferencePool':
+        """
+        Start the workers and wait until each has loaded and warmed up the model.
+
+        Returns:
+            InferencePool: The pool itself.
+
+        Raises:
+            RuntimeError: If the pool is closed, or a worker fails to load the model in time.
+        """
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("InferencePool is closed")
+            if self._started:
+                return self
+            for worker in self._workers:
+                self._spawn(worker)
+            self._started = True
+            self._collector = threading.Thread(target=self._collect, name="inference-pool-collector", daemon=True)
+            self._collector.start()
+        deadline = time.monotonic() + self.start_timeout
+        for worker in self._workers:
+            if not worker.ready.wait(max(0.0, deadline - time.monotonic())) or worker.error is not None:
+                self.close()
+                raise RuntimeError(f"Inference worker {worker.index} failed to start: {worker.error or 'timeout'}")
+        self.logger.info(f"Started {self.workers} inference workers with {self.num_threads} threads each")
+        return self
+
+    @property
+    def model_revision(self) -> str:
+        # * Callers such as the SentimentCache key results by revision before scoring anything
+        if not self._started:
+            self.start()
+        return self._model_revision
+
+    @property
+    def labels(self) -> Tuple[str, ...]:
+        if not self._started:
+            self.start()
+        return self._labels
+
+    def get_sentiment(self, text: Union[str, List[str]]) -> Union[Dict, List[Dict]]:
+        """
+        Score text on the workers.
+
+        Args:
+            text (Union[str, List[str]]): A single text string or a list of text strings.
+
+        Returns:
+            Union[Dict, List[Dict]]: Results in the same shape and order as
+            SentimentAnalyzer.get_sentiment.
+
+        Raises:
+            ValueError: If the input is empty.
+            RuntimeError: If a worker fails while scoring.
+        """
+        if not text:
+            raise ValueError("Input text cannot be empty or None")
+        if isinstance(text, str):
+            return self.get_sentiment([text])[0]
+        return self.score_batch(text).to_dicts()
+
+    def score_batch(self, texts: List[str]) -> SentimentBatch:
+        """
+        Score a list of texts on the workers and return the results as compact arrays.
+
+        Args:
+            texts (List[str]): The texts to score.
+
+        Returns:
+            SentimentBatch: Results in the same order as ``texts``.
+
+        Raises:
+            ValueError: If texts is empty.
+            RuntimeError: If a worker fails while scoring.
+        """
+        if not texts:
+            raise ValueError("Input text cannot be empty or None")
+        self.start()
+        chunks = self.plan_chunks([estimate_tokens(t) for t in texts])
+        futures = [self._submit([texts[i] for i in chunk], cost) for chunk, cost in chunks]
+        labels = self.labels
+        codes = np.empty(len(texts), dtype=np.int8)
+        confidences = np.empty(len(texts), dtype=np.float32)
+        for (chunk, _), future in zip(chunks, futures):
+            scored = future.result()
+            codes[chunk] = scored.recode(labels)
+            confidences[chunk] = scored.confidences
+        return SentimentBatch(labels, codes, confidences, list(texts))
+
+    def plan_chunks(self, costs: List[int]) -> List[tuple]:
+        """
+        Cut a call into chunks of similar-length texts and roughly equal token cost.
+
+        Indices are sorted by cost (longest first) and packed until a chunk reaches the
+        call's total cost divided by the number of workers, or ``max_tokens_per_task``.
+
+        Args:
+            costs (List[int]): Estimated tokens of each text.
+
+        Returns:
+            List[tuple]: (indices, estimated tokens) per chunk.
+        """
+        target = min(self.max_tokens_per_task, max(1, math.ceil(sum(costs) / self.workers)))
+        chunks, current, current_cost = [], [], 0
+        for i in sorted(range(len(costs)), key=lambda i: costs[i], reverse=True):
+            if current and current_cost + costs[i] > target:
+                chunks.append((current, current_cost))
+                current, current_cost = [], 0
+            current.append(i)
+            current_cost += costs[i]
+        if current:
+            chunks.append((current, current_cost))
+        return chunks
+
+    def stats(self) -> Dict:
+        """
+        Per-worker load and health.
+
+        Returns:
+            Dict: Pool configuration and, per worker, its pid, cores, outstanding tokens,
+            completed tasks, scored texts, restarts, last reported resident memory and the
+            error of a worker that could not load the model.
+        """
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'num_threads': self.num_threads,
+                'per_worker': [{
+                    'pid': worker.process.pid if worker.process is not None else None,
+                    'cores': worker.cores,
+                    'outstanding_tokens': worker.outstanding_tokens,
+                    'completed_tasks': worker.completed_tasks,
+                    'scored_texts': worker.scored_texts,
+                    'restarts': worker.restarts,
+                    'resident_memory_mb': worker.resident_memory_mb,
+                    'error': worker.error,
+                } for worker in self._workers],
+            }
+
+    def close(self) -> None:
+        """
+        Stop the workers. Pending calls fail with RuntimeError.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            workers = [worker for worker in self._workers if worker.process is not None]
+            for worker in workers:
+                worker.tasks.put(None)
+        for worker in workers:
+            worker.process.join(timeout=10)
+            if worker.process.is_alive():
+                worker.process.terminate()
+        if self._collector is not None:
+            self._collector.join(timeout=5)
+        with self._lock:
+            for worker in workers:
+                if worker.results is not None:
+                    worker.results.close()
+                    worker.results = None
+            for future in self._futures.values():
+                if not future.done():
+                    future.set_exception(RuntimeError("InferencePool was closed"))
+            self._futures.clear()
+
+    def __enter__(self) -> 'InferencePool':
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _submit(self, texts: List[str], cost: int) -> Future:
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("InferencePool is closed")
+            task_id = next(self._task_ids)
+            self._assign(self._least_loaded(), task_id, cost, texts)
+            self._futures[task_id] = future
+        return future
+
+    def _least_loaded(self) -> _Worker:
+        # * A worker that failed to load the model is no longer managed and must not get work
+        healthy = [worker for worker in self._workers if worker.error is None]
+        if not healthy:
+            raise RuntimeError("No inference worker could load the model")
+        return min(healthy, key=lambda worker: worker.outstanding_tokens)
+
+    def _assign(self, worker: _Worker, task_id: int, cost: int, texts: List[str]) -> None:
+        worker.pending[task_id] = (cost, texts)
+        worker.outstanding_tokens += cost
+        METRICS.set_gauge('inference_pool_outstanding_tokens', worker.outstanding_tokens, worker=str(worker.index))
+        worker.tasks.put((task_id, texts))
+
+    def _spawn(self, worker: _Worker) -> None:
+        worker.ready.clear()
+        worker.recycling = False
+        worker.tasks = self._context.Queue()
+        # * One pipe per worker: a worker killed mid-send cannot block the others, and the
+        # * end of its pipe tells the collector it exited after its last message was read
+        reader, writer = self._context.Pipe(duplex=False)
+        worker.process = self._context.Process(
+            target=_worker_main, name=f"inference-worker-{worker.index}", daemon=True,
+            args=(worker.index, self.model_name, self.model_options, self.num_threads, worker.cores,
+                  self.max_memory_mb, worker.tasks, writer))
+        worker.process.start()
+        writer.close()
+        worker.results = reader
+
+    def _collect(self) -> None:
+        while True:
+            with self._lock:
+                readers = {worker.results: worker for worker in self._workers if worker.results is not None}
+            # * Every wait covers all workers, so a dead worker is noticed while others keep answering
+            ready = multiprocessing.connection.wait(list(readers), timeout=0.5)
+            if not ready and self._closed:
+                return
+            for reader in ready:
+                worker = readers[reader]
+                try:
+                    kind, index, task_id, payload = reader.recv()
+                except (EOFError, OSError):
+                    self._restart(worker, reader)
+                    continue
+                with self._lock:
+                    if kind == 'ready':
+                        self._model_revision, self._labels, worker.resident_memory_mb = payload
+                        worker.ready.set()
+                    elif kind == 'failed':
+                        self._fail_worker(worker, payload)
+                    elif kind == 'recycle':
+                        worker.resident_memory_mb = payload
+                        worker.recycling = True
+                    else:
+                        self._finish(worker, task_id, payload, kind == 'done')
+
+    def _finish(self, worker: _Worker, task_id: int, payload, succeeded: bool) -> None:
+        cost, _ = worker.pending.pop(task_id, (0, None))
+        worker.outstanding_tokens -= cost
+        METRICS.set_gauge('inference_pool_outstanding_tokens', worker.outstanding_tokens, worker=str(worker.index))
+        future = self._futures.pop(task_id, None)
+        if future is None:
+            return
+        if succeeded:
+            worker.completed_tasks += 1
+            worker.scored_texts += len(payload)
+            future.set_result(payload)
+        else:
+            future.set_exception(RuntimeError(f"Inference worker {worker.index} failed: {payload}"))
+
+    def _fail_worker(self, worker: _Worker, error: str) -> None:
+        self.logger.error(f"Inference worker {worker.index} failed to load the model: {error}")
+        worker.error = error
+        worker.ready.set()
+        # * Chunks waiting for a restarted worker that cannot load the model move to the healthy ones
+        for task_id, (cost, texts) in list(worker.pending.items()):
+            if all(other.error is not None for other in self._workers):
+                self._finish(worker, task_id, error, False)
+                continue
+            del worker.pending[task_id]
+            worker.outstanding_tokens -= cost
+            self._assign(self._least_loaded(), task_id, cost, texts)
+
+    def _restart(self, worker: _Worker, reader: 'multiprocessing.connection.Connection') -> None:
+        with self._lock:
+            if worker.results is not reader:
+                return
+            reader.close()
+            worker.results = None
+            if self._closed or worker.error is not None:
+                return
+            process = worker.process
+        # * Joined without the lock: a dying process can take seconds to exit
+        process.join(timeout=10)
+        with self._lock:
+            if self._closed:
+                return
+            reason = 'memory_limit' if worker.recycling else 'crash'
+            if reason == 'crash':
+                self.logger.error(f"Inference worker {worker.index} exited with code {process.exitcode}")
+                # * Tasks run in submission order, so only the oldest chunk can have been running.
+                # * It may have caused the crash, so it fails rather than being retried
+                for task_id in list(worker.pending)[:1]:
+                    self._finish(worker, task_id, f"exit code {process.exitcode}", False)
+            worker.restarts += 1
+            METRICS.inc('inference_pool_restarts_total', reason=reason)
+            self._spawn(worker)
+            # * Chunks still queued for the old process, or submitted while it was joined, go to its replacement
+            for task_id, (_, texts) in worker.pending.items():
+                worker.tasks.put((task_id, texts))
+        self.logger.info(f"Restarted inference worker {worker.index} ({reason})")
@@ -0,0 +1,257 @@
+import hashlib
+import logging
+import math
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+from .metrics import METRICS
+from .records import SentimentBatch
+
+# * Word polarities on a -3..3 scale, biased towards words that carry a headline's tone
+DEFAULT_LEXICON = {
+    # * Positive
+    'win': 2.0, 'wins': 2.0, 'won': 2.0, 'winner': 2.0, 'victory': 2.5, 'triumph': 2.5, 'champion': 2.0,
+    'celebrate': 2.5, 'celebrates': 2.5, 'celebration': 2.5, 'success': 2.5, 'successful': 2.5,
+    'record': 1.0, 'best': 2.5, 'better': 1.5, 'great': 2.5, 'good': 2.0, 'excellent': 3.0, 'amazing': 3.0,
+    'love': 2.5, 'loves': 2.5, 'beloved': 2.5, 'happy': 2.5, 'joy': 2.5, 'hope': 1.5, 'hopes': 1.5,
+    'hopeful': 2.0, 'inspiring': 2.5, 'praise': 2.0, 'praised': 2.0, 'hero': 2.5, 'heroes': 2.5,
+    'rescue': 1.5, 'rescued': 2.0, 'saved': 2.0, 'recover': 1.5, 'recovers': 1.5, 'recovery': 1.5,
+    'rally': 1.5, 'rallies': 1.5, 'surge': 1.0, 'surges': 1.0, 'soar': 2.0, 'soars': 2.0, 'gain': 1.5,
+    'gains': 1.5, 'growth': 1.5, 'boost': 1.5, 'boosts': 1.5, 'rise': 0.5, 'rises': 0.5, 'profit': 1.5,
+    'breakthrough': 2.5, 'cure': 2.0, 'award': 2.0, 'awarded': 2.0, 'honor': 2.0, 'honored': 2.0,
+    'peace': 2.0, 'agreement': 1.0, 'deal': 0.5, 'reunited': 2.5, 'thrilled': 3.0, 'welcome': 1.5,
+    'welcomes': 1.5, 'strong': 1.0, 'stronger': 1.0, 'safe': 1.5, 'safely': 1.5, 'improve': 1.5,
+    'improved': 1.5, 'improves': 1.5, 'beautiful': 2.5, 'wonderful': 3.0, 'delight': 2.5, 'fun': 2.0,
+    # * Negative
+    'kill': -3.0, 'kills': -3.0, 'killed': -3.0, 'killing': -3.0, 'dead': -3.0, 'dies': -3.0, 'died': -3.0,
+    'death': -3.0, 'deaths': -3.0, 'deadly': -3.0, 'murder': -3.0, 'shooting': -3.0, 'shot': -2.0,
+    'attack': -2.5, 'attacks': -2.5, 'war': -2.5, 'bomb': -3.0, 'bombing': -3.0, 'terror': -3.0,
+    'crash': -2.5, 'crashes': -2.5, 'disaster': -3.0, 'tragedy': -3.0, 'tragic': -3.0, 'crisis': -2.5,
+    'fire': -1.5, 'wildfire': -2.0, 'flood': -2.0, 'floods': -2.0, 'storm': -1.0, 'hurricane': -1.5,
+    'injured': -2.5, 'injuries': -2.0, 'victim': -2.5, 'victims': -2.5, 'hostage': -2.5, 'abuse': -3.0,
+    'arrest': -1.5, 'arrested': -1.5, 'charged': -1.5, 'fraud': -2.5, 'scandal': -2.5, 'corruption': -2.5,
+    'lawsuit': -1.5, 'sued': -1.5, 'guilty': -2.0, 'convicted': -2.0, 'fear': -2.0, 'fears': -2.0,
+    'threat': -2.0, 'threatens': -2.0, 'warning': -1.5, 'warns': -1.5, 'danger': -2.0, 'dangerous': -2.0,
+    'fail': -2.0, 'fails': -2.0, 'failed': -2.0, 'failure': -2.0, 'loss': -2.0, 'losses': -2.0,
+    'lose': -1.5, 'loses': -1.5, 'lost': -1.5, 'plunge': -2.0, 'plunges': -2.0, 'slump': -2.0,
+    'decline': -1.5, 'declines': -1.5, 'fall': -1.0, 'falls': -1.0, 'drop': -1.0, 'drops': -1.0,
+    'recession': -2.5, 'layoffs': -2.5, 'cuts': -1.0, 'bankrupt': -3.0, 'bankruptcy': -3.0,
+    'worst': -3.0, 'worse': -2.0, 'bad': -2.5, 'terrible': -3.0, 'awful': -3.0, 'horrible': -3.0,
+    'hate': -3.0, 'sad': -2.0, 'angry': -2.5, 'outrage': -2.5, 'protest': -1.0, 'protests': -1.0,
+    'violence': -3.0, 'violent': -3.0, 'conflict': -2.0, 'collapse': -2.5, 'collapses': -2.5,
+    'outbreak': -2.0, 'pandemic': -2.0, 'sick': -2.0, 'illness': -2.0, 'missing': -1.5, 'ban': -1.0,
+    'accused': -2.0, 'blame': -2.0, 'blames': -2.0, 'condemn': -2.5, 'condemns': -2.5, 'chaos': -2.5,
+}
+NEGATIONS = frozenset({'not', 'no', 'never', 'nor', 'without', 'none', 'nobody', 'nothing', 'neither',
+                       "isn't", "aren't", "wasn't", "weren't", "don't", "doesn't", "didn't", "won't",
+                       "can't", "cannot", "couldn't", "shouldn't", "wouldn't", "hasn't", "haven't"})
+INTENSIFIERS = {'very': 1.3, 'extremely': 1.5, 'really': 1.2, 'so': 1.2, 'most': 1.2, 'deeply': 1.3,
+                'hugely': 1.4, 'massive': 1.3, 'huge': 1.2, 'slightly': 0.6, 'somewhat': 0.7, 'barely': 0.5}
+WORD_PATTERN = re.compile(r"[a-z]+(?:'[a-z]+)?")
+# * Words after a negation whose polarity is flipped
+NEGATION_SCOPE = 3
+# * Squashes a polarity sum into (-1, 1); a larger value needs more evidence for the same score
+NORMALIZATION_ALPHA = 15.0
+
+
+class LexiconScorer():
+    """
+    Pure-Python, rule-based sentiment scorer.
+
+    Each word found in the lexicon adds its polarity, scaled by a preceding intensifier
+    ("very", "slightly") and flipped when a negation occurs in the previous few words. The
+    sum is squashed into a polarity in (-1, 1) whose magnitude says how clear-cut the text
+    is. It costs microseconds per headline, so it can answer clearly positive or negative
+    items before they reach the transformer.
+
+    Attributes:
+        logger (logging.Logger): Logger instance for the class.
+        lexicon (Dict[str, float]): Lower-case word mapped to its polarity.
+        labels (Tuple[str, str]): The (negative, positive) labels, matching the model's labels.
+    """
+
+    def __init__(self, lexicon: Optional[Dict[str, float]] = None,
+                 labels: Tuple[str, str] = ('NEGATIVE', 'POSITIVE')) -> None:
+        self.logger = logging.getLogger(__name__)
+        self.logger.debug(f"Initiating Class {__name__}")
+        self.lexicon = {word.lower(): float(weight) for word, weight in (lexicon or DEFAULT_LEXICON).items()}
+        self.labels = tuple(labels)
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path], **options) -> 'LexiconScorer':
+        """
+        Load a lexicon of ``word<TAB>polarity`` lines (VADER's format; extra columns and
+        ``#`` comments are ignored).
+        """
+        lexicon = {}
+        with open(path, encoding='utf-8') as handle:
+            for line in handle:
+                fields = line.split('\t')
+                if len(fields) >= 2 and not line.startswith('#'):
+                    lexicon[fields[0].strip()] = float(fields[1])
+        return cls(lexicon, **options)
+
+    @property
+    def revision(self) -> str:
+        """
+        Fingerprint of the lexicon, so results of different lexicons are not mixed.
+        """
+        payload = '\n'.join(f'{word}\t{weight}' for word, weight in sorted(self.lexicon.items()))
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+    def polarity(self, text: str) -> float:
+        """
+        Score one text.
+
+        Args:
+            text (str): The text to score.
+
+        Returns:
+            float: Polarity in (-1, 1); 0.0 when no lexicon word is found.
+        """
+        lexicon = self.lexicon
+        total, boost, negated_until = 0.0, 1.0, -1
+        for position, word in enumerate(WORD_PATTERN.findall(text.lower())):
+            weight = lexicon.get(word)
+            if weight is not None:
+                total += weight * boost * (-0.75 if position <= negated_until else 1.0)
+                boost = 1.0
+            elif word in NEGATIONS or word.endswith("n't"):
+                negated_until = position + NEGATION_SCOPE
+            else:
+                boost = INTENSIFIERS.get(word, 1.0)
+        if not total:
+            return 0.0
+        return total / math.sqrt(total * total + NORMALIZATION_ALPHA)
+
+    def score(self, text: str) -> Tuple[str, float]:
+        """
+        Label and confidence of one text; the confidence is 0.5 plus half the polarity's size.
+        """
+        polarity = self.polarity(text)
+        return self.labels[polarity > 0], round(0.5 + abs(polarity) / 2, 3)
+
+    def score_batch(self, texts: List[str]) -> SentimentBatch:
+        """
+        Score texts with the lexicon alone.
+
+        Returns:
+            SentimentBatch: The results, tagged with the 'lexicon' tier.
+        """
+        scores = [self.score(text) for text in texts]
+        return SentimentBatch.from_labels([label for label, _ in scores], [confidence for _, confidence in scores],
+                                          list(texts), self.labels, ['lexicon'] * len(texts))
+
+
+class CascadeAnalyzer():
+    """
+    Tiered scorer: a LexiconScorer answers clear-cut texts and only the rest reach the model.
+
+    A text whose lexicon polarity is at least ``margin`` in size is labelled by the lexicon;
+    every other text is scored by the wrapped analyzer, through the SentimentCache when one
+    is given. Each result records the tier that produced it. ``benchmarks.calibrate_cascade``
+    reports how often the cascade agrees with the model and how much faster it is for a
+    range of margins.
+
+    Attributes:
+        logger (logging.Logger): Logger instance for the class.
+        analyzer (SentimentAnalyzer): The model used for uncertain texts, or anything with
+            ``score_batch``/``get_sentiment``.
+        lexicon (LexiconScorer): The cheap first tier.
+        margin (float): Minimum lexicon polarity size (0 to 1) for the lexicon to answer.
+        cache (Optional[SentimentCache]): Cache in front of the model tier.
+    """
+
+    TIERS = ('lexicon', 'model')
+
+    def __init__(self, analyzer, lexicon: Optional[LexiconScorer] = None, margin: float = 0.6,
+                 cache=None) -> None:
+        """
+        Initialize the CascadeAnalyzer.
+
+        Args:
+            analyzer (SentimentAnalyzer): The model tier.
+            lexicon (Optional[LexiconScorer], optional): The lexicon tier. Defaults to the built-in lexicon.
+            margin (float, optional): Minimum lexicon polarity size for the lexicon to answer. 1.0
+                or more sends everything to the model.
+            cache (Optional[SentimentCache], optional): Cache for the model tier.
+
+        Raises:
+            ValueError: If margin is negative.
+        """
+        self.logger = logging.getLogger(__name__)
+        self.logger.debug(f"Initiating Class {__name__}")
+        if margin < 0:
+            raise ValueError("margin must not be negative")
+        self.analyzer = analyzer
+        self.lexicon = lexicon or LexiconScorer(labels=_binary_labels(analyzer))
+        self.margin = margin
+        self.cache = cache
+
+    @property
+    def model_name(self) -> str:
+        return self.analyzer.model_name
+
+    @property
+    def model_revision(self) -> str:
+        return f'{self.analyzer.model_revision}:cascade:{self.lexicon.revision}:{self.margin}'
+
+    @property
+    def labels(self) -> Tuple[str, ...]:
+        return getattr(self.analyzer, 'labels', ())
+
+    def score_batch(self, texts: List[str]) -> SentimentBatch:
+        """
+        Score texts, sending only those the lexicon is unsure about to the model.
+
+        Args:
+            texts (List[str]): The texts to score.
+
+        Returns:
+            SentimentBatch: Results in the same order as ``texts``, with ``tiers`` set.
+
+        Raises:
+            ValueError: If texts is empty.
+        """
+        if not texts:
+            raise ValueError("Input text cannot be empty or None")
+        lexicon_labels = self.lexicon.labels
+        sentiments, confidences, tiers, uncertain = [], [], [], []
+        for i, text in enumerate(texts):
+            polarity = self.lexicon.polarity(text)
+            if abs(polarity) >= self.margin and polarity:
+                sentiments.append(lexicon_labels[polarity > 0])
+                confidences.append(round(0.5 + abs(polarity) / 2, 3))
+                tiers.append('lexicon')
+            else:
+                sentiments.append(None)
+                confidences.append(0.0)
+                tiers.append('model')
+                uncertain.append(i)
+        if uncertain:
+            uncertain_texts = [texts[i] for i in uncertain]
+            if self.cache is not None:
+                scored = self.cache.score_batch(self.analyzer, uncertain_texts)
+            elif hasattr(self.analyzer, 'score_batch'):
+                scored = self.analyzer.score_batch(uncertain_texts)
+            else:
+                scored = SentimentBatch.from_dicts(self.analyzer.get_sentiment(uncertain_texts))
+            for index, i in enumerate(uncertain):
+                sentiments[i], confidences[i] = scored.sentiment(index), scored.confidence(index)
+        METRICS.inc('cascade_texts_total', len(texts) - len(uncertain), tier='lexicon')
+        METRICS.inc('cascade_texts_total', len(uncertain), tier='model')
+        return SentimentBatch.from_labels(sentiments, confidences, list(texts), self.labels, tiers)
+
+    def get_sentiment(self, text: Union[str, List[str]]) -> Union[Dict, List[Dict]]:
+        """
+        Like SentimentAnalyzer.get_sentiment, with a 'tier' key in every result.
+        """
+        if isinstance(text, str):
+            return self.get_sentiment([text])[0]
+        return self.score_batch(text).to_dicts()
+
+
+def _binary_labels(analyzer) -> Tuple[str, str]:
+    # * SST-2 style models list NEGATIVE before POSITIVE; anything else falls back to those names
+    labels = tuple(getattr(analyzer, 'labels', ()))
+    return labels if len(labels) == 2 else ('NEGATIVE', 'POSITIVE')
@@ -0,0 +1,182 @@
+import atexit
+import json
+import logging
+import logging.config
+import logging.handlers
+import os
+import queue
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional, Union
+
+# * Default config shipped at the project root; override with NEWS_SENTIMENT_LOGGING_CONFIG
+DEFAULT_CONFIG_PATH = Path(__file__).parents[2] / "logging_config.yaml"
+CONFIG_ENV_VAR = "NEWS_SENTIMENT_LOGGING_CONFIG"
+DEFAULT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+# * Formatter factory as named in the YAML configs. It is resolved in code, so the configs
+# * work for the installed package and for a checkout that imports src.news_sentiment_analyzer
+JSONL_FORMATTER = "news_sentiment_analyzer.logging_setup.JsonLinesFormatter"
+
+# * Attributes every LogRecord has; anything else was passed through ``extra``
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+_configured = False
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """
+    Format records as one compact JSON object per line.
+
+    Every line has ``ts`` (UTC ISO 8601), ``level``, ``logger`` and ``message``;
+    exceptions are added as ``exc`` and values passed through ``extra`` are kept as
+    top-level keys, so the log can be loaded with ``pd.read_json(path, lines=True)``.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that leaves message formatting to the listener thread.
+
+    The stock QueueHandler merges the message and arguments in the calling thread so
+    the record can be pickled. Records here stay in-process, so only records that
+    carry an exception are prepared eagerly (their tracebacks pin frames alive); all
+    other records are formatted by the writer thread. Log arguments should therefore
+    be values that are not mutated after the call.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.exc_info:
+            return super().prepare(record)
+        return record
+
+
+def configure_logging(config_path: Union[str, Path, None] = None, level: int = logging.INFO,
+                      force: bool = False, use_queue: Optional[bool] = None) -> Optional[Path]:
+    """
+    Configure logging once for the process.
+
+    Library modules only create loggers; entry points (the Gradio app, CLIs, worker
+    processes) call this function. The YAML config is looked up from ``config_path``,
+    then the ``NEWS_SENTIMENT_LOGGING_CONFIG`` environment variable, then the project's
+    ``logging_config.yaml``. If none is found, or PyYAML is missing, a plain console
+    configuration at ``level`` is used instead of failing.
+
+    With a queue (``queue: true`` in the YAML config, or ``use_queue=True``), the root
+    logger's handlers are moved behind a QueueListener thread. Logging calls then only
+    enqueue the record, and formatting and file I/O happen in the background.
+
+    Args:
+        config_path (Union[str, Path, None], optional): Path of a logging YAML config.
+        level (int, optional): Log level of the fallback console configuration.
+        force (bool, optional): Reconfigure even if logging was already configured.
+        use_queue (Optional[bool], optional): Write through a background queue; defaults
+            to the config's ``queue`` setting.
+
+    Returns:
+        Optional[Path]: The config file that was applied, or None for the fallback.
+
+    Raises:
+        FileNotFoundError: If an explicitly given ``config_path`` does not exist.
+        ValueError: If the YAML config cannot be parsed or applied.
+    """
+    global _configured
+    if _configured and not force:
+        return None
+    stop_logging()
+
+    explicit = config_path is not None
+    path = Path(config_path or os.environ.get(CONFIG_ENV_VAR) or DEFAULT_CONFIG_PATH)
+    if not path.is_file():
+        if explicit:
+            raise FileNotFoundError(f"Logging config file not found: {path}")
+        path = None
+    log_config = None
+    if path is not None:
+        try:
+            import yaml
+        except ImportError:
+            yaml = None
+        if yaml is not None:
+            try:
+                with open(path, 'r') as f:
+                    log_config = yaml.safe_load(f)
+            except yaml.YAMLError as ex:
+                raise ValueError(f"Error parsing logging config file: {str(ex)}") from ex
+
+    config_queue = bool(log_config.pop('queue', False)) if log_config else False
+    if log_config is None:
+        if force:
+            # * basicConfig(force=True) needs Python 3.8
+            root = logging.getLogger()
+            for handler in list(root.handlers):
+                root.removeHandler(handler)
+                handler.close()
+        logging.basicConfig(level=level, format=DEFAULT_FORMAT)
+        path = None
+    else:
+        for formatter in (log_config.get('formatters') or {}).values():
+            if isinstance(formatter, dict) and str(formatter.get('()', '')).endswith(JSONL_FORMATTER):
+                formatter['()'] = JsonLinesFormatter
+        # * File handlers fail if their directory does not exist yet
+        for handler in log_config.get('handlers', {}).values():
+            if handler.get('filename'):
+                Path(handler['filename']).parent.mkdir(parents=True, exist_ok=True)
+        logging.config.dictConfig(log_config)
+    if use_queue if use_queue is not None else config_queue:
+        _start_queue(logging.getLogger())
+    _configured = True
+    logging.getLogger(__name__).debug(f"Logging configured from {path or 'defaults'}")
+    return path
+
+
+def stop_logging() -> None:
+    """
+    Stop the background log writer, if any, after it has written every queued record.
+
+    The root logger's handlers are restored, so logging keeps working synchronously.
+    Registered with ``atexit``; call it explicitly before forking or in tests.
+    """
+    global _listener
+    if _listener is None:
+        return
+    listener, _listener = _listener, None
+    listener.stop()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if isinstance(handler, DeferredQueueHandler):
+            root.removeHandler(handler)
+    for handler in listener.handlers:
+        root.addHandler(handler)
+
+
+def _start_queue(logger: logging.Logger) -> None:
+    global _listener
+    handlers = list(logger.handlers)
+    if not handlers:
+        return
+    records = queue.SimpleQueue()
+    for handler in handlers:
+        logger.removeHandler(handler)
+    logger.addHandler(DeferredQueueHandler(records))
+    _listener = logging.handlers.QueueListener(records, *handlers, respect_handler_level=True)
+    _listener.start()
+
+
+atexit.register(stop_logging)
@@ -0,0 +1,303 @@
+import bisect
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, Optional, Tuple
+
+# * Latency buckets in seconds (Prometheus convention: cumulative, plus +Inf)
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+# * HELP text for the metrics recorded by the instrumented classes
+METRIC_HELP = {
+    'scrape_seconds': 'Time to fetch and parse one feed.',
+    'fetch_seconds': 'Time to download one feed.',
+    'parse_seconds': 'Time to parse one feed, excluding text cleaning.',
+    'clean_seconds': 'Time spent cleaning the text fields of one feed.',
+    'store_seconds': 'Time spent writing one run to the results store.',
+    'embed_seconds': 'Time to embed one batch of new items for the semantic index.',
+    'tokenize_seconds': 'Time to tokenize one batch of texts.',
+    'inference_seconds': 'Time of one padded forward pass.',
+    'dataframe_seconds': 'Time to build one results DataFrame.',
+    'analysis_seconds': 'Time of one complete analysis run.',
+    'articles_scraped_total': 'Articles parsed from each feed.',
+    'bytes_fetched_total': 'Feed bytes downloaded (after decompression).',
+    'feed_not_modified_total': 'Fetches answered with 304 Not Modified.',
+    'feed_errors_total': 'Failed feed scrapes.',
+    'feed_retries_total': 'Fetch retries after transient errors.',
+    'feed_skipped_total': 'Feeds skipped by a run because they failed, timed out or had an open circuit breaker.',
+    'texts_scored_total': 'Texts scored by the sentiment model.',
+    'inference_batches_total': 'Forward passes through the sentiment model.',
+    'inference_coalesced_total': 'Texts whose scoring was shared with a concurrent session instead of run again.',
+    'cascade_texts_total': 'Texts scored by each tier (lexicon, model) of the cascade scorer.',
+    'sentiment_cache_hits_total': 'Sentiment lookups served from the cache.',
+    'sentiment_cache_misses_total': 'Sentiment lookups sent to the model.',
+    'poller_polls_total': 'Feed polls by outcome (new, unchanged, not_modified, error).',
+    'poller_new_items_total': 'Items the poller had not seen before.',
+    'inference_pool_outstanding_tokens': 'Estimated tokens queued on or running in each inference worker.',
+    'inference_pool_restarts_total': 'Inference worker restarts by reason (memory_limit, crash).',
+    'feed_queue_depth': 'Fetched feeds waiting to be scored.',
+    'model_memory_mb': 'Resident memory attributed to loading each model.',
+    'resident_memory_mb': 'Resident memory of the process after a model load.',
+}
+
+
+class _NoOpTimer():
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NO_OP_TIMER = _NoOpTimer()
+
+
+class MetricsRegistry():
+    """
+    Lightweight in-process metrics: counters, gauges and latency histograms.
+
+    Every recording method returns immediately when the registry is disabled, so
+    instrumentation left in the hot paths costs one attribute check. When enabled,
+    metrics can be rendered in the Prometheus text exposition format or summarised
+    per run as deltas between two snapshots.
+
+    Attributes:
+        enabled (bool): Whether metrics are recorded.
+        buckets (Tuple[float, ...]): Upper bounds of the histogram buckets, in seconds.
+    """
+
+    def __init__(self, enabled: bool = False, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.enabled = enabled
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._help: Dict[str, str] = {}
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, list]] = {}
+        self._help.update(METRIC_HELP)
+
+    def describe(self, name: str, help_text: str) -> None:
+        """
+        Set the HELP text of a metric.
+        """
+        self._help[name] = help_text
+
+    def inc(self, name: str, value: float = 1, **labels: str) -> None:
+        """
+        Increment a counter.
+
+        Args:
+            name (str): Metric name, e.g. 'articles_scraped_total'.
+            value (float, optional): Amount to add.
+            **labels (str): Label values, e.g. source='...'.
+        """
+        if not self.enabled:
+            return
+        key = self._label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels: str) -> None:
+        """
+        Set a gauge to the given value.
+        """
+        if not self.enabled:
+            return
+        key = self._label_key(labels)
+        with self._lock:
+            self._gauges.setdefault(name, {})[key] = value
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        """
+        Record one observation in a histogram.
+
+        Args:
+            name (str): Metric name, e.g. 'fetch_seconds'.
+            value (float): The observed value (seconds for latencies).
+            **labels (str): Label values.
+        """
+        if not self.enabled:
+            return
+        key = self._label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            state = series.get(key)
+            if state is None:
+                # * [bucket counts..., +Inf count, sum]
+                state = series[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            state[bisect.bisect_left(self.buckets, value)] += 1
+            state[-1] += value
+
+    def timer(self, name: str, **labels: str):
+        """
+        Context manager that records the duration of its block in a histogram.
+
+        Returns a shared no-op context manager when the registry is disabled.
+        """
+        if not self.enabled:
+            return _NO_OP_TIMER
+        return self._timer(name, labels)
+
+    @contextmanager
+    def _timer(self, name: str, labels: Dict[str, str]) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def snapshot(self) -> Dict[str, float]:
+        """
+        Take a flat snapshot of all counters and histogram sums/counts.
+
+        Returns:
+            Dict[str, float]: Values keyed by series, usable with ``summary_since``.
+        """
+        values = {}
+        with self._lock:
+            for name, series in self._counters.items():
+                for key, value in series.items():
+                    values[self._series_name(name, key)] = value
+            for name, series in self._histograms.items():
+                for key, state in series.items():
+                    values[self._series_name(f'{name}_sum', key)] = state[-1]
+                    values[self._series_name(f'{name}_count', key)] = sum(state[:-1])
+        return values
+
+    def summary_since(self, before: Dict[str, float]) -> Dict[str, float]:
+        """
+        Summarise what was recorded since an earlier snapshot.
+
+        Args:
+            before (Dict[str, float]): A snapshot taken at the start of a run.
+
+        Returns:
+            Dict[str, float]: Non-zero deltas keyed by series.
+        """
+        after = self.snapshot()
+        summary = {}
+        for series, value in after.items():
+            delta = value - before.get(series, 0)
+            if delta:
+                summary[series] = round(delta, 6)
+        return summary
+
+    def render_prometheus(self) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: The exposition text.
+        """
+        lines = []
+        with self._lock:
+            for kind, metrics in (('counter', self._counters), ('gauge', self._gauges)):
+                for name in sorted(metrics):
+                    self._header(lines, name, kind)
+                    for key, value in sorted(metrics[name].items()):
+                        lines.append(f'{self._series_name(name, key)} {value:g}')
+            for name in sorted(self._histograms):
+                self._header(lines, name, 'histogram')
+                for key, state in sorted(self._histograms[name].items()):
+                    cumulative = 0
+                    for bound, count in zip(self.buckets + (float('inf'),), state[:-1]):
+                        cumulative += count
+                        le = '+Inf' if bound == float('inf') else f'{bound:g}'
+                        lines.append(f"{self._series_name(f'{name}_bucket', key + (('le', le),))} {cumulative}")
+                    lines.append(f"{self._series_name(f'{name}_sum', key)} {state[-1]:g}")
+                    lines.append(f"{self._series_name(f'{name}_count', key)} {cumulative}")
+        return '\n'.join(lines) + '\n'
+
+    def reset(self) -> None:
+        """
+        Drop every recorded value.
+        """
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+    def _header(self, lines: list, name: str, kind: str) -> None:
+        if name in self._help:
+            lines.append(f'# HELP {name} {self._help[name]}')
+        lines.append(f'# TYPE {name} {kind}')
+
+    @staticmethod
+    def _label_key(labels: Dict[str, str]) -> LabelKey:
+        return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+    @staticmethod
+    def _series_name(name: str, key: LabelKey) -> str:
+        if not key:
+            return name
+        rendered = ','.join('{}="{}"'.format(label, value.replace('\\', '\\\\').replace('"', '\\"'))
+                            for label, value in key)
+        return f'{name}{{{rendered}}}'
+
+
+# * Process-wide registry used by the instrumented classes; disabled until enabled
+METRICS = MetricsRegistry()
+
+
+class MetricsServer():
+    """
+    Minimal HTTP server exposing a MetricsRegistry at ``/metrics``.
+
+    Attributes:
+        logger (logging.Logger): Logger instance for the class.
+        registry (MetricsRegistry): The registry to expose.
+        host (str): Interface to bind.
+        port (int): Port to bind (0 picks a free port).
+    """
+
+    def __init__(self, registry: MetricsRegistry = METRICS, host: str = '127.0.0.1', port: int = 9100) -> None:
+        self.logger = logging.getLogger(__name__)
+        self.logger.debug(f"Initiating Class {__name__}")
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    def start(self) -> int:
+        """
+        Start serving in a daemon thread.
+
+        Returns:
+            int: The bound port.
+        """
+        registry = self.registry
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = registry.render_prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), MetricsHandler)
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, name="metrics-server", daemon=True).start()
+        self.logger.info(f"Serving metrics at http://{self.host}:{self.port}/metrics")
+        return self.port
+
+    def stop(self) -> None:
+        """
+        Stop the server.
+        """
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
@@ -0,0 +1,138 @@
+import logging
+import threading
+import time
+from typing import Dict, Tuple
+from .metrics import METRICS
+from .sentiment_analyzer import SentimentAnalyzer
+
+
+def get_resident_memory_mb() -> float:
+    """
+    Get the resident memory of the current process.
+
+    Reads ``/proc/self/statm`` where available and falls back to the peak
+    resident size reported by ``resource.getrusage``.
+
+    Returns:
+        float: Resident memory in megabytes.
+    """
+    try:
+        import os
+        with open('/proc/self/statm', 'r') as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, IndexError, AttributeError):
+        import resource
+        import sys
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # * ru_maxrss is reported in bytes on macOS and kilobytes elsewhere
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+class ModelRegistry():
+    """
+    Process-wide registry of loaded SentimentAnalyzer instances.
+
+    Each distinct model configuration is loaded once per process and the same
+    instance is handed to every caller, so Gradio sessions share one warm model
+    instead of reloading it on every Run click. Loading is guarded by a lock so
+    concurrent first requests only load the model once.
+
+    Attributes:
+        _models (Dict[Tuple, SentimentAnalyzer]): Loaded analyzers keyed by configuration.
+        _stats (Dict[Tuple, Dict]): Load statistics keyed by configuration.
+        _lock (threading.Lock): Lock guarding model loading.
+    """
+    _models: Dict[Tuple, SentimentAnalyzer] = {}
+    _stats: Dict[Tuple, Dict] = {}
+    _lock = threading.Lock()
+    logger = logging.getLogger(__name__)
+
+    @classmethod
+    def get(cls, model_name: str = SentimentAnalyzer.DEFAULT_MODEL_NAME, **kwargs) -> SentimentAnalyzer:
+        """
+        Get the shared analyzer for a model, loading it on first use.
+
+        Args:
+            model_name (str, optional): HuggingFace model name or local path of the model.
+            **kwargs: Additional SentimentAnalyzer constructor arguments.
+
+        Returns:
+            SentimentAnalyzer: The shared analyzer instance.
+        """
+        key = cls._key(model_name, kwargs)
+        analyzer = cls._models.get(key)
+        if analyzer is not None:
+            return analyzer
+        with cls._lock:
+            analyzer = cls._models.get(key)
+            if analyzer is None:
+                memory_before = get_resident_memory_mb()
+                start = time.perf_counter()
+                analyzer = SentimentAnalyzer(model_name=model_name, **kwargs)
+                load_seconds = time.perf_counter() - start
+                memory_after = get_resident_memory_mb()
+                cls._stats[key] = {
+                    'model_name': model_name,
+                    'load_seconds': round(load_seconds, 3),
+                    'warm_up_seconds': None,
+                    'resident_memory_mb': round(memory_after, 1),
+                    'model_memory_mb': round(memory_after - memory_before, 1)
+                }
+                cls._models[key] = analyzer
+                METRICS.set_gauge('model_memory_mb', cls._stats[key]['model_memory_mb'], model=model_name)
+                METRICS.set_gauge('resident_memory_mb', cls._stats[key]['resident_memory_mb'])
+                cls.logger.info(
+                    f"Loaded model {model_name} in {load_seconds:.2f}s "
+                    f"(resident memory {memory_after:.0f} MB)")
+        return analyzer
+
+    @classmethod
+    def warm_up(cls, model_name: str = SentimentAnalyzer.DEFAULT_MODEL_NAME, **kwargs) -> Dict:
+        """
+        Eagerly load a model and run a dummy forward pass through it.
+
+        Intended to be called at server start so the first user request does not
+        pay for loading or for lazily initialised kernels.
+
+        Args:
+            model_name (str, optional): HuggingFace model name or local path of the model.
+            **kwargs: Additional SentimentAnalyzer constructor arguments.
+
+        Returns:
+            Dict: Load statistics for the model.
+        """
+        analyzer = cls.get(model_name, **kwargs)
+        start = time.perf_counter()
+        analyzer.get_sentiment(["Warm-up headline for the sentiment model."])
+        warm_up_seconds = time.perf_counter() - start
+        stats = cls._stats[cls._key(model_name, kwargs)]
+        stats['warm_up_seconds'] = round(warm_up_seconds, 3)
+        stats['resident_memory_mb'] = round(get_resident_memory_mb(), 1)
+        cls.logger.info(
+            f"Warmed up model {model_name} in {warm_up_seconds:.2f}s")
+        return dict(stats)
+
+    @classmethod
+    def stats(cls) -> Dict[str, Dict]:
+        """
+        Get load statistics for every loaded model.
+
+        Returns:
+            Dict[str, Dict]: Statistics keyed by model name, including load time,
+            warm-up time and resident memory.
+        """
+        return {stats['model_name']: dict(stats) for stats in cls._stats.values()}
+
+    @classmethod
+    def clear(cls) -> None:
+        """
+        Drop all loaded models from the registry.
+        """
+        with cls._lock:
+            cls._models.clear()
+            cls._stats.clear()
+
+    @staticmethod
+    def _key(model_name: str, kwargs: Dict) -> Tuple:
+        return (model_name,) + tuple(sorted(kwargs.items()))
@@ -1,91 +1,263 @@
 import logging
-from typing import List
-import gradio as gr
-import pandas as pd
-from typing import Union
-import logging
-import logging.config
-import yaml
-from tqdm import tqdm
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Dict, List
+from typing import Optional, Union
 from pathlib import Path
 from .rss_news_scraper import RSSNewsScraper, BaseRSSNewsScraperAdapter, ABCRSSNewsScraperAdapter, NYTRSSNewsScraperAdapter
+from .http_transport import HTTPTransport
+from .model_registry import ModelRegistry
 from .sentiment_analyzer import SentimentAnalyzer
+from .result_buffer import ResultBuffer
+from .feed_pipeline import FeedPipeline
+from .inference_pool import InferencePool
+from .sentiment_cache import SentimentCache
+from .deduplicator import ArticleDeduplicator, result_key
+from .feed_parser import parse_published
+from .records import ArticleBatch
+from .metrics import METRICS, MetricsServer
+from .results_store import ResultsStore
+from .sentiment_aggregator import SentimentAggregator
+from .semantic_index import SemanticIndex
+from .coalescing import InferenceCoalescer, SingleFlight
+from .lexicon_scorer import CascadeAnalyzer, LexiconScorer
+from .resilience import CircuitBreakers, RetryPolicy
+
+if TYPE_CHECKING:
+    # * pandas and gradio are only needed to build results and the UI, so import them lazily
+    import gradio as gr
+    import pandas as pd
+
 
-config_path = Path(__file__).parents[2] / "logging_config.yaml"
-config_path = Path(config_path)
-if not config_path.is_file():
-    raise FileNotFoundError(f"Logging config file not found: {config_path}")
-try:
-    with open(config_path, 'r') as f:
-        log_config = yaml.safe_load(f)
-        logging.config.dictConfig(log_config)
-except yaml.YAMLError as ex:
-    raise yaml.YAMLError(f"Error parsing logging config file: {str(ex)}")
+def _no_progress(*args, **kwargs) -> None:
+    pass
 
 
 class NewsSentimentAnalyzer:
-    def __init__(self, config_path: Union[str, Path] = None):
+    """
+    Coordinates scraping and sentiment analysis of news feeds.
+
+    The analysis core does not depend on gradio; ``create_blocks`` and ``run`` build the
+    Gradio interface from ``gradio_app`` on demand.
+    """
+    # * Sentiments are stored as int8 category codes and confidences as float32
+    RESULT_COLUMNS = {'text': 'object', 'sentiment': 'category', 'confidence': 'float32', 'source': 'object',
+                      'link': 'object', 'guid': 'object', 'published': 'float64', 'tier': 'category'}
+    # * Columns shown in the UI; link, guid and publish time identify and date the article
+    DISPLAY_COLUMNS = ['text', 'sentiment', 'confidence', 'source']
+
+    def __init__(self, config_path: Union[str, Path] = None, model_name: str = SentimentAnalyzer.DEFAULT_MODEL_NAME,
+                 model_options: Optional[Dict] = None, emit_every: Optional[int] = 50,
+                 emit_interval: Optional[float] = 1.0, max_fetchers: int = 4, queue_size: int = 4,
+                 max_batch_articles: int = 256, sentiment_cache: Optional[SentimentCache] = None,
+                 results_store: Optional[ResultsStore] = None, aggregator: Optional[SentimentAggregator] = None,
+                 inference_pool: Optional[InferencePool] = None, semantic_index: Optional[SemanticIndex] = None,
+                 feed_freshness: float = 30.0, max_concurrent_runs: int = 2, max_queued_runs: Optional[int] = 32,
+                 cascade_margin: Optional[float] = None, lexicon: Optional[LexiconScorer] = None,
+                 fetch_deadline: Optional[float] = 20.0, feed_timeout: Optional[float] = 8.0,
+                 retry_policy: Optional[RetryPolicy] = None, feed_breakers: Optional[CircuitBreakers] = None,
+                 transport: Optional[HTTPTransport] = None):
         self.logger = logging.getLogger(__name__)
         self.logger.debug(f"Initiating Class {__name__}")
+        # * Model served from the process-wide ModelRegistry, or by a pool of worker processes
+        self.model_name = model_name
+        self.model_options = model_options or {}
+        self.inference_pool = inference_pool
+        # * How often analyze_news publishes partial results to the UI
+        self.emit_every = emit_every
+        self.emit_interval = emit_interval
+        # * Fetch/inference pipeline sizing
+        self.max_fetchers = max_fetchers
+        self.queue_size = queue_size
+        self.max_batch_articles = max_batch_articles
+        # * Headlines already scored (in this or an earlier run) are served from the cache
+        self.sentiment_cache = sentiment_cache if sentiment_cache is not None else SentimentCache()
+        # * Optional history of every scored article, filled by gather_data
+        self.results_store = results_store
+        # * Optional rolling per-source statistics, updated as results are produced
+        self.aggregator = aggregator
+        # * Optional embedding index of scored stories for similarity search, filled by gather_data
+        self.semantic_index = semantic_index
+        # * Concurrent sessions share feed fetches (reused for feed_freshness seconds) and the
+        # * scoring of identical texts; the Gradio queue runs at most max_concurrent_runs at once
+        self.feed_freshness = feed_freshness
+        self.feed_flights = SingleFlight()
+        self.inference_coalescer = InferenceCoalescer()
+        self.max_concurrent_runs = max_concurrent_runs
+        self.max_queued_runs = max_queued_runs
+        # * With a cascade margin, clear-cut headlines are labelled by the lexicon and only the
+        # * rest are sent to the model; the 'tier' column records which one answered
+        self.cascade_margin = cascade_margin
+        self.lexicon = lexicon
+        # * Latency budget of the fetch stage: slow or failing feeds are skipped and listed in
+        # * last_run_metrics['failed_feeds'], and feeds that keep failing are not called for a while
+        self.fetch_deadline = fetch_deadline
+        self.feed_timeout = feed_timeout
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.feed_breakers = feed_breakers if feed_breakers is not None else CircuitBreakers()
+        # * Scrapers of the selectable sources are kept across runs, so a feed answered with
+        # * 304 Not Modified returns the articles parsed last time instead of parsing them again
+        self.transport = transport
+        self._news_sources: Dict[str, RSSNewsScraper] = {}
+        self._news_sources_lock = threading.Lock()
+        self.last_run_metrics = {}
 
-    def analyze_news(self, sources: List[RSSNewsScraper], progress=gr.Progress()):
+    def analyze_news(self, sources: List[RSSNewsScraper], progress: Optional[Callable] = None):
         """
         Analyze news from given sources and yield results progressively.
 
+        Feeds are fetched concurrently by a FeedPipeline while already fetched feeds are
+        scored, so network I/O overlaps with inference. Duplicate and near-duplicate stories
+        across feeds are scored once and the result is reported for every source that
+        carried them. Sessions running at the same time share feed fetches and the scoring
+        of identical texts, and a feed fetched less than ``feed_freshness`` seconds ago is
+        reused instead of downloaded again. With ``cascade_margin`` set, headlines the
+        lexicon scores clearly enough skip the model. A feed that fails, or does not arrive
+        within ``feed_timeout`` seconds or the run's ``fetch_deadline``, is skipped: the other
+        feeds are still analyzed and the skipped ones are listed in the frames'
+        ``attrs['failed_feeds']`` and in ``last_run_metrics``. Partial results are published every
+        ``emit_every`` articles or ``emit_interval`` seconds, whichever comes first, and the
+        complete DataFrame is yielded last. When metrics are enabled, ``last_run_metrics['stages']``
+        holds the per-stage timings and counters recorded during the run.
+
         Args:
             sources (List[RSSNewsScraper]): List of news sources to analyze.
-            progress (gr.Progress, optional): Gradio progress bar.
+            progress (Callable, optional): Progress callback such as a gr.Progress, called
+                as ``progress(fraction, desc=...)``.
 
         Yields:
             pd.DataFrame: DataFrame containing analysis results.
         """
-        analyzer = SentimentAnalyzer()
-        results = []
+        progress = progress or _no_progress
+        metrics_before = METRICS.snapshot() if METRICS.enabled else None
+        run_start = time.perf_counter()
+        analyzer = self.inference_coalescer.wrap(self.inference_pool
+                                                 or ModelRegistry.get(self.model_name, **self.model_options))
+        cascade = None
+        if self.cascade_margin is not None:
+            cascade = CascadeAnalyzer(analyzer, self.lexicon, self.cascade_margin, cache=self.sentiment_cache)
+        results = ResultBuffer(columns=self.RESULT_COLUMNS, emit_every=self.emit_every,
+                               emit_interval=self.emit_interval)
+        deduplicator = ArticleDeduplicator()
+        group_results = {}
         progress(0, desc="Starting...")
-        total_stories = len(sources) * 10  # 10 stories per source
-        for source in progress.tqdm(iterable=sources, total=len(sources), desc=f"Processing News Sources"):
-            self.logger.info(f"Scraping {source.rss_adapter.get_rss_url()}")
-            articles = source.scrape_rss_feed()
-            for article in tqdm(articles, desc=f"Analyzing {len(articles)} stories", leave=False):
-                text = article["title"] + ' ' + article["description"]
-                sentiment_results = analyzer.get_sentiment(text)
-                results.append(sentiment_results)
-                self.logger.debug(
-                    f"Analyzed story from {source}: {article['title']}")
-                yield pd.DataFrame(results)
-
-        self.logger.info("Analysis complete")
+        pipeline = FeedPipeline(sources, max_fetchers=self.max_fetchers, queue_size=self.queue_size,
+                                flights=self.feed_flights, fresh_for=self.feed_freshness,
+                                deadline=self.fetch_deadline, feed_timeout=self.feed_timeout,
+                                retry=self.retry_policy, breakers=self.feed_breakers, partial_results=True)
+        completed = 0
+        for batch in pipeline.batches(max_articles=self.max_batch_articles):
+            columns = {'text': [], 'source': [], 'link': [], 'guid': [], 'published': []}
+            row_groups, new_groups, texts, keys = [], [], [], []
+            for source, articles in batch:
+                source_url = source.rss_adapter.get_rss_url()
+                self.logger.info("Scraped %s", source_url)
+                if not isinstance(articles, ArticleBatch):
+                    articles = ArticleBatch.from_records(articles or [])
+                article_texts = articles.texts()
+                for text, article in zip(article_texts, articles):
+                    group_id, is_new = deduplicator.add(article, source_url)
+                    if is_new:
+                        new_groups.append(group_id)
+                        texts.append(text)
+                    row_groups.append(group_id)
+                    if self.aggregator is not None:
+                        keys.append(result_key({'guid': article.get('guid'), 'link': article.get('link'),
+                                                'text': text}))
+                columns['text'].extend(article_texts)
+                columns['source'].extend([source_url] * len(articles))
+                columns['link'].extend(articles.column('link'))
+                columns['guid'].extend(articles.column('guid'))
+                columns['published'].extend(parse_published(value) for value in articles.column('published'))
+            completed += len(batch)
+            progress(completed / len(sources), desc="Processing News Sources")
+            if not row_groups:
+                continue
+            # * Score one representative per new group in one call, skipping cached texts
+            if texts:
+                if cascade is None:
+                    scored = self.sentiment_cache.score_batch(analyzer, texts)
+                else:
+                    scored = cascade.score_batch(texts)
+                tiers = scored.tiers or ['model'] * len(texts)
+                group_results.update(zip(new_groups, zip(scored.sentiments(), scored.confidences.tolist(), tiers)))
+            columns['sentiment'] = [group_results[group_id][0] for group_id in row_groups]
+            columns['confidence'] = [group_results[group_id][1] for group_id in row_groups]
+            columns['tier'] = [group_results[group_id][2] for group_id in row_groups]
+            if self.aggregator is not None:
+                for source_url, group_id, published, key in zip(columns['source'], row_groups,
+                                                                columns['published'], keys):
+                    sentiment, confidence, _ = group_results[group_id]
+                    self.aggregator.add(source_url, sentiment, round(confidence, 6), published, key)
+            columns['published'] = [float('nan') if value is None else value for value in columns['published']]
+            results.extend_columns(columns)
+            self.logger.debug("Analyzed %d unique of %d stories from %d sources",
+                              len(texts), len(row_groups), len(batch))
+            if results.should_emit():
+                with METRICS.timer('dataframe_seconds'):
+                    frame = results.to_frame()
+                frame.attrs['failed_feeds'] = pipeline.failed_feeds()
+                yield frame
+
+        with METRICS.timer('dataframe_seconds'):
+            pdf_results = results.to_frame()
+        # * A run with skipped feeds still returns everything else, flagged as partial
+        pdf_results.attrs['failed_feeds'] = pipeline.failed_feeds()
+        if self.aggregator is not None:
+            self.aggregator.flush()
+        METRICS.observe('analysis_seconds', time.perf_counter() - run_start)
+        self.last_run_metrics = pipeline.metrics()
+        self.last_run_metrics['cache'] = self.sentiment_cache.stats()
+        self.last_run_metrics['dedup'] = deduplicator.stats()
+        self.last_run_metrics['failed_feeds'] = pipeline.failed_feeds()
+        # * Coalescing counters are cumulative over all sessions of this analyzer
+        self.last_run_metrics['coalescing'] = {'feeds': self.feed_flights.stats(),
+                                               'inference': self.inference_coalescer.stats()}
+        if metrics_before is not None:
+            self.last_run_metrics['stages'] = METRICS.summary_since(metrics_before)
+        self.logger.info(f"Analysis complete: {self.last_run_metrics}")
         progress(1.0, "Analysis complete")
-        return pd.DataFrame(results)
+        yield pdf_results
+        return pdf_results
 
-    def gather_data(self, data: pd.DataFrame, progress=gr.Progress()):
+    def gather_data(self, data: 'pd.DataFrame', progress: Optional[Callable] = None) -> int:
         '''
-        Gathers the data to be analyzed
+        Gathers the analyzed data into the results store and the semantic index, if configured.
+
+        Rows are upserted by source and article identity, so storing overlapping runs
+        keeps one row per article with its latest score. Stories new to the semantic index
+        are embedded in one batch.
+
+        Returns:
+            int: The number of rows stored in the results store.
         '''
         self.logger.debug("Starting Gathering Data")
-        return
-
-    def news_sentiment_analysis(self, cnn: bool = False, abc: bool = False, nyt: bool = False, progress=gr.Progress()):
-        ''' Get News Articles and Perform Sentiment Analysis'''
-        sources = []
-        if cnn:
-            rss_url = 'https://rss.nytimes.com/services/xml/rss/nyt/HomePage.xml'
-            base_adapter = BaseRSSNewsScraperAdapter(rss_url=rss_url)
-            cnn_scraper = RSSNewsScraper(base_adapter)
-            sources.append(cnn_scraper)
-        if abc:
-            abc_scraper = RSSNewsScraper(ABCRSSNewsScraperAdapter())
-            sources.append(abc_scraper)
-        if nyt:
-            nyt_scraper = RSSNewsScraper(NYTRSSNewsScraperAdapter())
-            sources.append(nyt_scraper)
+        if data is None or data.empty:
+            return 0
+        stored = 0
+        if self.results_store is not None:
+            with METRICS.timer('store_seconds'):
+                stored = self.results_store.upsert_frame(data)
+            self.logger.info(f"Stored {stored} results")
+        if self.semantic_index is not None:
+            indexed = self.semantic_index.add_frame(data)
+            self.logger.info(f"Indexed {indexed} new stories")
+        return stored
+
+    def news_sentiment_analysis(self, cnn: bool = False, abc: bool = False, nyt: bool = False,
+                                progress: Optional[Callable] = None):
+        '''
+        Get News Articles and Perform Sentiment Analysis
+
+        Raises:
+            ValueError: If no news source is selected.
+        '''
+        sources = [self._news_source(name) for name, selected in (('cnn', cnn), ('abc', abc), ('nyt', nyt))
+                   if selected]
 
         if not sources:
             self.logger.warning("No sources selected")
-            # "Please select at least one news source."
-            raise gr.Error(
-                "Please select at least one news source.", duration=5)
-            return
+            raise ValueError("Please select at least one news source.")
         self.logger.debug(
             f'Starting analysis with {len(sources)} sources selected')
         pdf_results = yield from self.analyze_news(sources, progress)
@@ -93,31 +265,37 @@ class NewsSentimentAnalyzer:
         self.gather_data(pdf_results)
         return pdf_results, 0.5
 
-    def create_blocks(self) -> gr.Blocks:
-        with gr.Blocks(title="News Sentiment Analysis", fill_height=True) as demo:
-            gr.Markdown(
-                "Select at least one News Sources below to analyze sentiment of headlines and stories and then click **Run** to see the output.")
-            with gr.Row():
-                inp = [
-                    gr.Checkbox(label="CNN", value=True, info="CNN"),
-                    gr.Checkbox(label="ABC", value=True, info="ABC News"),
-                    gr.Checkbox(label="NYT", value=True, info="New York Times")
-                ]
-                btn = gr.Button("Run")
-            with gr.Row():
-                out = [
-                    gr.Dataframe(
-                        label="Sentiment Results",
-                        headers=["Description", "Sentiment", "Confidence"],
-                        min_width=300,
-                        wrap=True,
-                        scale=3
-                    )
-                ]
-            btn.click(fn=self.news_sentiment_analysis, inputs=inp, outputs=out)
-        return demo
-
-    def run(self):
+    def _news_source(self, name: str) -> RSSNewsScraper:
+        '''
+        The scraper of a selectable source ('cnn', 'abc' or 'nyt'), built on first use.
+        '''
+        with self._news_sources_lock:
+            scraper = self._news_sources.get(name)
+            if scraper is None:
+                if name == 'cnn':
+                    rss_url = 'https://rss.nytimes.com/services/xml/rss/nyt/HomePage.xml'
+                    adapter = BaseRSSNewsScraperAdapter(rss_url=rss_url, transport=self.transport)
+                elif name == 'abc':
+                    adapter = ABCRSSNewsScraperAdapter(transport=self.transport)
+                else:
+                    adapter = NYTRSSNewsScraperAdapter(transport=self.transport)
+                scraper = self._news_sources[name] = RSSNewsScraper(adapter)
+            return scraper
+
+    def create_blocks(self) -> 'gr.Blocks':
+        from .gradio_app import create_blocks
+        return create_blocks(self)
+
+    def run(self, warm_up: bool = True, metrics_port: Optional[int] = None):
+        if metrics_port is not None:
+            METRICS.enabled = True
+            MetricsServer(METRICS, port=metrics_port).start()
+        if self.inference_pool is not None:
+            self.inference_pool.start()
+        elif warm_up:
+            self.logger.info("Warming up sentiment model")
+            stats = ModelRegistry.warm_up(self.model_name, **self.model_options)
+            self.logger.info(f"Model ready: {stats}")
         self.logger.info("Starting Gradio interface")
         iface = self.create_blocks()
         iface.launch()
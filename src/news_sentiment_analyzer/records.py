@@ -0,0 +1,229 @@
+from collections.abc import Mapping, Sequence
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+import numpy as np
+
+# * Fields every article has; feed mappings may add more, which are kept in Article.extra
+ARTICLE_FIELDS = ('title', 'link', 'description', 'guid', 'published')
+
+
+class Article(Mapping):
+    """
+    One feed item as a compact, read-only record.
+
+    Fields live in ``__slots__`` instead of a per-item dict, but the record is a
+    ``Mapping``, so existing code that reads ``article['title']`` or
+    ``article.get('link')``, or compares an article with a dict, keeps working.
+
+    Attributes:
+        title (str): Headline.
+        link (str): Article URL.
+        description (str): Summary or teaser.
+        guid (str): Feed-assigned identifier.
+        published (str): Publish date as it appears in the feed.
+        extra (Optional[Dict[str, str]]): Fields beyond ARTICLE_FIELDS.
+    """
+    __slots__ = ARTICLE_FIELDS + ('extra',)
+
+    def __init__(self, title: str = '', link: str = '', description: str = '', guid: str = '',
+                 published: str = '', extra: Optional[Dict[str, str]] = None) -> None:
+        self.title = title
+        self.link = link
+        self.description = description
+        self.guid = guid
+        self.published = published
+        self.extra = extra or None
+
+    @classmethod
+    def from_mapping(cls, values: Mapping) -> 'Article':
+        extra = {key: value for key, value in values.items() if key not in ARTICLE_FIELDS}
+        return cls(*(values.get(field, '') for field in ARTICLE_FIELDS), extra=extra)
+
+    @property
+    def text(self) -> str:
+        """
+        The text that is scored: title and description.
+        """
+        return f'{self.title} {self.description}'
+
+    def __getitem__(self, key: str) -> str:
+        if key in ARTICLE_FIELDS:
+            return getattr(self, key)
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from ARTICLE_FIELDS
+        if self.extra:
+            yield from self.extra
+
+    def __len__(self) -> int:
+        return len(ARTICLE_FIELDS) + len(self.extra or ())
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+class ArticleBatch(Sequence):
+    """
+    The items of one feed, stored column by column.
+
+    Each field is one list of strings shared by every item, so a feed costs one list
+    slot per field and item rather than one dict per item. Items are returned as
+    Article records on access, and the whole batch compares equal to a list of dicts.
+
+    Attributes:
+        columns (Dict[str, List[str]]): Field name mapped to the values of every item.
+    """
+
+    def __init__(self, columns: Optional[Dict[str, List[str]]] = None) -> None:
+        """
+        Initialize an ArticleBatch.
+
+        Args:
+            columns (Optional[Dict[str, List[str]]]): Values per field. Missing ARTICLE_FIELDS
+                are filled with empty strings.
+
+        Raises:
+            ValueError: If the columns have different lengths.
+        """
+        columns = dict(columns or {})
+        lengths = {len(values) for values in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("All columns of an ArticleBatch must have the same length")
+        length = lengths.pop() if lengths else 0
+        for field in ARTICLE_FIELDS:
+            columns.setdefault(field, [''] * length)
+        self.columns = columns
+        self._length = length
+        self._extra_fields = [name for name in columns if name not in ARTICLE_FIELDS]
+
+    @classmethod
+    def from_records(cls, records: Iterable[Mapping]) -> 'ArticleBatch':
+        records = list(records)
+        names = list(dict.fromkeys(name for record in records for name in record))
+        return cls({name: [record.get(name, '') for record in records] for name in names})
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Article, 'ArticleBatch']:
+        if isinstance(index, slice):
+            return ArticleBatch({name: values[index] for name, values in self.columns.items()})
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("ArticleBatch index out of range")
+        columns = self.columns
+        extra = {name: columns[name][index] for name in self._extra_fields} if self._extra_fields else None
+        return Article(*(columns[field][index] for field in ARTICLE_FIELDS), extra=extra)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, ArticleBatch):
+            return self.columns == other.columns
+        if isinstance(other, (list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def column(self, name: str) -> List[str]:
+        return self.columns[name]
+
+    def texts(self) -> List[str]:
+        """
+        Title and description of every item, built in one pass for scoring and results.
+        """
+        return [f'{title} {description}'
+                for title, description in zip(self.columns['title'], self.columns['description'])]
+
+    def to_dicts(self) -> List[Dict[str, str]]:
+        names = list(self.columns)
+        return [dict(zip(names, values)) for values in zip(*self.columns.values())]
+
+
+class SentimentBatch(Sequence):
+    """
+    Sentiment results of a batch of texts as parallel arrays.
+
+    Labels are stored as int8 codes into ``labels`` and confidences as float32, so a
+    batch costs five bytes per result instead of one dict per result. Indexing returns
+    the familiar ``{'text', 'sentiment', 'confidence'}`` dict for existing callers.
+
+    Attributes:
+        labels (Tuple[str, ...]): Label of each code, e.g. ('NEGATIVE', 'POSITIVE').
+        codes (np.ndarray): int8 label code per result.
+        confidences (np.ndarray): float32 confidence per result.
+        texts (Optional[List[str]]): The scored texts; None when only the scores are carried,
+            e.g. when sent back from a worker process.
+        tiers (Optional[List[str]]): Scorer that produced each result ('lexicon' or 'model')
+            when scored by a CascadeAnalyzer; None otherwise.
+    """
+
+    def __init__(self, labels: Iterable[str], codes: np.ndarray, confidences: np.ndarray,
+                 texts: Optional[List[str]] = None, tiers: Optional[List[str]] = None) -> None:
+        self.labels = tuple(labels)
+        self.codes = np.asarray(codes, dtype=np.int8)
+        self.confidences = np.asarray(confidences, dtype=np.float32)
+        self.texts = texts
+        self.tiers = tiers
+        if len(self.codes) != len(self.confidences) or any(
+                column is not None and len(column) != len(self.codes) for column in (texts, tiers)):
+            raise ValueError("codes, confidences, texts and tiers must have the same length")
+
+    @classmethod
+    def from_labels(cls, sentiments: Iterable[str], confidences: Iterable[float],
+                    texts: Optional[List[str]] = None, labels: Iterable[str] = (),
+                    tiers: Optional[List[str]] = None) -> 'SentimentBatch':
+        """
+        Encode label strings, adding labels that are not in ``labels`` yet.
+        """
+        label_codes = {label: code for code, label in enumerate(labels)}
+        codes = [label_codes.setdefault(sentiment, len(label_codes)) for sentiment in sentiments]
+        return cls(label_codes, np.array(codes, dtype=np.int8), np.fromiter(confidences, dtype=np.float32),
+                   texts, tiers)
+
+    @classmethod
+    def from_dicts(cls, results: List[Dict], labels: Iterable[str] = ()) -> 'SentimentBatch':
+        return cls.from_labels([result['sentiment'] for result in results],
+                               [result['confidence'] for result in results],
+                               [result['text'] for result in results], labels)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, index: int) -> Dict:
+        result = {'text': self.texts[index] if self.texts is not None else '',
+                  'sentiment': self.labels[self.codes[index]],
+                  'confidence': self.confidence(index)}
+        if self.tiers is not None:
+            result['tier'] = self.tiers[index]
+        return result
+
+    def sentiment(self, index: int) -> str:
+        return self.labels[self.codes[index]]
+
+    def confidence(self, index: int) -> float:
+        # * float32 holds about 7 significant digits; rounding restores the scored value
+        return round(float(self.confidences[index]), 6)
+
+    def sentiments(self) -> List[str]:
+        labels = self.labels
+        return [labels[code] for code in self.codes.tolist()]
+
+    def to_dicts(self) -> List[Dict]:
+        texts = self.texts if self.texts is not None else [''] * len(self)
+        labels = self.labels
+        results = [{'text': text, 'sentiment': labels[code], 'confidence': round(confidence, 6)}
+                   for text, code, confidence in zip(texts, self.codes.tolist(), self.confidences.tolist())]
+        if self.tiers is not None:
+            for result, tier in zip(results, self.tiers):
+                result['tier'] = tier
+        return results
+
+    def recode(self, labels: Tuple[str, ...]) -> np.ndarray:
+        """
+        This batch's codes expressed in another label order (labels must be a superset).
+        """
+        if labels == self.labels:
+            return self.codes
+        mapping = np.array([labels.index(label) for label in self.labels], dtype=np.int8)
+        return mapping[self.codes]
@@ -0,0 +1,206 @@
+import logging
+import random
+import threading
+import time
+from typing import Callable, Dict, Optional
+import requests
+from .metrics import METRICS
+
+
+class Deadline():
+    """
+    A point in time work must finish by, measured on the monotonic clock.
+
+    Attributes:
+        expires_at (float): ``time.monotonic()`` value of the deadline; infinite when unbounded.
+    """
+
+    def __init__(self, seconds: Optional[float] = None) -> None:
+        """
+        Initialize the Deadline.
+
+        Args:
+            seconds (Optional[float], optional): Time from now until the deadline. None never expires.
+        """
+        self.expires_at = float('inf') if seconds is None else time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        """
+        Seconds left, never negative; infinite for an unbounded deadline.
+        """
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def earliest(self, seconds: Optional[float]) -> 'Deadline':
+        """
+        A deadline ``seconds`` from now, but no later than this one.
+        """
+        deadline = Deadline(seconds)
+        deadline.expires_at = min(deadline.expires_at, self.expires_at)
+        return deadline
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of calling a feed whose circuit breaker is open.
+    """
+
+
+class CircuitBreaker():
+    """
+    Stops calling a feed that keeps failing, then probes it again after a cool-down.
+
+    The breaker is closed while calls succeed. After ``failure_threshold`` consecutive
+    failures it opens and ``allow`` refuses calls for ``reset_timeout`` seconds. It then
+    lets one probe through (half-open): a success closes it, a failure opens it again.
+
+    Attributes:
+        failure_threshold (int): Consecutive failures that open the breaker.
+        reset_timeout (float): Seconds the breaker stays open before a probe.
+        failures (int): Current run of consecutive failures.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 60.0) -> None:
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be positive")
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def allow(self) -> bool:
+        """
+        Whether a call may go ahead now. In the half-open state only one probe is allowed.
+        """
+        with self._lock:
+            state = self._state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self._probing or self.failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._probing = False
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+
+class CircuitBreakers():
+    """
+    One CircuitBreaker per feed URL, created on first use and shared across runs.
+    """
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 60.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(key)
+            if breaker is None:
+                breaker = self._breakers[key] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            return breaker
+
+    def states(self) -> Dict[str, str]:
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {key: breaker.state for key, breaker in breakers.items()}
+
+
+def is_transient(ex: BaseException) -> bool:
+    """
+    Whether an error is worth retrying: timeouts, connection errors, 429 and 5xx responses.
+    """
+    if isinstance(ex, requests.HTTPError):
+        status = ex.response.status_code if ex.response is not None else None
+        return status is None or status == 429 or status >= 500
+    return isinstance(ex, (requests.Timeout, requests.ConnectionError))
+
+
+class RetryPolicy():
+    """
+    Retries transient failures with exponential backoff and full jitter, within a Deadline.
+
+    The delay before retry ``n`` is drawn uniformly from ``[0, min(max_delay, base_delay * 2**n)]``,
+    so sessions retrying the same feed spread out instead of retrying in lockstep. A retry
+    that cannot start before the deadline is not attempted and the last error is raised.
+
+    Attributes:
+        logger (logging.Logger): Logger instance for the class.
+        attempts (int): Maximum number of attempts, including the first.
+        base_delay (float): Upper bound of the first backoff delay, in seconds.
+        max_delay (float): Cap on the backoff delay, in seconds.
+        retry_on (Callable[[BaseException], bool]): Decides whether an error is retried.
+    """
+
+    def __init__(self, attempts: int = 3, base_delay: float = 0.5, max_delay: float = 4.0,
+                 retry_on: Callable[[BaseException], bool] = is_transient, seed: Optional[int] = None) -> None:
+        self.logger = logging.getLogger(__name__)
+        self.logger.debug(f"Initiating Class {__name__}")
+        if attempts < 1:
+            raise ValueError("attempts must be positive")
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_on = retry_on
+        self._random = random.Random(seed)
+
+    def call(self, fn: Callable[[], object], deadline: Optional[Deadline] = None, key: str = ''):
+        """
+        Call ``fn`` until it succeeds, fails permanently, runs out of attempts or of time.
+
+        Args:
+            fn (Callable[[], object]): The work to do.
+            deadline (Optional[Deadline], optional): No attempt starts after this deadline.
+            key (str, optional): Label for logs and metrics, e.g. the feed URL.
+
+        Returns:
+            The result of ``fn``.
+
+        Raises:
+            Exception: The last error raised by ``fn``.
+        """
+        deadline = deadline or Deadline()
+        for attempt in range(self.attempts):
+            try:
+                return fn()
+            except Exception as ex:
+                if attempt + 1 >= self.attempts or not self.retry_on(ex):
+                    raise
+                delay = self._random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+                if delay >= deadline.remaining():
+                    self.logger.warning("No time left to retry %s: %s", key, ex)
+                    raise
+                self.logger.warning("Retrying %s in %.2fs after: %s", key, delay, ex)
+                METRICS.inc('feed_retries_total', source=key)
+                time.sleep(delay)
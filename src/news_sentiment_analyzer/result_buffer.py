@@ -0,0 +1,220 @@
+import logging
+import time
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+class ResultBuffer():
+    """
+    Append-only, columnar buffer for streaming analysis results.
+
+    Values are written into fixed-size, preallocated NumPy chunks, one set per column,
+    so appending a row is constant time and never copies earlier rows. A new chunk is
+    allocated only when the current one is full, which keeps memory growth predictable.
+    Columns with the 'category' dtype hold a small set of labels (such as sentiments);
+    they are stored as int8 codes and returned as a pandas Categorical.
+    The buffer also decides when the caller should publish an update, either after a
+    number of new rows or after a time interval, so a UI is not re-rendered per row.
+
+    ``to_frame`` copies only the rows added since the previous call into one contiguous
+    array per column, which grows by doubling, and frees the chunks it has fully copied.
+    Frames are read-only views of those arrays, so publishing an update costs time in
+    proportion to the new rows rather than to everything buffered so far.
+
+    Attributes:
+        logger (logging.Logger): Logger instance for the class.
+        columns (Dict[str, str]): Column names mapped to NumPy dtypes or 'category', in output order.
+        chunk_size (int): Number of rows per preallocated chunk.
+        emit_every (Optional[int]): Emit after this many new rows.
+        emit_interval (Optional[float]): Emit after this many seconds since the last emit.
+    """
+
+    DEFAULT_COLUMNS = {'text': 'object', 'sentiment': 'object', 'confidence': 'float64'}
+
+    def __init__(self, columns: Optional[Dict[str, str]] = None, chunk_size: int = 1024,
+                 emit_every: Optional[int] = 50, emit_interval: Optional[float] = 1.0) -> None:
+        """
+        Initialize an empty ResultBuffer.
+
+        Args:
+            columns (Optional[Dict[str, str]]): Column names mapped to NumPy dtypes or
+                'category'. Defaults to text, sentiment and confidence.
+            chunk_size (int, optional): Number of rows per preallocated chunk.
+            emit_every (Optional[int], optional): Emit after this many new rows. None disables it.
+            emit_interval (Optional[float], optional): Emit after this many seconds. None disables it.
+
+        Raises:
+            ValueError: If chunk_size is not positive.
+        """
+        self.logger = logging.getLogger(__name__)
+        self.logger.debug(f"Initiating Class {__name__}")
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+        self.columns = dict(columns or self.DEFAULT_COLUMNS)
+        self.chunk_size = chunk_size
+        self.emit_every = emit_every
+        self.emit_interval = emit_interval
+        self._chunks: Dict[str, List[np.ndarray]] = {name: [] for name in self.columns}
+        # * Code of each label seen in a category column, in first-seen order
+        self._categories: Dict[str, Dict[str, int]] = {
+            name: {} for name, dtype in self.columns.items() if dtype == 'category'}
+        self._length = 0
+        # * Rows [0, _merged_length) are copied into _merged; _chunks start at row _chunks_start
+        self._merged: Dict[str, np.ndarray] = {name: np.empty(0, dtype=self._storage_dtype(name))
+                                               for name in self.columns}
+        self._merged_length = 0
+        self._chunks_start = 0
+        self._emitted_length = 0
+        self._emitted_at = time.monotonic()
+
+    def __len__(self) -> int:
+        return self._length
+
+    def append(self, row: Dict) -> None:
+        """
+        Append one result row. Missing columns are left at their empty value.
+
+        Args:
+            row (Dict): Mapping of column name to value.
+        """
+        offset = self._length % self.chunk_size
+        if offset == 0:
+            self._allocate_chunk()
+        for name, chunks in self._chunks.items():
+            if name in row:
+                value = row[name]
+                if name in self._categories:
+                    value = self._encode(name, [value])[0]
+                chunks[-1][offset] = value
+        self._length += 1
+
+    def extend(self, rows: Iterable[Dict]) -> None:
+        """
+        Append several result rows.
+
+        Args:
+            rows (Iterable[Dict]): Mappings of column name to value.
+        """
+        for row in rows:
+            self.append(row)
+
+    def extend_columns(self, columns: Dict[str, Sequence]) -> None:
+        """
+        Append rows given column by column, copying each column in chunk-sized slices.
+
+        Args:
+            columns (Dict[str, Sequence]): Column name mapped to the values of the new rows.
+                All sequences must have the same length; missing columns are left empty.
+
+        Raises:
+            ValueError: If the columns have different lengths.
+        """
+        lengths = {len(values) for values in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("All columns must have the same length")
+        count = lengths.pop() if lengths else 0
+        columns = {name: self._encode(name, values) if name in self._categories else values
+                   for name, values in columns.items() if name in self._chunks}
+        written = 0
+        while written < count:
+            offset = self._length % self.chunk_size
+            if offset == 0:
+                self._allocate_chunk()
+            size = min(self.chunk_size - offset, count - written)
+            for name, values in columns.items():
+                self._chunks[name][-1][offset:offset + size] = values[written:written + size]
+            written += size
+            self._length += size
+
+    def should_emit(self) -> bool:
+        """
+        Check whether enough rows or time have accumulated to publish an update.
+
+        Returns:
+            bool: True if there are unpublished rows and either threshold was reached.
+        """
+        pending = self._length - self._emitted_length
+        if pending <= 0:
+            return False
+        if self.emit_every is not None and pending >= self.emit_every:
+            return True
+        if self.emit_interval is not None and time.monotonic() - self._emitted_at >= self.emit_interval:
+            return True
+        return self.emit_every is None and self.emit_interval is None
+
+    def to_frame(self) -> 'pd.DataFrame':
+        """
+        Build a DataFrame from the buffered rows and mark them as published.
+
+        Returns:
+            pd.DataFrame: One column per buffer column, in configuration order. The columns
+            are read-only views of the buffer; ``copy()`` the frame before changing values in place.
+        """
+        import pandas as pd
+        self._emitted_length = self._length
+        self._emitted_at = time.monotonic()
+        self._merge_new_rows()
+        index = pd.RangeIndex(self._length)
+        data = {}
+        for name, merged in self._merged.items():
+            view = merged[:self._length]
+            view.flags.writeable = False
+            if name in self._categories:
+                view = pd.Categorical.from_codes(view, categories=list(self._categories[name]))
+            # * One Series per column: a frame built from Series keeps a block per column, whereas
+            # * ndarrays of the same dtype may be consolidated into one block, copying every row.
+            # * Object columns keep their dtype; inferring a string dtype would rescan every row
+            data[name] = pd.Series(view, index=index, dtype=view.dtype, copy=False)
+        return pd.DataFrame(data, columns=list(self.columns), copy=False)
+
+    def _merge_new_rows(self) -> None:
+        if self._merged_length == self._length:
+            return
+        capacity = len(next(iter(self._merged.values()), ()))
+        if self._length > capacity:
+            capacity = max(self._length, 2 * capacity, self.chunk_size)
+            for name, merged in self._merged.items():
+                grown = np.empty(capacity, dtype=merged.dtype)
+                grown[:self._merged_length] = merged[:self._merged_length]
+                self._merged[name] = grown
+        row = self._merged_length
+        while row < self._length:
+            index, offset = divmod(row - self._chunks_start, self.chunk_size)
+            size = min(self.chunk_size - offset, self._length - row)
+            for name, chunks in self._chunks.items():
+                self._merged[name][row:row + size] = chunks[index][offset:offset + size]
+            row += size
+        self._merged_length = self._length
+        # * Full chunks are now held by the merged arrays; keep only the one being filled
+        full = (self._length - self._chunks_start) // self.chunk_size
+        if full:
+            for chunks in self._chunks.values():
+                del chunks[:full]
+            self._chunks_start += full * self.chunk_size
+
+    def _storage_dtype(self, name: str) -> np.dtype:
+        return np.dtype(np.int8) if name in self._categories else np.dtype(self.columns[name])
+
+    def _encode(self, name: str, values: Sequence) -> np.ndarray:
+        codes = self._categories[name]
+        encoded = np.array([codes.setdefault(value, len(codes)) for value in values], dtype=np.int16)
+        if len(codes) > np.iinfo(np.int8).max:
+            raise ValueError(f"Column {name} has more than {np.iinfo(np.int8).max} categories")
+        return encoded.astype(np.int8)
+
+    def _allocate_chunk(self) -> None:
+        for name, chunks in self._chunks.items():
+            dtype = self._storage_dtype(name)
+            if name in self._categories:
+                # * -1 is the missing-value code of a pandas Categorical
+                chunk = np.full(self.chunk_size, -1, dtype=dtype)
+            elif dtype.kind == 'f':
+                chunk = np.full(self.chunk_size, np.nan, dtype=dtype)
+            elif dtype.kind == 'O':
+                chunk = np.full(self.chunk_size, '', dtype=dtype)
+            else:
+                chunk = np.zeros(self.chunk_size, dtype=dtype)
+            chunks.append(chunk)
@@ -0,0 +1,218 @@
+import logging
+import math
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple, Union
+from .deduplicator import result_key
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+COLUMNS = ('source', 'article_key', 'link', 'guid', 'text', 'sentiment', 'confidence',
+           'published_at', 'stored_at')
+
+
+class ResultsStore():
+    """
+    Persistent, indexed store of sentiment results backed by SQLite.
+
+    Rows are keyed by (source, article identity), where the identity is the item's GUID,
+    canonical link or text hash, so storing the same run twice, or re-scoring an article,
+    updates the row instead of duplicating it. Rows are indexed by source, publish time
+    and sentiment, and queries filter and paginate in SQL so history can be read without
+    loading the table into pandas. Articles without a publish date are filed under the
+    time they were first stored.
+
+    Attributes:
+        logger (logging.Logger): Logger instance for the class.
+        db_path (Path): Path of the SQLite database (``:memory:`` for a temporary store).
+    """
+
+    def __init__(self, db_path: Union[str, Path] = ':memory:') -> None:
+        """
+        Initialize the ResultsStore.
+
+        Args:
+            db_path (Union[str, Path], optional): SQLite database path.
+        """
+        self.logger = logging.getLogger(__name__)
+        self.logger.debug(f"Initiating Class {__name__}")
+        self.db_path = Path(db_path) if str(db_path) != ':memory:' else db_path
+        if isinstance(self.db_path, Path):
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._connection.executescript("""
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            PRAGMA cache_size=-65536;
+            CREATE TABLE IF NOT EXISTS results (
+                source TEXT NOT NULL,
+                article_key TEXT NOT NULL,
+                link TEXT,
+                guid TEXT,
+                text TEXT NOT NULL,
+                sentiment TEXT NOT NULL,
+                confidence REAL NOT NULL,
+                published_at REAL NOT NULL,
+                stored_at REAL NOT NULL,
+                PRIMARY KEY (source, article_key)
+            );
+            CREATE INDEX IF NOT EXISTS idx_results_published ON results (published_at);
+            CREATE INDEX IF NOT EXISTS idx_results_source_published ON results (source, published_at);
+            CREATE INDEX IF NOT EXISTS idx_results_sentiment_published ON results (sentiment, published_at);
+        """)
+
+    def upsert(self, rows: Iterable[Dict]) -> int:
+        """
+        Insert or update result rows in one transaction.
+
+        Args:
+            rows (Iterable[Dict]): Rows with 'source', 'text', 'sentiment' and 'confidence',
+                and optionally 'link', 'guid' and 'published' (Unix time). An explicit
+                'article_key' overrides the identity derived from guid/link/text.
+
+        Returns:
+            int: The number of rows written.
+        """
+        now = time.time()
+        records = []
+        for row in rows:
+            published = row.get('published')
+            if published is None or (isinstance(published, float) and math.isnan(published)):
+                published = now
+            key = result_key(row)
+            records.append((row['source'], key, row.get('link') or '', row.get('guid') or '',
+                            row['text'], row['sentiment'], round(float(row['confidence']), 6), float(published), now))
+        if not records:
+            return 0
+        with self._lock, self._connection:
+            # * Keep the earliest publish time, so a known date wins over a first-seen fallback
+            self._connection.executemany("""
+                INSERT INTO results (source, article_key, link, guid, text, sentiment, confidence,
+                                     published_at, stored_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (source, article_key) DO UPDATE SET
+                    link = excluded.link, guid = excluded.guid, text = excluded.text,
+                    sentiment = excluded.sentiment, confidence = excluded.confidence,
+                    published_at = MIN(results.published_at, excluded.published_at),
+                    stored_at = excluded.stored_at
+            """, records)
+        self.logger.debug(f"Stored {len(records)} results")
+        return len(records)
+
+    def upsert_frame(self, frame: 'pd.DataFrame') -> int:
+        """
+        Store the rows of a NewsSentimentAnalyzer results DataFrame.
+
+        Args:
+            frame (pd.DataFrame): Results with at least text, sentiment, confidence and source.
+
+        Returns:
+            int: The number of rows written.
+        """
+        return self.upsert(frame.to_dict('records'))
+
+    def query(self, source: Optional[str] = None, sentiment: Optional[str] = None,
+              start: Optional[float] = None, end: Optional[float] = None,
+              min_confidence: Optional[float] = None, limit: Optional[int] = 1000,
+              offset: int = 0, newest_first: bool = True) -> List[Dict]:
+        """
+        Fetch results matching the filters, ordered by publish time.
+
+        Args:
+            source (Optional[str], optional): Only results from this feed URL.
+            sentiment (Optional[str], optional): Only results with this label, e.g. 'NEGATIVE'.
+            start (Optional[float], optional): Earliest publish time (Unix time, inclusive).
+            end (Optional[float], optional): Latest publish time (Unix time, exclusive).
+            min_confidence (Optional[float], optional): Minimum confidence.
+            limit (Optional[int], optional): Maximum number of rows; None for all.
+            offset (int, optional): Number of matching rows to skip.
+            newest_first (bool, optional): Order by publish time descending.
+
+        Returns:
+            List[Dict]: Matching rows.
+        """
+        where, params = self._where(source, sentiment, start, end, min_confidence)
+        sql = (f"SELECT {', '.join(COLUMNS)} FROM results{where} "
+               f"ORDER BY published_at {'DESC' if newest_first else 'ASC'}")
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params += [limit, offset]
+        with self._lock:
+            rows = self._connection.execute(sql, params).fetchall()
+        return [dict(zip(COLUMNS, row)) for row in rows]
+
+    def count(self, source: Optional[str] = None, sentiment: Optional[str] = None,
+              start: Optional[float] = None, end: Optional[float] = None) -> int:
+        """
+        Count results matching the filters.
+        """
+        where, params = self._where(source, sentiment, start, end, None)
+        with self._lock:
+            return self._connection.execute(f"SELECT COUNT(*) FROM results{where}", params).fetchone()[0]
+
+    def sentiment_counts(self, source: Optional[str] = None, start: Optional[float] = None,
+                         end: Optional[float] = None) -> Dict[str, int]:
+        """
+        Count results per sentiment label.
+
+        Returns:
+            Dict[str, int]: Number of results per label.
+        """
+        where, params = self._where(source, None, start, end, None)
+        # * '+sentiment' stops SQLite scanning the whole sentiment index to avoid a tiny sort
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT sentiment, COUNT(*) FROM results{where} GROUP BY +sentiment", params).fetchall()
+        return dict(rows)
+
+    def sources(self) -> List[str]:
+        """
+        List the feeds that have stored results.
+        """
+        with self._lock:
+            return [source for (source,) in self._connection.execute(
+                "SELECT DISTINCT source FROM results ORDER BY source")]
+
+    def to_frame(self, **filters) -> 'pd.DataFrame':
+        """
+        Query results into a DataFrame. Accepts the same filters as ``query``.
+        """
+        import pandas as pd
+        return pd.DataFrame(self.query(**filters), columns=list(COLUMNS))
+
+    def explain(self, **filters) -> str:
+        """
+        Describe how SQLite executes ``query`` for the given filters.
+
+        Returns:
+            str: The query plan, one step per line.
+        """
+        where, params = self._where(filters.get('source'), filters.get('sentiment'), filters.get('start'),
+                                    filters.get('end'), filters.get('min_confidence'))
+        with self._lock:
+            plan = self._connection.execute(
+                f"EXPLAIN QUERY PLAN SELECT * FROM results{where} ORDER BY published_at DESC", params).fetchall()
+        return '\n'.join(step[-1] for step in plan)
+
+    def close(self) -> None:
+        """
+        Close the database.
+        """
+        with self._lock:
+            self._connection.close()
+
+    @staticmethod
+    def _where(source: Optional[str], sentiment: Optional[str], start: Optional[float],
+               end: Optional[float], min_confidence: Optional[float]) -> Tuple[str, list]:
+        clauses, params = [], []
+        for clause, value in (("source = ?", source), ("sentiment = ?", sentiment),
+                              ("published_at >= ?", start), ("published_at < ?", end),
+                              ("confidence >= ?", min_confidence)):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+        return (' WHERE ' + ' AND '.join(clauses) if clauses else ''), params
@@ -1,11 +1,11 @@
 import logging
-from bs4 import BeautifulSoup
 import requests
-import logging
-from pathlib import Path
-from typing import Union, Dict, List
-import yaml
-import emoji
+from typing import Dict, Optional
+from .http_transport import HTTPTransport
+from .feed_parser import FeedParser, RSS_MAPPING
+from .metrics import METRICS
+from .records import ArticleBatch
+from .text_normalizer import TextNormalizer, DEFAULT_NORMALIZER, HTML_NORMALIZER
 
 # NPR https://feeds.npr.org/1003/rss.xml
 # NyTimes https://rss.nytimes.com/services/xml/rss/nyt/HomePage.xml
@@ -13,37 +13,21 @@ import emoji
 # NBC news: http://feeds.nbcnews.com/feeds/topstories
 # ABC news" http://abcnews.go.com/abcnews/topstories
 
-config_path = Path(__file__).parents[2] / "logging_config.yaml"
-config_path = Path(config_path)
-if not config_path.is_file():
-    raise FileNotFoundError(f"Logging config file not found: {config_path}")
-try:
-    with open(config_path, 'r') as f:
-        log_config = yaml.safe_load(f)
-        logging.config.dictConfig(log_config)
-except yaml.YAMLError as ex:
-    raise yaml.YAMLError(f"Error parsing logging config file: {str(ex)}")
-
-
 class StringCleaner():
     @classmethod
     def clean_string(cls, input_string: str) -> str:
         """
         Clean up a string by removing unnecessary spaces, emojis, and other formatting.
 
+        Delegates to the default TextNormalizer, so accented letters are kept.
+
         Args:
             input_string (str): The input string to be cleaned.
 
         Returns:
             str: The cleaned string.
         """
-        emoji_free = emoji.replace_emoji(input_string, replace='')
-        temp_string = emoji_free.replace(
-            "\n", " ").replace("\r", " ").strip()
-        clean_string = ' '.join(temp_string.split())
-        clean_string = clean_string.encode(
-            'ascii', 'ignore').decode('ascii').strip()
-        return clean_string
+        return DEFAULT_NORMALIZER.normalize(input_string)
 
 
 class RSSNewsScraper():
@@ -69,18 +53,32 @@ class RSSNewsScraper():
         self.logger.debug(f"Initiating Class {__name__}")
         self.rss_adapter = rss_adapter
 
-    def scrape_rss_feed(self) -> List[Dict[str, str]]:
+    def scrape_rss_feed(self, timeout: Optional[float] = None) -> ArticleBatch:
         """
         Scrape the RSS feed using the provided adapter and extract article information.
 
+        Args:
+            timeout (Optional[float], optional): Upper bound on the request timeout, passed
+                on to the adapter. Defaults to the adapter's own timeout.
+
         Returns:
-            List[Dict[str, str]]: A list of dictionaries, each containing
-            information about a single article (title, link, description).
+            ArticleBatch: The articles of the feed, stored column by column. Each item
+            reads like a dictionary with title, link, description, guid and published keys.
         """
-        results = self.rss_adapter.scrape_rss_feed()
+        kwargs = {} if timeout is None else {'timeout': timeout}
+        if not METRICS.enabled:
+            results = self.rss_adapter.scrape_rss_feed(**kwargs)
+        else:
+            source = self.rss_adapter.get_rss_url()
+            try:
+                with METRICS.timer('scrape_seconds', source=source):
+                    results = self.rss_adapter.scrape_rss_feed(**kwargs)
+            except Exception:
+                METRICS.inc('feed_errors_total', source=source)
+                raise
+            METRICS.inc('articles_scraped_total', len(results or []), source=source)
         if results:
-            self.logger.debug(
-                f'RSSNewsScraper.scrape_rss_feed Results Len: {len(results)}')
+            self.logger.debug('RSSNewsScraper.scrape_rss_feed Results Len: %d', len(results))
         return results
 
 
@@ -90,17 +88,29 @@ class BaseRSSNewsScraperAdapter():
 
     This class provides a common interface for different RSS feed adapters.
 
+    Subclasses describe source-specific fields declaratively by overriding
+    ``FEED_MAPPING`` instead of re-implementing ``scrape_rss_feed``.
+
     Attributes:
         logger (logging.Logger): Logger instance for the class.
         __rss_url (str): The URL of the RSS feed to scrape.
+        transport (HTTPTransport): Pooled HTTP transport used to fetch the feed.
+        not_modified (bool): True if the last fetch was answered with 304 Not Modified.
+        _last_articles (Optional[ArticleBatch]): Articles parsed from the last full response,
+            returned again while the feed is not modified.
     """
+    FEED_MAPPING = RSS_MAPPING
+    # * Normalizer per field; fields not listed use DEFAULT_NORMALIZER
+    TEXT_NORMALIZERS: Dict[str, TextNormalizer] = {'description': HTML_NORMALIZER}
 
-    def __init__(self, rss_url: str) -> None:
+    def __init__(self, rss_url: str, transport: HTTPTransport = None) -> None:
         """
         Initialize the BaseRSSNewsScraperAdapter with a specific RSS URL.
 
         Args:
             rss_url (str): The URL of the RSS feed to scrape.
+            transport (HTTPTransport, optional): HTTP transport to fetch with.
+                Defaults to the process-wide shared transport.
 
         Raises:
             ValueError: If no RSS URL is provided.
@@ -109,61 +119,84 @@ class BaseRSSNewsScraperAdapter():
         self.logger.debug(f"Initiating Class {__name__}")
         self.logger.debug(f"Setting RSS URL: {rss_url}")
         self.__rss_url = rss_url
+        self.transport = transport or HTTPTransport.shared()
+        self.not_modified = False
+        self._last_articles: Optional[ArticleBatch] = None
 
-    def scrape_rss_feed(self) -> List[Dict[str, str]]:
+    def scrape_rss_feed(self, timeout: Optional[float] = None) -> ArticleBatch:
         """
         Scrape the RSS feed and extract article information.
 
+        The feed is parsed in a single streaming pass using the adapter's ``FEED_MAPPING``
+        straight into one column per field, then each column is normalized with
+        ``TEXT_NORMALIZERS``.
+
+        Args:
+            timeout (Optional[float], optional): Upper bound on the request timeout; the
+                transport's timeout applies when it is shorter or when this is None.
+
+        Returns:
+            ArticleBatch: The feed's articles (title, link, description, guid, published).
+            Items read like dictionaries. If the feed has not changed since the last fetch,
+            the articles parsed then are returned without parsing again.
+
+        Raises:
+            requests.RequestException: If there's an error fetching the RSS feed.
+        """
+        content = self._fetch_feed(timeout)
+        if self.not_modified and self._last_articles is not None:
+            return self._last_articles
+
+        with METRICS.timer('parse_seconds', source=self.__rss_url):
+            columns = FeedParser(self.FEED_MAPPING).parse_columns(content)
+        # * Normalize each field for the whole feed at once
+        with METRICS.timer('clean_seconds', source=self.__rss_url):
+            for field, values in columns.items():
+                normalizer = self.TEXT_NORMALIZERS.get(field, DEFAULT_NORMALIZER)
+                columns[field] = normalizer.normalize_batch(values)
+        articles = ArticleBatch(columns)
+        # * Per-story logging is skipped entirely unless DEBUG is enabled
+        if self.logger.isEnabledFor(logging.DEBUG):
+            for story in articles:
+                self.logger.debug('Story: %s', story)
+
+        self._last_articles = articles
+        if not articles:
+            self.logger.error(f'No items found at {self.get_rss_url()}')
+            return articles
+        self.logger.debug('Scraped %d articles', len(articles))
+        return articles
+
+    def _fetch_feed(self, timeout: Optional[float] = None) -> bytes:
+        """
+        Fetch the raw feed through the shared transport.
+
+        Args:
+            timeout (Optional[float], optional): Upper bound on the request timeout.
+
         Returns:
-            List[Dict[str, str]]: A list of dictionaries, each containing
-            information about a single article (title, link, description).
+            bytes: The feed body. On a 304 Not Modified this is the cached body and
+            ``not_modified`` is set.
 
         Raises:
             requests.RequestException: If there's an error fetching the RSS feed.
         """
-        articles = []
+        if timeout is not None:
+            timeout = min(self.transport.timeout, timeout)
         try:
-            self.logger.debug(f'Getting RSS feed from: {self.get_rss_url()}')
-            response = requests.get(self.get_rss_url(), timeout=10)
-            response.raise_for_status()
+            self.logger.debug('Getting RSS feed from: %s', self.__rss_url)
+            with METRICS.timer('fetch_seconds', source=self.__rss_url):
+                result = self.transport.get(self.get_rss_url(), timeout=timeout)
         except requests.RequestException as ex:
             self.logger.exception(f'Error getting RSS feed: {str(ex)}')
             raise
-
-        soup = BeautifulSoup(response.content, 'xml')
-        if not soup:
-            self.logger.error(f'No XML content found at {self.get_rss_url()}')
-            return None
-
-        # * Find all the "item" elements (commonly used in RSS feeds)
-        items = soup.find_all('item')
-        if not items or len(items) == 0:
-            self.logger.error(f'No items found at {self.get_rss_url()}')
-            return None
-
-        # * Iterate over each item to extract the data you need
-        for item in items:
-            title, link, description = "", "", ""
-            if item.find('title'):
-                title = StringCleaner.clean_string(item.find('title').text)
-            if item.find('link'):
-                link = StringCleaner.clean_string(item.find('link').text)
-            if item.find('description'):
-                description = StringCleaner.clean_string(item.find(
-                    'description').text)
-
-            story = {
-                'title': title,
-                'link': link,
-                'description': description
-            }
-            self.logger.debug(f'---')
-            self.logger.debug(f'Story: {story}')
-            # * Add it to the list of articles
-            articles.append(story)
-
-        self.logger.debug(f'Scraped {len(articles)} articles')
-        return articles
+        self.not_modified = result.not_modified
+        if result.not_modified:
+            METRICS.inc('feed_not_modified_total', source=self.__rss_url)
+            self.logger.info(f'RSS feed not modified: {self.get_rss_url()}')
+            return result.content
+        METRICS.inc('bytes_fetched_total', len(result.content), source=self.__rss_url)
+        return result.content
 
     def get_rss_url(self) -> str:
         """
@@ -172,7 +205,6 @@ class BaseRSSNewsScraperAdapter():
         Returns:
             str: The URL of the RSS feed.
         """
-        self.logger.debug(f'RSS URL: {self.__rss_url}')
         return self.__rss_url
 
     def set_rss_url(self, rss_url: str) -> str:
@@ -201,74 +233,21 @@ class NYTRSSNewsScraperAdapter(BaseRSSNewsScraperAdapter):
         logger (logging.Logger): Logger instance for the class.
         rss_url (str): The URL of the NYT News RSS feed.
     """
+    # * NYT appends media:description to the item description
+    FEED_MAPPING = RSS_MAPPING.extend(
+        {'description': ('description', 'media:description')}, join_fields=('description',))
 
-    def __init__(self):
+    def __init__(self, transport: HTTPTransport = None):
         """
         Initialize the NYTRSSNewsScraperAdapter.
+
+        Args:
+            transport (HTTPTransport, optional): HTTP transport to fetch with.
         """
         rss_url = 'https://rss.nytimes.com/services/xml/rss/nyt/HomePage.xml'
         self.logger = logging.getLogger(__name__)
         self.logger.debug(f"Initiating Class {__name__}")
-        super().__init__(rss_url)
-
-    def scrape_rss_feed(self) -> List[Dict[str, str]]:
-        """
-        Scrape the NYT RSS feed and extract article information.
-
-        Returns:
-            List[Dict[str, str]]: A list of dictionaries, each containing
-            information about a single article (title, link, description).
-
-        Raises:
-            requests.RequestException: If there's an error fetching the RSS feed.
-        """
-        articles = []
-        try:
-            self.logger.debug(f'Getting RSS feed from: {self.get_rss_url()}')
-            response = requests.get(self.get_rss_url(), timeout=10)
-            response.raise_for_status()
-        except requests.RequestException as ex:
-            self.logger.exception(f'Error getting RSS feed: {str(ex)}')
-            raise
-
-        soup = BeautifulSoup(response.content, 'xml')
-        if not soup:
-            self.logger.error(f'No XML content found at {self.get_rss_url()}')
-            return None
-
-        # * Find all the "item" elements (commonly used in RSS feeds)
-        items = soup.find_all('item')
-        if not items or len(items) == 0:
-            self.logger.error(f'No items found at {self.get_rss_url()}')
-            return None
-
-        # * Iterate over each item to extract the data you need
-        for item in items:
-            title, link, description = "", "", ""
-            if item.find('title'):
-                title = StringCleaner.clean_string(item.find('title').text)
-            if item.find('link'):
-                link = StringCleaner.clean_string(item.find('link').text)
-            if item.find('description'):
-                description = StringCleaner.clean_string(item.find(
-                    'description').text)
-            if item.find('media:description'):
-                description += " " + \
-                    StringCleaner.clean_string(item.find(
-                        'media:description').text)
-
-            story = {
-                'title': title,
-                'link': link,
-                'description': description
-            }
-            self.logger.debug(f'---')
-            self.logger.debug(f'Story: {story}')
-            # * Add it to the list of articles
-            articles.append(story)
-
-        self.logger.debug(f'Scraped {len(articles)} articles')
-        return articles
+        super().__init__(rss_url, transport)
 
 
 class ABCRSSNewsScraperAdapter(BaseRSSNewsScraperAdapter):
@@ -282,85 +261,41 @@ class ABCRSSNewsScraperAdapter(BaseRSSNewsScraperAdapter):
         logger (Logger): Logger instance for the class.
         rss_url (str): The URL of the ABC News RSS feed.
     """
+    # * ABC wraps some values in literal CDATA markers
+    FEED_MAPPING = RSS_MAPPING.extend(strip_cdata=True)
 
-    def __init__(self):
+    def __init__(self, transport: HTTPTransport = None):
         """
         Initialize the ABCRSSNewsScraperAdapter.
 
         Args:
-            rss_url (str): The URL of the ABC News RSS feed to scrape.
+            transport (HTTPTransport, optional): HTTP transport to fetch with.
         """
         rss_url = "https://abcnews.go.com/abcnews/topstories"
         self.logger = logging.getLogger(__name__)
         self.logger.debug(f"Initiating Class {__name__}")
-        super().__init__(rss_url)
-
-    def scrape_rss_feed(self) -> list[dict[str, str]]:
-        """
-        Scrape the ABC News RSS feed and extract article information.
-
-        Returns:
-            List[Dict[str, str]]: A list of dictionaries, each containing
-            information about a single article (title, link, description).
+        super().__init__(rss_url, transport)
 
-        Raises:
-            requests.RequestException: If there's an error fetching the RSS feed.
-        """
-        articles = []
-        try:
-            self.logger.debug(f'Getting RSS feed from: {self.get_rss_url()}')
-            response = requests.get(self.get_rss_url(), timeout=10)
-            response.raise_for_status()
-        except requests.RequestException as ex:
-            self.logger.exception(f'Error getting RSS feed: {str(ex)}')
-            raise
 
-        soup = BeautifulSoup(response.content, 'xml')
-        if not soup:
-            self.logger.error(f'No XML content found at {self.get_rss_url()}')
-            return []
+# * Feeds with source-specific mappings; every other URL uses the generic RSS/Atom adapter
+KNOWN_ADAPTERS = {
+    'https://rss.nytimes.com/services/xml/rss/nyt/HomePage.xml': NYTRSSNewsScraperAdapter,
+    'https://abcnews.go.com/abcnews/topstories': ABCRSSNewsScraperAdapter,
+}
 
-        # Find all the "item" elements (commonly used in RSS feeds)
-        items = soup.find_all('item')
-        if not items:
-            self.logger.error(f'No items found at {self.get_rss_url()}')
-            return []
-
-        # Iterate over each item to extract the data you need
-        for item in items:
-            title = StringCleaner.clean_string(item.find('title').text)
-            link = StringCleaner.clean_string(item.find('link').text)
-            description = StringCleaner.clean_string(
-                item.find('description').text)
-
-            # Handle CDATA sections
-            title = self._extract_cdata(title)
-            link = self._extract_cdata(link)
-            description = self._extract_cdata(description)
-
-            story = {
-                'title': title,
-                'link': link,
-                'description': description
-            }
-            self.logger.debug(f'---')
-            self.logger.debug(f'Story: {story}')
-            # Add it to the list of articles
-            articles.append(story)
-
-        self.logger.debug(f'Scraped {len(articles)} articles')
-        return articles
 
-    def _extract_cdata(self, text: str) -> str:
-        """
-        Extract text from CDATA sections.
+def create_adapter(rss_url: str, transport: HTTPTransport = None) -> BaseRSSNewsScraperAdapter:
+    """
+    Build the adapter for a feed URL, using a source-specific adapter when one exists.
 
-        Args:
-            text (str): The text potentially containing CDATA sections.
+    Args:
+        rss_url (str): The URL of the RSS feed.
+        transport (HTTPTransport, optional): HTTP transport to fetch with.
 
-        Returns:
-            str: The extracted text without the CDATA tags.
-        """
-        if text.startswith('<![CDATA[') and text.endswith(']]>'):
-            text = text[9:-3]
-        return text
+    Returns:
+        BaseRSSNewsScraperAdapter: The adapter for the feed.
+    """
+    adapter_class = KNOWN_ADAPTERS.get(rss_url)
+    if adapter_class:
+        return adapter_class(transport=transport)
+    return BaseRSSNewsScraperAdapter(rss_url=rss_url, transport=transport)
@@ -0,0 +1,538 @@
+import logging
+import math
+import re
+import sqlite3
+import threading
+import zlib
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple, Union
+import numpy as np
+from .deduplicator import result_key
+from .metrics import METRICS
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+DEFAULT_EMBEDDING_MODEL = 'sentence-transformers/all-MiniLM-L6-v2'
+ITEM_COLUMNS = ('id', 'article_key', 'source', 'text', 'sentiment', 'confidence', 'published_at')
+WORD_PATTERN = re.compile(r'\w+')
+# * Rows scored per matrix product; bounds the temporary memory of a scan
+BLOCK_ROWS = 32768
+
+
+class HashingEmbedder():
+    """
+    Dependency-free embedder based on signed feature hashing of words and word pairs.
+
+    It captures shared vocabulary rather than meaning, so it is a fallback for machines
+    without sentence-transformers and a fast, deterministic embedder for tests.
+
+    Attributes:
+        dim (int): Embedding dimension.
+        name (str): Identifier stored with an index so it is reopened with the same embedder.
+    """
+
+    def __init__(self, dim: int = 256) -> None:
+        self.dim = dim
+        self.name = f'hashing-{dim}'
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            words = WORD_PATTERN.findall(text.lower())
+            for feature in words + [f'{a} {b}' for a, b in zip(words, words[1:])]:
+                digest = zlib.crc32(feature.encode('utf-8'))
+                vectors[i, digest % self.dim] += 1.0 if digest & 0x80000000 else -1.0
+        return normalize_rows(vectors)
+
+
+class SentenceTransformerEmbedder():
+    """
+    Sentence-transformers embedder, loaded on first use.
+
+    Attributes:
+        model_name (str): Model name or local path.
+        batch_size (int): Texts encoded per forward pass.
+        name (str): Identifier stored with an index (the model name).
+    """
+
+    def __init__(self, model_name: str = DEFAULT_EMBEDDING_MODEL, batch_size: int = 64) -> None:
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.name = model_name
+        self._model = None
+        self._lock = threading.Lock()
+
+    @property
+    def dim(self) -> int:
+        return self._load().get_sentence_embedding_dimension()
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        model = self._load()
+        vectors = model.encode(texts, batch_size=self.batch_size, convert_to_numpy=True,
+                               normalize_embeddings=True, show_progress_bar=False)
+        return np.asarray(vectors, dtype=np.float32)
+
+    def _load(self):
+        with self._lock:
+            if self._model is None:
+                # * sentence-transformers imports torch, so it is only loaded when something is embedded
+                from sentence_transformers import SentenceTransformer
+                self._model = SentenceTransformer(self.model_name)
+            return self._model
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """
+    Scale each row to unit length so inner products are cosine similarities.
+    """
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def spherical_kmeans(vectors: np.ndarray, k: int, iterations: int = 10,
+                     seed: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Cluster unit vectors by cosine similarity.
+
+    Args:
+        vectors (np.ndarray): Unit-length rows.
+        k (int): Number of clusters; capped at the number of rows.
+        iterations (int, optional): Lloyd iterations.
+        seed (int, optional): Seed of the initial centroid sample.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Unit-length centroids (k x dim) and the cluster of each row.
+    """
+    rng = np.random.default_rng(seed)
+    vectors = np.asarray(vectors, dtype=np.float32)
+    k = max(1, min(k, len(vectors)))
+    centroids = vectors[rng.choice(len(vectors), k, replace=False)].copy()
+    assignments = np.zeros(len(vectors), dtype=np.int32)
+    for _ in range(iterations):
+        assignments = assign_nearest(vectors, centroids)
+        order = np.argsort(assignments, kind='stable')
+        counts = np.bincount(assignments, minlength=k)
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        sums = np.zeros_like(centroids)
+        sums[counts > 0] = np.add.reduceat(vectors[order], starts[counts > 0], axis=0)
+        empty = counts == 0
+        if empty.any():
+            # * Restart empty clusters on random rows
+            sums[empty] = vectors[rng.choice(len(vectors), int(empty.sum()))]
+        centroids = normalize_rows(sums)
+    return centroids, assign_nearest(vectors, centroids)
+
+
+def assign_nearest(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    assignments = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), BLOCK_ROWS):
+        block = np.asarray(vectors[start:start + BLOCK_ROWS], dtype=np.float32)
+        assignments[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+    return assignments
+
+
+class SemanticIndex():
+    """
+    Local vector index of analyzed headlines for similarity search and topic clustering.
+
+    Title and description are embedded in batches when results are added and stored as
+    unit-length rows of a float32 matrix, or as int8 rows with a per-row scale when
+    ``quantize`` is set (4x smaller, at a small loss of ranking precision). On disk the
+    matrix is a memory-mapped file, so the collection does not need to fit in memory and
+    opens instantly; item metadata lives in SQLite next to it. Search is an exact,
+    vectorized scan in blocks with ``np.argpartition`` top-k. Large collections can build
+    a coarse IVF partition with ``build_ivf``: rows are grouped by their nearest k-means
+    centroid, and a query then scans only the ``nprobe`` closest groups plus the rows
+    added since the partition was built.
+
+    Attributes:
+        logger (logging.Logger): Logger instance for the class.
+        directory (Optional[Path]): Where the index is stored, or None for a temporary in-memory index.
+        embedder: Object with ``name``, ``dim`` and ``embed(texts) -> np.ndarray``.
+        dim (int): Embedding dimension.
+        quantize (bool): Whether rows are stored as int8.
+        nprobe (int): Partitions scanned per query once an IVF partition is built.
+    """
+
+    def __init__(self, directory: Union[str, Path, None] = None, embedder=None, quantize: bool = False,
+                 nprobe: int = 8) -> None:
+        """
+        Open or create a SemanticIndex.
+
+        Args:
+            directory (Union[str, Path, None], optional): Index directory. None keeps the index in memory.
+            embedder (optional): The embedder. Defaults to a SentenceTransformerEmbedder.
+            quantize (bool, optional): Store rows as int8 when creating the index. An existing
+                index keeps the storage it was created with.
+            nprobe (int, optional): Partitions scanned per query once an IVF partition is built.
+
+        Raises:
+            ValueError: If an existing index was built with a different embedder.
+        """
+        self.logger = logging.getLogger(__name__)
+        self.logger.debug(f"Initiating Class {__name__}")
+        self.directory = Path(directory) if directory is not None else None
+        self.embedder = embedder if embedder is not None else SentenceTransformerEmbedder()
+        self.nprobe = nprobe
+        self._lock = threading.Lock()
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        db_path = str(self.directory / 'items.sqlite') if self.directory is not None else ':memory:'
+        self._connection = sqlite3.connect(db_path, check_same_thread=False)
+        self._connection.executescript("""
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            CREATE TABLE IF NOT EXISTS items (
+                id INTEGER PRIMARY KEY,
+                article_key TEXT NOT NULL UNIQUE,
+                source TEXT NOT NULL,
+                text TEXT NOT NULL,
+                sentiment TEXT,
+                confidence REAL,
+                published_at REAL
+            );
+            CREATE INDEX IF NOT EXISTS idx_items_source ON items (source);
+            CREATE TABLE IF NOT EXISTS settings (name TEXT PRIMARY KEY, value TEXT NOT NULL);
+        """)
+        settings = dict(self._connection.execute("SELECT name, value FROM settings").fetchall())
+        if settings:
+            if settings['embedder'] != self.embedder.name:
+                raise ValueError(f"Index was built with embedder {settings['embedder']}, not {self.embedder.name}")
+            self.dim, self.quantize = int(settings['dim']), settings['quantize'] == '1'
+            self._count = int(settings['count'])
+        else:
+            self.dim, self.quantize, self._count = self.embedder.dim, quantize, 0
+            with self._connection:
+                self._connection.executemany("INSERT INTO settings (name, value) VALUES (?, ?)",
+                                             [('embedder', self.embedder.name), ('dim', str(self.dim)),
+                                              ('quantize', '1' if quantize else '0'), ('count', '0')])
+        self._vectors, self._scales = None, None
+        self._capacity = 0
+        self._open_storage(max(self._count, 1024))
+        self._ivf = self._load_ivf()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add(self, rows: Iterable[Dict]) -> int:
+        """
+        Embed and add result rows that are not in the index yet.
+
+        Args:
+            rows (Iterable[Dict]): Rows with 'text' and 'source', and optionally 'link', 'guid',
+                'sentiment', 'confidence', 'published' (Unix time) and 'article_key'.
+
+        Returns:
+            int: The number of rows added.
+        """
+        new = {}
+        for row in rows:
+            key = result_key(row)
+            new.setdefault(key, row)
+        with self._lock:
+            keys = list(new)
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                existing = self._connection.execute(
+                    f"SELECT article_key FROM items WHERE article_key IN ({','.join('?' * len(chunk))})",
+                    chunk).fetchall()
+                for (key,) in existing:
+                    del new[key]
+            if not new:
+                return 0
+            with METRICS.timer('embed_seconds'):
+                vectors = normalize_rows(np.asarray(self.embedder.embed([row['text'] for row in new.values()]),
+                                                    dtype=np.float32))
+            first = self._count
+            self._write_vectors(first, vectors)
+            records = []
+            for offset, (key, row) in enumerate(new.items()):
+                published = row.get('published')
+                if published is not None and published != published:
+                    published = None
+                confidence = row.get('confidence')
+                records.append((first + offset, key, row['source'], row['text'], row.get('sentiment'),
+                                round(float(confidence), 6) if confidence is not None else None, published))
+            self._count += len(records)
+            # * Vectors are flushed before the count that makes them visible is committed
+            with self._connection:
+                self._connection.executemany(
+                    "INSERT INTO items (id, article_key, source, text, sentiment, confidence, published_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)", records)
+                self._connection.execute("UPDATE settings SET value = ? WHERE name = 'count'", (str(self._count),))
+        self.logger.debug(f"Indexed {len(records)} new items")
+        return len(records)
+
+    def add_frame(self, frame: 'pd.DataFrame') -> int:
+        """
+        Add the rows of a NewsSentimentAnalyzer results DataFrame.
+        """
+        return self.add(frame.to_dict('records'))
+
+    def search(self, query: Union[str, np.ndarray], k: int = 10, source: Optional[str] = None,
+               exact: bool = False) -> List[Dict]:
+        """
+        Find the stored items most similar to a text or embedding.
+
+        Args:
+            query (Union[str, np.ndarray]): Query text, or a query embedding.
+            k (int, optional): Number of results.
+            source (Optional[str], optional): Only return items from this source.
+            exact (bool, optional): Scan every row even if an IVF partition is built.
+
+        Returns:
+            List[Dict]: Items (see ITEM_COLUMNS) with a cosine 'score', best first.
+        """
+        if isinstance(query, str):
+            query = self.embedder.embed([query])[0]
+        return self._search(np.asarray(query, dtype=np.float32), k, source, exact, exclude=None)
+
+    def similar(self, key: str, k: int = 10, source: Optional[str] = None, exact: bool = False) -> List[Dict]:
+        """
+        Find stories similar to a stored one.
+
+        Args:
+            key (str): The stored item's article key.
+            k (int, optional): Number of results, not counting the item itself.
+            source (Optional[str], optional): Only return items from this source.
+            exact (bool, optional): Scan every row even if an IVF partition is built.
+
+        Returns:
+            List[Dict]: Items with a cosine 'score', best first.
+
+        Raises:
+            KeyError: If the key is not in the index.
+        """
+        with self._lock:
+            found = self._connection.execute("SELECT id FROM items WHERE article_key = ?", (key,)).fetchone()
+        if found is None:
+            raise KeyError(key)
+        return self._search(self.vector(found[0]), k, source, exact, exclude=found[0])
+
+    def vector(self, row: int) -> np.ndarray:
+        """
+        The stored (dequantized) embedding of a row.
+        """
+        vector = np.asarray(self._vectors[row], dtype=np.float32)
+        return vector * self._scales[row] if self.quantize else vector
+
+    def build_ivf(self, n_lists: Optional[int] = None, iterations: int = 10, sample_size: int = 65536,
+                  seed: int = 0) -> Dict:
+        """
+        Partition the stored rows by their nearest of ``n_lists`` k-means centroids.
+
+        Centroids are trained on a sample of at most ``sample_size`` rows, then every row is
+        assigned. Rows added later are scanned exhaustively until the partition is rebuilt.
+
+        Args:
+            n_lists (Optional[int], optional): Number of partitions. Defaults to sqrt(rows).
+            iterations (int, optional): k-means iterations.
+            sample_size (int, optional): Rows used to train the centroids.
+            seed (int, optional): Seed of the sample and initial centroids.
+
+        Returns:
+            Dict: Partition statistics (lists, rows, largest list).
+        """
+        with self._lock:
+            count = self._count
+            if count == 0:
+                return {'lists': 0, 'rows': 0, 'largest_list': 0}
+            n_lists = n_lists or max(1, int(math.sqrt(count)))
+            rng = np.random.default_rng(seed)
+            sample = np.sort(rng.choice(count, min(count, sample_size), replace=False))
+            centroids, _ = spherical_kmeans(self._dequantize(sample), n_lists, iterations, seed)
+            assignments = np.empty(count, dtype=np.int32)
+            for start in range(0, count, BLOCK_ROWS):
+                rows = np.arange(start, min(count, start + BLOCK_ROWS))
+                assignments[rows] = assign_nearest(self._dequantize(rows), centroids)
+            order = np.argsort(assignments, kind='stable').astype(np.int64)
+            offsets = np.searchsorted(assignments[order], np.arange(len(centroids) + 1)).astype(np.int64)
+            self._ivf = {'centroids': centroids, 'order': order, 'offsets': offsets, 'count': count}
+            if self.directory is not None:
+                np.savez(self.directory / 'ivf.npz', **self._ivf)
+        sizes = np.diff(offsets)
+        return {'lists': len(centroids), 'rows': count, 'largest_list': int(sizes.max())}
+
+    def topics(self, n_topics: int = 8, source: Optional[str] = None, start: Optional[float] = None,
+               max_items: int = 50000, examples: int = 3, seed: int = 0) -> List[Dict]:
+        """
+        Cluster stored stories into topics.
+
+        Args:
+            n_topics (int, optional): Number of topics.
+            source (Optional[str], optional): Only cluster items from this source.
+            start (Optional[float], optional): Only cluster items published at or after this Unix time.
+            max_items (int, optional): Cluster at most this many of the most recent items.
+            examples (int, optional): Stories closest to each topic centroid to return.
+            seed (int, optional): Seed of the initial centroids.
+
+        Returns:
+            List[Dict]: One entry per topic, largest first, with 'size', 'positive_ratio'
+            and 'examples' (texts).
+        """
+        where, params = self._where(source, start)
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT id, text, sentiment FROM items{where} ORDER BY published_at DESC, id DESC LIMIT ?",
+                params + [max_items]).fetchall()
+        if not rows:
+            return []
+        ids = np.array([row for row, _, _ in rows], dtype=np.int64)
+        order = np.argsort(ids)
+        vectors = self._dequantize(ids[order])
+        centroids, assignments = spherical_kmeans(vectors, n_topics, seed=seed)
+        similarity = np.einsum('ij,ij->i', vectors, centroids[assignments])
+        topics = []
+        for topic in range(len(centroids)):
+            members = np.flatnonzero(assignments == topic)
+            if len(members) == 0:
+                continue
+            closest = members[np.argsort(-similarity[members])[:examples]]
+            sentiments = [rows[order[i]][2] for i in members]
+            topics.append({'size': int(len(members)),
+                           'positive_ratio': round(sentiments.count('POSITIVE') / len(members), 4),
+                           'examples': [rows[order[i]][1] for i in closest]})
+        topics.sort(key=lambda topic: topic['size'], reverse=True)
+        for number, topic in enumerate(topics):
+            topic['topic'] = number
+        return topics
+
+    def close(self) -> None:
+        """
+        Flush the vectors and close the metadata database.
+        """
+        with self._lock:
+            if isinstance(self._vectors, np.memmap):
+                self._vectors.flush()
+                if self.quantize:
+                    self._scales.flush()
+            self._connection.close()
+
+    def _search(self, query: np.ndarray, k: int, source: Optional[str], exact: bool,
+                exclude: Optional[int]) -> List[Dict]:
+        query = query / max(float(np.linalg.norm(query)), 1e-12)
+        with self._lock:
+            count = self._count
+            candidates = None
+            if source is not None:
+                candidates = np.array([row for (row,) in self._connection.execute(
+                    "SELECT id FROM items WHERE source = ? ORDER BY id", (source,))], dtype=np.int64)
+            if self._ivf is not None and not exact:
+                probed = self._probe(query)
+                candidates = probed if candidates is None else np.intersect1d(candidates, probed)
+            wanted = k + (exclude is not None)
+            rows, scores = self._top_k(query, wanted, count, candidates)
+            keep = rows != exclude
+            rows, scores = rows[keep][:k], scores[keep][:k]
+            items = self._items(rows.tolist())
+        for item, score in zip(items, scores.tolist()):
+            item['score'] = round(score, 4)
+        return items
+
+    def _probe(self, query: np.ndarray) -> np.ndarray:
+        ivf = self._ivf
+        lists = np.argsort(-(ivf['centroids'] @ query))[:self.nprobe]
+        parts = [ivf['order'][ivf['offsets'][i]:ivf['offsets'][i + 1]] for i in lists]
+        # * Rows added after the partition was built are always scanned
+        parts.append(np.arange(ivf['count'], self._count, dtype=np.int64))
+        return np.sort(np.concatenate(parts))
+
+    def _top_k(self, query: np.ndarray, k: int, count: int,
+               candidates: Optional[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        best_rows, best_scores = [], []
+        total = count if candidates is None else len(candidates)
+        for start in range(0, total, BLOCK_ROWS):
+            if candidates is None:
+                rows = None
+                block = self._vectors[start:min(count, start + BLOCK_ROWS)]
+                scales = self._scales[start:start + len(block)] if self.quantize else None
+            else:
+                rows = candidates[start:start + BLOCK_ROWS]
+                block = self._vectors[rows]
+                scales = self._scales[rows] if self.quantize else None
+            scores = block.astype(np.float32, copy=False) @ query
+            if scales is not None:
+                scores *= scales
+            top = np.argpartition(-scores, k - 1)[:k] if len(scores) > k else np.arange(len(scores))
+            best_scores.append(scores[top])
+            best_rows.append(top + start if rows is None else rows[top])
+        if not best_rows:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        rows, scores = np.concatenate(best_rows), np.concatenate(best_scores)
+        order = np.argsort(-scores, kind='stable')[:k]
+        return rows[order], scores[order]
+
+    def _items(self, rows: List[int]) -> List[Dict]:
+        if not rows:
+            return []
+        found = {row[0]: dict(zip(ITEM_COLUMNS, row)) for row in self._connection.execute(
+            f"SELECT {', '.join(ITEM_COLUMNS)} FROM items WHERE id IN ({','.join('?' * len(rows))})", rows)}
+        return [found[row] for row in rows]
+
+    def _dequantize(self, rows: np.ndarray) -> np.ndarray:
+        vectors = np.asarray(self._vectors[rows], dtype=np.float32)
+        return vectors * self._scales[rows][:, None] if self.quantize else vectors
+
+    def _write_vectors(self, first: int, vectors: np.ndarray) -> None:
+        if first + len(vectors) > self._capacity:
+            self._open_storage(max(first + len(vectors), self._capacity * 2))
+        end = first + len(vectors)
+        if self.quantize:
+            scales = np.maximum(np.abs(vectors).max(axis=1), 1e-12) / 127.0
+            self._vectors[first:end] = np.round(vectors / scales[:, None]).astype(np.int8)
+            self._scales[first:end] = scales
+        else:
+            self._vectors[first:end] = vectors
+        if isinstance(self._vectors, np.memmap):
+            self._vectors.flush()
+            if self.quantize:
+                self._scales.flush()
+
+    def _open_storage(self, capacity: int) -> None:
+        """
+        Open (or grow to ``capacity`` rows) the vector matrix and, for int8 rows, the scales.
+        """
+        dtype = np.int8 if self.quantize else np.float32
+        if self.directory is None:
+            vectors = np.zeros((capacity, self.dim), dtype=dtype)
+            scales = np.zeros(capacity, dtype=np.float32)
+            if self._vectors is not None:
+                vectors[:self._capacity] = self._vectors
+                scales[:self._capacity] = self._scales
+            self._vectors, self._scales = vectors, scales
+        else:
+            files = [(self.directory / ('vectors.i8' if self.quantize else 'vectors.f32'), dtype, (capacity, self.dim))]
+            if self.quantize:
+                files.append((self.directory / 'scales.f32', np.float32, (capacity,)))
+            self._vectors = self._scales = None
+            opened = []
+            for path, file_dtype, shape in files:
+                size = int(np.prod(shape)) * np.dtype(file_dtype).itemsize
+                with open(path, 'ab') as handle:
+                    if handle.tell() < size:
+                        handle.truncate(size)
+                opened.append(np.memmap(path, dtype=file_dtype, mode='r+', shape=shape))
+            self._vectors = opened[0]
+            self._scales = opened[1] if self.quantize else np.ones(0, dtype=np.float32)
+        self._capacity = capacity
+
+    def _load_ivf(self) -> Optional[Dict]:
+        path = self.directory / 'ivf.npz' if self.directory is not None else None
+        if path is None or not path.exists():
+            return None
+        with np.load(path) as data:
+            ivf = {name: data[name] for name in data.files}
+        ivf['count'] = int(ivf['count'])
+        if ivf['count'] > self._count:
+            return None
+        return ivf
+
+    @staticmethod
+    def _where(source: Optional[str], start: Optional[float]) -> Tuple[str, list]:
+        clauses, params = [], []
+        for clause, value in (("source = ?", source), ("published_at >= ?", start)):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+        return (' WHERE ' + ' AND '.join(clauses) if clauses else ''), params
@@ -0,0 +1,345 @@
+import logging
+import math
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Tuple, Union
+from .deduplicator import result_key
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+HOUR = 3600
+DAY = 24 * HOUR
+# * Bucket width and how long buckets are kept, per resolution
+DEFAULT_RESOLUTIONS = {'hour': (HOUR, 14 * DAY), 'day': (DAY, 730 * DAY)}
+ALL_SOURCES = '*'
+
+BucketKey = Tuple[str, str, int]
+
+
+class RunningStats():
+    """
+    Streaming sentiment statistics of one time bucket.
+
+    Counts are kept per label and the confidence mean and variance are updated with
+    Welford's algorithm, so adding a result is O(1) and buckets can be merged without
+    revisiting the results.
+
+    Attributes:
+        count (int): Number of results.
+        positive (int): Results labelled POSITIVE.
+        negative (int): Results labelled NEGATIVE.
+        mean_confidence (float): Mean confidence.
+        m2 (float): Sum of squared differences from the mean confidence.
+    """
+
+    def __init__(self, count: int = 0, positive: int = 0, negative: int = 0,
+                 mean_confidence: float = 0.0, m2: float = 0.0) -> None:
+        self.count = count
+        self.positive = positive
+        self.negative = negative
+        self.mean_confidence = mean_confidence
+        self.m2 = m2
+
+    def add(self, sentiment: str, confidence: float) -> None:
+        self.count += 1
+        if sentiment == 'POSITIVE':
+            self.positive += 1
+        elif sentiment == 'NEGATIVE':
+            self.negative += 1
+        delta = confidence - self.mean_confidence
+        self.mean_confidence += delta / self.count
+        self.m2 += delta * (confidence - self.mean_confidence)
+
+    def merge(self, other: 'RunningStats') -> None:
+        """
+        Fold another bucket into this one (Chan et al. parallel variance).
+        """
+        if other.count == 0:
+            return
+        count = self.count + other.count
+        delta = other.mean_confidence - self.mean_confidence
+        self.mean_confidence += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.positive += other.positive
+        self.negative += other.negative
+
+    def as_dict(self) -> Dict:
+        return {
+            'count': self.count,
+            'positive': self.positive,
+            'negative': self.negative,
+            'positive_ratio': round(self.positive / self.count, 4) if self.count else 0.0,
+            'mean_confidence': round(self.mean_confidence, 4),
+            'confidence_std': round(math.sqrt(self.m2 / self.count), 4) if self.count else 0.0,
+        }
+
+
+class SentimentAggregator():
+    """
+    Rolling per-source sentiment aggregates in fixed-size hour and day buckets.
+
+    Results are added one at a time as ``analyze_news`` produces them. Each result
+    updates one bucket per resolution in O(1), keyed by source and the bucket its
+    publish time (or, if unknown, the time it was added) falls into. Articles are
+    counted once: results whose identity was already aggregated, e.g. when the same
+    feed is analyzed again, are ignored. The identities of aggregated articles live in
+    SQLite, indexed by key and time, so memory only holds those added since the last
+    flush. Buckets older than their resolution's retention are dropped. ``flush``
+    persists changed buckets to SQLite, and the aggregates are reloaded from there on
+    start-up.
+
+    Attributes:
+        logger (logging.Logger): Logger instance for the class.
+        db_path (Union[str, Path]): SQLite database (``:memory:`` keeps the aggregates in memory only).
+        resolutions (Dict[str, Tuple[int, float]]): Bucket width and retention in seconds, per resolution.
+        clock (Callable[[], float]): Time source, replaceable in tests.
+    """
+
+    def __init__(self, db_path: Union[str, Path] = ':memory:',
+                 resolutions: Optional[Dict[str, Tuple[int, float]]] = None,
+                 clock: Callable[[], float] = time.time) -> None:
+        """
+        Initialize the SentimentAggregator and load persisted buckets.
+
+        Args:
+            db_path (Union[str, Path], optional): SQLite database path.
+            resolutions (Optional[Dict[str, Tuple[int, float]]], optional): Bucket width and
+                retention per resolution. Defaults to hourly buckets for 14 days and daily
+                buckets for two years.
+            clock (Callable[[], float], optional): Time source, replaceable in tests.
+        """
+        self.logger = logging.getLogger(__name__)
+        self.logger.debug(f"Initiating Class {__name__}")
+        self.db_path = Path(db_path) if str(db_path) != ':memory:' else db_path
+        if isinstance(self.db_path, Path):
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.resolutions = dict(resolutions or DEFAULT_RESOLUTIONS)
+        self.clock = clock
+        self._retention = max(retention for _, retention in self.resolutions.values())
+        self._lock = threading.Lock()
+        self._buckets: Dict[BucketKey, RunningStats] = {}
+        self._dirty_buckets = set()
+        # * Identities added since the last flush; older ones are looked up in aggregated_items
+        self._new_seen: Dict[Tuple[str, str], float] = {}
+        self._connection = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._connection.executescript("""
+            PRAGMA journal_mode=WAL;
+            CREATE TABLE IF NOT EXISTS sentiment_buckets (
+                resolution TEXT NOT NULL,
+                source TEXT NOT NULL,
+                bucket_start INTEGER NOT NULL,
+                count INTEGER NOT NULL,
+                positive INTEGER NOT NULL,
+                negative INTEGER NOT NULL,
+                mean_confidence REAL NOT NULL,
+                m2 REAL NOT NULL,
+                PRIMARY KEY (resolution, source, bucket_start)
+            );
+            CREATE TABLE IF NOT EXISTS aggregated_items (
+                source TEXT NOT NULL,
+                article_key TEXT NOT NULL,
+                bucket_time REAL NOT NULL,
+                PRIMARY KEY (source, article_key)
+            );
+            CREATE INDEX IF NOT EXISTS idx_aggregated_items_time ON aggregated_items (bucket_time);
+        """)
+        self._load()
+
+    def add(self, source: str, sentiment: str, confidence: float, published: Optional[float] = None,
+            key: Optional[str] = None) -> bool:
+        """
+        Add one scored article to its buckets.
+
+        Args:
+            source (str): Feed URL of the article.
+            sentiment (str): Sentiment label.
+            confidence (float): Confidence of the label.
+            published (Optional[float], optional): Unix publish time; the current time when unknown.
+            key (Optional[str], optional): Article identity (see ``result_key``). Articles
+                with a key are only counted the first time they are added.
+
+        Returns:
+            bool: False if the article had already been aggregated or is older than every
+            retention window.
+        """
+        now = self.clock()
+        if published is None or published != published:
+            published = now
+        if published < now - self._retention:
+            return False
+        with self._lock:
+            if key is not None:
+                if (source, key) in self._new_seen or self._connection.execute(
+                        "SELECT 1 FROM aggregated_items WHERE source = ? AND article_key = ?",
+                        (source, key)).fetchone():
+                    return False
+                self._new_seen[(source, key)] = published
+            for resolution, (width, retention) in self.resolutions.items():
+                if published < now - retention:
+                    continue
+                bucket = (resolution, source, int(published // width) * width)
+                stats = self._buckets.get(bucket)
+                if stats is None:
+                    stats = self._buckets[bucket] = RunningStats()
+                stats.add(sentiment, confidence)
+                self._dirty_buckets.add(bucket)
+        return True
+
+    def add_rows(self, rows: Iterable[Dict]) -> int:
+        """
+        Add result rows such as those of ``analyze_news`` or the FeedPoller.
+
+        Args:
+            rows (Iterable[Dict]): Rows with 'source', 'text', 'sentiment' and 'confidence',
+                and optionally 'link', 'guid' and 'published'.
+
+        Returns:
+            int: The number of rows that were aggregated.
+        """
+        added = 0
+        for row in rows:
+            added += self.add(row['source'], row['sentiment'], row['confidence'], row.get('published'),
+                              result_key(row))
+        return added
+
+    def series(self, resolution: str = 'hour', source: Optional[str] = None,
+               start: Optional[float] = None, end: Optional[float] = None) -> List[Dict]:
+        """
+        Statistics per bucket, oldest first.
+
+        Args:
+            resolution (str, optional): 'hour' or 'day' (or another configured resolution).
+            source (Optional[str], optional): One feed; all feeds combined when omitted.
+            start (Optional[float], optional): Earliest bucket start (Unix time, inclusive).
+            end (Optional[float], optional): Latest bucket start (Unix time, exclusive).
+
+        Returns:
+            List[Dict]: One row per non-empty bucket with 'bucket_start', 'source' and
+            the statistics of ``RunningStats.as_dict``.
+
+        Raises:
+            ValueError: If the resolution is not configured.
+        """
+        if resolution not in self.resolutions:
+            raise ValueError(f"resolution must be one of {list(self.resolutions)}")
+        merged: Dict[int, RunningStats] = {}
+        with self._lock:
+            for (bucket_resolution, bucket_source, bucket_start), stats in self._buckets.items():
+                if bucket_resolution != resolution or (source is not None and bucket_source != source):
+                    continue
+                if (start is not None and bucket_start < start) or (end is not None and bucket_start >= end):
+                    continue
+                merged.setdefault(bucket_start, RunningStats()).merge(stats)
+        return [{'bucket_start': bucket_start, 'source': source or ALL_SOURCES, **merged[bucket_start].as_dict()}
+                for bucket_start in sorted(merged)]
+
+    def summary(self, window: float = DAY, resolution: str = 'hour') -> List[Dict]:
+        """
+        Statistics per source over the most recent window, plus a combined row.
+
+        Args:
+            window (float, optional): Window length in seconds, rounded to whole buckets.
+            resolution (str, optional): Resolution of the buckets that are combined.
+
+        Returns:
+            List[Dict]: One row per source, sorted by source, followed by the ALL_SOURCES row.
+        """
+        width = self.resolutions[resolution][0]
+        start = (int(self.clock() // width) * width) - window + width
+        per_source: Dict[str, RunningStats] = {}
+        with self._lock:
+            for (bucket_resolution, source, bucket_start), stats in self._buckets.items():
+                if bucket_resolution == resolution and bucket_start >= start:
+                    per_source.setdefault(source, RunningStats()).merge(stats)
+        total = RunningStats()
+        rows = []
+        for source in sorted(per_source):
+            total.merge(per_source[source])
+            rows.append({'source': source, **per_source[source].as_dict()})
+        if rows:
+            rows.append({'source': ALL_SOURCES, **total.as_dict()})
+        return rows
+
+    def summary_frame(self, window: float = DAY, resolution: str = 'hour') -> 'pd.DataFrame':
+        """
+        ``summary`` as a DataFrame, for the dashboard panels.
+        """
+        import pandas as pd
+        return pd.DataFrame(self.summary(window, resolution),
+                            columns=['source', 'count', 'positive', 'negative', 'positive_ratio',
+                                     'mean_confidence', 'confidence_std'])
+
+    def series_frame(self, resolution: str = 'hour', window: float = DAY) -> 'pd.DataFrame':
+        """
+        Per-source bucket statistics of the most recent window as a long DataFrame.
+        """
+        import pandas as pd
+        start = self.clock() - window
+        with self._lock:
+            sources = sorted({source for (bucket_resolution, source, _) in self._buckets
+                              if bucket_resolution == resolution})
+        rows = [row for source in sources for row in self.series(resolution, source, start=start)]
+        frame = pd.DataFrame(rows, columns=['bucket_start', 'source', 'count', 'positive', 'negative',
+                                            'positive_ratio', 'mean_confidence', 'confidence_std'])
+        frame['bucket_start'] = pd.to_datetime(frame['bucket_start'], unit='s', utc=True)
+        return frame
+
+    def flush(self) -> int:
+        """
+        Persist changed buckets and newly aggregated articles, and drop expired ones.
+
+        Returns:
+            int: The number of buckets written.
+        """
+        now = self.clock()
+        with self._lock:
+            self._expire(now)
+            buckets = [(resolution, source, bucket_start, stats.count, stats.positive, stats.negative,
+                        stats.mean_confidence, stats.m2)
+                       for (resolution, source, bucket_start) in self._dirty_buckets
+                       for stats in [self._buckets.get((resolution, source, bucket_start))] if stats is not None]
+            seen = [(source, key, bucket_time) for (source, key), bucket_time in self._new_seen.items()]
+            self._new_seen = {}
+            self._dirty_buckets = set()
+            with self._connection:
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO sentiment_buckets (resolution, source, bucket_start, count, "
+                    "positive, negative, mean_confidence, m2) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", buckets)
+                self._connection.executemany(
+                    "INSERT OR IGNORE INTO aggregated_items (source, article_key, bucket_time) VALUES (?, ?, ?)",
+                    seen)
+                for resolution, (_, retention) in self.resolutions.items():
+                    self._connection.execute(
+                        "DELETE FROM sentiment_buckets WHERE resolution = ? AND bucket_start < ?",
+                        (resolution, now - retention - self.resolutions[resolution][0]))
+                self._connection.execute("DELETE FROM aggregated_items WHERE bucket_time < ?",
+                                         (now - self._retention,))
+        self.logger.debug(f"Flushed {len(buckets)} sentiment buckets")
+        return len(buckets)
+
+    def close(self) -> None:
+        """
+        Flush and close the database.
+        """
+        self.flush()
+        with self._lock:
+            self._connection.close()
+
+    def _expire(self, now: float) -> None:
+        for bucket in [bucket for bucket in self._buckets
+                       if bucket[2] + self.resolutions[bucket[0]][0] <= now - self.resolutions[bucket[0]][1]]:
+            del self._buckets[bucket]
+            self._dirty_buckets.discard(bucket)
+
+    def _load(self) -> None:
+        for row in self._connection.execute(
+                "SELECT resolution, source, bucket_start, count, positive, negative, mean_confidence, m2 "
+                "FROM sentiment_buckets"):
+            if row[0] in self.resolutions:
+                self._buckets[(row[0], row[1], row[2])] = RunningStats(*row[3:])
+        self._expire(self.clock())
+        self.logger.debug(f"Loaded {len(self._buckets)} sentiment buckets")
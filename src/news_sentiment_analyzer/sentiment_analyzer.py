@@ -1,20 +1,16 @@
-import yaml
+import hashlib
 import logging
-from typing import Union, List, Dict
+import threading
+from typing import TYPE_CHECKING, Union, List, Dict, Tuple
 from pathlib import Path
-from transformers import pipeline
-from transformers import DistilBertTokenizer, DistilBertForSequenceClassification
+import numpy as np
+from .metrics import METRICS
+from .records import SentimentBatch
 
-config_path = Path(__file__).parents[2] / "logging_config.yaml"
-config_path = Path(config_path)
-if not config_path.is_file():
-    raise FileNotFoundError(f"Logging config file not found: {config_path}")
-try:
-    with open(config_path, 'r') as f:
-        log_config = yaml.safe_load(f)
-        logging.config.dictConfig(log_config)
-except yaml.YAMLError as ex:
-    raise yaml.YAMLError(f"Error parsing logging config file: {str(ex)}")
+if TYPE_CHECKING:
+    # * torch and transformers take seconds to import, so they are loaded with the model
+    import torch
+    from .inference_backends import InferenceBackend
 
 
 class SentimentAnalyzer:
@@ -22,56 +18,126 @@ class SentimentAnalyzer:
     A class for performing sentiment analysis on text using a pre-trained DistilBERT model.
 
     This class uses the DistilBERT model fine-tuned for sentiment analysis on the SST-2 dataset.
-    It can analyze single texts or batches of texts for sentiment.
+    It can analyze single texts or batches of texts for sentiment. Batches are tokenized once,
+    sorted by token length and grouped into padded mini-batches so that each forward pass
+    carries as little padding as possible. Texts longer than the model's maximum input length
+    are split into overlapping windows whose scores are combined into one result. The forward
+    pass is delegated to a pluggable backend: stock PyTorch, dynamically int8-quantized PyTorch,
+    or an ONNX Runtime session.
 
     Attributes:
         logger (logging.Logger): Logger for the class.
+        model_name (str): Name or local path of the pre-trained model.
+        max_batch_size (int): Maximum number of texts per forward pass.
+        max_tokens_per_batch (int): Maximum number of (padded) tokens per forward pass.
+        window_overlap (int): Number of tokens shared by consecutive windows of a long text.
+        window_aggregation (str): Rule used to combine window scores ('mean', 'max' or 'weighted').
+        model_revision (str): Fingerprint of the loaded model and scoring settings, used to key caches.
         tokenizer (DistilBertTokenizer): Tokenizer for the DistilBERT model.
         model (DistilBertForSequenceClassification): Pre-trained DistilBERT model.
-        nlp (pipeline): Sentiment analysis pipeline.
+        backend (InferenceBackend): Engine that runs the forward pass.
+        labels (Tuple[str, ...]): Label of each class id, used as the codes of a SentimentBatch.
     '''
 
-    def __init__(self):
+    DEFAULT_MODEL_NAME = "distilbert-base-uncased-finetuned-sst-2-english"
+    WINDOW_AGGREGATIONS = ('mean', 'max', 'weighted')
+
+    def __init__(self, model_name: str = DEFAULT_MODEL_NAME, max_batch_size: int = 32,
+                 max_tokens_per_batch: int = 8192, window_overlap: int = 64,
+                 window_aggregation: str = 'mean', backend: str = 'torch',
+                 artifact_dir: Union[str, Path, None] = None):
         """
-        Initialize the SentimentAnalyzer with logging configuration and pre-trained model.
+        Initialize the SentimentAnalyzer with a pre-trained model.
 
         Args:
-            config_path (Union[str, Path], optional): Path to the logging configuration file.
-                If None, it looks for 'logging_config.yaml' in the project root.
+            model_name (str, optional): HuggingFace model name or local path of the model.
+            max_batch_size (int, optional): Maximum number of texts per forward pass.
+            max_tokens_per_batch (int, optional): Maximum number of padded tokens per forward pass.
+            window_overlap (int, optional): Number of tokens shared by consecutive windows when a
+                text is longer than the model's maximum input length.
+            window_aggregation (str, optional): How window scores are combined: 'mean' averages the
+                class probabilities, 'max' keeps the most confident window and 'weighted' averages
+                the probabilities weighted by window length.
+            backend (str, optional): Inference backend: 'torch', 'int8' or 'onnx'.
+            artifact_dir (Union[str, Path, None], optional): Where exported or quantized model
+                artifacts are cached. Defaults to ~/.cache/news_sentiment_analyzer/artifacts.
 
         Raises:
-            FileNotFoundError: If the logging configuration file is not found.
+            ValueError: If the batch limits are not positive, or the aggregation rule or
+                backend is unknown.
         """
         self.logger = logging.getLogger(__name__)
         self.logger.debug(f"Initiating Class {__name__}")
-        model_name = "distilbert-base-uncased-finetuned-sst-2-english"
+        if max_batch_size < 1 or max_tokens_per_batch < 1:
+            raise ValueError("max_batch_size and max_tokens_per_batch must be positive")
+        self.model_name = model_name
+        self.max_batch_size = max_batch_size
+        self.max_tokens_per_batch = max_tokens_per_batch
+        if window_aggregation not in self.WINDOW_AGGREGATIONS:
+            raise ValueError(
+                f"window_aggregation must be one of {self.WINDOW_AGGREGATIONS}")
+        self.window_overlap = max(0, window_overlap)
+        self.window_aggregation = window_aggregation
+        from transformers import DistilBertTokenizer, DistilBertForSequenceClassification
+        from .inference_backends import BACKENDS, create_backend
+        if backend not in BACKENDS:
+            raise ValueError(f"backend must be one of {tuple(BACKENDS)}")
+        # * Serializes forward passes when one instance is shared across sessions
+        self._inference_lock = threading.Lock()
 
         try:
             # Load the pre-trained tokenizer and model from HuggingFace
             self.tokenizer = DistilBertTokenizer.from_pretrained(model_name)
             self.model = DistilBertForSequenceClassification.from_pretrained(
                 model_name)
-
-            # Create the sentiment analysis pipeline
-            self.nlp = pipeline('sentiment-analysis',
-                                model=self.model, tokenizer=self.tokenizer)
+            self.model.eval()
         except Exception as ex:
             self.logger.error(
-                f"Error loading model or creating pipeline: {str(ex)}")
+                f"Error loading model: {str(ex)}")
             raise
+        self._model_fingerprint = self._fingerprint_model()
+        self.backend: 'InferenceBackend' = create_backend(
+            backend, self.model, self._model_fingerprint, artifact_dir)
+        id2label = self.model.config.id2label
+        self.labels = tuple(id2label[i] for i in range(len(id2label)))
+
+    @property
+    def model_revision(self) -> str:
+        """
+        Fingerprint of the loaded model and the settings that affect its scores.
+
+        Returns:
+            str: A short hex digest that changes whenever the model weights, its
+            configuration, the backend or the long-text windowing settings change.
+        """
+        return (f'{self._model_fingerprint}:{self.backend.name}:'
+                f'{self.window_aggregation}:{self.window_overlap}')
+
+    def _fingerprint_model(self) -> str:
+        parts = [getattr(self.model.config, '_commit_hash', None) or '',
+                 self.model.config.to_json_string()]
+        model_dir = Path(self.model_name)
+        if model_dir.is_dir():
+            # * Local models have no hub revision, so use the weight files' metadata
+            for weights in sorted(model_dir.glob('*.safetensors')) + sorted(model_dir.glob('*.bin')):
+                stat = weights.stat()
+                parts.append(f'{weights.name}:{stat.st_size}:{stat.st_mtime_ns}')
+        return hashlib.sha256('\n'.join(parts).encode('utf-8')).hexdigest()[:16]
 
     def get_sentiment(self, text: Union[str, List[str]]) -> Union[Dict, List[Dict]]:
         """
         Generate sentiment analysis for the given text or list of texts.
 
         This method performs sentiment analysis on the input text(s) using the pre-trained model.
+        A list is scored as a batch and the results are returned in input order.
 
         Args:
             text (Union[str, List[str]]): A single text string or a list of text strings to analyze.
 
         Returns:
             Union[Dict, List[Dict]]: A dictionary (for single input) or list of dictionaries (for multiple inputs)
-                containing the sentiment analysis results. Each dictionary includes 'label' and 'score' keys.
+                containing the sentiment analysis results. Each dictionary includes 'text', 'sentiment'
+                and 'confidence' keys.
 
         Raises:
             ValueError: If the input text is empty or None.
@@ -85,7 +151,7 @@ class SentimentAnalyzer:
             if isinstance(text, str):
                 return self._process_single_text(text)
             elif isinstance(text, list):
-                return [self._process_single_text(t) for t in text]
+                return self._process_batch(text).to_dicts()
             else:
                 raise ValueError("Input must be a string or a list of strings")
         except Exception as ex:
@@ -102,21 +168,163 @@ class SentimentAnalyzer:
 
         Returns:
             Dict: A dictionary containing the sentiment analysis result.
+        """
+        return self._process_batch([text])[0]
+
+    def score_batch(self, texts: List[str]) -> SentimentBatch:
+        """
+        Score a list of texts and return the results as compact arrays.
+
+        Like ``get_sentiment`` for a list, but the labels come back as int8 codes into
+        ``labels`` and the confidences as a float32 array, without building a dict per text.
+
+        Args:
+            texts (List[str]): The texts to analyze.
+
+        Returns:
+            SentimentBatch: The results, in the same order as ``texts``.
 
         Raises:
-            ValueError: If the input text is too long for the model.
+            ValueError: If texts is empty.
         """
-        # Check if the text is too long for the model
-        if len(self.tokenizer.encode(text)) > self.model.config.max_position_embeddings:
-            self.logger.exception(
-                f"Input text is too long. Maximum length is {self.model.config.max_position_embeddings} tokens.")
-            raise ValueError(
-                f"Input text is too long. Maximum length is {self.model.config.max_position_embeddings} tokens.")
-        result = self.nlp(text)[0]
-        dict_result = {
-            'text': text,
-            'sentiment': result['label'],
-            'confidence': round(result['score'], 3)
-        }
-        self.logger.debug(f'result: {dict_result}')
-        return dict_result
+        if not texts:
+            raise ValueError("Input text cannot be empty or None")
+        return self._process_batch(texts)
+
+    def _process_batch(self, texts: List[str]) -> SentimentBatch:
+        """
+        Process a list of texts for sentiment analysis with length-bucketed batching.
+
+        Every text is tokenized exactly once and the token ids are reused for inference.
+        Over-long texts are split into overlapping windows that are scored in the same
+        batches as the other texts and then combined with ``window_aggregation``.
+
+        Args:
+            texts (List[str]): The texts to analyze.
+
+        Returns:
+            SentimentBatch: The sentiment analysis results, in the same order as ``texts``.
+        """
+        windows, owners = [], []
+        with METRICS.timer('tokenize_seconds'):
+            token_ids = self.tokenizer(texts, add_special_tokens=False)['input_ids']
+        for i, ids in enumerate(token_ids):
+            for window in self._split_windows(ids):
+                windows.append(window)
+                owners.append(i)
+
+        window_probabilities = [None] * len(windows)
+        for batch in self._plan_batches([len(window) for window in windows]):
+            probabilities = self._forward([windows[i] for i in batch])
+            for i, row in zip(batch, probabilities):
+                window_probabilities[i] = row
+
+        METRICS.inc('texts_scored_total', len(texts))
+        grouped = [[] for _ in texts]
+        for owner, window, row in zip(owners, windows, window_probabilities):
+            grouped[owner].append((len(window), row))
+
+        codes = np.empty(len(texts), dtype=np.int8)
+        confidences = np.empty(len(texts), dtype=np.float32)
+        for i, scored_windows in enumerate(grouped):
+            score, label = self._aggregate_windows(scored_windows)
+            codes[i], confidences[i] = label, round(score, 3)
+        results = SentimentBatch(self.labels, codes, confidences, texts)
+        if self.logger.isEnabledFor(logging.DEBUG):
+            for result in results:
+                self.logger.debug('result: %s', result)
+        return results
+
+    def _split_windows(self, ids: List[int]) -> List[List[int]]:
+        """
+        Split token ids into model-sized windows and add the special tokens.
+
+        Args:
+            ids (List[int]): Token ids of one text, without special tokens.
+
+        Returns:
+            List[List[int]]: One window for texts that fit the model, otherwise overlapping
+            windows covering the whole text (the last window is aligned to the end).
+        """
+        cls_id, sep_id = self.tokenizer.cls_token_id, self.tokenizer.sep_token_id
+        window_length = self.model.config.max_position_embeddings - 2
+        if len(ids) <= window_length:
+            return [[cls_id] + ids + [sep_id]]
+
+        step = max(1, window_length - min(self.window_overlap, window_length - 1))
+        starts = list(range(0, len(ids) - window_length, step))
+        starts.append(len(ids) - window_length)
+        self.logger.debug('Splitting %d tokens into %d windows', len(ids), len(starts))
+        return [[cls_id] + ids[start:start + window_length] + [sep_id] for start in starts]
+
+    def _aggregate_windows(self, scored_windows: List[Tuple[int, 'torch.Tensor']]) -> Tuple[float, int]:
+        """
+        Combine the class probabilities of a text's windows.
+
+        Args:
+            scored_windows (List): (window length, class probabilities) pairs for one text.
+
+        Returns:
+            Tuple[float, int]: The confidence and label id of the combined prediction.
+        """
+        import torch
+        if len(scored_windows) == 1:
+            score, label = scored_windows[0][1].max(dim=-1)
+        elif self.window_aggregation == 'max':
+            score, label = max((row.max(dim=-1) for _, row in scored_windows),
+                               key=lambda pair: pair[0].item())
+        else:
+            rows = torch.stack([row for _, row in scored_windows])
+            if self.window_aggregation == 'weighted':
+                weights = torch.tensor([length for length, _ in scored_windows],
+                                       dtype=rows.dtype)
+            else:
+                weights = torch.ones(len(scored_windows), dtype=rows.dtype)
+            combined = (rows * weights.unsqueeze(-1)).sum(dim=0) / weights.sum()
+            score, label = combined.max(dim=-1)
+        return score.item(), label.item()
+
+    def _plan_batches(self, lengths: List[int]) -> List[List[int]]:
+        """
+        Group input indices into batches of similar token length.
+
+        Indices are sorted by length (longest first) and packed greedily, starting a new
+        batch whenever adding the next item would exceed ``max_batch_size`` or the padded
+        size (items x longest item) would exceed ``max_tokens_per_batch``.
+
+        Args:
+            lengths (List[int]): Token length of each input.
+
+        Returns:
+            List[List[int]]: Batches of indices into ``lengths``.
+        """
+        batches = []
+        current, current_max = [], 0
+        for i in sorted(range(len(lengths)), key=lambda i: lengths[i], reverse=True):
+            padded_len = max(current_max, lengths[i])
+            if current and (len(current) >= self.max_batch_size
+                            or padded_len * (len(current) + 1) > self.max_tokens_per_batch):
+                batches.append(current)
+                current, padded_len = [], lengths[i]
+            current.append(i)
+            current_max = padded_len
+        if current:
+            batches.append(current)
+        return batches
+
+    def _forward(self, batch_ids: List[List[int]]) -> 'torch.Tensor':
+        """
+        Run one padded forward pass through the model.
+
+        Args:
+            batch_ids (List[List[int]]): Token ids (with special tokens) for each item.
+
+        Returns:
+            torch.Tensor: Class probabilities with shape (len(batch_ids), num_labels).
+        """
+        import torch
+        inputs = self.tokenizer.pad({'input_ids': batch_ids}, return_tensors='pt')
+        with self._inference_lock, METRICS.timer('inference_seconds', backend=self.backend.name):
+            logits = self.backend.predict(inputs['input_ids'], inputs['attention_mask'])
+        METRICS.inc('inference_batches_total', backend=self.backend.name)
+        return torch.softmax(logits, dim=-1)
@@ -0,0 +1,332 @@
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+import numpy as np
+from .metrics import METRICS
+from .records import SentimentBatch
+
+
+class SentimentCache():
+    """
+    Content-addressed cache of sentiment results in front of a SentimentAnalyzer.
+
+    Results are keyed by a SHA-256 hash of (normalized text, model name, model revision),
+    so the same headline seen in another feed or another run is only scored once. Lookups
+    go through an in-memory LRU tier first and an optional on-disk SQLite tier second.
+    Entries are evicted by count and by age, and all entries of a model are dropped when
+    its revision changes.
+
+    Attributes:
+        logger (logging.Logger): Logger instance for the class.
+        db_path (Optional[Path]): Path of the SQLite database, or None for memory only.
+        max_memory_entries (int): Capacity of the in-memory LRU tier.
+        max_disk_entries (int): Capacity of the SQLite tier.
+        max_age_seconds (Optional[float]): Entries older than this are treated as misses.
+    """
+
+    def __init__(self, db_path: Optional[Union[str, Path]] = None, max_memory_entries: int = 10000,
+                 max_disk_entries: int = 1000000, max_age_seconds: Optional[float] = 30 * 24 * 3600) -> None:
+        """
+        Initialize the SentimentCache.
+
+        Args:
+            db_path (Optional[Union[str, Path]], optional): SQLite database path. None keeps
+                the cache in memory only.
+            max_memory_entries (int, optional): Capacity of the in-memory LRU tier.
+            max_disk_entries (int, optional): Capacity of the SQLite tier.
+            max_age_seconds (Optional[float], optional): Maximum age of an entry. None disables
+                age-based eviction.
+        """
+        self.logger = logging.getLogger(__name__)
+        self.logger.debug(f"Initiating Class {__name__}")
+        self.db_path = Path(db_path) if db_path else None
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self.max_age_seconds = max_age_seconds
+        self._memory: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._revisions: Dict[str, str] = {}
+        self._counters = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'evictions': 0}
+        self._connection = None
+        self._disk_entries = 0
+        if self.db_path:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            self._connection.executescript("""
+                PRAGMA journal_mode=WAL;
+                CREATE TABLE IF NOT EXISTS sentiment_cache (
+                    key TEXT PRIMARY KEY,
+                    model_name TEXT NOT NULL,
+                    sentiment TEXT NOT NULL,
+                    confidence REAL NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_sentiment_cache_accessed ON sentiment_cache (accessed_at);
+                CREATE INDEX IF NOT EXISTS idx_sentiment_cache_created ON sentiment_cache (created_at);
+                CREATE TABLE IF NOT EXISTS model_revisions (
+                    model_name TEXT PRIMARY KEY,
+                    revision TEXT NOT NULL
+                );
+            """)
+            self._disk_entries = self._disk_count()
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """
+        Normalize text so trivially different copies share a cache entry.
+
+        Args:
+            text (str): The text to normalize.
+
+        Returns:
+            str: NFKC-normalized text with whitespace collapsed.
+        """
+        return ' '.join(unicodedata.normalize('NFKC', text).split())
+
+    @classmethod
+    def make_key(cls, text: str, model_name: str, model_revision: str) -> str:
+        """
+        Build the cache key for a text scored by a given model.
+
+        Args:
+            text (str): The text to score.
+            model_name (str): Name of the model.
+            model_revision (str): Revision fingerprint of the model.
+
+        Returns:
+            str: Hex SHA-256 digest.
+        """
+        payload = '\0'.join((cls.normalize(text), model_name, model_revision))
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get_sentiment(self, analyzer, text: Union[str, List[str]]) -> Union[Dict, List[Dict]]:
+        """
+        Score text through the cache, sending only cache misses to the analyzer.
+
+        Args:
+            analyzer (SentimentAnalyzer): The analyzer used for cache misses.
+            text (Union[str, List[str]]): A single text string or a list of text strings.
+
+        Returns:
+            Union[Dict, List[Dict]]: Results in the same shape and order as
+            SentimentAnalyzer.get_sentiment.
+        """
+        if isinstance(text, str):
+            return self.get_sentiment(analyzer, [text])[0]
+        if not text:
+            return analyzer.get_sentiment(text)
+        return self.score_batch(analyzer, text).to_dicts()
+
+    def score_batch(self, analyzer, texts: List[str]) -> SentimentBatch:
+        """
+        Score a list of texts through the cache and return the results as compact arrays.
+
+        Cache misses are scored with ``analyzer.score_batch`` when the analyzer has it,
+        otherwise with ``analyzer.get_sentiment``.
+
+        Args:
+            analyzer (SentimentAnalyzer): The analyzer used for cache misses.
+            texts (List[str]): The texts to score.
+
+        Returns:
+            SentimentBatch: Results in the same order as ``texts``.
+
+        Raises:
+            ValueError: If texts is empty.
+        """
+        if not texts:
+            raise ValueError("Input text cannot be empty or None")
+        model_name, revision = analyzer.model_name, analyzer.model_revision
+        self._check_revision(model_name, revision)
+        keys = [self.make_key(t, model_name, revision) for t in texts]
+        cached = self._lookup(keys)
+
+        label_codes = {label: code for code, label in enumerate(getattr(analyzer, 'labels', ()))}
+        codes = np.empty(len(texts), dtype=np.int8)
+        confidences = np.empty(len(texts), dtype=np.float32)
+        missing: Dict[str, List[int]] = {}
+        for i, key in enumerate(keys):
+            if key in cached:
+                sentiment, confidence = cached[key]
+                codes[i] = label_codes.setdefault(sentiment, len(label_codes))
+                confidences[i] = confidence
+            else:
+                # * Identical texts in one call are scored once
+                missing.setdefault(key, []).append(i)
+        if METRICS.enabled:
+            misses = sum(len(positions) for positions in missing.values())
+            METRICS.inc('sentiment_cache_hits_total', len(texts) - misses)
+            METRICS.inc('sentiment_cache_misses_total', misses)
+
+        if missing:
+            scored = self._score(analyzer, [texts[positions[0]] for positions in missing.values()])
+            entries = {}
+            for index, key in enumerate(missing):
+                sentiment, confidence = scored.sentiment(index), scored.confidence(index)
+                entries[key] = (sentiment, confidence)
+                positions = missing[key]
+                codes[positions] = label_codes.setdefault(sentiment, len(label_codes))
+                confidences[positions] = confidence
+            self._store(model_name, entries)
+        return SentimentBatch(label_codes, codes, confidences, list(texts))
+
+    @staticmethod
+    def _score(analyzer, texts: List[str]) -> SentimentBatch:
+        score_batch = getattr(analyzer, 'score_batch', None)
+        if score_batch is not None:
+            return score_batch(texts)
+        return SentimentBatch.from_dicts(analyzer.get_sentiment(texts))
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """
+        Get hit/miss counters.
+
+        Returns:
+            Dict[str, Union[int, float]]: Counters plus the overall hit ratio and tier sizes.
+            The disk tier's size is tracked as entries are stored and evicted, not counted.
+        """
+        with self._lock:
+            stats = dict(self._counters)
+            stats['memory_entries'] = len(self._memory)
+            stats['disk_entries'] = self._disk_entries
+        lookups = stats['memory_hits'] + stats['disk_hits'] + stats['misses']
+        stats['hit_ratio'] = round((stats['memory_hits'] + stats['disk_hits']) / lookups, 4) if lookups else 0.0
+        return stats
+
+    def clear(self) -> None:
+        """
+        Remove every cached entry from both tiers.
+        """
+        with self._lock:
+            self._memory.clear()
+            if self._connection:
+                with self._connection:
+                    self._connection.execute("DELETE FROM sentiment_cache")
+                self._disk_entries = 0
+
+    def close(self) -> None:
+        """
+        Close the SQLite connection.
+        """
+        if self._connection:
+            self._connection.close()
+            self._connection = None
+
+    def _check_revision(self, model_name: str, revision: str) -> None:
+        if self._revisions.get(model_name) == revision:
+            return
+        with self._lock:
+            if self._connection:
+                row = self._connection.execute(
+                    "SELECT revision FROM model_revisions WHERE model_name = ?", (model_name,)).fetchone()
+                if row and row[0] != revision:
+                    self.logger.info(f'Model {model_name} changed, invalidating cached sentiment')
+                    with self._connection:
+                        cursor = self._connection.execute(
+                            "DELETE FROM sentiment_cache WHERE model_name = ?", (model_name,))
+                    self._disk_entries -= max(cursor.rowcount, 0)
+                with self._connection:
+                    self._connection.execute(
+                        "INSERT OR REPLACE INTO model_revisions (model_name, revision) VALUES (?, ?)",
+                        (model_name, revision))
+            self._revisions[model_name] = revision
+
+    def _lookup(self, keys: List[str]) -> Dict[str, tuple]:
+        now = time.time()
+        found, tiers = {}, {}
+        with self._lock:
+            for key in set(keys):
+                entry = self._memory.get(key)
+                if entry is not None and not self._expired(entry[2], now):
+                    self._memory.move_to_end(key)
+                    found[key] = entry[:2]
+                    tiers[key] = 'memory_hits'
+            remaining = [key for key in set(keys) if key not in found]
+            if self._connection and remaining:
+                for start in range(0, len(remaining), 500):
+                    chunk = remaining[start:start + 500]
+                    placeholders = ','.join('?' * len(chunk))
+                    rows = self._connection.execute(
+                        f"SELECT key, sentiment, confidence, created_at FROM sentiment_cache "
+                        f"WHERE key IN ({placeholders})", chunk).fetchall()
+                    for key, sentiment, confidence, created_at in rows:
+                        if self._expired(created_at, now):
+                            continue
+                        found[key] = (sentiment, confidence)
+                        tiers[key] = 'disk_hits'
+                        self._remember(key, (sentiment, confidence, created_at))
+                disk_keys = [key for key, tier in tiers.items() if tier == 'disk_hits']
+                if disk_keys:
+                    with self._connection:
+                        self._connection.executemany(
+                            "UPDATE sentiment_cache SET accessed_at = ? WHERE key = ?",
+                            [(now, key) for key in disk_keys])
+            for key in keys:
+                self._counters[tiers.get(key, 'misses')] += 1
+        return found
+
+    def _store(self, model_name: str, entries: Dict[str, tuple]) -> None:
+        now = time.time()
+        with self._lock:
+            for key, (sentiment, confidence) in entries.items():
+                self._remember(key, (sentiment, confidence, now))
+            if self._connection:
+                # * Expired entries, or entries stored by another session, are replaced rather than added
+                keys = list(entries)
+                replaced = 0
+                for start in range(0, len(keys), 500):
+                    chunk = keys[start:start + 500]
+                    placeholders = ','.join('?' * len(chunk))
+                    replaced += self._connection.execute(
+                        f"SELECT COUNT(*) FROM sentiment_cache WHERE key IN ({placeholders})", chunk).fetchone()[0]
+                with self._connection:
+                    self._connection.executemany(
+                        "INSERT OR REPLACE INTO sentiment_cache "
+                        "(key, model_name, sentiment, confidence, created_at, accessed_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        [(key, model_name, sentiment, confidence, now, now)
+                         for key, (sentiment, confidence) in entries.items()])
+                self._disk_entries += len(entries) - replaced
+                self._evict_disk(now)
+
+    def _remember(self, key: str, entry: tuple) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+            self._counters['evictions'] += 1
+
+    def _evict_disk(self, now: float) -> None:
+        # * Other processes may share the database, so count exactly before evicting for size
+        if self._disk_entries <= self.max_disk_entries and self.max_age_seconds is None:
+            return
+        with self._connection:
+            if self.max_age_seconds is not None:
+                cursor = self._connection.execute(
+                    "DELETE FROM sentiment_cache WHERE created_at < ?", (now - self.max_age_seconds,))
+                self._counters['evictions'] += max(cursor.rowcount, 0)
+                self._disk_entries -= max(cursor.rowcount, 0)
+            if self._disk_entries > self.max_disk_entries:
+                self._disk_entries = self._disk_count()
+            excess = self._disk_entries - self.max_disk_entries
+            if excess > 0:
+                cursor = self._connection.execute(
+                    "DELETE FROM sentiment_cache WHERE key IN ("
+                    "SELECT key FROM sentiment_cache ORDER BY accessed_at LIMIT ?)", (excess,))
+                self._counters['evictions'] += max(cursor.rowcount, 0)
+                self._disk_entries -= max(cursor.rowcount, 0)
+
+    def _disk_count(self) -> int:
+        if not self._connection:
+            return 0
+        return self._connection.execute("SELECT COUNT(*) FROM sentiment_cache").fetchone()[0]
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self.max_age_seconds is not None and now - created_at > self.max_age_seconds
@@ -0,0 +1,125 @@
+import html
+import logging
+import re
+import unicodedata
+from typing import Iterable, List, Optional, Tuple
+
+# * Emoji blocks (pictographs, emoticons, dingbats, flags, skin tones) and emoji modifiers
+EMOJI_RANGES = (
+    (0x1F000, 0x1FAFF), (0x2600, 0x27BF), (0x2B00, 0x2BFF), (0x231A, 0x231B), (0x2328, 0x2328),
+    (0x23CF, 0x23CF), (0x23E9, 0x23F3), (0x23F8, 0x23FA), (0x3030, 0x3030), (0x303D, 0x303D),
+    (0x3297, 0x3297), (0x3299, 0x3299), (0xFE00, 0xFE0F), (0x20E3, 0x20E3), (0xE0020, 0xE007F),
+)
+# * Invisible formatting characters (zero-width, bidi controls, soft hyphen, BOM)
+FORMAT_RANGES = ((0x00AD, 0x00AD), (0x200B, 0x200F), (0x202A, 0x202E), (0x2060, 0x2064), (0xFEFF, 0xFEFF))
+# * Control characters that str.split() does not already treat as whitespace
+CONTROL_RANGES = ((0x00, 0x08), (0x0E, 0x1B), (0x7F, 0x84), (0x86, 0x9F))
+WHITESPACE_CONTROLS = '\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f\x85\u2028\u2029'
+TAG_PATTERN = re.compile(r'<!--.*?-->|</?[A-Za-z][^<>]*>', re.S)
+# * unicodedata.is_normalized is new in Python 3.8; before that the text is always normalized
+_is_normalized = getattr(unicodedata, 'is_normalized', lambda form, text: False)
+
+
+def _compile_removal(ranges: Tuple[Tuple[int, int], ...]) -> Optional['re.Pattern']:
+    if not ranges:
+        return None
+    parts = []
+    for start, end in ranges:
+        parts.append(re.escape(chr(start)) if start == end else f'{re.escape(chr(start))}-{re.escape(chr(end))}')
+    return re.compile(f"[{''.join(parts)}]+")
+
+
+class TextNormalizer():
+    """
+    Precompiled, policy-driven text normalizer for feed titles, links and descriptions.
+
+    Emoji and control characters are removed by one character-class regular expression
+    compiled in the constructor, and whitespace is collapsed by one split/join. Pure
+    ASCII text skips the character pass entirely. Unlike the previous ASCII round trip,
+    accented and other non-ASCII letters are kept by default.
+
+    Attributes:
+        keep_unicode (bool): Keep non-ASCII letters; False drops every non-ASCII character.
+        strip_emoji (bool): Remove emoji, flags, skin tones and variation selectors.
+        strip_control (bool): Remove control and invisible formatting characters.
+        collapse_whitespace (bool): Collapse whitespace runs to one space and strip the ends.
+        unescape_html (bool): Decode HTML entities such as ``&amp;`` and ``&#8217;``.
+        strip_tags (bool): Remove HTML tags and comments, also those that were entity-escaped.
+        unicode_form (Optional[str]): Unicode normalization form applied last, e.g. 'NFC'.
+    """
+
+    def __init__(self, keep_unicode: bool = True, strip_emoji: bool = True, strip_control: bool = True,
+                 collapse_whitespace: bool = True, unescape_html: bool = False, strip_tags: bool = False,
+                 unicode_form: Optional[str] = 'NFC') -> None:
+        self.logger = logging.getLogger(__name__)
+        self.keep_unicode = keep_unicode
+        self.strip_emoji = strip_emoji
+        self.strip_control = strip_control
+        self.collapse_whitespace = collapse_whitespace
+        self.unescape_html = unescape_html
+        self.strip_tags = strip_tags
+        self.unicode_form = unicode_form
+        ranges = (EMOJI_RANGES if strip_emoji else ()) + (CONTROL_RANGES + FORMAT_RANGES if strip_control else ())
+        self._removal = _compile_removal(ranges)
+        # * Without collapsing, line breaks and tabs still become plain spaces
+        self._spaces = (str.maketrans(WHITESPACE_CONTROLS, ' ' * len(WHITESPACE_CONTROLS))
+                        if strip_control and not collapse_whitespace else None)
+
+    def normalize(self, text: str) -> str:
+        """
+        Normalize one string.
+
+        Args:
+            text (str): The raw text.
+
+        Returns:
+            str: The normalized text.
+        """
+        if not text:
+            return ''
+        text = self._normalize_characters(text)
+        if self.collapse_whitespace:
+            return ' '.join(text.split())
+        return text
+
+    def normalize_batch(self, texts: Iterable[str]) -> List[str]:
+        """
+        Normalize many strings at once, e.g. every description of a feed.
+
+        Args:
+            texts (Iterable[str]): The raw texts.
+
+        Returns:
+            List[str]: The normalized texts, in input order.
+        """
+        normalize_characters = self._normalize_characters
+        if self.collapse_whitespace:
+            return [' '.join(normalize_characters(text).split()) if text else '' for text in texts]
+        return [normalize_characters(text) if text else '' for text in texts]
+
+    def _normalize_characters(self, text: str) -> str:
+        if self.strip_tags and '<' in text:
+            text = TAG_PATTERN.sub(' ', text)
+        if self.unescape_html and '&' in text:
+            text = html.unescape(text)
+            # * Escaped markup such as &lt;b&gt; only becomes a tag once unescaped
+            if self.strip_tags and '<' in text:
+                text = TAG_PATTERN.sub(' ', text)
+        if not text.isascii():
+            if not self.keep_unicode:
+                text = text.encode('ascii', 'ignore').decode('ascii')
+            else:
+                if self._removal:
+                    text = self._removal.sub('', text)
+                if self.unicode_form and not _is_normalized(self.unicode_form, text):
+                    text = unicodedata.normalize(self.unicode_form, text)
+        if self.strip_control and not text.isprintable():
+            text = self._removal.sub('', text)
+            if self._spaces:
+                text = text.translate(self._spaces)
+        return text
+
+
+# * Policies used by the RSS adapters: plain fields, and descriptions that may carry HTML
+DEFAULT_NORMALIZER = TextNormalizer()
+HTML_NORMALIZER = TextNormalizer(unescape_html=True, strip_tags=True)
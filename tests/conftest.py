@@ -0,0 +1,23 @@
+import pytest
+from benchmarks.tiny_model import build_tiny_model
+
+
+@pytest.fixture(scope="session")
+def tiny_model_dir(tmp_path_factory):
+    '''
+    Build a tiny randomly initialised DistilBERT classifier on disk so tests
+    can load a SentimentAnalyzer without network access.
+    '''
+    return build_tiny_model(tmp_path_factory.mktemp("tiny_distilbert"))
+
+
+@pytest.fixture
+def tiny_analyzer(tiny_model_dir, monkeypatch):
+    '''
+    The tiny model's SentimentAnalyzer, returned by ModelRegistry.get for any model name
+    so a NewsSentimentAnalyzer built in the test scores with it.
+    '''
+    from src.news_sentiment_analyzer.model_registry import ModelRegistry
+    analyzer = ModelRegistry.get(tiny_model_dir)
+    monkeypatch.setattr(ModelRegistry, "get", lambda *args, **kwargs: analyzer)
+    return analyzer
@@ -0,0 +1,27 @@
+import pytest
+from benchmarks.run_benchmarks import FIXTURES, compare, make_source, time_case
+
+# ? pytest -vs tests/test_benchmarks.py
+
+
+@pytest.mark.parametrize("name,expected", [('nyt_small', 25), ('abc_medium', 100), ('nyt_large', 400)])
+def test_fixtures_scrape_offline(name, expected):
+    articles = make_source(name).scrape_rss_feed()
+    assert len(articles) == expected
+    assert all(article['title'] for article in articles)
+    assert set(FIXTURES) == {'nyt_small', 'abc_medium', 'nyt_large'}
+
+
+def test_time_case_reports_timings():
+    result = time_case(lambda: sum(range(100)), repeat=3)
+    assert result['repeat'] == 3
+    assert 0 <= result['min_seconds'] <= result['median_seconds']
+
+
+def test_compare_flags_regressions():
+    baseline = {'results': {'fast': {'median_seconds': 0.010}, 'slow': {'median_seconds': 0.010}}}
+    current = {'results': {'fast': {'median_seconds': 0.011}, 'slow': {'median_seconds': 0.020},
+                           'new_case': {'median_seconds': 1.0}}}
+    regressions = compare(current, baseline, tolerance=0.25)
+    assert [regression['case'] for regression in regressions] == ['slow']
+    assert regressions[0]['slowdown'] == 2.0
@@ -0,0 +1,76 @@
+import json
+import threading
+import pytest
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from src.news_sentiment_analyzer import cli
+from src.news_sentiment_analyzer.results_store import ResultsStore
+
+# ? pytest -vs tests/test_cli.py
+
+FIXTURE_DIR = Path(__file__).parents[1] / "benchmarks" / "fixtures"
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def fixture_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), partial(QuietHandler, directory=str(FIXTURE_DIR)))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
+
+
+def test_load_feed_urls_from_text_and_opml(tmp_path):
+    text_list = tmp_path / 'feeds.txt'
+    text_list.write_text("# news\nhttp://a.example/rss\n\nhttp://b.example/rss\nhttp://a.example/rss\n")
+    assert cli.load_feed_urls(text_list) == ['http://a.example/rss', 'http://b.example/rss']
+
+    opml = tmp_path / 'feeds.opml'
+    opml.write_text('<?xml version="1.0"?><opml version="2.0"><body>'
+                    '<outline text="News"><outline text="A" type="rss" xmlUrl="http://a.example/rss"/>'
+                    '<outline text="B" type="rss" xmlUrl="http://b.example/rss"/></outline>'
+                    '</body></opml>')
+    assert cli.load_feed_urls(opml) == ['http://a.example/rss', 'http://b.example/rss']
+
+
+def test_stage_seconds_totals_sources():
+    summary = {'fetch_seconds_sum{source="a"}': 1.0, 'fetch_seconds_sum{source="b"}': 0.5,
+               'fetch_seconds_count{source="a"}': 1, 'tokenize_seconds_sum': 0.25,
+               'articles_scraped_total{source="a"}': 10}
+    assert cli.stage_seconds(summary) == {'fetch': 1.5, 'tokenize': 0.25}
+
+
+def test_cli_writes_jsonl_and_report(tmp_path, tiny_model_dir, fixture_server, capsys):
+    feeds = tmp_path / 'feeds.txt'
+    feeds.write_text(f"{fixture_server}/nyt_small.xml\n{fixture_server}/abc_medium.xml\n"
+                     f"{fixture_server}/missing.xml\n")
+    output, report_path = tmp_path / 'out.jsonl', tmp_path / 'report.json'
+    store_path = tmp_path / 'results.db'
+    assert cli.main([str(feeds), '-o', str(output), '--model', tiny_model_dir,
+                     '--report', str(report_path), '--store', str(store_path)]) == 0
+
+    rows = [json.loads(line) for line in output.read_text().splitlines()]
+    assert len(rows) == 125
+    assert set(rows[0]) == set(cli.RESULT_FIELDS)
+    assert ResultsStore(store_path).count() == len({(row['source'], row['link']) for row in rows})
+    report = json.loads(report_path.read_text())
+    assert report['articles'] == 125
+    assert report['failed_feeds'] == [f"{fixture_server}/missing.xml"]
+    assert report['articles_per_second'] > 0
+    assert {'fetch', 'parse', 'inference'} <= set(report['stage_seconds'])
+    assert 'articles/s' in capsys.readouterr().err
+
+
+def test_run_batch_with_worker_processes(tiny_model_dir, fixture_server):
+    urls = [f"{fixture_server}/nyt_small.xml", f"{fixture_server}/abc_medium.xml"]
+    rows, report = cli.run_batch(urls, workers=2, model_name=tiny_model_dir)
+    assert report['workers'] == 2
+    assert len(rows) == 125
+    assert {row['source'] for row in rows} == set(urls)
@@ -0,0 +1,113 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from src.news_sentiment_analyzer.coalescing import InferenceCoalescer, SingleFlight
+from src.news_sentiment_analyzer.records import SentimentBatch
+
+# ? pytest -vs tests/test_coalescing.py
+
+USERS = 20
+
+
+def run_concurrently(fn, count=USERS):
+    barrier = threading.Barrier(count)
+
+    def call(i):
+        barrier.wait()
+        return fn(i)
+    with ThreadPoolExecutor(max_workers=count) as executor:
+        return list(executor.map(call, range(count)))
+
+
+def test_single_flight_shares_one_execution():
+    flights = SingleFlight()
+    executions = []
+
+    def fetch():
+        executions.append(1)
+        time.sleep(0.2)
+        return ['story']
+    results = run_concurrently(lambda i: flights.do('http://feed.example/rss', fetch))
+    assert len(executions) == 1
+    assert all(result is results[0] for result in results)
+    stats = flights.stats()
+    assert stats['calls'] == USERS and stats['executions'] == 1 and stats['in_flight'] == 0
+
+
+def test_single_flight_freshness_and_errors():
+    flights = SingleFlight()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return len(calls)
+    assert flights.do('feed', fetch, fresh_for=60) == 1
+    assert flights.do('feed', fetch, fresh_for=60) == 1
+    assert flights.do('feed', fetch) == 2
+    flights.forget('feed')
+    assert flights.do('feed', fetch, fresh_for=60) == 3
+
+    def fail():
+        calls.append(1)
+        raise ConnectionError("feed down")
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            flights.do('down', fail, fresh_for=60)
+    assert flights.stats()['executions'] == 5
+
+
+class SlowAnalyzer:
+    model_name, model_revision, labels = 'slow', 'r1', ('NEGATIVE', 'POSITIVE')
+
+    def __init__(self):
+        self.texts = []
+
+    def score_batch(self, texts):
+        self.texts.extend(texts)
+        time.sleep(0.1)
+        return SentimentBatch.from_labels(['POSITIVE' if 'good' in text else 'NEGATIVE' for text in texts],
+                                          [0.9] * len(texts), texts, self.labels)
+
+
+def test_inference_coalescer_scores_shared_texts_once():
+    analyzer = SlowAnalyzer()
+    coalescer = InferenceCoalescer()
+    wrapped = coalescer.wrap(analyzer)
+    texts = ['good news', 'bad news', 'good day']
+    results = run_concurrently(lambda i: wrapped.score_batch(texts[i % 2:] + [f'only {i}']))
+    assert sorted(analyzer.texts) == sorted(texts + [f'only {i}' for i in range(USERS)])
+    assert results[0].sentiments() == ['POSITIVE', 'NEGATIVE', 'POSITIVE', 'NEGATIVE']
+    assert results[1].sentiments() == ['NEGATIVE', 'POSITIVE', 'NEGATIVE']
+    assert wrapped.get_sentiment('good news')['sentiment'] == 'POSITIVE'
+    assert coalescer.stats()['in_flight'] == 0
+
+
+def test_concurrent_sessions_fetch_and_score_like_one(tiny_analyzer, monkeypatch):
+    from src.news_sentiment_analyzer import news_sentiment_analyzer as module
+    from tests.test_news_sentiment_analyzer import FakeSource, make_articles
+    scored = []
+    original = tiny_analyzer.score_batch
+
+    def slow_score_batch(texts):
+        scored.extend(texts)
+        time.sleep(0.05)
+        return original(texts)
+    monkeypatch.setattr(tiny_analyzer, "score_batch", slow_score_batch)
+    news = module.NewsSentimentAnalyzer(emit_every=None, emit_interval=None)
+    feeds = {'http://a.example/rss': make_articles('a', 30), 'http://b.example/rss': make_articles('b', 30)}
+    sessions = [[FakeSource(url, articles) for url, articles in feeds.items()] for _ in range(USERS)]
+    original_scrape = FakeSource.scrape_rss_feed
+
+    def slow_scrape(self):
+        time.sleep(0.1)
+        return original_scrape(self)
+    monkeypatch.setattr(FakeSource, "scrape_rss_feed", slow_scrape)
+
+    frames = run_concurrently(lambda i: list(news.analyze_news(sessions[i]))[-1])
+    assert all(len(frame) == 60 for frame in frames)
+    assert all(frame['sentiment'].tolist() == frames[0]['sentiment'].tolist() for frame in frames)
+    assert sum(source.calls for sources in sessions for source in sources) == len(feeds)
+    # * A session can miss the cache just after another one finished scoring, so allow a little slack
+    assert len(scored) <= 2 * 60
+    assert news.last_run_metrics['coalescing']['feeds']['executions'] == len(feeds)
@@ -0,0 +1,62 @@
+import pytest
+from src.news_sentiment_analyzer.deduplicator import ArticleDeduplicator, article_key, canonicalize_link
+
+# ? pytest -vs tests/test_deduplicator.py
+
+
+def article(title, link, description=''):
+    return {'title': title, 'link': link, 'description': description}
+
+
+def test_canonicalize_link():
+    assert canonicalize_link('http://WWW.Example.com/story/?utm_source=rss&id=2#top') == \
+        'https://example.com/story?id=2'
+    assert canonicalize_link('https://example.com/story?smid=tw&b=1&a=2') == \
+        'https://example.com/story?a=2&b=1'
+    assert canonicalize_link('') == ''
+
+
+def test_article_key_prefers_guid():
+    assert article_key({'guid': 'abc', 'link': 'https://x.com/a'}) == 'guid:abc'
+    assert article_key({'guid': '', 'link': 'https://www.x.com/a?utm_source=rss'}) == 'link:https://x.com/a'
+    assert article_key({'title': 't', 'description': 'd'}).startswith('text:')
+
+
+def test_exact_duplicates_by_link():
+    dedup = ArticleDeduplicator()
+    group, is_new = dedup.add(article('Title one', 'https://example.com/a'))
+    again, again_new = dedup.add(article('Different title', 'http://www.example.com/a/?utm_medium=x'))
+    assert is_new and not again_new
+    assert group == again
+    assert dedup.stats()['exact_duplicates'] == 1
+
+
+def test_opaque_guids_only_match_within_their_feed():
+    dedup = ArticleDeduplicator()
+    first, _ = dedup.add({'title': 'Storm batters coast', 'link': '', 'guid': '12345'}, 'https://a.example/rss')
+    other, is_new = dedup.add({'title': 'Council approves budget', 'link': '', 'guid': '12345'},
+                              'https://b.example/rss')
+    assert is_new and other != first
+    again, again_new = dedup.add({'title': 'Storm update', 'link': '', 'guid': '12345'}, 'https://a.example/rss')
+    assert again == first and not again_new
+
+    # * Permalink GUIDs identify the story whichever feed carries it
+    permalink, _ = dedup.add({'title': 'Markets rally', 'guid': 'https://www.example.com/markets'}, 'a')
+    shared, shared_new = dedup.add({'title': 'Stocks climb', 'link': 'http://example.com/markets/'}, 'b')
+    assert shared == permalink and not shared_new
+
+
+def test_near_duplicates_by_minhash():
+    dedup = ArticleDeduplicator(threshold=0.6)
+    text = ('Senate passes sweeping budget bill after marathon overnight session, '
+            'sending the measure to the president for signature')
+    first, _ = dedup.add(article('Senate passes budget bill', 'https://a.example/1', text))
+    second, is_new = dedup.add(article('Senate passes budget bill', 'https://b.example/2',
+                                       text + ' on Friday'))
+    third, third_new = dedup.add(article('Storm batters coast', 'https://c.example/3',
+                                         'Hurricane makes landfall with heavy rain and high winds'))
+    assert second == first and not is_new
+    assert third != first and third_new
+    stats = dedup.stats()
+    assert stats['near_duplicates'] == 1
+    assert stats['dedup_ratio'] == pytest.approx(1 / 3, abs=1e-3)
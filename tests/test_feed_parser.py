@@ -0,0 +1,94 @@
+import pytest
+from src.news_sentiment_analyzer.feed_parser import FeedParser, RSS_MAPPING, parse_published
+from src.news_sentiment_analyzer import NYTRSSNewsScraperAdapter, ABCRSSNewsScraperAdapter
+
+# ? pytest -vs tests/test_feed_parser.py
+
+NYT_FEED = b"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:media="http://search.yahoo.com/mrss/">
+  <channel><title>NYT</title>
+    <item>
+      <title>Markets rally</title>
+      <link>https://www.nytimes.com/markets</link>
+      <description>Stocks climbed.</description>
+      <media:description>A trader on the floor.</media:description>
+    </item>
+  </channel>
+</rss>"""
+
+ABC_FEED = b"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0"><channel>
+  <item>
+    <title><![CDATA[Storm hits coast]]></title>
+    <link>&lt;![CDATA[https://abcnews.go.com/storm]]&gt;</link>
+    <description><![CDATA[Heavy rain expected.]]></description>
+  </item>
+</channel></rss>"""
+
+ATOM_FEED = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <title>Atom Feed</title>
+  <entry>
+    <title>Atom story</title>
+    <id>urn:uuid:1225c695</id>
+    <updated>2024-05-01T12:30:00Z</updated>
+    <link rel="self" href="https://example.com/self"/>
+    <link href="https://example.com/story"/>
+    <summary>Atom summary</summary>
+  </entry>
+</feed>"""
+
+
+def test_plain_rss_ignores_media_description():
+    stories = list(FeedParser().parse(NYT_FEED))
+    assert stories == [{'title': 'Markets rally', 'link': 'https://www.nytimes.com/markets',
+                        'description': 'Stocks climbed.', 'guid': '', 'published': ''}]
+
+
+def test_nyt_mapping_joins_media_description():
+    stories = list(FeedParser(NYTRSSNewsScraperAdapter.FEED_MAPPING).parse(NYT_FEED))
+    assert stories[0]['description'] == 'Stocks climbed. A trader on the floor.'
+
+
+def test_abc_mapping_strips_cdata():
+    stories = list(FeedParser(ABCRSSNewsScraperAdapter.FEED_MAPPING).parse(ABC_FEED))
+    assert stories[0] == {'title': 'Storm hits coast', 'link': 'https://abcnews.go.com/storm',
+                          'description': 'Heavy rain expected.', 'guid': '', 'published': ''}
+
+
+def test_atom_entries():
+    stories = list(FeedParser(RSS_MAPPING).parse(ATOM_FEED))
+    assert stories == [{'title': 'Atom story', 'link': 'https://example.com/story',
+                        'description': 'Atom summary', 'guid': 'urn:uuid:1225c695',
+                        'published': '2024-05-01T12:30:00Z'}]
+
+
+def test_items_are_cleared_while_streaming(monkeypatch):
+    items = b''.join(b'<item><title>t%d</title><link>l</link></item>' % i for i in range(50))
+    feed = b'<rss><channel>' + items + b'</channel></rss>'
+    parser = FeedParser()
+    sibling_counts = []
+    original_extract = parser._extract
+
+    def recording_extract(element):
+        sibling_counts.append(len(list(element.itersiblings(preceding=True))))
+        return original_extract(element)
+    monkeypatch.setattr(parser, "_extract", recording_extract)
+
+    titles = [story['title'] for story in parser.parse(feed)]
+    assert titles == [f't{i}' for i in range(50)]
+    # * Earlier items are removed from the tree as parsing advances
+    assert max(sibling_counts) <= 1
+
+
+@pytest.mark.parametrize("value,expected", [
+    ('Tue, 01 May 2024 00:15:00 +0000', 1714522500.0),
+    ('Tue, 01 May 2024 02:15:00 +0200', 1714522500.0),
+    ('2024-05-01T00:15:00Z', 1714522500.0),
+    ('2024-05-01T02:15:00.000z', 1714529700.0),
+    ('2024-05-01T00:15:00', 1714522500.0),
+    ('not a date', None),
+    ('', None),
+])
+def test_parse_published(value, expected):
+    assert parse_published(value) == expected
@@ -0,0 +1,53 @@
+import time
+import pytest
+from src.news_sentiment_analyzer.feed_pipeline import FeedPipeline
+
+# ? pytest -vs tests/test_feed_pipeline.py
+
+
+class SlowSource:
+    def __init__(self, name, delay, count=2, error=None):
+        self.name = name
+        self.delay = delay
+        self.count = count
+        self.error = error
+
+    def scrape_rss_feed(self):
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return [{'title': f'{self.name} {i}', 'link': '', 'description': ''}
+                for i in range(self.count)]
+
+
+def test_fetches_overlap_with_consumer():
+    sources = [SlowSource(f's{i}', 0.2) for i in range(6)]
+    pipeline = FeedPipeline(sources, max_fetchers=6, queue_size=6)
+    start = time.perf_counter()
+    seen = []
+    for batch in pipeline.batches():
+        time.sleep(0.1)  # simulated inference
+        seen.extend(source.name for source, _ in batch)
+    elapsed = time.perf_counter() - start
+    assert sorted(seen) == sorted(source.name for source in sources)
+    # * Sequential fetch + inference would take 6 * (0.2 + 0.1) = 1.8s
+    assert elapsed < 1.2
+    metrics = pipeline.metrics()
+    assert metrics['fetch']['items'] == 6
+    assert metrics['infer']['items'] == 12
+
+
+def test_bounded_queue_applies_backpressure():
+    sources = [SlowSource(f's{i}', 0.0) for i in range(5)]
+    pipeline = FeedPipeline(sources, max_fetchers=5, queue_size=1)
+    for batch in pipeline.batches(max_articles=1):
+        time.sleep(0.05)
+    metrics = pipeline.metrics()
+    assert metrics['fetch']['max_queue_depth'] <= 1
+    assert metrics['fetch']['wait_seconds'] > 0
+
+
+def test_fetch_error_is_raised_to_consumer():
+    sources = [SlowSource('bad', 0.0, error=RuntimeError("boom"))]
+    with pytest.raises(RuntimeError):
+        list(FeedPipeline(sources).batches())
@@ -0,0 +1,175 @@
+import threading
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from src.news_sentiment_analyzer import feed_poller
+from src.news_sentiment_analyzer.feed_parser import FeedParser
+from src.news_sentiment_analyzer.feed_poller import FeedPoller
+
+# ? pytest -vs tests/test_feed_poller.py
+
+
+def make_feed(titles):
+    items = ''.join(f'<item><title>{title}</title><link>https://example.com/{title.replace(" ", "-")}</link>'
+                    f'<guid>id-{title}</guid><description>good news today</description></item>'
+                    for title in titles)
+    return f'<rss version="2.0"><channel><title>Stub</title>{items}</channel></rss>'.encode('utf-8')
+
+
+class VersionedFeedHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.requests += 1
+        etag = f'"v{self.server.version}"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/rss+xml')
+        self.send_header('Content-Length', str(len(self.server.body)))
+        self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(self.server.body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def feed_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), VersionedFeedHandler)
+    server.requests, server.version, server.body = 0, 1, make_feed(['alpha story', 'beta story'])
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.url = f'http://127.0.0.1:{server.server_address[1]}/rss'
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def scoring_calls(tiny_analyzer, monkeypatch):
+    calls = []
+    original = tiny_analyzer.score_batch
+    monkeypatch.setattr(tiny_analyzer, "score_batch", lambda texts: calls.append(texts) or original(texts))
+    return calls
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_poller(tmp_path, clock, **kwargs):
+    return FeedPoller(tmp_path / "state" / "poller.db", default_interval=60, max_interval=600,
+                      jitter=0, clock=clock, **kwargs)
+
+
+def test_only_new_items_are_scored(tmp_path, feed_server, scoring_calls, monkeypatch):
+    clock = FakeClock()
+    poller = make_poller(tmp_path, clock)
+    poller.add_feed(feed_server.url)
+    rows = poller.poll_once()
+    assert sorted(row['guid'] for row in rows) == ['id-alpha story', 'id-beta story']
+
+    # * Unchanged feed: one conditional GET, no parsing and no inference
+    parse_calls = []
+    original_parse = FeedParser.parse
+    monkeypatch.setattr(FeedParser, "parse", lambda self, source: parse_calls.append(1) or original_parse(self, source))
+    requests_before = feed_server.requests
+    assert poller.poll_once(force=True) == []
+    assert feed_server.requests == requests_before + 1
+    assert parse_calls == []
+    assert poller._sources[feed_server.url].rss_adapter.not_modified
+    assert len(scoring_calls) == 1
+
+    feed_server.version, feed_server.body = 2, make_feed(['gamma story', 'alpha story', 'beta story'])
+    rows = poller.poll_once(force=True)
+    assert [row['guid'] for row in rows] == ['id-gamma story']
+    assert scoring_calls[-1] == ['gamma story good news today']
+    poller.close()
+
+
+def test_backoff_and_reset(tmp_path, feed_server, scoring_calls):
+    clock = FakeClock()
+    poller = make_poller(tmp_path, clock)
+    state = poller.add_feed(feed_server.url)
+    poller.poll_once()
+    assert state.interval == 60
+    for expected in (120, 240, 480, 600, 600):
+        clock.now = state.next_poll_at
+        poller.poll_once()
+        assert state.interval == expected
+    assert state.unchanged_polls == 5
+
+    feed_server.version, feed_server.body = 2, make_feed(['delta story'])
+    clock.now = state.next_poll_at
+    assert len(poller.poll_once()) == 1
+    assert state.interval == 60 and state.unchanged_polls == 0
+    poller.close()
+
+
+def test_state_survives_restart(tmp_path, feed_server, scoring_calls):
+    clock = FakeClock()
+    poller = make_poller(tmp_path, clock)
+    poller.add_feed(feed_server.url)
+    assert len(poller.poll_once()) == 2
+    poller.poll_once(force=True)
+    next_poll_at = poller._feeds[feed_server.url].next_poll_at
+    poller.close()
+
+    # * A new ETag forces a full 200 response, but every item is already known
+    feed_server.version = 3
+    restarted = make_poller(tmp_path, clock)
+    state = restarted.add_feed(feed_server.url)
+    assert state.next_poll_at == next_poll_at and state.unchanged_polls == 1
+    assert restarted.poll_once() == []
+    clock.now = state.next_poll_at
+    assert restarted.poll_once() == []
+    assert len(scoring_calls) == 1
+    restarted.close()
+
+
+def test_items_are_not_marked_seen_when_delivery_fails(tmp_path, feed_server, scoring_calls):
+    delivered = []
+
+    def flaky_on_results(rows):
+        if not delivered:
+            delivered.append(None)
+            raise IOError("disk full")
+        delivered.append(rows)
+    poller = make_poller(tmp_path, FakeClock(), on_results=flaky_on_results)
+    poller.add_feed(feed_server.url)
+    with pytest.raises(IOError):
+        poller.poll_once()
+    assert poller._seen[feed_server.url] == set()
+
+    feed_server.version = 2
+    assert len(poller.poll_once(force=True)) == 2
+    assert len(delivered[1]) == 2 and len(poller._seen[feed_server.url]) == 2
+    poller.close()
+
+
+def test_run_survives_a_failed_round(tmp_path, feed_server, scoring_calls):
+    clock = FakeClock()
+    delivered = []
+
+    def flaky_on_results(rows):
+        clock.now += 3600
+        if not delivered:
+            delivered.append(None)
+            raise IOError("disk full")
+        delivered.append(rows)
+    poller = make_poller(tmp_path, clock, on_results=flaky_on_results)
+    poller.add_feed(feed_server.url)
+    poller.run(max_polls=2)
+    assert len(delivered) == 2
+    assert sorted(row['guid'] for row in delivered[1]) == ['id-alpha story', 'id-beta story']
+    assert len(poller._seen[feed_server.url]) == 2
+    poller.close()
@@ -0,0 +1,136 @@
+import gzip
+import threading
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from src.news_sentiment_analyzer import RSSNewsScraper, BaseRSSNewsScraperAdapter
+from src.news_sentiment_analyzer.feed_parser import FeedParser
+from src.news_sentiment_analyzer.http_transport import HTTPTransport
+
+# ? pytest -vs tests/test_http_transport.py
+
+RSS_BODY = b"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0"><channel><title>Stub</title>
+<item><title>Stub Article</title><link>http://example.com/stub</link>
+<description>Stub description</description></item>
+</channel></rss>"""
+ETAG = '"feed-v1"'
+
+
+class StubFeedHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.requests.append(dict(self.headers))
+        self.server.client_ports.add(self.client_address[1])
+        if self.headers.get('If-None-Match') == ETAG:
+            self.send_response(304)
+            self.send_header('ETag', ETAG)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        body = RSS_BODY
+        self.send_response(200)
+        if 'gzip' in self.headers.get('Accept-Encoding', ''):
+            body = gzip.compress(body)
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Type', 'application/rss+xml')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', ETAG)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubFeedHandler)
+    server.requests = []
+    server.client_ports = set()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def feed_url(server):
+    return f'http://127.0.0.1:{server.server_address[1]}/rss'
+
+
+def test_conditional_get_skips_parsing(stub_server, tmp_path, monkeypatch):
+    transport = HTTPTransport(cache_dir=tmp_path)
+    adapter = BaseRSSNewsScraperAdapter(feed_url(stub_server), transport=transport)
+    scraper = RSSNewsScraper(adapter)
+
+    articles = scraper.scrape_rss_feed()
+    assert articles[0]['title'] == "Stub Article"
+    assert not adapter.not_modified
+
+    parse_calls = []
+    original_parse = FeedParser.parse_columns
+    monkeypatch.setattr(FeedParser, "parse_columns",
+                        lambda self, source: parse_calls.append(1) or original_parse(self, source))
+    assert scraper.scrape_rss_feed() == articles
+    assert adapter.not_modified and parse_calls == []
+    assert stub_server.requests[1]['If-None-Match'] == ETAG
+
+    # * A new adapter (e.g. after a restart) parses the cached body of the 304
+    restarted = BaseRSSNewsScraperAdapter(feed_url(stub_server), transport=transport)
+    assert restarted.scrape_rss_feed() == articles
+    assert restarted.not_modified and parse_calls == [1]
+
+
+def test_shared_transport_uses_the_cache_dir_from_the_environment(tmp_path, monkeypatch):
+    monkeypatch.setattr(HTTPTransport, "_shared", None)
+    monkeypatch.setenv("HTTP_CACHE_DIR", str(tmp_path / "http_cache"))
+    assert HTTPTransport.shared().cache_dir == tmp_path / "http_cache"
+    assert (tmp_path / "http_cache").is_dir()
+    monkeypatch.setattr(HTTPTransport, "_shared", None)
+    monkeypatch.delenv("HTTP_CACHE_DIR")
+    assert HTTPTransport.shared().cache_dir is None
+
+
+def test_connections_are_reused_and_compressed(stub_server):
+    transport = HTTPTransport()
+    for _ in range(3):
+        result = transport.get(feed_url(stub_server))
+        assert result.content == RSS_BODY
+    assert 'gzip' in stub_server.requests[0]['Accept-Encoding']
+    assert len(stub_server.client_ports) == 1
+    # * Without a cache directory no conditional headers are sent
+    assert all('If-None-Match' not in headers for headers in stub_server.requests)
+
+
+class LocalTransport(HTTPTransport):
+    '''
+    Sends every request to the stub server, whatever the feed URL.
+    '''
+
+    def __init__(self, url, **kwargs):
+        super().__init__(**kwargs)
+        self.url = url
+
+    def get(self, url, timeout=None):
+        return super().get(self.url, timeout=timeout)
+
+
+def test_repeated_analysis_of_an_unchanged_feed_skips_parsing_and_scoring(stub_server, tmp_path, monkeypatch,
+                                                                          tiny_analyzer):
+    from src.news_sentiment_analyzer.news_sentiment_analyzer import NewsSentimentAnalyzer
+    analyzer = NewsSentimentAnalyzer(emit_every=None, emit_interval=None, feed_freshness=0,
+                                     transport=LocalTransport(feed_url(stub_server), cache_dir=tmp_path))
+    first = list(analyzer.news_sentiment_analysis(cnn=True))[-1]
+    assert first['text'].tolist() == ['Stub Article Stub description']
+
+    parse_calls, score_calls = [], []
+    original_parse = FeedParser.parse_columns
+    monkeypatch.setattr(FeedParser, "parse_columns",
+                        lambda self, source: parse_calls.append(1) or original_parse(self, source))
+    original_score = tiny_analyzer.score_batch
+    monkeypatch.setattr(tiny_analyzer, "score_batch", lambda texts: score_calls.append(texts) or original_score(texts))
+    second = list(analyzer.news_sentiment_analysis(cnn=True))[-1]
+    assert stub_server.requests[-1]['If-None-Match'] == ETAG and len(stub_server.requests) == 2
+    assert parse_calls == [] and score_calls == []
+    assert second['text'].tolist() == first['text'].tolist()
@@ -0,0 +1,48 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+
+# ? pytest -vs tests/test_import_time.py
+
+ROOT_DIR = Path(__file__).parents[1]
+# * Generous enough for slow CI machines; importing torch or gradio alone takes longer
+IMPORT_BUDGET_SECONDS = 1.5
+HEAVY_MODULES = ('torch', 'transformers', 'gradio', 'pandas')
+
+PROBE = """
+import json, logging, sys, time
+start = time.perf_counter()
+import {module}
+from src.news_sentiment_analyzer import NewsSentimentAnalyzer, RSSNewsScraper, ModelRegistry
+elapsed = time.perf_counter() - start
+print(json.dumps({{'seconds': elapsed, 'loaded': [m for m in {heavy!r} if m in sys.modules],
+                  'handlers': len(logging.getLogger().handlers)}}))
+"""
+
+
+def probe_import(module: str) -> dict:
+    output = subprocess.run([sys.executable, '-c', PROBE.format(module=module, heavy=HEAVY_MODULES)],
+                            cwd=ROOT_DIR, capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize('module', ['src.news_sentiment_analyzer',
+                                    'src.news_sentiment_analyzer.news_sentiment_analyzer'])
+def test_core_import_is_light(module):
+    result = probe_import(module)
+    assert result['loaded'] == []
+    assert result['handlers'] == 0
+    assert result['seconds'] < IMPORT_BUDGET_SECONDS
+
+
+def test_configure_logging_falls_back_without_config(tmp_path, monkeypatch):
+    from src.news_sentiment_analyzer import logging_setup
+    monkeypatch.setattr(logging_setup, 'DEFAULT_CONFIG_PATH', tmp_path / 'missing.yaml')
+    monkeypatch.setattr(logging_setup, '_configured', False)
+    monkeypatch.delenv(logging_setup.CONFIG_ENV_VAR, raising=False)
+    with pytest.raises(FileNotFoundError):
+        logging_setup.configure_logging(tmp_path / 'missing.yaml')
+    assert logging_setup.configure_logging() is None
+    assert logging_setup._configured
@@ -0,0 +1,43 @@
+import pytest
+import torch
+from src.news_sentiment_analyzer import SentimentAnalyzer
+from src.news_sentiment_analyzer.inference_backends import check_backend_parity, PARITY_SAMPLES
+
+# ? pytest -vs tests/test_inference_backends.py
+
+
+@pytest.fixture(scope="module")
+def baseline(tiny_model_dir):
+    return SentimentAnalyzer(model_name=tiny_model_dir)
+
+
+def test_int8_backend_caches_artifact_and_matches_baseline(tiny_model_dir, baseline, tmp_path, monkeypatch):
+    analyzer = SentimentAnalyzer(model_name=tiny_model_dir, backend='int8', artifact_dir=tmp_path)
+    artifacts = list(tmp_path.glob('*/model_int8.pt'))
+    assert len(artifacts) == 1
+    parity = check_backend_parity(analyzer, baseline)
+    assert parity['samples'] == len(PARITY_SAMPLES)
+    assert parity['max_confidence_diff'] < 0.05
+
+    # * A second analyzer reuses the cached artifact instead of quantizing again
+    mtime = artifacts[0].stat().st_mtime_ns
+    monkeypatch.setattr(torch.ao.quantization, "quantize_dynamic", lambda *a, **k: pytest.fail("re-quantized"))
+    reloaded = SentimentAnalyzer(model_name=tiny_model_dir, backend='int8', artifact_dir=tmp_path)
+    assert artifacts[0].stat().st_mtime_ns == mtime
+    assert reloaded.get_sentiment(PARITY_SAMPLES) == analyzer.get_sentiment(PARITY_SAMPLES)
+
+
+def test_onnx_backend_matches_baseline(tiny_model_dir, baseline, tmp_path):
+    pytest.importorskip("onnxruntime")
+    pytest.importorskip("onnx")
+    analyzer = SentimentAnalyzer(model_name=tiny_model_dir, backend='onnx', artifact_dir=tmp_path)
+    assert list(tmp_path.glob('*/model.onnx'))
+    parity = check_backend_parity(analyzer, baseline)
+    assert parity['label_agreement'] == 1.0
+    assert parity['max_confidence_diff'] <= 0.001
+    assert analyzer.model_revision != baseline.model_revision
+
+
+def test_unknown_backend_raises(tiny_model_dir):
+    with pytest.raises(ValueError):
+        SentimentAnalyzer(model_name=tiny_model_dir, backend='tensorrt')
@@ -0,0 +1,111 @@
+import time
+import pytest
+from src.news_sentiment_analyzer.inference_pool import InferencePool, estimate_tokens
+from src.news_sentiment_analyzer.model_registry import ModelRegistry
+
+# ? pytest -vs tests/test_inference_pool.py
+
+TEXTS = ["i love this movie", "the weather is sad", "good news", "bad news " * 20,
+         "this is okay", "i hate the news", "great great great feeling", "a movie"]
+
+
+@pytest.fixture(scope="module")
+def pool(tiny_model_dir):
+    with InferencePool(tiny_model_dir, workers=2, num_threads=1, max_tokens_per_task=16) as pool:
+        yield pool
+
+
+def test_plan_chunks_balances_token_cost():
+    pool = InferencePool("unused", workers=2, num_threads=1, max_tokens_per_task=100)
+    costs = [40, 5, 30, 5, 10, 10]
+    chunks = pool.plan_chunks(costs)
+    assert sorted(i for chunk, _ in chunks for i in chunk) == list(range(len(costs)))
+    assert [chunk for chunk, _ in chunks] == [[0], [2, 4, 5], [1, 3]]
+    assert all(cost <= 50 for _, cost in chunks)
+    assert estimate_tokens("x" * 40) == 12
+
+
+def test_invalid_configuration():
+    with pytest.raises(ValueError):
+        InferencePool("unused", workers=0)
+
+
+def test_pool_matches_in_process_scores(pool, tiny_model_dir):
+    expected = ModelRegistry.get(tiny_model_dir).get_sentiment(TEXTS)
+    results = pool.get_sentiment(TEXTS)
+    assert [r['text'] for r in results] == TEXTS
+    assert results == expected
+    assert pool.get_sentiment(TEXTS[0]) == expected[0]
+    assert pool.model_revision == ModelRegistry.get(tiny_model_dir).model_revision
+    stats = pool.stats()
+    assert all(worker['completed_tasks'] > 0 for worker in stats['per_worker'])
+    assert all(worker['outstanding_tokens'] == 0 for worker in stats['per_worker'])
+
+
+def test_workers_over_the_memory_limit_are_recycled(tiny_model_dir):
+    # * Two chunks: the worker exits after the first, so a replacement must score the second
+    texts = ["i love this movie", "the weather is sad"]
+    with InferencePool(tiny_model_dir, workers=1, num_threads=1, max_memory_mb=1,
+                       max_tokens_per_task=8) as pool:
+        assert pool.get_sentiment(texts) == ModelRegistry.get(tiny_model_dir).get_sentiment(texts)
+        assert pool.stats()['per_worker'][0]['restarts'] >= 1
+
+
+def test_unstarted_pool_works_behind_the_cache(tiny_model_dir, monkeypatch):
+    from src.news_sentiment_analyzer import news_sentiment_analyzer as module
+    from src.news_sentiment_analyzer.sentiment_cache import SentimentCache
+    from tests.test_news_sentiment_analyzer import FakeSource, make_articles
+    expected = ModelRegistry.get(tiny_model_dir).get_sentiment(TEXTS[:3])
+    pool = InferencePool(tiny_model_dir, workers=1, num_threads=1)
+    try:
+        assert SentimentCache().get_sentiment(pool, TEXTS[:3]) == expected
+        assert pool.labels == ModelRegistry.get(tiny_model_dir).labels
+    finally:
+        pool.close()
+
+    monkeypatch.setattr(module.ModelRegistry, "get", lambda *a, **k: pytest.fail("model loaded in-process"))
+    pool = InferencePool(tiny_model_dir, workers=1, num_threads=1)
+    try:
+        analyzer = module.NewsSentimentAnalyzer(emit_every=None, emit_interval=None, inference_pool=pool)
+        frame = list(analyzer.analyze_news([FakeSource('http://a.example/rss', make_articles('a', 3))]))[-1]
+        assert len(frame) == 3
+    finally:
+        pool.close()
+
+
+def test_crashed_worker_is_restarted(tiny_model_dir):
+    with InferencePool(tiny_model_dir, workers=2, num_threads=1, max_tokens_per_task=8) as pool:
+        pool._workers[0].process.kill()
+        for _ in range(50):
+            if pool.stats()['per_worker'][0]['restarts']:
+                break
+            time.sleep(0.1)
+        assert pool.stats()['per_worker'][0]['restarts'] == 1
+        assert pool.get_sentiment(TEXTS) == ModelRegistry.get(tiny_model_dir).get_sentiment(TEXTS)
+
+
+def wait_for(condition, attempts=100):
+    for _ in range(attempts):
+        if condition():
+            return True
+        time.sleep(0.1)
+    return False
+
+
+def test_worker_that_cannot_reload_the_model_gets_no_work(tiny_model_dir):
+    expected = ModelRegistry.get(tiny_model_dir).get_sentiment(TEXTS)
+    with InferencePool(tiny_model_dir, workers=2, num_threads=1, max_tokens_per_task=8) as pool:
+        # * Replacement workers fail to load the model from now on
+        pool.model_options = {'backend': 'tensorrt'}
+        pool._workers[0].process.kill()
+        assert wait_for(lambda: pool.stats()['per_worker'][0]['restarts'] == 1)
+        # * Chunks sent to the replacement while it loads move to the healthy worker when it fails
+        assert pool.get_sentiment(TEXTS) == expected
+        assert wait_for(lambda: pool.stats()['per_worker'][0]['error'] is not None)
+        assert pool.get_sentiment(TEXTS) == expected
+        assert pool.stats()['per_worker'][0]['outstanding_tokens'] == 0
+
+        pool._workers[1].process.kill()
+        assert wait_for(lambda: pool.stats()['per_worker'][1]['error'] is not None, attempts=300)
+        with pytest.raises(RuntimeError, match="could load the model"):
+            pool.get_sentiment(TEXTS)
@@ -0,0 +1,100 @@
+import pytest
+from src.news_sentiment_analyzer.lexicon_scorer import CascadeAnalyzer, LexiconScorer
+from src.news_sentiment_analyzer.records import SentimentBatch
+from src.news_sentiment_analyzer.sentiment_cache import SentimentCache
+from benchmarks.calibrate_cascade import DEFAULT_SAMPLE, calibrate, load_sample, recommend
+
+# ? pytest -vs tests/test_lexicon_scorer.py
+
+
+class CountingModel:
+    model_name, model_revision, labels = 'counting', 'r1', ('NEGATIVE', 'POSITIVE')
+
+    def __init__(self):
+        self.texts = []
+
+    def score_batch(self, texts):
+        self.texts.extend(texts)
+        return SentimentBatch.from_labels(['POSITIVE'] * len(texts), [0.75] * len(texts), texts, self.labels)
+
+
+def test_lexicon_polarity_rules():
+    scorer = LexiconScorer()
+    assert scorer.polarity('Home team wins championship victory') > 0.6
+    assert scorer.polarity('Two killed in deadly crash') < -0.6
+    assert scorer.polarity('Council meets on Tuesday') == 0.0
+    assert scorer.polarity('Officials say it was not a failure') > 0
+    assert abs(scorer.polarity('a very bad day')) > abs(scorer.polarity('a bad day'))
+    label, confidence = scorer.score('Two killed in deadly crash')
+    assert label == 'NEGATIVE' and 0.8 < confidence < 1.0
+    assert scorer.score_batch(['great news']).to_dicts()[0]['tier'] == 'lexicon'
+
+
+def test_lexicon_from_file(tmp_path):
+    path = tmp_path / 'lexicon.tsv'
+    path.write_text("# word\tpolarity\nsplendid\t3.0\t0.5\ndreadful\t-3.0\n")
+    scorer = LexiconScorer.from_file(path)
+    assert scorer.lexicon == {'splendid': 3.0, 'dreadful': -3.0}
+    assert scorer.polarity('a splendid day') > 0 > scorer.polarity('a dreadful day')
+    assert scorer.revision != LexiconScorer().revision
+
+
+def test_cascade_sends_only_uncertain_texts_to_the_model():
+    model = CountingModel()
+    texts = ['Two killed in deadly crash', 'Council meets on Tuesday', 'Home team wins championship victory']
+    cascade = CascadeAnalyzer(model, margin=0.6)
+    scored = cascade.score_batch(texts)
+    assert model.texts == ['Council meets on Tuesday']
+    assert scored.tiers == ['lexicon', 'model', 'lexicon']
+    assert scored.sentiments() == ['NEGATIVE', 'POSITIVE', 'POSITIVE']
+    assert scored[1] == {'text': texts[1], 'sentiment': 'POSITIVE', 'confidence': 0.75, 'tier': 'model'}
+
+    model.texts.clear()
+    assert CascadeAnalyzer(model, margin=1.0).score_batch(texts).tiers == ['model'] * 3
+    assert model.texts == texts
+    with pytest.raises(ValueError):
+        CascadeAnalyzer(model, margin=-0.1)
+
+
+def test_cascade_model_tier_goes_through_the_cache():
+    model = CountingModel()
+    cache = SentimentCache()
+    cascade = CascadeAnalyzer(model, margin=0.6, cache=cache)
+    cascade.score_batch(['Council meets on Tuesday', 'Two killed in deadly crash'])
+    cascade.get_sentiment(['Council meets on Tuesday'])
+    assert model.texts == ['Council meets on Tuesday']
+    assert cache.stats()['memory_hits'] == 1
+
+
+def test_analyze_news_records_the_tier(tiny_analyzer, monkeypatch):
+    from src.news_sentiment_analyzer import news_sentiment_analyzer as module
+    from tests.test_news_sentiment_analyzer import FakeSource
+    scored = []
+    original = tiny_analyzer.score_batch
+
+    def recording_score_batch(texts):
+        scored.extend(texts)
+        return original(texts)
+    monkeypatch.setattr(tiny_analyzer, "score_batch", recording_score_batch)
+    articles = [{'title': 'Two killed in deadly crash', 'link': 'http://example.com/1', 'description': ''},
+                {'title': 'Council meets on Tuesday', 'link': 'http://example.com/2', 'description': ''}]
+    analyzer = module.NewsSentimentAnalyzer(emit_every=None, emit_interval=None, cascade_margin=0.6)
+    frame = list(analyzer.analyze_news([FakeSource('http://a.example/rss', articles)]))[-1]
+    assert frame['tier'].tolist() == ['lexicon', 'model']
+    assert frame['sentiment'][0] == 'NEGATIVE'
+    assert [text.strip() for text in scored] == ['Council meets on Tuesday']
+
+    plain = module.NewsSentimentAnalyzer(emit_every=None, emit_interval=None)
+    frame = list(plain.analyze_news([FakeSource('http://b.example/rss', articles)]))[-1]
+    assert frame['tier'].tolist() == ['model', 'model']
+
+
+def test_calibration_reports_the_tradeoff(tiny_model_dir):
+    from src.news_sentiment_analyzer.model_registry import ModelRegistry
+    texts, labels = load_sample(DEFAULT_SAMPLE)
+    assert len(texts) == len(labels) and all(labels)
+    results = calibrate(ModelRegistry.get(tiny_model_dir), texts, labels, [0.2, 0.6, 1.0], repeat=1)
+    shares = [case['lexicon_share'] for case in results['cases']]
+    assert shares == sorted(shares, reverse=True) and shares[-1] == 0.0
+    assert results['cases'][-1]['agreement'] == 1.0
+    assert recommend(results, min_agreement=1.0)['margin'] in (0.2, 0.6, 1.0)
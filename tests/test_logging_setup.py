@@ -0,0 +1,122 @@
+import json
+import logging
+import threading
+import pytest
+from src.news_sentiment_analyzer import logging_setup
+
+# ? pytest -vs tests/test_logging_setup.py
+
+CONFIG = """
+version: 1
+disable_existing_loggers: false
+queue: {queue}
+formatters:
+  jsonl:
+    (): news_sentiment_analyzer.logging_setup.JsonLinesFormatter
+handlers:
+  file:
+    class: logging.handlers.RotatingFileHandler
+    level: INFO
+    formatter: jsonl
+    filename: "{filename}"
+    maxBytes: 1048576
+    backupCount: 2
+root:
+  level: DEBUG
+  handlers: [file]
+"""
+
+
+class FormattedIn:
+    # * Records the thread that turns the log argument into text
+    def __init__(self):
+        self.threads = []
+
+    def __str__(self):
+        self.threads.append(threading.current_thread().name)
+        return 'payload'
+
+
+@pytest.fixture
+def restore_root(monkeypatch):
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    monkeypatch.setattr(logging_setup, '_configured', False)
+    yield root
+    logging_setup.stop_logging()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+    for handler in handlers:
+        root.addHandler(handler)
+    root.setLevel(level)
+
+
+def write_config(tmp_path, queue):
+    log_path = tmp_path / 'logs' / 'app.jsonl'
+    config_path = tmp_path / 'logging.yaml'
+    config_path.write_text(CONFIG.format(queue=str(queue).lower(), filename=log_path))
+    return config_path, log_path
+
+
+def test_json_lines_formatter_keeps_extra_fields_and_exceptions():
+    formatter = logging_setup.JsonLinesFormatter()
+    record = logging.LogRecord('feeds', logging.WARNING, __file__, 1, 'Skipped %s', ('nyt',), None)
+    record.source = 'https://example.com/rss'
+    entry = json.loads(formatter.format(record))
+    assert entry['message'] == 'Skipped nyt'
+    assert entry['level'] == 'WARNING' and entry['logger'] == 'feeds'
+    assert entry['source'] == 'https://example.com/rss'
+    assert entry['ts'].endswith('+00:00')
+    try:
+        raise ValueError('boom')
+    except ValueError:
+        import sys
+        record = logging.LogRecord('feeds', logging.ERROR, __file__, 1, 'failed', (), sys.exc_info())
+    assert 'ValueError: boom' in json.loads(formatter.format(record))['exc']
+
+
+def test_queued_logging_formats_in_the_background(tmp_path, restore_root):
+    config_path, log_path = write_config(tmp_path, queue=True)
+    logging_setup.configure_logging(config_path)
+    assert [type(h) for h in restore_root.handlers] == [logging_setup.DeferredQueueHandler]
+
+    logger = logging.getLogger('tests.queued')
+    payload = FormattedIn()
+    logger.info('article %s', payload)
+    logger.debug('below the handler level %s', payload)
+    logging_setup.stop_logging()
+
+    lines = [json.loads(line) for line in log_path.read_text().splitlines()]
+    assert [line['message'] for line in lines] == ['article payload']
+    assert payload.threads and threading.main_thread().name not in payload.threads
+    assert [type(h).__name__ for h in restore_root.handlers] == ['RotatingFileHandler']
+
+
+def test_queue_can_be_disabled(tmp_path, restore_root):
+    config_path, log_path = write_config(tmp_path, queue=True)
+    logging_setup.configure_logging(config_path, use_queue=False)
+    logging.getLogger('tests.sync').warning('written synchronously')
+    assert json.loads(log_path.read_text())['message'] == 'written synchronously'
+
+
+def test_forced_fallback_replaces_the_root_handlers(tmp_path, restore_root, monkeypatch):
+    monkeypatch.delenv(logging_setup.CONFIG_ENV_VAR, raising=False)
+    monkeypatch.setattr(logging_setup, 'DEFAULT_CONFIG_PATH', tmp_path / 'missing.yaml')
+    old = logging.FileHandler(tmp_path / 'old.log')
+    restore_root.addHandler(old)
+    assert logging_setup.configure_logging(force=True, use_queue=False) is None
+    assert old not in restore_root.handlers and old.stream is None
+    assert [type(h) for h in restore_root.handlers] == [logging.StreamHandler]
+
+
+def test_shipped_jsonl_config_loads(tmp_path, restore_root, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    config_path = logging_setup.DEFAULT_CONFIG_PATH.parent / 'logging_config_jsonl.yaml'
+    assert logging_setup.configure_logging(config_path, use_queue=False) == config_path
+    file_handler = next(h for h in restore_root.handlers if isinstance(h, logging.FileHandler))
+    assert isinstance(file_handler.formatter, logging_setup.JsonLinesFormatter)
+    logging.getLogger('tests.jsonl').info('shipped config')
+    file_handler.flush()
+    lines = (tmp_path / 'logs' / 'news_sentiment_analysis.jsonl').read_text().splitlines()
+    assert json.loads(lines[-1])['message'] == 'shipped config'
@@ -0,0 +1,85 @@
+import urllib.request
+import pytest
+from src.news_sentiment_analyzer.metrics import METRICS, MetricsRegistry, MetricsServer
+
+# ? pytest -vs tests/test_metrics.py
+
+
+@pytest.fixture
+def enabled_metrics():
+    METRICS.reset()
+    METRICS.enabled = True
+    yield METRICS
+    METRICS.enabled = False
+    METRICS.reset()
+
+
+def test_disabled_registry_records_nothing():
+    registry = MetricsRegistry()
+    registry.inc('articles_scraped_total', 5, source='a')
+    registry.observe('fetch_seconds', 0.2)
+    with registry.timer('parse_seconds'):
+        pass
+    assert registry.snapshot() == {}
+    assert registry.render_prometheus().strip() == ''
+
+
+def test_prometheus_rendering():
+    registry = MetricsRegistry(enabled=True, buckets=(0.1, 1.0))
+    registry.inc('articles_scraped_total', 3, source='http://a/rss')
+    registry.set_gauge('feed_queue_depth', 2)
+    registry.observe('fetch_seconds', 0.05)
+    registry.observe('fetch_seconds', 0.5)
+    registry.observe('fetch_seconds', 5)
+    text = registry.render_prometheus()
+    assert '# TYPE articles_scraped_total counter' in text
+    assert 'articles_scraped_total{source="http://a/rss"} 3' in text
+    assert 'feed_queue_depth 2' in text
+    assert 'fetch_seconds_bucket{le="0.1"} 1' in text
+    assert 'fetch_seconds_bucket{le="1"} 2' in text
+    assert 'fetch_seconds_bucket{le="+Inf"} 3' in text
+    assert 'fetch_seconds_count 3' in text
+
+
+def test_summary_since_reports_deltas():
+    registry = MetricsRegistry(enabled=True)
+    registry.inc('texts_scored_total', 4)
+    before = registry.snapshot()
+    registry.inc('texts_scored_total', 6)
+    registry.observe('inference_seconds', 0.25, backend='torch')
+    summary = registry.summary_since(before)
+    assert summary['texts_scored_total'] == 6
+    assert summary['inference_seconds_count{backend="torch"}'] == 1
+    assert summary['inference_seconds_sum{backend="torch"}'] == pytest.approx(0.25)
+
+
+def test_metrics_server_serves_text():
+    registry = MetricsRegistry(enabled=True)
+    registry.inc('feed_errors_total', source='x')
+    server = MetricsServer(registry, port=0)
+    port = server.start()
+    try:
+        with urllib.request.urlopen(f'http://127.0.0.1:{port}/metrics', timeout=5) as response:
+            body = response.read().decode('utf-8')
+            assert response.headers['Content-Type'].startswith('text/plain')
+        assert 'feed_errors_total{source="x"} 1' in body
+    finally:
+        server.stop()
+
+
+def test_analysis_run_records_stage_summary(tiny_analyzer, enabled_metrics):
+    from src.news_sentiment_analyzer import news_sentiment_analyzer as module
+    from benchmarks.run_benchmarks import make_source
+    news_analyzer = module.NewsSentimentAnalyzer()
+    list(news_analyzer.analyze_news([make_source('nyt_small')]))
+    stages = news_analyzer.last_run_metrics['stages']
+    source = 'source="https://rss.nytimes.com/services/xml/rss/nyt/HomePage.xml"'
+    assert stages[f'articles_scraped_total{{{source}}}'] == 25
+    assert stages[f'bytes_fetched_total{{{source}}}'] > 0
+    for stage in ('fetch_seconds', 'parse_seconds', 'clean_seconds', 'scrape_seconds'):
+        assert stages[f'{stage}_count{{{source}}}'] == 1
+    assert stages['tokenize_seconds_count'] >= 1
+    assert stages['inference_seconds_count{backend="torch"}'] >= 1
+    assert stages['sentiment_cache_misses_total'] == 25
+    assert stages['dataframe_seconds_count'] >= 1
+    assert 'feed_queue_depth' in enabled_metrics.render_prometheus()
@@ -0,0 +1,56 @@
+import pytest
+from pathlib import Path
+import yaml
+import logging.config
+from concurrent.futures import ThreadPoolExecutor
+from src.news_sentiment_analyzer import ModelRegistry, SentimentAnalyzer
+
+# ? pytest -vs tests/test_model_registry.py
+
+# Get the root directory of the project
+ROOT_DIR = Path(__file__).parents[1]
+
+
+@pytest.fixture(scope="session", autouse=True)
+def setup_logging():
+    config_path = ROOT_DIR / "logging_config.yaml"
+    with open(config_path, "r") as f:
+        config = yaml.safe_load(f.read())
+    # Ensure the logs directory exists
+    log_dir = ROOT_DIR / "logs"
+    log_dir.mkdir(exist_ok=True)
+    # Update the log file path in the config
+    config['handlers']['file']['filename'] = str(
+        log_dir / "test_news_sentiment_analysis.log")
+    logging.config.dictConfig(config)
+
+
+@pytest.fixture(autouse=True)
+def clear_registry():
+    ModelRegistry.clear()
+    yield
+    ModelRegistry.clear()
+
+
+def test_model_is_loaded_once(tiny_model_dir, monkeypatch):
+    loads = []
+    original_init = SentimentAnalyzer.__init__
+
+    def counting_init(self, *args, **kwargs):
+        loads.append(args)
+        original_init(self, *args, **kwargs)
+    monkeypatch.setattr(SentimentAnalyzer, "__init__", counting_init)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        analyzers = list(pool.map(lambda _: ModelRegistry.get(tiny_model_dir), range(8)))
+    assert len(loads) == 1
+    assert all(analyzer is analyzers[0] for analyzer in analyzers)
+
+
+def test_warm_up_reports_stats(tiny_model_dir):
+    stats = ModelRegistry.warm_up(tiny_model_dir)
+    assert stats['model_name'] == tiny_model_dir
+    assert stats['load_seconds'] >= 0
+    assert stats['warm_up_seconds'] >= 0
+    assert stats['resident_memory_mb'] > 0
+    assert tiny_model_dir in ModelRegistry.stats()
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+from src.news_sentiment_analyzer.deduplicator import article_key
+from src.news_sentiment_analyzer.records import Article, ArticleBatch, SentimentBatch
+from src.news_sentiment_analyzer.sentiment_cache import SentimentCache
+from src.news_sentiment_analyzer.model_registry import ModelRegistry
+from benchmarks.run_benchmarks import make_source
+
+# ? pytest -vs tests/test_records.py
+
+STORIES = [{'title': 'Markets rally', 'link': 'http://example.com/1', 'description': 'Stocks rose.'},
+           {'title': 'Storm warning', 'link': 'http://example.com/2', 'description': 'Heavy rain.',
+            'guid': 'urn:2', 'author': 'Desk'}]
+
+
+def test_article_batch_reads_like_a_list_of_dicts():
+    batch = ArticleBatch.from_records(STORIES)
+    assert len(batch) == 2
+    assert batch[0]['title'] == 'Markets rally'
+    assert batch[-1].get('author') == 'Desk'
+    assert batch[0]['guid'] == '' and batch[0]['published'] == ''
+    assert batch.texts() == ['Markets rally Stocks rose.', 'Storm warning Heavy rain.']
+    assert [article.text for article in batch] == batch.texts()
+    assert article_key(batch[1]) == 'guid:urn:2'
+    assert batch == [dict(story, guid=story.get('guid', ''), published='', author=story.get('author', ''))
+                     for story in STORIES]
+    assert ArticleBatch() == []
+    assert not ArticleBatch()
+    with pytest.raises(IndexError):
+        batch[2]
+    with pytest.raises(ValueError):
+        ArticleBatch({'title': ['a'], 'link': []})
+
+
+def test_article_has_no_instance_dict():
+    article = Article.from_mapping(STORIES[1])
+    assert not hasattr(article, '__dict__')
+    assert dict(article)['author'] == 'Desk'
+    with pytest.raises(KeyError):
+        article['missing']
+
+
+def test_sentiment_batch_codes_and_dict_view():
+    batch = SentimentBatch.from_labels(['POSITIVE', 'NEGATIVE', 'POSITIVE'], [0.991, 0.5, 0.875],
+                                       ['a', 'b', 'c'], labels=('NEGATIVE', 'POSITIVE'))
+    assert batch.codes.dtype == np.int8 and batch.confidences.dtype == np.float32
+    assert batch.codes.tolist() == [1, 0, 1]
+    assert batch[0] == {'text': 'a', 'sentiment': 'POSITIVE', 'confidence': 0.991}
+    assert batch.to_dicts() == [batch[i] for i in range(3)]
+    assert batch.recode(('POSITIVE', 'NEGATIVE')).tolist() == [0, 1, 0]
+    assert SentimentBatch.from_dicts(batch.to_dicts()).sentiments() == batch.sentiments()
+
+
+def test_scraper_returns_a_columnar_batch():
+    articles = make_source('abc_medium').scrape_rss_feed()
+    assert isinstance(articles, ArticleBatch)
+    assert len(articles) > 0
+    assert articles.to_dicts()[0] == dict(articles[0])
+
+
+def test_score_batch_matches_get_sentiment(tiny_model_dir):
+    analyzer = ModelRegistry.get(tiny_model_dir)
+    texts = ['good news today', 'terrible awful news', 'good news today']
+    scored = analyzer.score_batch(texts)
+    assert scored.labels == analyzer.labels
+    assert scored.to_dicts() == analyzer.get_sentiment(texts)
+    cached = SentimentCache().score_batch(analyzer, texts)
+    assert cached.to_dicts() == scored.to_dicts()
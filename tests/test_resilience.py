@@ -0,0 +1,151 @@
+import time
+import pytest
+import requests
+from src.news_sentiment_analyzer.feed_pipeline import FeedPipeline
+from src.news_sentiment_analyzer.resilience import (CircuitBreaker, CircuitBreakers, Deadline, RetryPolicy,
+                                                    is_transient)
+from tests.test_news_sentiment_analyzer import FakeAdapter, make_articles
+
+# ? pytest -vs tests/test_resilience.py
+
+
+class FlakySource:
+    def __init__(self, rss_url, articles=None, delay=0.0, errors=()):
+        self.rss_adapter = FakeAdapter(rss_url)
+        self.articles = articles if articles is not None else make_articles(rss_url, 2)
+        self.delay = delay
+        self.errors = list(errors)
+        self.calls = 0
+
+    def scrape_rss_feed(self):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.errors:
+            raise self.errors.pop(0)
+        return self.articles
+
+
+def http_error(status):
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(f"{status} error", response=response)
+
+
+def test_deadline():
+    assert Deadline().remaining() == float('inf') and not Deadline().expired()
+    deadline = Deadline(10)
+    assert 9 < deadline.remaining() <= 10
+    assert deadline.earliest(1).remaining() <= 1
+    assert deadline.earliest(None).expires_at == deadline.expires_at
+    assert Deadline(0).expired()
+
+
+def test_circuit_breaker_opens_and_probes():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.1)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == 'open' and not breaker.allow()
+    time.sleep(0.12)
+    assert breaker.state == 'half_open'
+    assert breaker.allow() and not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == 'open'
+    time.sleep(0.12)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == 'closed' and breaker.failures == 0
+
+
+def test_retry_policy_retries_transient_errors_within_the_deadline():
+    assert is_transient(requests.ConnectionError()) and is_transient(http_error(503))
+    assert not is_transient(http_error(404)) and not is_transient(ValueError())
+    policy = RetryPolicy(attempts=3, base_delay=0.01, seed=0)
+    source = FlakySource('http://a/rss', errors=[requests.Timeout(), requests.ConnectionError()])
+    assert policy.call(source.scrape_rss_feed) == source.articles
+    assert source.calls == 3
+
+    source = FlakySource('http://b/rss', errors=[http_error(404)])
+    with pytest.raises(requests.HTTPError):
+        policy.call(source.scrape_rss_feed)
+    assert source.calls == 1
+
+    # * A retry that could not start before the deadline is not attempted
+    slow = RetryPolicy(attempts=5, base_delay=10, max_delay=10, seed=1)
+    source = FlakySource('http://c/rss', errors=[requests.Timeout()] * 4)
+    start = time.perf_counter()
+    with pytest.raises(requests.Timeout):
+        slow.call(source.scrape_rss_feed, Deadline(0.2))
+    assert time.perf_counter() - start < 0.2
+
+
+def test_pipeline_skips_slow_and_failing_feeds():
+    sources = [FlakySource('http://good/rss'), FlakySource('http://slow/rss', delay=3.0),
+               FlakySource('http://bad/rss', errors=[RuntimeError("parse failed")])]
+    pipeline = FeedPipeline(sources, max_fetchers=3, feed_timeout=0.3, partial_results=True)
+    start = time.perf_counter()
+    fetched = [source.rss_adapter.get_rss_url() for batch in pipeline.batches() for source, _ in batch]
+    assert time.perf_counter() - start < 1.5
+    assert fetched == ['http://good/rss']
+    failed = pipeline.failed_feeds()
+    assert set(failed) == {'http://slow/rss', 'http://bad/rss'}
+    assert failed['http://slow/rss'].startswith('Timeout')
+    assert failed['http://bad/rss'] == 'RuntimeError: parse failed'
+
+    with pytest.raises(TimeoutError):
+        for _ in FeedPipeline([FlakySource('http://slow/rss', delay=3.0)], deadline=0.2).batches():
+            pass
+
+
+def test_circuit_breaker_stops_calling_a_failing_feed():
+    breakers = CircuitBreakers(failure_threshold=2, reset_timeout=60)
+    source = FlakySource('http://bad/rss', errors=[requests.ConnectionError()] * 10)
+    for _ in range(4):
+        pipeline = FeedPipeline([source], breakers=breakers, partial_results=True)
+        assert list(pipeline.batches()) == []
+    assert source.calls == 2
+    assert breakers.states() == {'http://bad/rss': 'open'}
+    assert pipeline.failed_feeds()['http://bad/rss'].startswith('CircuitOpenError')
+
+
+def test_analyze_news_returns_flagged_partial_results(tiny_analyzer):
+    from src.news_sentiment_analyzer import news_sentiment_analyzer as module
+    analyzer = module.NewsSentimentAnalyzer(emit_every=None, emit_interval=None, feed_timeout=0.3,
+                                            retry_policy=RetryPolicy(attempts=2, base_delay=0.01))
+    sources = [FlakySource('http://good/rss', make_articles('good', 3)),
+               FlakySource('http://hung/rss', delay=5.0),
+               FlakySource('http://down/rss', errors=[requests.ConnectionError("refused")] * 2)]
+    start = time.perf_counter()
+    frame = list(analyzer.analyze_news(sources))[-1]
+    assert time.perf_counter() - start < 2.0
+    assert len(frame) == 3 and set(frame['source']) == {'http://good/rss'}
+    assert set(frame.attrs['failed_feeds']) == {'http://hung/rss', 'http://down/rss'}
+    assert analyzer.last_run_metrics['failed_feeds'] == frame.attrs['failed_feeds']
+    assert sources[2].calls == 2
+
+
+class RecordingTransport:
+    timeout = 10
+
+    def __init__(self):
+        self.timeouts = []
+
+    def get(self, url, timeout=None):
+        self.timeouts.append(timeout)
+        raise requests.Timeout("read timed out")
+
+
+def test_request_timeout_is_capped_by_the_feed_deadline():
+    from src.news_sentiment_analyzer.rss_news_scraper import BaseRSSNewsScraperAdapter, RSSNewsScraper
+    transport = RecordingTransport()
+    source = RSSNewsScraper(BaseRSSNewsScraperAdapter('http://slow/rss', transport=transport))
+    pipeline = FeedPipeline([source], feed_timeout=2.0, partial_results=True,
+                            retry=RetryPolicy(attempts=2, base_delay=0.01))
+    assert list(pipeline.batches()) == []
+    assert len(transport.timeouts) == 2 and all(0 < timeout <= 2.0 for timeout in transport.timeouts)
+    assert transport.timeouts[1] < transport.timeouts[0]
+
+    # * Without a deadline the transport's own timeout applies
+    transport.timeouts.clear()
+    assert list(FeedPipeline([source], partial_results=True).batches()) == []
+    assert transport.timeouts == [None]
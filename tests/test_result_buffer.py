@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+from src.news_sentiment_analyzer.result_buffer import ResultBuffer
+
+# ? pytest -vs tests/test_result_buffer.py
+
+
+def make_rows(count):
+    return [{'text': f'story {i}', 'sentiment': 'POSITIVE' if i % 2 else 'NEGATIVE',
+             'confidence': i / 100} for i in range(count)]
+
+
+def test_buffer_grows_in_chunks():
+    buffer = ResultBuffer(chunk_size=4, emit_every=None, emit_interval=None)
+    buffer.extend(make_rows(10))
+    assert len(buffer) == 10
+    assert len(buffer._chunks['text']) == 3
+    frame = buffer.to_frame()
+    assert list(frame.columns) == ['text', 'sentiment', 'confidence']
+    assert list(frame['text']) == [f'story {i}' for i in range(10)]
+    assert frame['confidence'].iloc[9] == pytest.approx(0.09)
+
+
+def test_emit_every_items():
+    buffer = ResultBuffer(emit_every=3, emit_interval=None)
+    buffer.extend(make_rows(2))
+    assert not buffer.should_emit()
+    buffer.append(make_rows(1)[0])
+    assert buffer.should_emit()
+    buffer.to_frame()
+    assert not buffer.should_emit()
+
+
+def test_emit_interval(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("src.news_sentiment_analyzer.result_buffer.time.monotonic", lambda: now[0])
+    buffer = ResultBuffer(emit_every=None, emit_interval=2.0)
+    buffer.append(make_rows(1)[0])
+    assert not buffer.should_emit()
+    now[0] += 2.5
+    assert buffer.should_emit()
+
+
+def test_empty_buffer_and_missing_columns():
+    buffer = ResultBuffer()
+    assert buffer.to_frame().empty
+    buffer.append({'text': 'only text'})
+    frame = buffer.to_frame()
+    assert frame['sentiment'].iloc[0] == ''
+    assert frame['confidence'].isna().iloc[0]
+
+
+def test_category_columns_are_stored_as_codes():
+    buffer = ResultBuffer(columns={'text': 'object', 'sentiment': 'category', 'confidence': 'float32'},
+                          chunk_size=4, emit_every=None, emit_interval=None)
+    buffer.extend(make_rows(3))
+    rows = make_rows(10)[3:]
+    buffer.extend_columns({'text': [row['text'] for row in rows], 'sentiment': [row['sentiment'] for row in rows],
+                           'confidence': [row['confidence'] for row in rows]})
+    assert len(buffer) == 10
+    assert buffer._chunks['sentiment'][0].dtype == 'int8'
+    frame = buffer.to_frame()
+    assert str(frame['sentiment'].dtype) == 'category'
+    assert list(frame['sentiment']) == [row['sentiment'] for row in make_rows(10)]
+    assert list(frame['text']) == [f'story {i}' for i in range(10)]
+    assert frame['confidence'].dtype == 'float32'
+    assert frame['confidence'].iloc[9] == pytest.approx(0.09)
+
+
+def test_to_frame_copies_only_new_rows():
+    buffer = ResultBuffer(columns={'text': 'object', 'sentiment': 'category', 'confidence': 'float32'},
+                          chunk_size=4, emit_every=None, emit_interval=None)
+    rows = make_rows(23)
+    frames = []
+    for start in range(0, 23, 3):
+        buffer.extend(rows[start:start + 3])
+        frames.append(buffer.to_frame())
+        # * Only the chunk still being filled is kept once its rows were published
+        assert len(buffer._chunks['text']) <= 1
+    assert [len(frame) for frame in frames] == [3, 6, 9, 12, 15, 18, 21, 23]
+    assert list(frames[-1]['text']) == [row['text'] for row in rows]
+    assert list(frames[-1]['sentiment']) == [row['sentiment'] for row in rows]
+    assert list(frames[0]['text']) == ['story 0', 'story 1', 'story 2'] and frames[0]['text'].dtype == object
+    with pytest.raises(ValueError):
+        frames[-1].loc[0, 'confidence'] = 1.0
+
+
+def test_frame_columns_share_the_buffer_memory():
+    columns = {'text': 'object', 'sentiment': 'category', 'confidence': 'float32', 'source': 'object',
+               'link': 'object', 'guid': 'object', 'published': 'float64'}
+    buffer = ResultBuffer(columns=columns, chunk_size=4, emit_every=None, emit_interval=None)
+    buffer.extend_columns({'text': ['a', 'b', 'c'], 'sentiment': ['POSITIVE', 'NEGATIVE', 'POSITIVE'],
+                           'confidence': [0.9, 0.8, 0.7], 'source': ['x'] * 3, 'link': ['l'] * 3,
+                           'guid': ['g'] * 3, 'published': [1.0, 2.0, 3.0]})
+    frame = buffer.to_frame()
+    for name in columns:
+        values = frame[name].array.codes if name == 'sentiment' else frame[name].to_numpy()
+        assert np.shares_memory(values, buffer._merged[name]), name
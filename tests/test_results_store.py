@@ -0,0 +1,81 @@
+import pytest
+from src.news_sentiment_analyzer.results_store import ResultsStore
+
+# ? pytest -vs tests/test_results_store.py
+
+HOUR = 3600.0
+
+
+def make_rows(count, source='http://a.example/rss', start=1_700_000_000.0):
+    return [{'source': source, 'text': f'story {i}', 'link': f'http://example.com/{i}', 'guid': '',
+             'sentiment': 'POSITIVE' if i % 2 else 'NEGATIVE', 'confidence': 0.5 + (i % 5) / 10,
+             'published': start + i * HOUR} for i in range(count)]
+
+
+@pytest.fixture
+def store():
+    store = ResultsStore()
+    yield store
+    store.close()
+
+
+def test_upsert_is_idempotent_and_updates_scores(store):
+    rows = make_rows(10)
+    assert store.upsert(rows) == 10
+    assert store.upsert(rows) == 10
+    assert store.count() == 10
+    rows[0]['sentiment'], rows[0]['confidence'] = 'POSITIVE', 0.99
+    store.upsert(rows[:1])
+    stored = store.query(start=rows[0]['published'], end=rows[0]['published'] + 1)
+    assert [(row['sentiment'], row['confidence']) for row in stored] == [('POSITIVE', 0.99)]
+
+
+def test_same_article_in_two_feeds_is_kept_per_source(store):
+    store.upsert(make_rows(3) + make_rows(3, source='http://b.example/rss'))
+    assert store.count() == 6
+    assert store.sources() == ['http://a.example/rss', 'http://b.example/rss']
+    assert store.count(source='http://b.example/rss') == 3
+
+
+def test_missing_publish_time_keeps_earliest_known_date(store):
+    row = make_rows(1)[0]
+    store.upsert([dict(row, published=float('nan'))])
+    store.upsert([row])
+    store.upsert([dict(row, published=None)])
+    assert store.query()[0]['published_at'] == row['published']
+
+
+def test_filters_and_ordering(store):
+    store.upsert(make_rows(48))
+    start = 1_700_000_000.0
+    day = store.query(start=start, end=start + 24 * HOUR, limit=None)
+    assert len(day) == 24
+    assert day[0]['published_at'] > day[-1]['published_at']
+    negative = store.query(sentiment='NEGATIVE', min_confidence=0.8, limit=None, newest_first=False)
+    assert negative and all(r['sentiment'] == 'NEGATIVE' and r['confidence'] >= 0.8 for r in negative)
+    assert negative[0]['published_at'] < negative[-1]['published_at']
+    assert len(store.query(limit=5, offset=45)) == 3
+    assert store.sentiment_counts(end=start + 24 * HOUR) == {'NEGATIVE': 12, 'POSITIVE': 12}
+    assert list(store.to_frame(limit=2).columns)[:2] == ['source', 'article_key']
+
+
+@pytest.mark.parametrize('filters, index', [
+    ({'source': 'http://a.example/rss', 'start': 0.0}, 'idx_results_source_published'),
+    ({'sentiment': 'NEGATIVE'}, 'idx_results_sentiment_published'),
+    ({'start': 0.0, 'end': 1.0}, 'idx_results_published'),
+])
+def test_queries_use_an_index(store, filters, index):
+    store.upsert(make_rows(10))
+    plan = store.explain(**filters)
+    assert index in plan
+    assert 'TEMP B-TREE' not in plan
+
+
+def test_store_persists_between_connections(tmp_path):
+    db_path = tmp_path / 'history' / 'results.db'
+    store = ResultsStore(db_path)
+    store.upsert(make_rows(4))
+    store.close()
+    reopened = ResultsStore(db_path)
+    assert reopened.count() == 4
+    reopened.close()
@@ -67,8 +67,10 @@ def mock_rss_content():
 
 @pytest.fixture
 def mock_requests_get(mock_rss_content):
-    with patch('requests.get') as mock_get:
+    with patch('requests.Session.get') as mock_get:
         mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.headers = {}
         mock_response.content = mock_rss_content.encode('utf-8')
         mock_response.raise_for_status.return_value = None
         mock_get.return_value = mock_response
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+from src.news_sentiment_analyzer.semantic_index import HashingEmbedder, SemanticIndex, spherical_kmeans
+
+# ? pytest -vs tests/test_semantic_index.py
+
+STORIES = [('Stocks rally as markets cheer the rate cut', 'http://a.example/rss'),
+           ('Markets rally after the central bank rate cut', 'http://b.example/rss'),
+           ('Storm floods coastal towns overnight', 'http://a.example/rss'),
+           ('Heavy storm floods towns along the coast', 'http://b.example/rss'),
+           ('Home team wins the championship final', 'http://a.example/rss'),
+           ('Championship final won by the home team', 'http://b.example/rss')]
+
+
+def make_rows():
+    return [{'text': text, 'source': source, 'link': f'http://example.com/{i}', 'guid': '',
+             'sentiment': 'POSITIVE' if i % 2 else 'NEGATIVE', 'confidence': 0.9, 'published': 1000.0 + i}
+            for i, (text, source) in enumerate(STORIES)]
+
+
+@pytest.mark.parametrize('quantize', [False, True])
+def test_search_finds_related_stories(tmp_path, quantize):
+    index = SemanticIndex(tmp_path / 'index', HashingEmbedder(), quantize=quantize)
+    assert index.add(make_rows()) == 6
+    assert index.add(make_rows()) == 0
+    results = index.search('storm floods towns', k=2)
+    assert {item['text'] for item in results} == {STORIES[2][0], STORIES[3][0]}
+    assert results[0]['score'] >= results[1]['score']
+    similar = index.similar(results[0]['article_key'], k=1)
+    assert similar[0]['text'] in {STORIES[2][0], STORIES[3][0]} - {results[0]['text']}
+    assert [item['source'] for item in index.search('rate cut', k=3, source='http://b.example/rss')] == \
+        ['http://b.example/rss'] * 3
+    index.close()
+
+    reopened = SemanticIndex(tmp_path / 'index', HashingEmbedder())
+    assert len(reopened) == 6 and reopened.quantize == quantize
+    assert reopened.search('storm floods towns', k=2) == results
+    reopened.close()
+    with pytest.raises(ValueError):
+        SemanticIndex(tmp_path / 'index', HashingEmbedder(dim=64))
+
+
+def test_ivf_search_matches_exact_scan():
+    rng = np.random.default_rng(0)
+    centers = rng.standard_normal((20, 32)).astype(np.float32)
+
+    class ClusteredEmbedder:
+        name, dim = 'clustered', 32
+
+        def embed(self, texts):
+            return np.stack([centers[int(text.split()[-1]) % 20] + rng.standard_normal(32) * 0.1
+                             for text in texts]).astype(np.float32)
+
+    index = SemanticIndex(embedder=ClusteredEmbedder(), nprobe=2)
+    index.add({'text': f'item {i}', 'source': 'src'} for i in range(2000))
+    assert len(index) == 2000
+    stats = index.build_ivf(n_lists=20)
+    assert stats['lists'] == 20 and stats['rows'] == 2000
+    index.add([{'text': 'late item 3', 'source': 'src'}])
+    query = centers[3]
+    exact = {item['id'] for item in index.search(query, k=10, exact=True)}
+    approximate = {item['id'] for item in index.search(query, k=10)}
+    assert len(exact & approximate) >= 9
+    # * Rows added after the partition was built are still found
+    assert 2000 in {item['id'] for item in index.search(query, k=len(index))}
+
+
+def test_topics_group_similar_stories():
+    index = SemanticIndex(embedder=HashingEmbedder())
+    index.add(make_rows())
+    topics = index.topics(n_topics=3, examples=2)
+    assert sum(topic['size'] for topic in topics) == 6
+    assert all(len(topic['examples']) <= 2 for topic in topics)
+    vectors = HashingEmbedder().embed([text for text, _ in STORIES])
+    _, assignments = spherical_kmeans(vectors, 3)
+    assert len(set(assignments.tolist())) <= 3
@@ -0,0 +1,91 @@
+import math
+import pytest
+from src.news_sentiment_analyzer.sentiment_aggregator import (
+    ALL_SOURCES, DAY, HOUR, RunningStats, SentimentAggregator)
+
+# ? pytest -vs tests/test_sentiment_aggregator.py
+
+NOW = 1_700_000_000.0 - 1_700_000_000.0 % DAY + 12 * HOUR
+
+
+class FakeClock:
+    def __init__(self, now=NOW):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_running_stats_match_batch_statistics():
+    values = [('POSITIVE', 0.9), ('NEGATIVE', 0.6), ('POSITIVE', 0.75), ('NEGATIVE', 0.99), ('NEUTRAL', 0.5)]
+    whole, left, right = RunningStats(), RunningStats(), RunningStats()
+    for i, (sentiment, confidence) in enumerate(values):
+        whole.add(sentiment, confidence)
+        (left if i < 2 else right).add(sentiment, confidence)
+    left.merge(right)
+    confidences = [confidence for _, confidence in values]
+    mean = sum(confidences) / len(confidences)
+    std = math.sqrt(sum((c - mean) ** 2 for c in confidences) / len(confidences))
+    for stats in (whole, left):
+        assert stats.as_dict() == {'count': 5, 'positive': 2, 'negative': 2, 'positive_ratio': 0.4,
+                                   'mean_confidence': round(mean, 4), 'confidence_std': round(std, 4)}
+
+
+def test_results_land_in_hour_and_day_buckets():
+    aggregator = SentimentAggregator(clock=FakeClock())
+    aggregator.add('a', 'POSITIVE', 0.9, published=NOW - 10)
+    aggregator.add('a', 'NEGATIVE', 0.7, published=NOW - 2 * HOUR)
+    aggregator.add('b', 'POSITIVE', 0.8)
+    hourly = aggregator.series('hour', source='a')
+    assert [row['bucket_start'] for row in hourly] == [NOW - 2 * HOUR, NOW - HOUR]
+    daily = aggregator.series('day')
+    assert len(daily) == 1 and daily[0]['source'] == ALL_SOURCES
+    assert daily[0]['count'] == 3 and daily[0]['positive_ratio'] == pytest.approx(0.6667)
+    with pytest.raises(ValueError):
+        aggregator.series('minute')
+
+
+def test_articles_are_counted_once():
+    aggregator = SentimentAggregator(clock=FakeClock())
+    rows = [{'source': 'a', 'text': 'story', 'link': 'http://example.com/1', 'sentiment': 'POSITIVE',
+             'confidence': 0.9, 'published': NOW}]
+    assert aggregator.add_rows(rows) == 1
+    assert aggregator.add_rows(rows) == 0
+    assert aggregator.add_rows([dict(rows[0], source='b')]) == 1
+    summary = aggregator.summary()
+    assert [(row['source'], row['count']) for row in summary] == [('a', 1), ('b', 1), (ALL_SOURCES, 2)]
+
+
+def test_buckets_expire_and_persist(tmp_path):
+    clock = FakeClock()
+    db_path = tmp_path / 'aggregates.db'
+    aggregator = SentimentAggregator(db_path, resolutions={'hour': (HOUR, DAY), 'day': (DAY, 7 * DAY)},
+                                     clock=clock)
+    assert not aggregator.add('a', 'POSITIVE', 0.9, published=NOW - 8 * DAY)
+    aggregator.add('a', 'POSITIVE', 0.9, published=NOW - 2 * DAY, key='old')
+    aggregator.add('a', 'NEGATIVE', 0.6, published=NOW, key='new')
+    assert len(aggregator.series('hour')) == 1
+    aggregator.close()
+
+    clock.now += 2 * DAY
+    reopened = SentimentAggregator(db_path, resolutions={'hour': (HOUR, DAY), 'day': (DAY, 7 * DAY)},
+                                   clock=clock)
+    assert reopened.series('hour') == []
+    assert [row['count'] for row in reopened.series('day')] == [1, 1]
+    assert not reopened.add('a', 'NEGATIVE', 0.6, published=NOW, key='new')
+    reopened.close()
+
+
+def test_only_unflushed_identities_are_kept_in_memory():
+    aggregator = SentimentAggregator(clock=FakeClock())
+    for i in range(100):
+        aggregator.add('a', 'POSITIVE', 0.9, published=NOW, key=f'story-{i}')
+    assert len(aggregator._new_seen) == 100
+    aggregator.flush()
+    assert aggregator._new_seen == {}
+    assert not aggregator.add('a', 'POSITIVE', 0.9, published=NOW, key='story-7')
+    assert aggregator.add('a', 'POSITIVE', 0.9, published=NOW, key='story-100')
+    assert aggregator.summary()[0]['count'] == 101
+    plan = aggregator._connection.execute(
+        "EXPLAIN QUERY PLAN DELETE FROM aggregated_items WHERE bucket_time < ?", (NOW,)).fetchall()
+    assert 'idx_aggregated_items_time' in str(plan)
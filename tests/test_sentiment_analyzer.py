@@ -42,3 +42,55 @@ def test_sentiment_analyzer_initialization():
     for result in results:
         print(result)
         # Add more assertions as needed
+
+
+def test_batched_results_match_single_text(tiny_model_dir):
+    analyzer = SentimentAnalyzer(model_name=tiny_model_dir, max_batch_size=2)
+    texts = ["i love this movie", "sad", "the weather is okay today",
+             "bad news", "great"]
+    results = analyzer.get_sentiment(texts)
+    assert [r['text'] for r in results] == texts
+    for text, result in zip(texts, results):
+        single = analyzer.get_sentiment(text)
+        assert single['sentiment'] == result['sentiment']
+        assert single['confidence'] == pytest.approx(result['confidence'], abs=1e-3)
+
+
+def test_plan_batches_respects_limits(tiny_model_dir):
+    analyzer = SentimentAnalyzer(model_name=tiny_model_dir, max_batch_size=3,
+                                 max_tokens_per_batch=20)
+    lengths = [10, 2, 9, 3, 4, 2, 1]
+    batches = analyzer._plan_batches(lengths)
+    assert sorted(i for batch in batches for i in batch) == list(range(len(lengths)))
+    for batch in batches:
+        assert len(batch) <= 3
+        assert max(lengths[i] for i in batch) * len(batch) <= 20
+
+
+def test_long_text_is_scored_with_windows(tiny_model_dir):
+    analyzer = SentimentAnalyzer(model_name=tiny_model_dir, window_overlap=8)
+    ids = list(range(100))
+    windows = analyzer._split_windows(ids)
+    assert len(windows) > 1
+    assert all(len(window) <= 32 for window in windows)
+    assert windows[0][1:-1][:10] == ids[:10]
+    assert windows[-1][1:-1][-10:] == ids[-10:]
+
+    for aggregation in SentimentAnalyzer.WINDOW_AGGREGATIONS:
+        analyzer.window_aggregation = aggregation
+        result = analyzer.get_sentiment("good news " * 40)
+        assert result['sentiment'] in ("POSITIVE", "NEGATIVE")
+        assert 0.5 <= result['confidence'] <= 1.0
+
+
+def test_unknown_window_aggregation_raises(tiny_model_dir):
+    with pytest.raises(ValueError):
+        SentimentAnalyzer(model_name=tiny_model_dir, window_aggregation="median")
+
+
+def test_model_revision_tracks_scoring_settings(tiny_model_dir):
+    analyzer = SentimentAnalyzer(model_name=tiny_model_dir)
+    revision = analyzer.model_revision
+    assert revision == SentimentAnalyzer(model_name=tiny_model_dir).model_revision
+    analyzer.window_aggregation = 'max'
+    assert analyzer.model_revision != revision
@@ -0,0 +1,87 @@
+import time
+import pytest
+from src.news_sentiment_analyzer.sentiment_cache import SentimentCache
+
+# ? pytest -vs tests/test_sentiment_cache.py
+
+
+class CountingAnalyzer:
+    model_name = "counting-model"
+
+    def __init__(self, revision="r1"):
+        self.model_revision = revision
+        self.scored = []
+
+    def get_sentiment(self, texts):
+        self.scored.extend(texts)
+        return [{'text': t, 'sentiment': 'POSITIVE' if 'good' in t else 'NEGATIVE',
+                 'confidence': 0.9} for t in texts]
+
+
+def test_repeat_texts_are_not_rescored():
+    cache = SentimentCache()
+    analyzer = CountingAnalyzer()
+    first = cache.get_sentiment(analyzer, ["good news", "bad news", "good news"])
+    assert analyzer.scored == ["good news", "bad news"]
+    second = cache.get_sentiment(analyzer, ["good  news", "bad news"])
+    assert analyzer.scored == ["good news", "bad news"]
+    assert [r['sentiment'] for r in first] == ['POSITIVE', 'NEGATIVE', 'POSITIVE']
+    assert second[0]['text'] == "good  news"
+    stats = cache.stats()
+    assert stats['misses'] == 3
+    assert stats['memory_hits'] == 2
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    db_path = tmp_path / "cache.sqlite"
+    analyzer = CountingAnalyzer()
+    cache = SentimentCache(db_path)
+    cache.get_sentiment(analyzer, ["good news", "bad news"])
+    cache.close()
+
+    reopened = SentimentCache(db_path)
+    reopened.get_sentiment(analyzer, ["good news", "bad news", "new story"])
+    assert analyzer.scored == ["good news", "bad news", "new story"]
+    assert reopened.stats()['disk_hits'] == 2
+
+
+def test_model_change_invalidates_entries(tmp_path):
+    db_path = tmp_path / "cache.sqlite"
+    cache = SentimentCache(db_path)
+    cache.get_sentiment(CountingAnalyzer("r1"), ["good news"])
+    updated = CountingAnalyzer("r2")
+    cache.get_sentiment(updated, ["good news"])
+    assert updated.scored == ["good news"]
+    assert cache.stats()['disk_entries'] == 1
+
+
+def test_lru_and_age_eviction(tmp_path, monkeypatch):
+    cache = SentimentCache(tmp_path / "cache.sqlite", max_memory_entries=2,
+                           max_disk_entries=3, max_age_seconds=60)
+    analyzer = CountingAnalyzer()
+    cache.get_sentiment(analyzer, ["a", "b", "c", "d"])
+    stats = cache.stats()
+    assert stats['memory_entries'] == 2
+    assert stats['disk_entries'] == 3
+
+    now = time.time()
+    monkeypatch.setattr("src.news_sentiment_analyzer.sentiment_cache.time.time", lambda: now + 120)
+    cache.get_sentiment(analyzer, ["d"])
+    assert analyzer.scored.count("d") == 2
+
+
+def test_disk_size_is_tracked_without_counting(tmp_path, monkeypatch):
+    cache = SentimentCache(tmp_path / "cache.sqlite", max_age_seconds=60)
+    analyzer = CountingAnalyzer()
+    cache.get_sentiment(analyzer, ["a", "b"])
+    monkeypatch.setattr(cache, "_disk_count", lambda: pytest.fail("sentiment_cache rows counted"))
+    assert cache.stats()['disk_entries'] == 2
+
+    # * Rescoring an expired entry replaces its row
+    cache._memory.clear()
+    now = time.time()
+    with cache._connection:
+        cache._connection.execute("UPDATE sentiment_cache SET created_at = ? WHERE rowid = 1", (now - 120,))
+    cache.get_sentiment(analyzer, ["a", "b", "c"])
+    assert analyzer.scored.count("a") + analyzer.scored.count("b") == 3
+    assert cache.stats()['disk_entries'] == 3
@@ -0,0 +1,41 @@
+import pytest
+from src.news_sentiment_analyzer.text_normalizer import TextNormalizer, DEFAULT_NORMALIZER, HTML_NORMALIZER
+from src.news_sentiment_analyzer.rss_news_scraper import StringCleaner
+
+# ? pytest -vs tests/test_text_normalizer.py
+
+
+@pytest.mark.parametrize("raw,expected", [
+    ("  Breaking:\n  markets\r\n rally\t ", "Breaking: markets rally"),
+    ("Zelensky meets Macron 🇺🇦🇫🇷 in Paris", "Zelensky meets Macron in Paris"),
+    ("Café owner in São Paulo ☕️ wins", "Café owner in São Paulo wins"),
+    ("Family 👨‍👩‍👧 reunited 👍🏽", "Family reunited"),
+    ("zero\u200bwidth\u00adsoft and bell\x07", "zerowidthsoft and bell"),
+    ("Cafe\u0301 decomposed", "Caf\u00e9 decomposed"),
+    ("", ""),
+])
+def test_default_policy(raw, expected):
+    assert DEFAULT_NORMALIZER.normalize(raw) == expected
+
+
+def test_html_policy_unescapes_and_strips_tags():
+    raw = "<p>Tom &amp; Jerry&#8217;s <b>new</b> show</p><!-- ad --><br/>a < b"
+    assert HTML_NORMALIZER.normalize(raw) == "Tom & Jerry’s new show a < b"
+    assert DEFAULT_NORMALIZER.normalize("<b>kept</b>") == "<b>kept</b>"
+    assert HTML_NORMALIZER.normalize("Café &lt;b&gt;bold&lt;/b&gt; &lt;3") == "Café bold <3"
+
+
+def test_optional_policies():
+    assert TextNormalizer(keep_unicode=False).normalize("Café 😀 Zoë") == "Caf Zo"
+    assert TextNormalizer(strip_emoji=False).normalize("Go 🚀 now") == "Go 🚀 now"
+    assert TextNormalizer(collapse_whitespace=False).normalize("a\nb\x00  c") == "a b  c"
+
+
+def test_batch_matches_single_calls():
+    texts = ["  One\n", "Två 🎉", "", None, "<i>x</i> &amp; y"]
+    for normalizer in (DEFAULT_NORMALIZER, HTML_NORMALIZER, TextNormalizer(collapse_whitespace=False)):
+        assert normalizer.normalize_batch(texts) == [normalizer.normalize(text) for text in texts]
+
+
+def test_string_cleaner_keeps_accented_names():
+    assert StringCleaner.clean_string(" Angela Merkel and José Mourinho 😀 \n") == "Angela Merkel and José Mourinho"